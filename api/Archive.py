@@ -0,0 +1,44 @@
+"""
+Move past events and read notifications into the archive tables.
+
+Events dated before the horizon (ARCHIVE_HORIZON_DAYS, default 180) are moved
+with their group links and RSVPs; read notifications about them follow.
+Batches are small, separate transactions with a pause in between, so this can
+run next to live traffic (e.g. nightly from cron).
+
+Usage:
+    python Archive.py                               # horizon from settings
+    python Archive.py --horizon-days 365 --batch-size 1000 --pause 0.5
+    python Archive.py --max-batches 10              # bounded run
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional
+
+from classes.ArchiveManager import ArchiveManager
+from classes.SQLManager import DatabaseManager
+from classes.ServiceConfig import Settings
+
+
+def main(argv: Optional[list] = None) -> None:
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizon-days", type=int, default=settings.archive_horizon_days)
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per transaction")
+    parser.add_argument("--pause", type=float, default=0.1, help="seconds between batches")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches per table")
+    args = parser.parse_args(argv)
+
+    horizon = datetime.now() - timedelta(days=args.horizon_days)
+    archiver = ArchiveManager(DatabaseManager.from_settings(settings), batch_size=args.batch_size, pause=args.pause)
+    print(f"Archiving everything dated before {horizon:%Y-%m-%d %H:%M}")
+
+    events = archiver.archiveEvents(horizon, args.max_batches,
+                                    on_batch=lambda n: print(f"  moved {n} events", flush=True))
+    notifications = archiver.archiveNotifications(horizon, args.max_batches,
+                                                  on_batch=lambda n: print(f"  moved {n} notifications", flush=True))
+    print(f"Archived {events} events and {notifications} read notifications")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,153 @@
 import sys
 import os
+import asyncio
+import base64
+import logging
+from contextlib import asynccontextmanager
 
 
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
+from classes.AdminDirectory import AdminDirectory
+from classes.AdmissionControl import add_admission_control
+from classes.CalendarFeeds import CalendarFeeds, FeedStamp
+from classes.FastJSON import RowEncoder, json_rows
+from classes.HealthChecks import add_health_checks
+from classes.ChangeVersions import ChangeVersions, conditional, group_version_bumps, groups_by_id, http_date, not_modified
+from classes.Compression import add_compression
+from classes.DataLoader import Loaders
+from classes.DatabaseGuard import CircuitBreaker, add_database_guard, endpoint_statement_timeout
+from classes.NotificationCoalescer import NotificationCoalescer
+from classes.NotificationHub import NotificationHub, format_sse
 from classes.NotificationManager import NotificationManager
+from classes.NotificationOutbox import NotificationOutbox
+from classes.OutboxWorker import OutboxWorker
+from classes.ReadReceiptBuffer import ReadReceiptBuffer
+from classes.ReminderScheduler import ReminderScheduler, parse_leads
+from classes.SingleFlight import SingleFlight
+from classes.ServiceConfig import DESCRIPTION_MAX_LENGTH, NEXT_CURSOR_HEADER, Settings, add_cors
 
 from classes.SQLManager import DatabaseManager
 
-# Initialize NotificationManager with DB credentials
-nm = NotificationManager(
-    server="cs4090.database.windows.net,1433",
-    database="CS4090Project",
-    username="DevUser",
-    password="CSProject4090!"
-)
-
-
-db = DatabaseManager(
-    server="cs4090.database.windows.net,1433",
-    database="CS4090Project",
-    username="DevUser",
-    password="CSProject4090!"
-)
-
-app = FastAPI(title="Events Service", version="1.0.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000", "http://localhost:5174", "http://127.0.0.1"],
-    allow_origin_regex=r"http://localhost:\d+",
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(dependencies=[Depends(endpoint_statement_timeout)])
+
+
+def get_db(request: Request) -> DatabaseManager:
+    return request.app.state.db
+
+
+def get_nm(request: Request) -> NotificationManager:
+    return request.app.state.nm
+
+
+def get_read_receipts(request: Request) -> ReadReceiptBuffer:
+    return request.app.state.read_receipts
+
+
+def get_hub(request: Request) -> NotificationHub:
+    return request.app.state.hub
+
+
+def get_loaders(request: Request) -> Loaders:
+    """This request's batching loaders (classes/DataLoader.py)."""
+    return Loaders.of(request, request.app.state.db, request.app.state.flights)
+
+
+def get_outbox(request: Request) -> NotificationOutbox:
+    return request.app.state.outbox
+
+
+def get_outbox_worker(request: Request) -> Optional[OutboxWorker]:
+    """The in-process outbox worker, or None when a NotificationWorker.py process delivers."""
+    return request.app.state.outbox_worker if request.app.state.settings.outbox_inline_worker else None
+
+
+def get_admins(request: Request) -> AdminDirectory:
+    return request.app.state.admins
+
+
+def get_feeds(request: Request) -> CalendarFeeds:
+    return request.app.state.feeds
+
+
+def get_versions(request: Request) -> ChangeVersions:
+    return request.app.state.versions
+
+
+def get_flights(request: Request) -> SingleFlight:
+    return request.app.state.flights
+
+
+def require_event_admin(admins: AdminDirectory, username: str, event_df) -> None:
+    """
+    Only an admin of one of the event's groups may change it. event_df holds
+    the event's GroupToEvent rows (groupID is NULL for an event in no group,
+    which stays open to any user as before).
+    """
+    group_ids = [int(g) for g in event_df["groupID"].dropna()]
+    if group_ids and not any(admins.is_admin(username, g, confirm=True) for g in group_ids):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only an admin of the event's group can change it"
+        )
+
+
+async def require_user(loaders: Loaders, username: str) -> None:
+    """
+    404 unless the user exists; looked up through the request's users loader,
+    so it shares a batch with the request's other user lookups.
+    """
+    if await loaders.users.load(username) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+
+def event_sources(include_archived: bool) -> Tuple[str, str]:
+    """
+    Event and GroupToEvent sources for read queries. Past events moved to the
+    archive tables (classes/ArchiveManager.py) are only read when asked for.
+    """
+    if include_archived:
+        return "EventAll", "GroupToEventAll"
+    return "[Event]", "GroupToEvent"
+
+
+# Notification pages (GET /notifications/{username})
+NOTIFICATION_PAGE_SIZE = 50
+NOTIFICATION_PAGE_MAX = 200
+
+
+def encode_cursor(timestamp, notification_id: Optional[int] = None) -> str:
+    """
+    Opaque page cursor for the notificationTimestamp and notificationID of
+    the last row returned. The timestamp is passed back to the database as it
+    was read, so it compares exactly against the stored timestamps.
+    """
+    value = str(timestamp) if notification_id is None else f"{timestamp}|{int(notification_id)}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[int]]:
+    """
+    Inverse of encode_cursor: (timestamp, notificationID). Cursors issued
+    before the ID was added decode with no ID. Raises ValueError for a cursor
+    it did not produce.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, _, notification_id = value.partition("|")
+        datetime.fromisoformat(timestamp)
+        return timestamp, int(notification_id) if notification_id else None
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
 
 # Response models
 
@@ -46,61 +156,72 @@ class EventResponse(BaseModel):
     date: str
     description: Optional[str] = None
 
+# Hot list endpoints send rows in these models' shape without validating a model per row
+EVENT_ROWS = RowEncoder(EventResponse)
+
 class EventDetailResponse(BaseModel):
     eventID: int
     date: str
     description: Optional[str] = None
     groups: List[dict]
 
+# name and time are stored together as "<name> at <time>"
 class EventCreate(BaseModel):
-    name: str
+    name: str = Field(max_length=DESCRIPTION_MAX_LENGTH - 50)
     date: str
-    time: str
+    time: str = Field(max_length=46)
 
 class EventUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[str] = Field(default=None, max_length=DESCRIPTION_MAX_LENGTH - 50)
     date: Optional[str] = None
-    time: Optional[str] = None
+    time: Optional[str] = Field(default=None, max_length=46)
 
 class EventCreateForGroup(BaseModel):
     date: str
-    description: str
+    description: str = Field(max_length=DESCRIPTION_MAX_LENGTH)
 
 class RSVPRequest(BaseModel):
     username: str
 
 # EVENT QUERY ENDPOINTS
 
-@app.get("/events/user/{username}")
-async def get_user_events(username: str) -> List[EventResponse]:
+def read_events(db: DatabaseManager, query: str, params: dict) -> List[dict]:
+    """An event list query's rows in EventResponse shape."""
+    return EVENT_ROWS.encode(db.read_query_to_rows(query, params))
+
+
+@router.get("/events/user/{username}")
+async def get_user_events(username: str, request: Request, response: Response, include_archived: bool = False,
+                          db: DatabaseManager = Depends(get_db),
+                          versions: ChangeVersions = Depends(get_versions),
+                          flights: SingleFlight = Depends(get_flights)) -> List[EventResponse]:
     """
     Get all events for a specific user based on their group memberships.
     
     Returns events from all groups the user is a member of.
+    Archived events are included only with include_archived=true.
+    Answers 304 to a current If-None-Match without reading the events.
+    Concurrent requests for the same list at the same version share one query.
     """
     try:
-        query = """
-            SELECT DISTINCT e.eventID, e.date, CAST(e.description AS NVARCHAR(MAX)) as description
-            FROM [Event] e
-            JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        etag = await flights.do("user_events_tag", username, versions.userEventsTag, username)
+        unchanged = conditional(request, response, etag)
+        if unchanged:
+            return unchanged
+
+        events_table, links_table = event_sources(include_archived)
+        query = f"""
+            SELECT DISTINCT e.eventID, e.date, e.description
+            FROM {events_table} e
+            JOIN {links_table} gte ON e.eventID = gte.eventID
             JOIN GroupMember gm ON gte.groupID = gm.groupID
             WHERE gm.username = :username
             ORDER BY e.date
         """
         
-        df = db.read_query_to_df(query, {"username": username})
-        
-        if len(df) == 0:
-            return []
-        
-        events = df.to_dict('records')
-        
-        # Convert date to string format
-        for event in events:
-            if isinstance(event['date'], datetime):
-                event['date'] = event['date'].isoformat()
-        
-        return events
+        events = await flights.do("user_events", (username, include_archived, etag),
+                                  read_events, db, query, {"username": username})
+        return json_rows(events, response)
         
     except Exception as e:
         raise HTTPException(
@@ -108,35 +229,37 @@ async def get_user_events(username: str) -> List[EventResponse]:
             detail=f"Error retrieving user events: {str(e)}"
         )
 
-@app.get("/events/group/{group_id}")
-async def get_group_events(group_id: int) -> List[EventResponse]:
+@router.get("/events/group/{group_id}")
+async def get_group_events(group_id: int, request: Request, response: Response, include_archived: bool = False,
+                           db: DatabaseManager = Depends(get_db),
+                           versions: ChangeVersions = Depends(get_versions),
+                           flights: SingleFlight = Depends(get_flights)) -> List[EventResponse]:
     """
     Get all events for a specific group.
     
     Returns all events associated with the given group ID.
+    Archived events are included only with include_archived=true.
+    Answers 304 to a current If-None-Match without reading the events.
+    Concurrent requests for the same list at the same version share one query.
     """
     try:
-        query = """
-            SELECT e.eventID, e.date, CAST(e.description AS NVARCHAR(MAX)) as description
-            FROM [Event] e
-            JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        etag = await flights.do("group_events_tag", group_id, versions.groupEventsTag, group_id)
+        unchanged = conditional(request, response, etag)
+        if unchanged:
+            return unchanged
+
+        events_table, links_table = event_sources(include_archived)
+        query = f"""
+            SELECT e.eventID, e.date, e.description
+            FROM {events_table} e
+            JOIN {links_table} gte ON e.eventID = gte.eventID
             WHERE gte.groupID = :group_id
             ORDER BY e.date
         """
         
-        df = db.read_query_to_df(query, {"group_id": group_id})
-        
-        if len(df) == 0:
-            return []
-        
-        events = df.to_dict('records')
-        
-        # Convert date to string format
-        for event in events:
-            if isinstance(event['date'], datetime):
-                event['date'] = event['date'].isoformat()
-        
-        return events
+        events = await flights.do("group_events", (group_id, include_archived, etag),
+                                  read_events, db, query, {"group_id": group_id})
+        return json_rows(events, response)
         
     except Exception as e:
         raise HTTPException(
@@ -144,51 +267,109 @@ async def get_group_events(group_id: int) -> List[EventResponse]:
             detail=f"Error retrieving group events: {str(e)}"
         )
 
-@app.get("/events/{event_id}")
-async def get_event_details(event_id: int) -> EventDetailResponse:
+def calendar_response(request: Request, feeds: CalendarFeeds, stamp: FeedStamp) -> Response:
+    """
+    200 with the feed, or 304 when the client's copy is current. Both carry the validators.
+    """
+    headers = {"ETag": stamp.etag, "Cache-Control": "no-cache"}
+    if stamp.last_modified is not None:
+        headers["Last-Modified"] = http_date(stamp.last_modified)
+    if not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since"),
+                    stamp.etag, stamp.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=feeds.body(stamp), media_type="text/calendar; charset=utf-8", headers=headers)
+
+@router.get("/events/user/{username}/calendar.ics")
+async def get_user_calendar(username: str, request: Request, feeds: CalendarFeeds = Depends(get_feeds)):
+    """
+    iCalendar feed of the events in all of a user's groups, for calendar app subscriptions.
+    Polls with If-None-Match get 304 until one of the groups' events changes.
+    """
+    try:
+        stamp = feeds.userStamp(username)
+        if stamp is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return calendar_response(request, feeds, stamp)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving user calendar: {str(e)}"
+        )
+
+@router.get("/events/group/{group_id}/calendar.ics")
+async def get_group_calendar(group_id: int, request: Request, feeds: CalendarFeeds = Depends(get_feeds)):
+    """
+    iCalendar feed of a group's events, for calendar app subscriptions.
+    Polls with If-None-Match or If-Modified-Since get 304 until the group's events change.
+    """
+    try:
+        stamp = feeds.groupStamp(group_id)
+        if stamp is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Group not found"
+            )
+        return calendar_response(request, feeds, stamp)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving group calendar: {str(e)}"
+        )
+
+async def load_event_details(loaders: Loaders, event_ids: List[int], include_archived: bool) -> List[Optional[dict]]:
+    """
+    Events with their groups, None for any that does not exist. However many
+    are asked for, the events are read in one query and their groups in another.
+    """
+    tables = event_sources(include_archived)
+    events, groups = await asyncio.gather(loaders.events(tables).load_many(event_ids),
+                                          loaders.event_groups(tables).load_many(event_ids))
+    return [
+        {**EVENT_ROWS.encode([event])[0], "groups": event_groups} if event is not None else None
+        for event, event_groups in zip(events, groups)
+    ]
+
+@router.post("/events/by_id/", response_model=List[EventDetailResponse])
+async def get_events_by_id(eventIDs: List[int], include_archived: bool = False,
+                           loaders: Loaders = Depends(get_loaders)):
+    """
+    Details of a list of events, with their groups, in the order asked for.
+    Events that do not exist are left out. Two queries for the whole list.
+    """
+    try:
+        details = await load_event_details(loaders, list(dict.fromkeys(eventIDs)), include_archived)
+        return [event for event in details if event is not None]
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving events: {str(e)}"
+        )
+
+@router.get("/events/{event_id}")
+async def get_event_details(event_id: int, include_archived: bool = False,
+                            loaders: Loaders = Depends(get_loaders)) -> EventDetailResponse:
     """
     Get detailed information about a specific event.
     
     Includes the event details and all groups associated with it.
+    Archived events are found only with include_archived=true.
+    Concurrent requests for the same event share one read.
     """
     try:
-        event_query = """
-            SELECT eventID, date, CAST(description AS NVARCHAR(MAX)) as description
-            FROM [Event]
-            WHERE eventID = :event_id
-        """
-        
-        event_df = db.read_query_to_df(event_query, {"event_id": event_id})
-        
-        if len(event_df) == 0:
+        details = (await load_event_details(loaders, [event_id], include_archived))[0]
+        if details is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
-        
-        # Get associated groups
-        groups_query = """
-            SELECT g.groupID, g.groupName, CAST(g.description AS NVARCHAR(MAX)) as description
-            FROM [Group] g
-            JOIN GroupToEvent gte ON g.groupID = gte.groupID
-            WHERE gte.eventID = :event_id
-        """
-        
-        groups_df = db.read_query_to_df(groups_query, {"event_id": event_id})
-        
-        event = event_df.iloc[0].to_dict()
-        
-        if isinstance(event['date'], datetime):
-            event['date'] = event['date'].isoformat()
-
-        groups = groups_df.to_dict('records') if len(groups_df) > 0 else []
-        
-        return {
-            "eventID": event['eventID'],
-            "date": event['date'],
-            "description": event['description'],
-            "groups": groups
-        }
+        return details
         
     except HTTPException:
         raise
@@ -200,24 +381,16 @@ async def get_event_details(event_id: int) -> EventDetailResponse:
 
 # Event command endpoints
 
-@app.post("/events/{username}", status_code=status.HTTP_201_CREATED)
-async def create_event(username: str, event: EventCreate):
+@router.post("/events/{username}", status_code=status.HTTP_201_CREATED)
+async def create_event(username: str, event: EventCreate, db: DatabaseManager = Depends(get_db),
+                       loaders: Loaders = Depends(get_loaders)):
     """
     Create a new event for a user.
     This is a temporary endpoint - will move to Groups Service.
     """
     try:
         # Verify user exists
-        user_check = """
-            SELECT username FROM [User] WHERE username = :username
-        """
-        user_df = db.read_query_to_df(user_check, {"username": username})
-        
-        if len(user_df) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        await require_user(loaders, username)
         
         # Create event
         insert_query = """
@@ -234,7 +407,7 @@ async def create_event(username: str, event: EventCreate):
             {"date": event.date, "description": description}
         )
         
-        new_event_id = result_df.iloc[0]['eventID']
+        new_event_id = int(result_df.iloc[0]['eventID'])
         
         return {
             "id": new_event_id,
@@ -253,28 +426,26 @@ async def create_event(username: str, event: EventCreate):
         )
 
 
-@app.put("/events/{username}/{event_id}")
-async def update_event(username: str, event_id: int, event: EventUpdate):
+@router.put("/events/{username}/{event_id}")
+async def update_event(username: str, event_id: int, event: EventUpdate,
+                       db: DatabaseManager = Depends(get_db),
+                       admins: AdminDirectory = Depends(get_admins),
+                       flights: SingleFlight = Depends(get_flights),
+                       loaders: Loaders = Depends(get_loaders)):
     """
-    Update an existing event.
+    Update an existing event. A group's event can only be changed by its admins.
     This is a temporary endpoint - will move to Groups Service.
     """
     try:
         # Verify user exists
-        user_check = """
-            SELECT username FROM [User] WHERE username = :username
-        """
-        user_df = db.read_query_to_df(user_check, {"username": username})
-        
-        if len(user_df) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        await require_user(loaders, username)
         
-        # Verify event exists
+        # Verify event exists, with the groups it belongs to
         event_check = """
-            SELECT eventID FROM [Event] WHERE eventID = :event_id
+            SELECT e.eventID, gte.groupID
+            FROM [Event] e
+            LEFT JOIN GroupToEvent gte ON e.eventID = gte.eventID
+            WHERE e.eventID = :event_id
         """
         event_df = db.read_query_to_df(event_check, {"event_id": event_id})
         
@@ -283,6 +454,8 @@ async def update_event(username: str, event_id: int, event: EventUpdate):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Event not found"
             )
+
+        require_event_admin(admins, username, event_df)
         
         # Build update description
         description = None
@@ -313,7 +486,12 @@ async def update_event(username: str, event_id: int, event: EventUpdate):
             WHERE eventID = :event_id
         """
         
-        db.execute_query(update_query, params)
+        # The event's groups' calendar feeds change with it
+        group_ids = [int(g) for g in event_df["groupID"].dropna()]
+        db.execute_transaction(
+            [(update_query, params)] + (group_version_bumps(*groups_by_id(group_ids)) if group_ids else [])
+        )
+        flights.forget("events_by_id", "event_groups")
         
         return {
             "id": event_id,
@@ -331,28 +509,25 @@ async def update_event(username: str, event_id: int, event: EventUpdate):
             detail=f"Error updating event: {str(e)}"
         )
 
-@app.delete("/events/{username}/{event_id}")
-async def delete_event(username: str, event_id: int):
+@router.delete("/events/{username}/{event_id}")
+async def delete_event(username: str, event_id: int, db: DatabaseManager = Depends(get_db),
+                       admins: AdminDirectory = Depends(get_admins),
+                       flights: SingleFlight = Depends(get_flights),
+                       loaders: Loaders = Depends(get_loaders)):
     """
-    Delete an event.
+    Delete an event. A group's event can only be deleted by its admins.
     This is a temporary endpoint - will move to Groups Service.
     """
     try:
         # Verify user exists
-        user_check = """
-            SELECT username FROM [User] WHERE username = :username
-        """
-        user_df = db.read_query_to_df(user_check, {"username": username})
-        
-        if len(user_df) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        await require_user(loaders, username)
         
-        # Verify event exists
+        # Verify event exists, with the groups it belongs to
         event_check = """
-            SELECT eventID FROM [Event] WHERE eventID = :event_id
+            SELECT e.eventID, gte.groupID
+            FROM [Event] e
+            LEFT JOIN GroupToEvent gte ON e.eventID = gte.eventID
+            WHERE e.eventID = :event_id
         """
         event_df = db.read_query_to_df(event_check, {"event_id": event_id})
         
@@ -361,24 +536,25 @@ async def delete_event(username: str, event_id: int):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Event not found"
             )
+
+        require_event_admin(admins, username, event_df)
         
-        # Delete from RSVP first (if exists)
-        delete_rsvp = """
-            DELETE FROM RSVP WHERE eventID = :event_id
-        """
-        db.execute_query(delete_rsvp, {"event_id": event_id})
-        
-        # Delete from GroupToEvent (if exists)
-        delete_mapping = """
-            DELETE FROM GroupToEvent WHERE eventID = :event_id
-        """
-        db.execute_query(delete_mapping, {"event_id": event_id})
-        
-        # Delete event
-        delete_query = """
-            DELETE FROM [Event] WHERE eventID = :event_id
-        """
-        db.execute_query(delete_query, {"event_id": event_id})
+        params = {"event_id": event_id}
+        db.execute_transaction([
+            # Delete from RSVP first (if exists)
+            ("DELETE FROM RSVP WHERE eventID = :event_id", params),
+            # Its groups' calendar feeds lose it; bumped before its GroupToEvent rows go
+            *group_version_bumps("SELECT groupID FROM GroupToEvent WHERE eventID = :event_id", params),
+            # Delete from GroupToEvent (if exists)
+            ("DELETE FROM GroupToEvent WHERE eventID = :event_id", params),
+            # Delete the record of reminders sent for it
+            ("DELETE FROM EventReminderSent WHERE eventID = :event_id", params),
+            # Drop its notification job if it has not been delivered yet
+            ("DELETE FROM NotificationOutbox WHERE eventID = :event_id", params),
+            # Delete event
+            ("DELETE FROM [Event] WHERE eventID = :event_id", params),
+        ])
+        flights.forget("events_by_id", "event_groups")
         
         return {
             "message": "Event deleted successfully",
@@ -395,8 +571,8 @@ async def delete_event(username: str, event_id: int):
 
 # RSVP Endpoitns
 
-@app.get("/rsvp/{event_id}/{username}")
-async def check_rsvp(event_id: int, username: str):
+@router.get("/rsvp/{event_id}/{username}")
+async def check_rsvp(event_id: int, username: str, db: DatabaseManager = Depends(get_db)):
     """
     Check if a user has RSVPed to an event.
     """
@@ -418,12 +594,16 @@ async def check_rsvp(event_id: int, username: str):
             detail=f"Error checking RSVP: {str(e)}"
         )
 
-@app.post("/rsvp/{event_id}", status_code=status.HTTP_201_CREATED)
-async def rsvp_to_event(event_id: int, request: RSVPRequest):
+@router.post("/rsvp/{event_id}", status_code=status.HTTP_201_CREATED)
+async def rsvp_to_event(event_id: int, request: RSVPRequest, db: DatabaseManager = Depends(get_db),
+                        loaders: Loaders = Depends(get_loaders)):
     """
     RSVP to an event.
     """
     try:
+        # Verify user exists
+        await require_user(loaders, request.username)
+
         # Check if already RSVPed
         check_query = """
             SELECT username FROM RSVP
@@ -464,8 +644,8 @@ async def rsvp_to_event(event_id: int, request: RSVPRequest):
             detail=f"Error creating RSVP: {str(e)}"
         )
 
-@app.delete("/rsvp/{event_id}/{username}")
-async def un_rsvp_from_event(event_id: int, username: str):
+@router.delete("/rsvp/{event_id}/{username}")
+async def un_rsvp_from_event(event_id: int, username: str, db: DatabaseManager = Depends(get_db)):
     """
     Remove RSVP from an event.
     """
@@ -511,35 +691,22 @@ async def un_rsvp_from_event(event_id: int, username: str):
         )
 
 # HEALTH CHECK
+# /health, /health/live and /health/ready come from classes/HealthChecks.py (see create_app)
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    try:
-        # Count total events
-        count_query = "SELECT COUNT(*) as total FROM [Event]"
-        df = db.read_query_to_df(count_query, {})
-        total_events = df.iloc[0]['total'] if len(df) > 0 else 0
-        
-        return {
-            "status": "healthy",
-            "total_events": total_events
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "error": str(e)
-        }
-    
-@app.post("/events/group/{group_id}", status_code=status.HTTP_201_CREATED)
-async def create_event_for_group(group_id: int, event: EventCreateForGroup):
+@router.post("/events/group/{group_id}", status_code=status.HTTP_201_CREATED)
+async def create_event_for_group(group_id: int, event: EventCreateForGroup,
+                                 db: DatabaseManager = Depends(get_db),
+                                 outbox: NotificationOutbox = Depends(get_outbox),
+                                 worker: Optional[OutboxWorker] = Depends(get_outbox_worker)):
     """
     Create a new event for a specific group.
+    Members are notified through the notification outbox: at once, or in a
+    digest when the group just had another event.
     """
     try:
         # Verify group exists
         group_check = """
-            SELECT groupID FROM [Group] WHERE groupID = :group_id
+            SELECT groupID, groupName FROM [Group] WHERE groupID = :group_id
         """
         group_df = db.read_query_to_df(group_check, {"group_id": group_id})
         
@@ -549,65 +716,47 @@ async def create_event_for_group(group_id: int, event: EventCreateForGroup):
                 detail="Group not found"
             )
         
-        # Get the next available eventID
-        max_id_query = "SELECT ISNULL(MAX(eventID), 0) + 1 as next_id FROM [Event]"
+        # Get the next available eventID (archived IDs stay taken)
+        max_id_query = "SELECT ISNULL(MAX(eventID), 0) + 1 as next_id FROM EventAll"
         max_id_df = db.read_query_to_df(max_id_query, {})
         next_event_id = int(max_id_df.iloc[0]['next_id'])
         
-        # Insert new event with explicit eventID
+        # The event, its group link and the members' notification job commit together
         insert_query = """
             INSERT INTO [Event] (eventID, date, description)
             VALUES (:eventID, :date, :description)
         """
-        
-        db.execute_query(insert_query, {
-            "eventID": next_event_id,
-            "date": event.date,
-            "description": event.description
-        })
-        
-        # Link event to group in GroupToEvent table
         link_query = """
             INSERT INTO GroupToEvent (eventID, groupID)
             VALUES (:eventID, :groupID)
         """
-        
-        db.execute_query(link_query, {
-            "eventID": next_event_id,
-            "groupID": group_id
-        })
-
-        # Send out notifications
-        try:
-            nm = NotificationManager(
-                server="cs4090.database.windows.net,1433",
-                database="CS4090Project",
-                username="DevUser",
-                password="CSProject4090!"
-            )
-
-            # Fetch all group members
-            members_query = f"SELECT username FROM GroupMember WHERE groupID = {group_id}"
-            members_df = db.read_query_to_df(members_query, {"group_id": group_id})
-            member_usernames = members_df["username"].tolist() if not members_df.empty else []
-
-            # Current timestamp
-            created_at = datetime.now(timezone.utc)
-
-            # Create notifications
-            nm.createNotification(
-                usernames=member_usernames,
-                description=event.description,
+        db.execute_transaction([
+            (insert_query, {
+                "eventID": next_event_id,
+                "date": event.date,
+                "description": event.description
+            }),
+            (link_query, {
+                "eventID": next_event_id,
+                "groupID": group_id
+            }),
+            outbox.enqueueStatement(
                 eventID=next_event_id,
-                created_at=created_at,
-                eventDate=datetime.fromisoformat(event.date),
-                isRead=0
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error sending notifications: {str(e)}"
-            )
+                groupID=group_id,
+                groupName=str(group_df.iloc[0]["groupName"]),
+                description=event.description,
+                eventDate=datetime.fromisoformat(event.date)
+            ),
+            *group_version_bumps(*groups_by_id([group_id]))
+        ])
+
+        # Deliver it now when this service runs the worker, off the event loop; a failure
+        # leaves the job to be retried
+        if worker is not None:
+            try:
+                await run_in_threadpool(worker.process, [next_event_id])
+            except Exception as e:
+                logger.warning("Notification delivery for event %s deferred: %s", next_event_id, e)
         
         return {
             "eventID": next_event_id,
@@ -633,60 +782,327 @@ class NotificationResponse(BaseModel):
     notificationTimestamp: datetime
     eventDate: datetime
     isRead: int
+    groupID: Optional[int] = None
+    # Events a digest notification covers (1 for a single event)
+    eventCount: int = 1
+
+NOTIFICATION_ROWS = RowEncoder(NotificationResponse)
+
+class UnreadCountResponse(BaseModel):
+    username: str
+    unreadCount: int
 
-@app.get("/notifications/{username}", response_model=List[NotificationResponse])
-async def get_notifications(username: str):
+@router.get("/notifications/{username}", response_model=List[NotificationResponse])
+async def get_notifications(username: str, request: Request, response: Response,
+                            limit: int = Query(NOTIFICATION_PAGE_SIZE, ge=1, le=NOTIFICATION_PAGE_MAX),
+                            cursor: Optional[str] = None, unread_only: bool = False,
+                            include_archived: bool = False,
+                            nm: NotificationManager = Depends(get_nm),
+                            versions: ChangeVersions = Depends(get_versions),
+                            flights: SingleFlight = Depends(get_flights)):
     """
-    Get all notifications for a specific user.
+    Get one page of notifications for a specific user, newest first.
+    When more remain, the X-Next-Cursor header holds the cursor for the next page.
+    Archived (read, past-event) notifications are included only with include_archived=true.
+    Answers 304 to a current If-None-Match without reading the notifications.
+    Concurrent requests for the same page at the same version share one query.
     """
     try:
-        notifications = nm.getNotificationsByUsername(username)
-        return notifications
+        try:
+            before, before_id = decode_cursor(cursor) if cursor else (None, None)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+        etag = await flights.do("notifications_tag", username, versions.notificationsTag, username)
+        unchanged = conditional(request, response, etag)
+        if unchanged:
+            return unchanged
+
+        def read_page():
+            # One extra row tells us whether there is a next page
+            notifications = nm.getNotificationsByUsername(
+                username, include_archived=include_archived, limit=limit + 1,
+                before=before, unread_only=unread_only, before_id=before_id
+            )
+            next_cursor = None
+            if len(notifications) > limit:
+                notifications = notifications[:limit]
+                last = notifications[-1]
+                next_cursor = encode_cursor(last["notificationTimestamp"], last.get("notificationID"))
+            return NOTIFICATION_ROWS.encode(notifications), next_cursor
+
+        page, next_cursor = await flights.do(
+            "notifications", (username, etag, limit, before, before_id, unread_only, include_archived), read_page
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return json_rows(page, response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving notifications: {str(e)}"
         )
 
-def send_out_notifications(
-    group_id: int,
-    event_id: int,
-    description: str,
-    event_date: str
-):
+@router.get("/notifications/{username}/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(username: str, nm: NotificationManager = Depends(get_nm)):
     """
-    Send notifications to all group members and group admins
-    when a new event is created.
+    Get the number of unread notifications for a user (for the bell badge).
     """
     try:
-        # Fetch all usernames in the group
-        members_query = """
-            SELECT username FROM GroupMember WHERE groupID = :group_id
-        """
-        df = nm.db.read_query_to_df(members_query, {"group_id": group_id})
-        member_usernames = df["username"].tolist() if not df.empty else []
+        return {"username": username, "unreadCount": nm.getUnreadCount(username)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving unread count: {str(e)}"
+        )
+
+@router.get("/notifications/{username}/stream")
+async def stream_notifications(username: str, request: Request,
+                               nm: NotificationManager = Depends(get_nm),
+                               hub: NotificationHub = Depends(get_hub)):
+    """
+    Server-Sent Events stream of a user's new notifications.
+
+    Sends an "unread" event with the current unread count on connect, then a
+    "notification" event for each notification created while connected. A
+    "resync" event means messages were dropped and the client should refetch.
+    """
+    try:
+        unread = nm.getUnreadCount(username)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error opening notification stream: {str(e)}"
+        )
+
+    heartbeat = request.app.state.settings.sse_heartbeat_seconds
+    subscription = hub.subscribe(username)
 
-        # Current timestamp
-        created_at = datetime.utcnow()
+    async def events():
+        try:
+            yield format_sse("unread", {"unreadCount": unread})
+            async for frame in subscription.frames(heartbeat):
+                yield frame
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Bulk mark-as-read
+
+READ_BY_ID_MAX = 500
+
+class MarkReadByID(BaseModel):
+    notificationIDs: List[int] = Field(min_length=1, max_length=READ_BY_ID_MAX)
+
+class MarkReadInRange(BaseModel):
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+class MarkReadResponse(BaseModel):
+    username: str
+    updated: int
+
+@router.put("/notifications/{username}/read-all", response_model=MarkReadResponse)
+async def mark_all_notifications_read(username: str, nm: NotificationManager = Depends(get_nm)):
+    """
+    Mark every unread notification of a user as read.
+    """
+    try:
+        return {"username": username, "updated": nm.markAllNotificationsAsRead(username)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error marking notifications as read: {str(e)}"
+        )
+
+@router.put("/notifications/{username}/read", response_model=MarkReadResponse)
+async def mark_notifications_read(username: str, request: MarkReadByID,
+                                  nm: NotificationManager = Depends(get_nm)):
+    """
+    Mark a list of a user's notifications as read.
+    """
+    try:
+        updated = nm.markNotificationsAsReadByID(username, request.notificationIDs)
+        return {"username": username, "updated": updated}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error marking notifications as read: {str(e)}"
+        )
 
-        # Convert eventDate string to datetime if needed
-        event_dt = (
-            datetime.fromisoformat(event_date)
-            if isinstance(event_date, str)
-            else event_date
+@router.put("/notifications/{username}/read-range", response_model=MarkReadResponse)
+async def mark_notifications_read_in_range(username: str, request: MarkReadInRange,
+                                           nm: NotificationManager = Depends(get_nm)):
+    """
+    Mark a user's notifications created between start (inclusive) and end (exclusive) as read.
+    """
+    if request.start and request.end and request.start >= request.end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    try:
+        updated = nm.markNotificationsAsReadInRange(username, request.start, request.end)
+        return {"username": username, "updated": updated}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error marking notifications as read: {str(e)}"
         )
 
-        # Create notifications
-        nm.createNotification(
-            usernames=member_usernames,
-            description=description,
-            eventID=event_id,
-            created_at=created_at,
-            eventDate=event_dt,
-            isRead=0
+@router.put("/notifications/{username}/{notification_id}/read", status_code=status.HTTP_202_ACCEPTED)
+async def acknowledge_notification(username: str, notification_id: int,
+                                   receipts: ReadReceiptBuffer = Depends(get_read_receipts)):
+    """
+    Acknowledge that a user opened one notification. The ack is buffered and
+    written with others in one batch shortly after (classes/ReadReceiptBuffer.py).
+    """
+    try:
+        receipts.add(username, notification_id)
+        return {"username": username, "notificationID": notification_id, "status": "accepted"}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error acknowledging notification: {str(e)}"
         )
+
+class OutboxStatsResponse(BaseModel):
+    # Jobs waiting or being delivered
+    pending: int
+    # Jobs leased to a worker right now
+    inFlight: int
+    # Jobs out of attempts (NotificationWorker.py --requeue-failed retries them)
+    failed: int
+    # Age of the oldest pending job
+    lagSeconds: float
+
+@router.get("/outbox/stats", response_model=OutboxStatsResponse)
+async def get_outbox_stats(outbox: NotificationOutbox = Depends(get_outbox)):
+    """
+    Depth and lag of the notification outbox.
+    """
+    try:
+        return outbox.stats()
     except Exception as e:
-        raise Exception(f"Failed to send notifications: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving outbox stats: {str(e)}"
+        )
+
+
+@router.get("/events/stats/admission")
+async def get_admission_stats(request: Request):
+    """
+    Requests running and queued per lane, and how many were admitted or turned away.
+    """
+    admission = request.app.state.admission
+    return admission.stats() if admission else {"enabled": False}
+
+
+@router.get("/events/stats/coalescing")
+async def get_coalescing_stats(flights: SingleFlight = Depends(get_flights)):
+    """
+    How many requests each kind of read served per database call.
+    """
+    return {"inFlight": flights.in_flight, "reads": flights.stats()}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run the read receipt and digest flushers, the reminder scheduler, the
+    health check's table counts and (unless a NotificationWorker.py process
+    does it) the outbox worker while the service is up, and write whatever
+    the flushers still hold on shutdown.
+    """
+    receipts: ReadReceiptBuffer = app.state.read_receipts
+    coalescer: NotificationCoalescer = app.state.coalescer
+    reminders: ReminderScheduler = app.state.reminders
+    flushers = [asyncio.create_task(receipts.run()), asyncio.create_task(coalescer.run()),
+                asyncio.create_task(reminders.run())]
+    if app.state.settings.outbox_inline_worker:
+        flushers.append(asyncio.create_task(app.state.outbox_worker.run()))
+    if app.state.health.stats is not None:
+        flushers.append(asyncio.create_task(app.state.health.stats.run()))
+    try:
+        yield
+    finally:
+        for flusher in flushers:
+            flusher.cancel()
+        try:
+            receipts.flush()
+        except Exception as e:
+            logger.error("Final read receipt flush failed: %s", e)
+        try:
+            coalescer.flush(force=True)
+        except Exception as e:
+            logger.error("Final digest flush failed: %s", e)
+
+
+def create_app(
+    settings: Optional[Settings] = None,
+    db: Optional[DatabaseManager] = None,
+    nm: Optional[NotificationManager] = None,
+    hub: Optional[NotificationHub] = None,
+    admins: Optional[AdminDirectory] = None,
+    breaker: Optional[CircuitBreaker] = None
+) -> FastAPI:
+    """
+    Build the Events Service app.
+
+    Args:
+        settings (Settings): Configuration; read from the environment when omitted
+        db (DatabaseManager): Database to use; built lazily from settings when omitted
+        nm (NotificationManager): Notification manager; shares db, hub and admins when omitted
+        hub (NotificationHub): Fan-out to open notification streams
+        admins (AdminDirectory): Cached GroupAdmin lookups; pass one to share it with other services
+        breaker (CircuitBreaker): Circuit breaker for db; pass one to share it with other services
+    """
+    settings = settings or Settings()
+    db = db or DatabaseManager.from_settings(settings)
+    hub = hub or NotificationHub()
+    admins = admins or AdminDirectory(db, ttl=settings.admin_cache_seconds)
+    nm = nm or NotificationManager(db=db, hub=hub, admins=admins)
+
+    app = FastAPI(title="Events Service", version="1.0.0", lifespan=lifespan)
+    app.state.settings = settings
+    app.state.db = db
+    app.state.nm = nm
+    app.state.hub = hub
+    app.state.admins = admins
+    app.state.read_receipts = ReadReceiptBuffer(
+        nm, flush_interval=settings.read_ack_flush_ms / 1000, max_pending=settings.read_ack_batch_size,
+        max_backlog=settings.read_ack_max_backlog
+    )
+    app.state.coalescer = NotificationCoalescer(nm, window=settings.notification_digest_seconds)
+    app.state.outbox = NotificationOutbox(db)
+    app.state.feeds = CalendarFeeds(db, max_feeds=settings.calendar_cache_feeds)
+    app.state.versions = ChangeVersions(db)
+    app.state.flights = SingleFlight(enabled=bool(settings.read_coalescing))
+    app.state.outbox_worker = OutboxWorker(app.state.outbox, app.state.coalescer)
+    app.state.reminders = ReminderScheduler(
+        nm, leads=parse_leads(settings.reminder_lead_minutes), window=settings.reminder_window_minutes * 60
+    )
+
+    # Middleware, innermost first: CORS headers also reach admission control's and the breaker's 503s
+    add_admission_control(app, settings)
+    add_database_guard(app, settings, db, breaker)
+    add_cors(app)
+    add_compression(app, settings)
+    app.include_router(router)
+    add_health_checks(app, settings, db, "/health",
+                      {"total_events": "Event", "total_notifications": "Notifications", "total_rsvps": "RSVP"})
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
@@ -1,34 +1,47 @@
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from fastapi import FastAPI, HTTPException, status,Query
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response, status,Query
+from pydantic import BaseModel, Field
 
 # Add parent directory to path so classes can be imported
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from classes.AdminDirectory import AdminDirectory
+from classes.AdmissionControl import add_admission_control
+from classes.ChangeVersions import ChangeVersions, conditional
+from classes.Compression import add_compression
+from classes.DataLoader import Loaders
+from classes.DatabaseGuard import CircuitBreaker, add_database_guard, endpoint_statement_timeout
 from classes.GroupManager import GroupManager
+from classes.HealthChecks import add_health_checks, refresh_stats
+from classes.SingleFlight import SingleFlight
+from classes.ServiceConfig import DESCRIPTION_MAX_LENGTH, NAME_MAX_LENGTH, Settings, add_cors
+from classes.SQLManager import DatabaseManager
 
-#Group Manager class
-gm = GroupManager(
-    server="cs4090.database.windows.net,1433",
-    database="CS4090Project",
-    username="DevUser",
-    password="CSProject4090!"
-)
-
-app = FastAPI(title="Group Service", version="1.0.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000", "http://localhost:5174"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter(dependencies=[Depends(endpoint_statement_timeout)])
+
+
+def get_gm(request: Request) -> GroupManager:
+    return request.app.state.gm
+
+
+def get_admins(request: Request) -> AdminDirectory:
+    return request.app.state.admins
+
+
+def get_versions(request: Request) -> ChangeVersions:
+    return request.app.state.versions
+
+
+def get_flights(request: Request) -> SingleFlight:
+    return request.app.state.flights
+
+
+def get_loaders(request: Request) -> Loaders:
+    """This request's batching loaders (classes/DataLoader.py)."""
+    return Loaders.of(request, request.app.state.gm.db, request.app.state.flights)
 
 class GroupResponse(BaseModel):
     groupID: int
@@ -36,46 +49,55 @@ class GroupResponse(BaseModel):
     description: str
 
 class GroupCreate(BaseModel):
-    groupName: str
-    description: str
+    groupName: str = Field(max_length=NAME_MAX_LENGTH)
+    description: str = Field(max_length=DESCRIPTION_MAX_LENGTH)
     adminUsername: str
 
 
 
-@app.get("/groups/", response_model=List[int])
-async def get_all_group_ids() -> List[int]:
+def read_records(db: DatabaseManager, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return db.read_query_to_df(query, params).to_dict("records")
+
+
+@router.get("/groups/", response_model=List[int])
+async def get_all_group_ids(gm: GroupManager = Depends(get_gm),
+                            flights: SingleFlight = Depends(get_flights)) -> List[int]:
     """
     Retrieve all group IDs from the database.
     """
     try:
-        return gm.getAllGroupIDs()
+        return await flights.do("group_ids", None, gm.getAllGroupIDs)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving group IDs: {str(e)}"
         )
 
-@app.post("/groups/by_id/", response_model=List[Dict[str, Any]])
-async def get_groups_by_id(groupIDs: List[int]):
+@router.post("/groups/by_id/", response_model=List[Dict[str, Any]])
+async def get_groups_by_id(groupIDs: List[int], loaders: Loaders = Depends(get_loaders)):
     """
-    Retrieve group information for a list of group IDs.
+    Retrieve group information for a list of group IDs, in the order asked for.
+    Groups that do not exist are left out.
     """
     try:
-        return gm.getGroupInfoByID(groupIDs)
+        groups = await loaders.groups.load_many(list(dict.fromkeys(groupIDs)))
+        return [group for group in groups if group is not None]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving group info: {str(e)}"
         )
 
-@app.post("/groups/join/{group_id}")
-async def join_group(group_id: int, username: str):
+@router.post("/groups/join/{group_id}")
+async def join_group(group_id: int, username: str, gm: GroupManager = Depends(get_gm),
+                     flights: SingleFlight = Depends(get_flights)):
     """
     Add a user to a group.
     Example call: POST /groups/join/5?username=chase
     """
     try:
         gm.addGroupMember(username, group_id)
+        flights.forget("admin_groups")
         return {"message": f"User {username} joined group {group_id}"}
     except Exception as e:
         raise HTTPException(
@@ -84,14 +106,16 @@ async def join_group(group_id: int, username: str):
         )
 
 
-@app.post("/groups/leave/{group_id}")
-async def leave_group(group_id: int, username: str):
+@router.post("/groups/leave/{group_id}")
+async def leave_group(group_id: int, username: str, gm: GroupManager = Depends(get_gm),
+                      flights: SingleFlight = Depends(get_flights)):
     """
     Remove a user from a group.
     Example call: POST /groups/leave/5?username=chase
     """
     try:
         gm.removeGroupMember(username, group_id)
+        flights.forget("admin_groups")
         return {"message": f"User {username} left group {group_id}"}
     except Exception as e:
         raise HTTPException(
@@ -99,51 +123,68 @@ async def leave_group(group_id: int, username: str):
             detail=f"Error leaving group: {str(e)}"
         )
     
-@app.get("/groups/user/{username}")
-async def get_user_groups(username: str):
+@router.get("/groups/user/{username}")
+async def get_user_groups(username: str, request: Request, response: Response, gm: GroupManager = Depends(get_gm),
+                          versions: ChangeVersions = Depends(get_versions),
+                          flights: SingleFlight = Depends(get_flights)):
     """
     Get all groups a user is a member of.
+    Answers 304 to a current If-None-Match without reading the groups.
+    Concurrent requests for the same list at the same version share one query.
     """
     try:
+        etag = await flights.do("user_groups_tag", username, versions.userGroupsTag, username)
+        unchanged = conditional(request, response, etag)
+        if unchanged:
+            return unchanged
+
         query = """
-            SELECT g.groupID, g.groupName, CAST(g.description AS NVARCHAR(MAX)) as description
+            SELECT g.groupID, g.groupName, g.description
             FROM [Group] g
             JOIN GroupMember gm ON g.groupID = gm.groupID
             WHERE gm.username = :username
         """
-        df = gm.db.read_query_to_df(query, {"username": username})
-        return df.to_dict("records")
+        return await flights.do("user_groups", (username, etag), read_records, gm.db, query, {"username": username})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving user groups: {str(e)}"
         )
 
-@app.get("/groups/admin/{username}")
-async def get_admin_groups(username: str):
+@router.get("/groups/admin/{username}")
+async def get_admin_groups(username: str, gm: GroupManager = Depends(get_gm),
+                           admins: AdminDirectory = Depends(get_admins),
+                           flights: SingleFlight = Depends(get_flights)):
     """
     Get all groups where the user is an administrator.
+    Concurrent requests for the same groups share one query.
     """
     try:
-        query = """
-            SELECT g.groupID, g.groupName, CAST(g.description AS NVARCHAR(MAX)) as description,
+        group_ids = sorted(admins.groups_of(username))
+        if not group_ids:
+            return []
+
+        placeholders = ", ".join([f":id{i}" for i in range(len(group_ids))])
+        query = f"""
+            SELECT g.groupID, g.groupName, g.description,
                    (SELECT COUNT(*) FROM GroupMember WHERE groupID = g.groupID) as memberCount,
                    (SELECT COUNT(*) FROM GroupToEvent WHERE groupID = g.groupID) as eventCount
             FROM [Group] g
-            JOIN GroupAdmin ga ON g.groupID = ga.groupID
-            WHERE ga.username = :username
+            WHERE g.groupID IN ({placeholders})
             ORDER BY g.groupName
         """
-        df = gm.db.read_query_to_df(query, {"username": username})
-        return df.to_dict("records")
+        return await flights.do("admin_groups", tuple(group_ids), read_records, gm.db, query,
+                                {f"id{i}": gid for i, gid in enumerate(group_ids)})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving admin groups: {str(e)}"
         )
     
-@app.post("/groups/create", status_code=status.HTTP_201_CREATED)
-async def create_group(group: GroupCreate):
+@router.post("/groups/create", status_code=status.HTTP_201_CREATED)
+async def create_group(group: GroupCreate, gm: GroupManager = Depends(get_gm),
+                       admins: AdminDirectory = Depends(get_admins),
+                       flights: SingleFlight = Depends(get_flights)):
     """
     Create a new group with the specified admin.
     The admin user will automatically be added as a group member and group admin.
@@ -188,6 +229,8 @@ async def create_group(group: GroupCreate):
             "username": group.adminUsername,
             "groupID": next_group_id
         })
+        admins.add(group.adminUsername, next_group_id)
+        flights.forget("group_ids", "groups_by_id", "admin_groups")
         
         return {
             "groupID": next_group_id,
@@ -203,6 +246,63 @@ async def create_group(group: GroupCreate):
             detail=f"Error creating group: {str(e)}"
         )
 
+@router.get("/groups/stats/admission")
+async def get_admission_stats(request: Request):
+    """
+    Requests running and queued per lane, and how many were admitted or turned away.
+    """
+    admission = request.app.state.admission
+    return admission.stats() if admission else {"enabled": False}
+
+@router.get("/groups/stats/coalescing")
+async def get_coalescing_stats(flights: SingleFlight = Depends(get_flights)):
+    """
+    How many requests each kind of read served per database call.
+    """
+    return {"inFlight": flights.in_flight, "reads": flights.stats()}
+
+def create_app(
+    settings: Optional[Settings] = None,
+    db: Optional[DatabaseManager] = None,
+    gm: Optional[GroupManager] = None,
+    admins: Optional[AdminDirectory] = None,
+    breaker: Optional[CircuitBreaker] = None
+) -> FastAPI:
+    """
+    Build the Group Service app.
+
+    Args:
+        settings (Settings): Configuration; read from the environment when omitted
+        db (DatabaseManager): Database to use; built lazily from settings when omitted
+        gm (GroupManager): Group manager; wraps db when omitted
+        admins (AdminDirectory): Cached GroupAdmin lookups; pass one to share it with other services
+        breaker (CircuitBreaker): Circuit breaker for the database; pass one to share it with other services
+    """
+    settings = settings or Settings()
+    gm = gm or GroupManager(db=db or DatabaseManager.from_settings(settings))
+    admins = admins or AdminDirectory(gm.db, ttl=settings.admin_cache_seconds)
+
+    app = FastAPI(title="Group Service", version="1.0.0", lifespan=refresh_stats)
+    app.state.settings = settings
+    app.state.gm = gm
+    app.state.admins = admins
+    app.state.versions = ChangeVersions(gm.db)
+    app.state.flights = SingleFlight(enabled=bool(settings.read_coalescing))
+
+    # Middleware, innermost first: CORS headers also reach admission control's and the breaker's 503s
+    add_admission_control(app, settings)
+    add_database_guard(app, settings, gm.db, breaker)
+    add_cors(app)
+    add_compression(app, settings)
+    app.include_router(router)
+    add_health_checks(app, settings, gm.db, "/groups/health",
+                      {"total_groups": "Group", "total_memberships": "GroupMember"})
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Production launcher that runs a service with several uvicorn worker processes.
+
+Each worker is a separate process that imports the service itself, so engines
+and connection pools are always created inside the worker (pools inherited
+through fork are discarded by classes.SQLManager). The parent process only
+supervises the workers.
+
+Usage:
+    python Launcher.py event                  # one worker per available CPU
+    python Launcher.py group --workers 4
+    python Launcher.py all --preload          # composed app, fail fast on import errors
+
+Signals handled by the supervisor (POSIX):
+    SIGHUP   rolling restart: each worker is replaced only after its successor is ready
+    SIGTTIN  add one worker
+    SIGTTOU  remove one worker
+    SIGTERM  graceful shutdown (in-flight requests get --graceful-timeout seconds)
+"""
+import argparse
+import importlib
+import os
+from typing import Optional
+
+import uvicorn
+
+# service name -> (ASGI import string, default port)
+SERVICES = {
+    "user": ("User:app", 8001),
+    "event": ("Event:app", 8002),
+    "group": ("Group:app", 8003),
+    "all": ("Main:app", 8000),
+}
+
+
+def default_worker_count() -> int:
+    """
+    Number of workers to run when none is given.
+
+    Uses WEB_CONCURRENCY when set, otherwise the number of CPUs this process may
+    run on (which respects container CPU limits where the OS exposes them).
+    """
+    env_value = os.environ.get("WEB_CONCURRENCY")
+    if env_value:
+        return max(1, int(env_value))
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def preload(target: str) -> None:
+    """
+    Import a service in the parent so configuration and import errors surface
+    before any worker is spawned. Engines are created lazily on first query, so
+    the parent holds no database connections.
+    """
+    module_name, attr = target.split(":")
+    module = importlib.import_module(module_name)
+    getattr(module, attr)
+
+
+def launch(service: str, workers: Optional[int] = None, host: str = "0.0.0.0",
+           port: Optional[int] = None, graceful_timeout: int = 30, preload_app: bool = False) -> None:
+    """
+    Run a service under uvicorn's multi-process supervisor.
+
+    Args:
+        service (str): One of SERVICES
+        workers (int): Worker processes; defaults to default_worker_count()
+        host (str): Interface to bind
+        port (int): Port to bind; defaults to the service's usual port
+        graceful_timeout (int): Seconds in-flight requests get on shutdown/restart
+        preload_app (bool): Import the app in the parent first to fail fast
+    """
+    target, default_port = SERVICES[service]
+    if preload_app:
+        preload(target)
+
+    uvicorn.run(
+        target,
+        host=host,
+        port=port or default_port,
+        workers=workers or default_worker_count(),
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        timeout_graceful_shutdown=graceful_timeout,
+        access_log=False,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a service with multiple worker processes.")
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: WEB_CONCURRENCY or CPU count)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--preload", action="store_true",
+                        help="import the app in the parent before spawning workers")
+    args = parser.parse_args(argv)
+
+    launch(
+        args.service,
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        graceful_timeout=args.graceful_timeout,
+        preload_app=args.preload,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Composed entry point that serves the User, Event and Group services from a
+single process.
+
+Each service keeps its own FastAPI app (so `python Event.py` etc. still work on
+their own ports); this module only routes requests to the app that owns the
+first path segment. The services are built with one shared DatabaseManager
+(and `classes.SQLManager`'s engine registry) and `classes.ServiceConfig`'s CORS
+settings, so the composed process runs one connection pool and one interpreter
+instead of three.
+
+Run with:
+    python Main.py
+"""
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from starlette.responses import JSONResponse
+
+import User
+import Event
+import Group
+from classes.AdminDirectory import AdminDirectory
+from classes.DatabaseGuard import breaker_from_settings
+from classes.ServiceConfig import Settings
+from classes.SQLManager import DatabaseManager
+
+
+def service_prefixes(service: FastAPI) -> List[str]:
+    """
+    Return the first path segments (e.g. '/events') served by an app's API routes.
+    """
+    prefixes = []
+    for path in service.openapi().get("paths", {}):
+        prefix = "/" + path.lstrip("/").split("/", 1)[0]
+        if prefix not in prefixes:
+            prefixes.append(prefix)
+    return prefixes
+
+
+class ServiceDispatcher:
+    """
+    ASGI app that dispatches each request to the service owning its path prefix
+    and forwards lifespan startup/shutdown to every service.
+    """
+
+    def __init__(self, services: List[FastAPI]):
+        self.services = services
+        self.routes: Dict[str, FastAPI] = {}
+        for service in services:
+            for prefix in service_prefixes(service):
+                owner = self.routes.get(prefix)
+                if owner is not None and owner is not service:
+                    raise ValueError(
+                        f"Path prefix {prefix} is served by both {owner.title} and {service.title}"
+                    )
+                self.routes[prefix] = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        prefix = "/" + scope["path"].lstrip("/").split("/", 1)[0]
+        service = self.routes.get(prefix)
+        if service is None:
+            response = JSONResponse({"detail": "Not Found"}, status_code=404)
+            await response(scope, receive, send)
+            return
+        await service(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        await receive()  # lifespan.startup
+        async with AsyncExitStack() as stack:
+            try:
+                for service in self.services:
+                    await stack.enter_async_context(service.router.lifespan_context(service))
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+            await receive()  # lifespan.shutdown
+        await send({"type": "lifespan.shutdown.complete"})
+
+
+def create_app(settings: Optional[Settings] = None, db: Optional[DatabaseManager] = None) -> ServiceDispatcher:
+    """
+    Build the composed app; all three services share one DatabaseManager and
+    its circuit breaker, and the Event and Group services one AdminDirectory,
+    so an admin added by the Group service is seen by the Event service at once.
+    """
+    settings = settings or Settings()
+    db = db or DatabaseManager.from_settings(settings)
+    admins = AdminDirectory(db, ttl=settings.admin_cache_seconds)
+    breaker = breaker_from_settings(settings, db)
+    return ServiceDispatcher([
+        User.create_app(settings, db=db, breaker=breaker),
+        Event.create_app(settings, db=db, admins=admins, breaker=breaker),
+        Group.create_app(settings, db=db, admins=admins, breaker=breaker),
+    ])
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,46 @@
+"""
+Apply the versioned scripts in sql/Migrations to the configured database.
+
+Uses the same settings as the services (DB_* variables or DATABASE_URL).
+Local SQLite databases are migrated automatically when first opened; run this
+against Azure SQL as a deploy step.
+
+Usage:
+    python Migrate.py                 # apply everything pending
+    python Migrate.py --status        # list applied and pending migrations
+    python Migrate.py --target 1      # stop after version 0001
+"""
+import argparse
+from typing import Optional
+
+from classes.MigrationRunner import MigrationRunner
+from classes.SQLManager import DatabaseManager
+from classes.ServiceConfig import Settings
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="show versions without applying anything")
+    parser.add_argument("--target", type=int, help="highest version to apply")
+    args = parser.parse_args(argv)
+
+    runner = MigrationRunner(DatabaseManager.from_settings(Settings()).engine)
+
+    if args.status:
+        applied = runner.applied()
+        for version, row in sorted(applied.items()):
+            print(f"  {version:04d}_{row['name']:<40} applied {row['appliedAt']} ({row['durationMs']} ms)")
+        for migration in runner.pending():
+            print(f"  {migration.version:04d}_{migration.name:<40} pending")
+        print(f"Current version: {runner.current_version()}")
+        return
+
+    def report(migration, seconds):
+        print(f"  applied {migration.version:04d}_{migration.name} in {seconds * 1000:.0f} ms")
+
+    done = runner.migrate(target=args.target, on_applied=report)
+    print(f"{len(done)} migration(s) applied; now at version {runner.current_version()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Deliver group event notifications from the NotificationOutbox table.
+
+The Events Service queues one job per group event in the same transaction as
+the event. Run this next to it with OUTBOX_INLINE_WORKER=0 to take delivery
+out of the request path; start as many as the queue needs, they share it
+through leases. Stop with Ctrl+C: digests still held are written on the way out.
+
+Usage:
+    python NotificationWorker.py                     # deliver until stopped
+    python NotificationWorker.py --batch-size 500 --poll 0.2
+    python NotificationWorker.py --once              # drain the queue and exit
+    python NotificationWorker.py --requeue-failed    # retry jobs that ran out of attempts
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from classes.NotificationCoalescer import NotificationCoalescer
+from classes.NotificationManager import NotificationManager
+from classes.NotificationOutbox import NotificationOutbox
+from classes.OutboxWorker import OutboxWorker
+from classes.SQLManager import DatabaseManager
+from classes.ServiceConfig import Settings
+
+
+def print_stats(outbox: NotificationOutbox) -> None:
+    stats = outbox.stats()
+    print(f"  outbox: {stats['pending']} pending ({stats['inFlight']} in flight), "
+          f"{stats['failed']} failed, lag {stats['lagSeconds']:.1f} s", flush=True)
+
+
+async def serve(worker: OutboxWorker, stats_interval: float) -> None:
+    tasks = [asyncio.create_task(worker.run()), asyncio.create_task(worker.coalescer.run())]
+    try:
+        while True:
+            await asyncio.sleep(stats_interval)
+            print_stats(worker.outbox)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def main(argv: Optional[list] = None) -> None:
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100, help="jobs claimed at a time")
+    parser.add_argument("--poll", type=float, default=0.5, help="seconds between polls of an empty queue")
+    parser.add_argument("--lease", type=float, default=60.0, help="seconds a claimed batch is reserved")
+    parser.add_argument("--max-attempts", type=int, default=8, help="deliveries tried before a job is failed")
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="seconds between queue reports")
+    parser.add_argument("--once", action="store_true", help="deliver what is due, then exit")
+    parser.add_argument("--requeue-failed", action="store_true", help="requeue failed jobs first")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager.from_settings(settings)
+    outbox = NotificationOutbox(db, max_attempts=args.max_attempts)
+    coalescer = NotificationCoalescer(NotificationManager(db=db), window=settings.notification_digest_seconds)
+    worker = OutboxWorker(outbox, coalescer, batch_size=args.batch_size, lease=args.lease,
+                          poll_interval=args.poll)
+
+    if args.requeue_failed:
+        print(f"Requeued {outbox.requeueFailed()} failed jobs")
+    print(f"Worker {worker.name} delivering from the notification outbox")
+    print_stats(outbox)
+    try:
+        if args.once:
+            start, delivered = time.perf_counter(), 0
+            while True:
+                batch = worker.process()
+                delivered += batch
+                if batch < args.batch_size:
+                    break
+            print(f"Delivered {delivered} jobs in {time.perf_counter() - start:.2f} s")
+        else:
+            asyncio.run(serve(worker, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        coalescer.flush(force=True)
+        print_stats(outbox)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,20 @@
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
+from typing import Optional
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, status
 from pydantic import BaseModel
+from classes.AdmissionControl import add_admission_control
+from classes.Compression import add_compression
+from classes.DatabaseGuard import CircuitBreaker, add_database_guard, endpoint_statement_timeout
+from classes.HealthChecks import add_health_checks, refresh_stats
 from classes.SQLManager import DatabaseManager
-import pandas as pd
-
-# Create FastAPI app for User microservice
-app = FastAPI(title="User Authentication Service", version="1.0.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000", "http://localhost:5174"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-db = DatabaseManager(
-    server="cs4090.database.windows.net,1433",
-    database="CS4090Project",
-    username="DevUser",
-    password="CSProject4090!"
-)
+from classes.ServiceConfig import Settings, add_cors
+
+router = APIRouter(dependencies=[Depends(endpoint_statement_timeout)])
+
+
+def get_db(request: Request) -> DatabaseManager:
+    return request.app.state.db
+
 
 # Request / response models
 
@@ -43,8 +36,8 @@ class UserResponse(BaseModel):
 
 # Auth endpoint
 
-@app.post("/login")
-async def login(request: LoginRequest) -> dict:
+@router.post("/login")
+async def login(request: LoginRequest, db: DatabaseManager = Depends(get_db)) -> dict:
     """
     Authenticate a user with username and password.
     """
@@ -74,8 +67,8 @@ async def login(request: LoginRequest) -> dict:
             detail=f"Error during login: {str(e)}"
         )
 
-@app.post("/register", response_model=UserResponse, status_code=201)
-async def register(user: UserCreate):
+@router.post("/register", response_model=UserResponse, status_code=201)
+async def register(user: UserCreate, db: DatabaseManager = Depends(get_db)):
     """
     Register a new user in the database.
     """
@@ -116,6 +109,36 @@ async def register(user: UserCreate):
             detail=f"Error during registration: {str(e)}"
         )
 
+def create_app(settings: Optional[Settings] = None, db: Optional[DatabaseManager] = None,
+               breaker: Optional[CircuitBreaker] = None) -> FastAPI:
+    """
+    Build the User Authentication Service app.
+
+    Args:
+        settings (Settings): Configuration; read from the environment when omitted
+        db (DatabaseManager): Database to use; built lazily from settings when omitted
+        breaker (CircuitBreaker): Circuit breaker for db; pass one to share it with other services
+    """
+    settings = settings or Settings()
+
+    # Create FastAPI app for User microservice
+    app = FastAPI(title="User Authentication Service", version="1.0.0", lifespan=refresh_stats)
+    app.state.settings = settings
+    app.state.db = db or DatabaseManager.from_settings(settings)
+
+    # Middleware, innermost first: CORS headers also reach admission control's and the breaker's 503s
+    add_admission_control(app, settings)
+    add_database_guard(app, settings, app.state.db, breaker)
+    add_cors(app)
+    add_compression(app, settings)
+    app.include_router(router)
+    add_health_checks(app, settings, app.state.db, "/users/health", {"total_users": "User"})
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Optional
+from .SQLManager import DatabaseManager
+
+
+class _Snapshot:
+    """GroupAdmin indexed both ways, as loaded at loaded_at."""
+    __slots__ = ("by_group", "by_user", "everyone", "loaded_at")
+
+    def __init__(self, by_group: Dict[int, FrozenSet[str]], loaded_at: float):
+        self.by_group = by_group
+        by_user: Dict[str, set] = {}
+        for groupID, usernames in by_group.items():
+            for username in usernames:
+                by_user.setdefault(username, set()).add(groupID)
+        self.by_user = {u: frozenset(g) for u, g in by_user.items()}
+        self.everyone = frozenset(self.by_user)
+        self.loaded_at = loaded_at
+
+
+class AdminDirectory:
+    """
+    In-memory copy of GroupAdmin, keyed by group and by user.
+
+    Notification sends, the manage page and event authorisation all ask "who
+    administers this group" or "is this user an admin of it"; each used to scan
+    GroupAdmin. The directory loads the table once and answers from
+    dictionaries until ttl seconds have passed, then reloads on the next lookup.
+
+    Admin changes made through this process (add/remove) update the copy at
+    once. Changes made by another process are picked up when the ttl runs
+    out; a denied is_admin check can ask for confirmation, which reloads first,
+    so a newly appointed admin is never locked out for a whole ttl.
+    """
+
+    # A confirming lookup reloads at most this often
+    CONFIRM_INTERVAL = 1.0
+
+    def __init__(self, db: DatabaseManager, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            db (DatabaseManager): Database holding GroupAdmin
+            ttl (float): Seconds a loaded copy is trusted (0 reloads on every lookup)
+            clock (callable): Monotonic time source (tests pass a fake one)
+        """
+        self.db = db
+        self.ttl = ttl
+        self.clock = clock
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> _Snapshot:
+        try:
+            df = self.db.read_query_to_df("SELECT username, groupID FROM GroupAdmin")
+        except Exception as e:
+            raise Exception(f"Failed to load group admins: {str(e)}")
+        by_group: Dict[int, set] = {}
+        if not df.empty:
+            for username, groupID in zip(df["username"], df["groupID"]):
+                by_group.setdefault(int(groupID), set()).add(username)
+        return _Snapshot({g: frozenset(u) for g, u in by_group.items()}, self.clock())
+
+    def _current(self, max_age: Optional[float] = None) -> _Snapshot:
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self._snapshot
+        if snapshot is not None and self.clock() - snapshot.loaded_at < max_age:
+            return snapshot
+        with self._lock:
+            # Another thread may have reloaded while this one waited
+            snapshot = self._snapshot
+            if snapshot is None or self.clock() - snapshot.loaded_at >= max_age:
+                snapshot = self._snapshot = self._load()
+            return snapshot
+
+    def admins_of(self, groupID: int) -> FrozenSet[str]:
+        """Usernames administering groupID."""
+        return self._current().by_group.get(groupID, frozenset())
+
+    def groups_of(self, username: str) -> FrozenSet[int]:
+        """groupIDs username administers."""
+        return self._current().by_user.get(username, frozenset())
+
+    def all_admins(self) -> FrozenSet[str]:
+        """Everyone who administers at least one group."""
+        return self._current().everyone
+
+    def is_admin(self, username: str, groupID: int, confirm: bool = False) -> bool:
+        """
+        Whether username administers groupID.
+
+        Args:
+            username (str): User to check
+            groupID (int): Group to check
+            confirm (bool): On a miss, reload (at most every CONFIRM_INTERVAL seconds) and check again
+
+        Returns:
+            bool: True if the user is an admin of the group
+        """
+        if username in self.admins_of(groupID):
+            return True
+        if not confirm:
+            return False
+        return username in self._current(min(self.ttl, self.CONFIRM_INTERVAL)).by_group.get(groupID, ())
+
+    def add(self, username: str, groupID: int) -> None:
+        """Record an admin written to GroupAdmin by this process."""
+        self._apply(groupID, lambda admins: admins | {username})
+
+    def remove(self, username: str, groupID: int) -> None:
+        """Record an admin deleted from GroupAdmin by this process."""
+        self._apply(groupID, lambda admins: admins - {username})
+
+    def invalidate(self) -> None:
+        """Drop the copy; the next lookup reloads GroupAdmin."""
+        with self._lock:
+            self._snapshot = None
+
+    def _apply(self, groupID: int, change: Callable[[FrozenSet[str]], FrozenSet[str]]) -> None:
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                # Nothing cached yet; the first lookup loads the change
+                return
+            by_group = dict(snapshot.by_group)
+            admins = change(by_group.get(groupID, frozenset()))
+            if admins:
+                by_group[groupID] = admins
+            else:
+                by_group.pop(groupID, None)
+            # Readers hold the old snapshot or the new one, never a half-updated one
+            self._snapshot = _Snapshot(by_group, snapshot.loaded_at)
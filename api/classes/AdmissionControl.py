@@ -0,0 +1,214 @@
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+from fastapi import FastAPI
+from starlette.responses import JSONResponse
+
+# Lanes in the order freed slots are handed out: cheap reads before heavy writes
+READ = "read"
+WRITE = "write"
+LANES = (READ, WRITE)
+
+# Never queued or shed: probes, stats and long-lived notification streams, by
+# their exact paths (any other path may carry user-chosen segments), and CORS preflights
+EXEMPT_PATHS = frozenset(
+    [f"{base}{probe}" for base in ("/health", "/groups/health", "/users/health") for probe in ("", "/live", "/ready")]
+    + ["/outbox/stats", "/events/stats/admission", "/events/stats/coalescing",
+       "/groups/stats/admission", "/groups/stats/coalescing"]
+)
+EXEMPT_PATTERN = re.compile(r"^/notifications/[^/]+/stream$")
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """
+    The lane of a request, or None when it bypasses admission control.
+    """
+    if method == "OPTIONS" or path in EXEMPT_PATHS or EXEMPT_PATTERN.match(path):
+        return None
+    return READ if method in ("GET", "HEAD") else WRITE
+
+
+class Rejected(Exception):
+    """A request turned away; retry_after is the suggested wait in seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class Lane:
+    """Limits of one endpoint class."""
+    # Requests of this class running at once (within the service's total)
+    max_concurrent: int
+    # Requests waiting for a slot; more are turned away at once
+    max_queue: int
+    # Seconds a request may wait for a slot
+    deadline: float
+    active: int = 0
+    waiting: Deque["asyncio.Future"] = field(default_factory=deque)
+    counts: Dict[str, int] = field(default_factory=lambda: {"admitted": 0, "queueFull": 0, "timedOut": 0})
+
+
+class AdmissionController:
+    """
+    Bounds the requests a service works on at once, so that a burst waits
+    in short queues here instead of piling up on the database connection
+    pool until its 30 second timeout.
+
+    Each endpoint class (lane) has its own concurrency cap, queue length and
+    queue deadline, within a total for the service. A request over its
+    lane's queue length, or that would not get a slot before its lane's
+    deadline at the current pace, is answered at once with 503 and
+    Retry-After; so is one still queued when the deadline passes. Every
+    request that is admitted is served within the deadline plus its own run
+    time. When a slot frees up, queued reads get it before queued writes.
+    """
+
+    def __init__(self, max_concurrent: int, lanes: Dict[str, Lane]):
+        """
+        Args:
+            max_concurrent (int): Requests of all lanes running at once
+            lanes (dict): Limits of each lane in LANES
+        """
+        self.max_concurrent = max_concurrent
+        self.lanes = lanes
+        self.active = 0
+        # Moving average of admitted requests' run time, for Retry-After
+        self._service_time = 0.05
+
+    def _can_run(self, lane: Lane) -> bool:
+        return self.active < self.max_concurrent and lane.active < lane.max_concurrent
+
+    def _start(self, lane: Lane) -> None:
+        self.active += 1
+        lane.active += 1
+        lane.counts["admitted"] += 1
+
+    def expected_wait(self, name: str) -> float:
+        """Seconds a request joining a lane's queue now would likely wait: its queue and those served first."""
+        lane = self.lanes[name]
+        ahead = sum(len(self.lanes[n].waiting) for n in LANES[:LANES.index(name) + 1])
+        return (ahead + 1) * self._service_time / max(1, min(lane.max_concurrent, self.max_concurrent))
+
+    def retry_after(self, lane: Lane) -> int:
+        """Seconds until the queue ahead of a new request is likely to have drained."""
+        backlog = sum(len(l.waiting) for l in self.lanes.values()) + self.active
+        return max(1, math.ceil(backlog * self._service_time / max(1, lane.max_concurrent)))
+
+    async def acquire(self, name: str) -> None:
+        """
+        Wait for a slot in a lane. Raises Rejected when the queue is full or the deadline passes.
+        """
+        lane = self.lanes[name]
+        ahead = LANES[:LANES.index(name)]
+        if not lane.waiting and self._can_run(lane) and not any(self.lanes[n].waiting for n in ahead):
+            self._start(lane)
+            return
+        if len(lane.waiting) >= lane.max_queue or self.expected_wait(name) > lane.deadline:
+            # Turned away now rather than after waiting out the deadline
+            lane.counts["queueFull"] += 1
+            raise Rejected("queue full", self.retry_after(lane))
+        slot = asyncio.get_running_loop().create_future()
+        lane.waiting.append(slot)
+        try:
+            await asyncio.wait_for(slot, lane.deadline)
+        except asyncio.TimeoutError:
+            lane.counts["timedOut"] += 1
+            raise Rejected("queue deadline passed", self.retry_after(lane))
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                self._free(lane)  # admitted just as the client went away
+            raise
+        finally:
+            if slot in lane.waiting:
+                lane.waiting.remove(slot)
+
+    def release(self, name: str, seconds: float) -> None:
+        """
+        Free a slot taken by acquire once its request has run for seconds, and hand it on.
+        """
+        self._service_time += 0.1 * (seconds - self._service_time)
+        self._free(self.lanes[name])
+
+    def _free(self, lane: Lane) -> None:
+        self.active -= 1
+        lane.active -= 1
+        for waiting_lane in (self.lanes[n] for n in LANES):
+            while waiting_lane.waiting and self._can_run(waiting_lane):
+                slot = waiting_lane.waiting.popleft()
+                if slot.done():
+                    continue  # timed out or the client went away
+                self._start(waiting_lane)
+                slot.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "active": self.active,
+            "maxConcurrent": self.max_concurrent,
+            "lanes": {
+                name: {"active": lane.active, "queued": len(lane.waiting), **lane.counts}
+                for name, lane in self.lanes.items()
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """
+    Puts every HTTP request except the exempt ones (classify) through an
+    AdmissionController, holding its slot until the response is sent.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        lane = classify(scope.get("method", ""), scope.get("path", "")) if scope["type"] == "http" else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire(lane)
+        except Rejected as e:
+            response = JSONResponse(
+                {"detail": f"Service overloaded ({e.reason}), retry later"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(lane, time.perf_counter() - start)
+
+
+def add_admission_control(app: FastAPI, settings) -> None:
+    """
+    Attach admission control to a FastAPI app; its controller is app.state.admission.
+
+    Args:
+        app (FastAPI): The app to configure
+        settings (Settings): Supplies the limits
+    """
+    app.state.admission = None
+    if settings.admission_max_concurrent <= 0:
+        return
+    controller = AdmissionController(settings.admission_max_concurrent, {
+        READ: Lane(max_concurrent=settings.admission_max_concurrent,
+                   max_queue=settings.admission_read_queue,
+                   deadline=settings.admission_read_deadline_ms / 1000),
+        WRITE: Lane(max_concurrent=max(1, min(settings.admission_max_writes, settings.admission_max_concurrent)),
+                    max_queue=settings.admission_write_queue,
+                    deadline=settings.admission_write_deadline_ms / 1000),
+    })
+    app.state.admission = controller
+    app.add_middleware(AdmissionMiddleware, controller=controller)
@@ -0,0 +1,158 @@
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from .ChangeVersions import group_version_bumps
+from .SQLManager import DatabaseManager
+
+
+class ArchiveManager:
+    """
+    Moves past events, their group links and RSVPs, and read notifications
+    from the hot tables into the archive tables (sql/Migrations/0003).
+
+    Work is done in small batches, each in its own transaction, with a pause
+    between batches so archival can run next to live traffic.
+    """
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 500, pause: float = 0.1):
+        """
+        Args:
+            db (DatabaseManager): Database to archive
+            batch_size (int): Events or notifications moved per transaction
+            pause (float): Seconds to sleep between batches
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def _run_batches(self, boundary_query: str, move: Callable[[Dict], int], params: Dict,
+                     max_batches: Optional[int], on_batch: Optional[Callable[[int], None]]) -> int:
+        moved = batches = 0
+        while max_batches is None or batches < max_batches:
+            df = self.db.read_query_to_df(boundary_query, {**params, "batch_size": self.batch_size})
+            boundary = df.iloc[0, 0] if len(df) else None
+            if boundary is None or boundary != boundary:  # NULL / NaN: nothing left
+                break
+            if hasattr(boundary, "item"):  # numpy scalar -> Python value for the driver
+                boundary = boundary.item()
+            rows = move({**params, "boundary": boundary})
+            moved += rows
+            batches += 1
+            if on_batch:
+                on_batch(rows)
+            if self.pause:
+                time.sleep(self.pause)
+        return moved
+
+    def archiveEvents(self, horizon: datetime, max_batches: Optional[int] = None,
+                      on_batch: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Archive events dated before horizon, with their GroupToEvent links and RSVPs.
+
+        Each batch takes the batch_size lowest eventIDs past the horizon and
+        moves them with everything that references them in one transaction.
+
+        Args:
+            horizon (datetime): Events strictly before this date are archived
+            max_batches (int): Stop after this many batches (default: until done)
+            on_batch (callable): Called with the number of events moved per batch
+
+        Returns:
+            int: Number of events archived
+        """
+        boundary_query = """
+            SELECT MAX(eventID) as boundary
+            FROM (SELECT TOP (:batch_size) eventID FROM [Event] WHERE date < :horizon ORDER BY eventID) b
+        """
+        batch = "SELECT eventID FROM [Event] WHERE date < :horizon AND eventID <= :boundary"
+
+        def move(params: Dict) -> int:
+            params = {**params, "archived_at": datetime.now()}
+            counts = self.db.execute_transaction([
+                (f"""
+                    INSERT INTO EventArchive (eventID, date, description, archivedAt)
+                    SELECT eventID, date, description, :archived_at FROM [Event]
+                    WHERE eventID IN ({batch})
+                """, params),
+                (f"""
+                    INSERT INTO GroupToEventArchive (eventID, groupID)
+                    SELECT eventID, groupID FROM GroupToEvent WHERE eventID IN ({batch})
+                """, params),
+                (f"""
+                    INSERT INTO RSVPArchive (eventID, username)
+                    SELECT eventID, username FROM RSVP WHERE eventID IN ({batch})
+                """, params),
+                (f"DELETE FROM RSVP WHERE eventID IN ({batch})", params),
+                # Archived events leave their groups' calendar feeds
+                *group_version_bumps(f"SELECT groupID FROM GroupToEvent WHERE eventID IN ({batch})", params),
+                (f"DELETE FROM GroupToEvent WHERE eventID IN ({batch})", params),
+                # Past events get no more reminders
+                (f"DELETE FROM EventReminderSent WHERE eventID IN ({batch})", params),
+                ("DELETE FROM [Event] WHERE date < :horizon AND eventID <= :boundary", params),
+            ])
+            return counts[0]
+
+        try:
+            return self._run_batches(boundary_query, move, {"horizon": horizon}, max_batches, on_batch)
+        except Exception as e:
+            raise Exception(f"Failed to archive events: {str(e)}")
+
+    def archiveNotifications(self, horizon: datetime, max_batches: Optional[int] = None,
+                             on_batch: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Archive read notifications about events dated before horizon.
+        Unread notifications stay in the hot table whatever their age.
+
+        Args:
+            horizon (datetime): Notifications whose eventDate is before this are archived
+            max_batches (int): Stop after this many batches (default: until done)
+            on_batch (callable): Called with the number of notifications moved per batch
+
+        Returns:
+            int: Number of notifications archived
+        """
+        boundary_query = """
+            SELECT MAX(notificationTimestamp) as boundary
+            FROM (
+                SELECT TOP (:batch_size) notificationTimestamp FROM Notifications
+                WHERE isRead = 1 AND eventDate < :horizon
+                ORDER BY notificationTimestamp
+            ) b
+        """
+        where = "isRead = 1 AND eventDate < :horizon AND notificationTimestamp <= :boundary"
+
+        def move(params: Dict) -> int:
+            counts = self.db.execute_transaction([
+                (f"""
+                    INSERT INTO NotificationsArchive
+                        (notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate,
+                         groupID, eventCount)
+                    SELECT notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate,
+                           groupID, eventCount
+                    FROM Notifications WHERE {where}
+                """, params),
+                # Their owners' notification lists change (ChangeVersions)
+                (f"""
+                    UPDATE NotificationUnreadCount SET version = version + 1
+                    WHERE username IN (SELECT username FROM Notifications WHERE {where})
+                """, params),
+                (f"DELETE FROM Notifications WHERE {where}", params),
+            ])
+            return counts[0]
+
+        try:
+            return self._run_batches(boundary_query, move, {"horizon": horizon}, max_batches, on_batch)
+        except Exception as e:
+            raise Exception(f"Failed to archive notifications: {str(e)}")
+
+    def archive(self, horizon: datetime, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Archive events and read notifications older than horizon.
+
+        Returns:
+            Dict[str, int]: Rows moved per kind
+        """
+        return {
+            "events": self.archiveEvents(horizon, max_batches),
+            "notifications": self.archiveNotifications(horizon, max_batches),
+        }
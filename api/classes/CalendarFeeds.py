@@ -0,0 +1,214 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Tuple
+from sqlalchemy import text
+from .ChangeVersions import _version
+from .SQLManager import DatabaseManager
+
+PRODID = "-//CS4090 Team 18//Group Events//EN"
+
+# Feed queries; both read [Event] by the GroupToEvent indexes. Archived events drop out of the feeds.
+GROUP_FEED_QUERY = """
+    SELECT e.eventID, e.date, e.description
+    FROM [Event] e
+    JOIN GroupToEvent gte ON e.eventID = gte.eventID
+    WHERE gte.groupID = :groupID
+    ORDER BY e.date, e.eventID
+"""
+USER_FEED_QUERY = """
+    SELECT e.eventID, e.date, e.description, MIN(g.groupName) as groupName
+    FROM [Event] e
+    JOIN GroupToEvent gte ON e.eventID = gte.eventID
+    JOIN GroupMember gm ON gte.groupID = gm.groupID
+    JOIN [Group] g ON g.groupID = gte.groupID
+    WHERE gm.username = :username
+    GROUP BY e.eventID, e.date, e.description
+    ORDER BY e.date, e.eventID
+"""
+
+
+def _as_datetime(value) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+def _utc(value) -> datetime:
+    value = _as_datetime(value)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def ics_escape(value: str) -> str:
+    """TEXT value escaping (RFC 5545 3.3.11)."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n").replace("\r", "\\n"))
+
+
+def ics_line(line: str) -> bytes:
+    """
+    One content line, folded at 75 octets (RFC 5545 3.1) without splitting a UTF-8 character.
+    """
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data + b"\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        start, limit = end, 74  # continuation lines start with a space
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def ics_datetime(value) -> str:
+    """
+    Event.date has no time zone, so it is written as floating local time
+    (shown at the same wall-clock time wherever the calendar is).
+    """
+    return _as_datetime(value).strftime("%Y%m%dT%H%M%S")
+
+
+def ics_utc(value) -> str:
+    return _utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+@dataclass(frozen=True)
+class FeedStamp:
+    """What a feed's content depends on, read with one cheap query."""
+    key: Tuple[str, Any]
+    name: str
+    etag: str
+    # None for user feeds: joining or leaving a group changes them without a timestamp
+    last_modified: Optional[datetime]
+    # DTSTAMP of the feed's events: when its groups' events last changed
+    changed_at: datetime
+
+
+class CalendarFeeds:
+    """
+    iCalendar (.ics) feeds of a group's events and of every event in a user's
+    groups, for subscribing from external calendar apps.
+
+    Calendar apps poll feeds often. Each poll first reads a stamp, the
+    GroupEventVersion counters of the groups involved (bumped with every
+    event change). An unchanged stamp lets the poll end in 304 Not Modified
+    without reading any event, and a changed one is answered from the cached
+    feed when another poll already regenerated it. A feed is rebuilt, straight
+    from the query's row stream, only when its events changed.
+    """
+
+    def __init__(self, db: DatabaseManager, max_feeds: int = 1000):
+        """
+        Args:
+            db (DatabaseManager): Database holding the events
+            max_feeds (int): Generated feeds kept in memory (least recently used are dropped)
+        """
+        self.db = db
+        self.max_feeds = max_feeds
+        self._feeds: "OrderedDict[Tuple[str, Any], Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def groupStamp(self, groupID: int) -> Optional[FeedStamp]:
+        """
+        Returns:
+            FeedStamp: The group feed's stamp, or None if the group does not exist
+        """
+        try:
+            df = self.db.read_query_to_df("""
+                SELECT g.groupName, v.version, v.changedAt
+                FROM [Group] g
+                LEFT JOIN GroupEventVersion v ON v.groupID = g.groupID
+                WHERE g.groupID = :groupID
+            """, {"groupID": groupID})
+        except Exception as e:
+            raise Exception(f"Failed to read group feed version: {str(e)}")
+        if df.empty:
+            return None
+        row = df.iloc[0]
+        version = _version(row["version"])
+        changed_at = _utc(row["changedAt"]) if version else datetime(2000, 1, 1, tzinfo=timezone.utc)
+        return FeedStamp(key=("group", groupID), name=str(row["groupName"]), etag=f'"g{groupID}-{version}"',
+                         last_modified=changed_at.replace(microsecond=0), changed_at=changed_at)
+
+    def userStamp(self, username: str) -> Optional[FeedStamp]:
+        """
+        Returns:
+            FeedStamp: The user feed's stamp, or None if the user does not exist
+        """
+        try:
+            df = self.db.read_query_to_df("""
+                SELECT gm.groupID, v.version, v.changedAt
+                FROM [User] u
+                LEFT JOIN GroupMember gm ON gm.username = u.username
+                LEFT JOIN GroupEventVersion v ON v.groupID = gm.groupID
+                WHERE u.username = :username
+            """, {"username": username})
+        except Exception as e:
+            raise Exception(f"Failed to read user feed version: {str(e)}")
+        if df.empty:
+            return None
+        versions, changed_at = [], datetime(2000, 1, 1, tzinfo=timezone.utc)
+        for groupID, version, changed in zip(df["groupID"].tolist(), df["version"].tolist(),
+                                             df["changedAt"].tolist()):
+            if groupID is None or groupID != groupID:
+                continue  # in no group
+            version = _version(version)
+            versions.append(f"{int(groupID)}:{version}")
+            if version:
+                changed_at = max(changed_at, _utc(changed))
+        digest = hashlib.sha1(",".join(sorted(versions)).encode()).hexdigest()[:20]
+        return FeedStamp(key=("user", username), name=f"{username}'s events", etag=f'"u-{digest}"',
+                         last_modified=None, changed_at=changed_at)
+
+    def body(self, stamp: FeedStamp) -> bytes:
+        """
+        The feed for a stamp: the cached copy when it is still current, otherwise regenerated.
+        """
+        with self._lock:
+            cached = self._feeds.get(stamp.key)
+            if cached is not None and cached[0] == stamp.etag:
+                self._feeds.move_to_end(stamp.key)
+                return cached[1]
+        # The stamp was read before the events, so a change committed in
+        # between at worst caches newer content under the older tag, which the
+        # next poll replaces.
+        body = b"".join(self._render(stamp))
+        with self._lock:
+            self._feeds[stamp.key] = (stamp.etag, body)
+            self._feeds.move_to_end(stamp.key)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+        return body
+
+    def _rows(self, stamp: FeedStamp) -> Iterator[Any]:
+        kind, value = stamp.key
+        query, params = ((GROUP_FEED_QUERY, {"groupID": value}) if kind == "group"
+                         else (USER_FEED_QUERY, {"username": value}))
+        try:
+            with self.db.connect() as conn:
+                result = conn.execution_options(stream_results=True, yield_per=500).execute(text(query), params)
+                for row in result.mappings():
+                    yield row
+        except Exception as e:
+            raise Exception(f"Failed to read feed events: {str(e)}")
+
+    def _render(self, stamp: FeedStamp) -> Iterator[bytes]:
+        dtstamp = ics_utc(stamp.changed_at)
+        yield ics_line("BEGIN:VCALENDAR")
+        yield ics_line("VERSION:2.0")
+        yield ics_line(f"PRODID:{PRODID}")
+        yield ics_line("CALSCALE:GREGORIAN")
+        yield ics_line("METHOD:PUBLISH")
+        yield ics_line(f"X-WR-CALNAME:{ics_escape(stamp.name)}")
+        for row in self._rows(stamp):
+            yield ics_line("BEGIN:VEVENT")
+            yield ics_line(f"UID:event-{int(row['eventID'])}@cs4090-team18")
+            yield ics_line(f"DTSTAMP:{dtstamp}")
+            yield ics_line(f"DTSTART:{ics_datetime(row['date'])}")
+            yield ics_line(f"SUMMARY:{ics_escape(row['description'] or '')}")
+            if row.get("groupName"):
+                yield ics_line(f"CATEGORIES:{ics_escape(str(row['groupName']))}")
+            yield ics_line("END:VEVENT")
+        yield ics_line("END:VCALENDAR")
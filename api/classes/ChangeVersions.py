@@ -0,0 +1,158 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi import Request, Response, status
+from .SQLManager import DatabaseManager, utc_now
+
+# Sent with every versioned response: caches may keep it but must revalidate before reuse
+REVALIDATE = "no-cache"
+
+
+def groups_by_id(groupIDs: Iterable[int]) -> Tuple[str, Dict[str, Any]]:
+    """
+    A query selecting the given groups, for group_version_bumps.
+    """
+    groupIDs = sorted(set(groupIDs))
+    placeholders = ", ".join(f":vg{i}" for i in range(len(groupIDs)))
+    return (f"SELECT groupID FROM [Group] WHERE groupID IN ({placeholders})",
+            {f"vg{i}": groupID for i, groupID in enumerate(groupIDs)})
+
+
+def group_version_bumps(groups: str, params: Optional[Dict[str, Any]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Statements bumping GroupEventVersion (migration 0009) for every group the
+    `groups` query selects, for the caller's execute_transaction. Run them in
+    the transaction that changes the groups' events, before any GroupToEvent
+    rows the query reads are deleted.
+
+    Args:
+        groups (str): Query returning a groupID column
+        params (dict): Its parameters
+
+    Returns:
+        list: (sql, params) pairs
+    """
+    params = {**(params or {}), "changed_at": utc_now()}
+    return [
+        (f"""
+            INSERT INTO GroupEventVersion (groupID, version, changedAt)
+            SELECT DISTINCT c.groupID, 0, :changed_at FROM ({groups}) c
+            WHERE NOT EXISTS (SELECT 1 FROM GroupEventVersion v WHERE v.groupID = c.groupID)
+        """, params),
+        (f"""
+            UPDATE GroupEventVersion SET version = version + 1, changedAt = :changed_at
+            WHERE groupID IN ({groups})
+        """, params),
+    ]
+
+
+def _version(value) -> int:
+    """A version column read through a LEFT JOIN: NULL / NaN means never changed."""
+    return int(value) if value is not None and value == value else 0
+
+
+def _tag(kind: str, parts: Iterable[str]) -> str:
+    digest = hashlib.sha1(",".join(sorted(parts)).encode()).hexdigest()[:20]
+    return f'W/"{kind}-{digest}"'
+
+
+class ChangeVersions:
+    """
+    Cheap version stamps (ETags) for the read endpoints the frontend re-fetches
+    on every page change. Each is one indexed lookup of change counters that
+    the writes keep in the same transaction as the data:
+
+    - GroupEventVersion (migration 0009): a group's events
+    - GroupMember: which groups a user is in
+    - NotificationUnreadCount.version (migration 0010): a user's notifications
+
+    A stamp only changes when the data behind the endpoint may have, so a
+    request whose If-None-Match holds the current stamp is answered with 304
+    without running its query. Tags are weak: the same data may be sent with
+    a different encoding.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """
+        Args:
+            db (DatabaseManager): Database holding the counters
+        """
+        self.db = db
+
+    def _read(self, query: str, params: Dict[str, Any], what: str):
+        try:
+            return self.db.read_query_to_df(query, params)
+        except Exception as e:
+            raise Exception(f"Failed to read {what} version: {str(e)}")
+
+    def groupEventsTag(self, groupID: int) -> str:
+        """Stamp of /events/group/{groupID}."""
+        df = self._read("SELECT version FROM GroupEventVersion WHERE groupID = :groupID",
+                        {"groupID": groupID}, "group events")
+        version = _version(df.iloc[0]["version"]) if not df.empty else 0
+        return f'W/"ge{groupID}-{version}"'
+
+    def userEventsTag(self, username: str) -> str:
+        """Stamp of /events/user/{username}: the user's groups and their event versions."""
+        df = self._read("""
+            SELECT gm.groupID, v.version
+            FROM GroupMember gm
+            LEFT JOIN GroupEventVersion v ON v.groupID = gm.groupID
+            WHERE gm.username = :username
+        """, {"username": username}, "user events")
+        parts = []
+        if not df.empty:
+            parts = [f"{int(g)}:{_version(v)}" for g, v in zip(df["groupID"].tolist(), df["version"].tolist())]
+        return _tag("ue", parts)
+
+    def userGroupsTag(self, username: str) -> str:
+        """Stamp of /groups/user/{username}: the user's memberships (groups are not edited)."""
+        df = self._read("SELECT groupID FROM GroupMember WHERE username = :username",
+                        {"username": username}, "user groups")
+        return _tag("ug", [str(int(g)) for g in df["groupID"].tolist()] if not df.empty else [])
+
+    def notificationsTag(self, username: str) -> str:
+        """Stamp of /notifications/{username}: the user's counter version, tied to the user."""
+        df = self._read("SELECT version FROM NotificationUnreadCount WHERE username = :username",
+                        {"username": username}, "notifications")
+        version = _version(df.iloc[0]["version"]) if not df.empty else 0
+        return _tag("n", [f"{username}:{version}"])
+
+
+def not_modified(if_none_match: Optional[str], if_modified_since: Optional[str], etag: str,
+                 last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether a conditional GET can be answered with 304 (RFC 9110 13.2.2):
+    If-None-Match decides when present (weak comparison); otherwise
+    If-Modified-Since is compared with last_modified.
+    """
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Put the ETag on response, and return the 304 to send instead when the
+    request's If-None-Match already holds it.
+    """
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if not_modified(request.headers.get("if-none-match"), None, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def http_date(value: datetime) -> str:
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
@@ -0,0 +1,157 @@
+import gzip
+from typing import Callable, Dict, List, Optional
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# gzip level and brotli quality for dynamic responses: most of the size win of the
+# higher settings for a fraction of their CPU (benchmarks/compression.py)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# Bodies worth compressing; text/event-stream is excluded as it is streamed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+STREAMED_TYPES = ("text/event-stream",)
+
+
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Content codings this process can produce, most preferred first."""
+    available = {"br": _brotli} if brotli is not None else {}
+    available["gzip"] = _gzip
+    return available
+
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    The coding to send for an Accept-Encoding header (RFC 9110 12.5.3): the
+    first of available the client accepts with q > 0, "*" accepting any not
+    listed. None when the response should be sent as is.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding.strip():
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip()] = q
+    for coding in available:
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return (content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(STREAMED_TYPES)
+            and "content-encoding" not in headers)
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best coding the client accepts
+    (brotli when the brotli package is installed, else gzip).
+
+    Bodies under minimum_size are sent as they are: on small responses the
+    saving is lost to the extra CPU and headers. Bodies of offload_size or
+    more are compressed on the thread pool so the event loop keeps serving
+    other requests meanwhile; smaller ones are compressed inline, which is
+    cheaper than the thread hop. Streamed responses (notification streams)
+    pass through untouched, as do bodies that are already encoded.
+
+    A compressed response carries a weak ETag, since its bytes differ from
+    the identity representation; the services compare tags weakly.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, offload_size: int = 32768):
+        """
+        Args:
+            app: The ASGI app to wrap
+            minimum_size (int): Smallest body (bytes) that is compressed
+            offload_size (int): Smallest body compressed off the event loop
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.encoders = encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] in (204, 304) or not compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until the body shows whether it is worth compressing
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streamed in chunks, or too small to gain from it
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            encode = self.encoders[coding]
+            body = await run_in_threadpool(encode, body) if len(body) >= self.offload_size else encode(body)
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(body))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, compressing_send)
+
+
+def add_compression(app: FastAPI, settings) -> None:
+    """
+    Attach the shared response compression to a FastAPI app.
+
+    Args:
+        app (FastAPI): The app to configure
+        settings (Settings): Supplies the size thresholds
+    """
+    if settings.compression_min_bytes < 0:
+        return
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes,
+                       offload_size=settings.compression_offload_bytes)
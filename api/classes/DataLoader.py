@@ -0,0 +1,173 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from starlette.requests import Request
+from .SingleFlight import SingleFlight
+from .SQLManager import MAX_BATCH, DatabaseManager
+
+
+class DataLoader:
+    """
+    Batches the by-key lookups of one request into one query.
+
+    load(key) does not query at once: every key asked for in the same tick
+    of the event loop (for instance by coroutines gathered together) is
+    collected and passed to batch in one call, which returns the values it
+    found by key. Keys it did not find load as None. Values are memoised
+    for the loader's lifetime, which is one request (Loaders), so asking
+    for a key again costs nothing; errors are not memoised. Values may be
+    shared with other requests and must not be modified.
+    """
+
+    def __init__(self, batch: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+                 max_batch: int = MAX_BATCH):
+        """
+        Args:
+            batch: Coroutine function reading the values of a list of keys
+            max_batch (int): Keys per call of batch; more are split over several calls
+        """
+        self.batch = batch
+        self.max_batch = max_batch
+        self.batches = 0
+        self._memo: Dict[Hashable, "asyncio.Future"] = {}
+        self._pending: List[Tuple[Hashable, "asyncio.Future"]] = []
+        self._dispatching: Optional["asyncio.Task"] = None
+
+    def _future(self, key: Hashable) -> "asyncio.Future":
+        future = self._memo.get(key)
+        if future is None:
+            future = self._memo[key] = asyncio.get_running_loop().create_future()
+            if not self._pending:
+                self._dispatching = asyncio.ensure_future(self._dispatch())
+            self._pending.append((key, future))
+        return future
+
+    async def load(self, key: Hashable) -> Any:
+        """The value of key, or None when there is none."""
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """The values of keys, in order; one batch for all of them."""
+        futures = [self._future(key) for key in keys]
+        return list(await asyncio.shield(asyncio.gather(*futures))) if futures else []
+
+    def clear(self, *keys: Hashable) -> None:
+        """Forget memoised values (after a write in the same request)."""
+        for key in keys:
+            self._memo.pop(key, None)
+
+    async def _dispatch(self) -> None:
+        # Let coroutines started alongside the first load add their keys
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            chunk = pending[start:start + self.max_batch]
+            self.batches += 1
+            try:
+                found = await self.batch([key for key, _ in chunk])
+            except Exception as e:
+                for key, future in chunk:
+                    if self._memo.get(key) is future:
+                        del self._memo[key]
+                    future.set_exception(e)
+                    future.exception()  # raised to every waiter; not logged if none is left
+                continue
+            for key, future in chunk:
+                future.set_result(found.get(key))
+
+
+def in_list(keys: List[Hashable]) -> Tuple[str, Dict[str, Any]]:
+    """Placeholders and parameters for IN (...) over keys."""
+    return ", ".join(f":id{i}" for i in range(len(keys))), {f"id{i}": key for i, key in enumerate(keys)}
+
+
+def fetch_events(db: DatabaseManager, tables: Tuple[str, str], event_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    placeholders, params = in_list(event_ids)
+    rows = db.read_query_to_rows(f"""
+        SELECT eventID, date, description
+        FROM {tables[0]}
+        WHERE eventID IN ({placeholders})
+    """, params)
+    return {row["eventID"]: row for row in rows}
+
+
+def fetch_event_groups(db: DatabaseManager, tables: Tuple[str, str],
+                       event_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    placeholders, params = in_list(event_ids)
+    rows = db.read_query_to_rows(f"""
+        SELECT gte.eventID, g.groupID, g.groupName, g.description
+        FROM [Group] g
+        JOIN {tables[1]} gte ON g.groupID = gte.groupID
+        WHERE gte.eventID IN ({placeholders})
+    """, params)
+    groups: Dict[int, List[Dict[str, Any]]] = {event_id: [] for event_id in event_ids}
+    for row in rows:
+        event_id = row.pop("eventID")
+        groups[event_id].append(row)
+    return groups
+
+
+def fetch_groups(db: DatabaseManager, _, group_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    placeholders, params = in_list(group_ids)
+    rows = db.read_query_to_rows(
+        f"SELECT groupID, groupName, description FROM [Group] WHERE groupID IN ({placeholders})", params
+    )
+    return {row["groupID"]: row for row in rows}
+
+
+def fetch_users(db: DatabaseManager, _, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+    placeholders, params = in_list(usernames)
+    rows = db.read_query_to_rows(
+        f"SELECT username, Fname, Lname, isAdmin FROM [User] WHERE username IN ({placeholders})", params
+    )
+    return {row["username"]: row for row in rows}
+
+
+class Loaders:
+    """
+    One request's DataLoaders, one per entity type:
+
+    - events(tables): eventID -> {eventID, date, description}
+    - event_groups(tables): eventID -> [{groupID, groupName, description}]
+    - groups: groupID -> {groupID, groupName, description}
+    - users: username -> {username, Fname, Lname, isAdmin} (never the password)
+
+    tables is the (events, links) pair to read, e.g. Event.event_sources().
+    Batches go through the service's SingleFlight under the names
+    events_by_id, event_groups, groups_by_id and users_by_name, so identical
+    batches of concurrent requests share one query; writes forget() them.
+    """
+
+    def __init__(self, db: DatabaseManager, flights: SingleFlight):
+        self.db = db
+        self.flights = flights
+        self._loaders: Dict[Tuple[str, Hashable], DataLoader] = {}
+
+    @classmethod
+    def of(cls, request: Request, db: DatabaseManager, flights: SingleFlight) -> "Loaders":
+        """The request's Loaders, created on first use."""
+        loaders = getattr(request.state, "loaders", None)
+        if loaders is None:
+            loaders = request.state.loaders = cls(db, flights)
+        return loaders
+
+    def _loader(self, name: str, source: Hashable, fetch: Callable[..., Dict[Hashable, Any]]) -> DataLoader:
+        loader = self._loaders.get((name, source))
+        if loader is None:
+            async def batch(keys: List[Hashable]) -> Dict[Hashable, Any]:
+                return await self.flights.do(name, (source, tuple(keys)), fetch, self.db, source, keys)
+            loader = self._loaders[(name, source)] = DataLoader(batch)
+        return loader
+
+    def events(self, tables: Tuple[str, str]) -> DataLoader:
+        return self._loader("events_by_id", tables, fetch_events)
+
+    def event_groups(self, tables: Tuple[str, str]) -> DataLoader:
+        return self._loader("event_groups", tables, fetch_event_groups)
+
+    @property
+    def groups(self) -> DataLoader:
+        return self._loader("groups_by_id", None, fetch_groups)
+
+    @property
+    def users(self) -> DataLoader:
+        return self._loader("users_by_name", None, fetch_users)
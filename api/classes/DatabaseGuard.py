@@ -0,0 +1,233 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from fastapi import FastAPI, Request
+from sqlalchemy import exc
+from starlette.responses import JSONResponse
+from .AdmissionControl import classify
+from .SQLManager import DatabaseManager, statement_timeout
+
+# Errors that say the database is down or overloaded, as opposed to a bad
+# query or a constraint violation, which it answered promptly
+UNHEALTHY_ERRORS = (exc.OperationalError, exc.InterfaceError, exc.DisconnectionError, exc.TimeoutError)
+
+
+def counts_as_failure(error: BaseException) -> bool:
+    return isinstance(error, UNHEALTHY_ERRORS) or getattr(error, "connection_invalidated", False)
+
+
+class CircuitOpen(Exception):
+    """A database call refused while the breaker is open; retry_after is in seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Database unavailable (circuit open), retry in {math.ceil(retry_after)}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops the services from calling a database that is down or hanging.
+
+    Every call's outcome goes into a window of the most recent calls. Once
+    the window holds at least min_calls and failure_ratio of them failed
+    (counts_as_failure, statement timeouts included) or ran for slow_seconds
+    or more, the breaker opens: calls fail at once with CircuitOpen instead
+    of each waiting out a timeout. After open_seconds the next call runs
+    probe (a cheap SELECT 1) first; if it answers the breaker closes and the
+    call goes ahead, otherwise it stays open for another open_seconds.
+    Calls arriving while a probe runs are refused.
+
+    Safe to share between threads and services using one database.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, probe: Callable[[], Any], window: int = 20, min_calls: int = 10,
+                 failure_ratio: float = 0.5, slow_seconds: float = 2.0, open_seconds: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            probe: Raises when the database is not answering (DatabaseManager.ping)
+            window (int): Recent calls the ratio is taken over
+            min_calls (int): Calls the window needs before the breaker can open
+            failure_ratio (float): Share of failed or slow calls that opens it
+            slow_seconds (float): Calls running at least this long count as slow
+            open_seconds (float): Seconds calls are refused before probing
+        """
+        self.probe = probe
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        # (failed, slow) per recent call
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._last_error: Optional[str] = None
+        self.counts = {"trips": 0, "rejected": 0, "probes": 0}
+
+    def retry_after(self) -> float:
+        """Seconds until calls are let through (to a probe) again; 0 when closed."""
+        if self.state == self.CLOSED:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - self.clock())
+
+    def rejecting(self) -> bool:
+        """True while calls are refused without probing."""
+        return self.state == self.HALF_OPEN or (self.state == self.OPEN and self.retry_after() > 0)
+
+    def before_call(self) -> None:
+        """
+        Called before each database call. Returns when it may go ahead;
+        raises CircuitOpen when it is refused or the probe fails.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.rejecting():
+                self.counts["rejected"] += 1
+                raise CircuitOpen(self.retry_after() or 1)
+            self.state = self.HALF_OPEN  # this caller probes; others are refused meanwhile
+            self.counts["probes"] += 1
+        try:
+            self.probe()
+        except Exception as e:
+            with self._lock:
+                self._trip(e)
+            raise CircuitOpen(self.open_seconds)
+        with self._lock:
+            self.state = self.CLOSED
+            self._calls.clear()
+
+    def record(self, seconds: float, error: Optional[BaseException] = None) -> None:
+        """
+        Called after each database call that went ahead, with its run time and
+        the exception it raised, if any.
+        """
+        failed = error is not None and counts_as_failure(error)
+        with self._lock:
+            if self.state != self.CLOSED:
+                return
+            self._calls.append((failed, seconds >= self.slow_seconds))
+            if failed:
+                self._last_error = str(error)
+            if len(self._calls) < self.min_calls:
+                return
+            bad = sum(1 for failed, slow in self._calls if failed or slow)
+            if bad >= self.failure_ratio * len(self._calls):
+                self._trip(None)
+
+    def _trip(self, error: Optional[BaseException]) -> None:
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._calls.clear()
+        self.counts["trips"] += 1
+        if error is not None:
+            self._last_error = str(error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "retryAfter": round(self.retry_after(), 1),
+                "recentCalls": len(self._calls),
+                "recentFailures": sum(1 for failed, _ in self._calls if failed),
+                "recentSlow": sum(1 for _, slow in self._calls if slow),
+                "lastError": self._last_error,
+                **self.counts,
+            }
+
+
+def breaker_from_settings(settings, db: DatabaseManager) -> Optional[CircuitBreaker]:
+    """
+    The circuit breaker settings ask for, probing db; None when it is turned off.
+    """
+    if settings.db_breaker_failure_percent <= 0:
+        return None
+    return CircuitBreaker(
+        db.ping,
+        window=settings.db_breaker_window,
+        min_calls=max(1, settings.db_breaker_window // 2),
+        failure_ratio=settings.db_breaker_failure_percent / 100,
+        slow_seconds=settings.db_breaker_slow_ms / 1000,
+        open_seconds=settings.db_breaker_open_seconds,
+    )
+
+
+def parse_statement_timeouts(value: str) -> Dict[str, int]:
+    """
+    Parse per-endpoint statement timeouts: comma-separated endpoint=ms pairs,
+    the endpoint being the handler's function name (get_user_calendar=15000).
+    """
+    timeouts = {}
+    for part in value.split(","):
+        name, _, ms = part.partition("=")
+        if name.strip():
+            timeouts[name.strip()] = int(ms)
+    return timeouts
+
+
+async def endpoint_statement_timeout(request: Request):
+    """
+    Router dependency: runs the endpoint's database calls under its own
+    statement timeout when DB_STATEMENT_TIMEOUTS names it.
+    """
+    route = request.scope.get("route")
+    ms = getattr(request.app.state, "statement_timeouts", {}).get(getattr(route, "name", None))
+    if ms is None:
+        yield
+        return
+    with statement_timeout(ms):
+        yield
+
+
+class CircuitBreakerMiddleware:
+    """
+    Answers requests with 503 and Retry-After while the breaker refuses
+    database calls, before they take an admission slot. Health checks,
+    stats and streams pass (AdmissionControl.classify), so probes can still
+    see the breaker's state.
+    """
+
+    def __init__(self, app, breaker: CircuitBreaker):
+        self.app = app
+        self.breaker = breaker
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] == "http" and self.breaker.rejecting()
+                and classify(scope.get("method", ""), scope.get("path", "")) is not None):
+            response = JSONResponse(
+                {"detail": "Database unavailable, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, math.ceil(self.breaker.retry_after())))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def add_database_guard(app: FastAPI, settings, db: DatabaseManager,
+                       breaker: Optional[CircuitBreaker] = None) -> None:
+    """
+    Attach per-endpoint statement timeouts and the circuit breaker to a
+    FastAPI app; the breaker is app.state.breaker (None when turned off).
+
+    Args:
+        app (FastAPI): The app to configure
+        settings (Settings): Supplies the timeouts and breaker thresholds
+        db (DatabaseManager): Database whose calls the breaker guards
+        breaker (CircuitBreaker): Pass one to share it with other services on db
+    """
+    app.state.statement_timeouts = parse_statement_timeouts(settings.db_statement_timeouts)
+    breaker = breaker or breaker_from_settings(settings, db)
+    app.state.breaker = breaker
+    if breaker is None:
+        return
+    db.breaker = breaker
+    app.add_middleware(CircuitBreakerMiddleware, breaker=breaker)
@@ -0,0 +1,123 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+
+def _iso(value) -> str:
+    """ISO 8601 as pydantic writes it: UTC as Z."""
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return _iso(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode to JSON bytes: with orjson when installed (datetimes and numpy
+    scalars natively), otherwise with json and the same output.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded by dumps; the content is sent as given, without model validation."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_rows(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    A FastJSONResponse carrying the headers set on the endpoint's injected
+    response (ETag, X-Next-Cursor), which FastAPI only copies onto responses
+    it builds itself.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def _to_datetime(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if type(value) is not datetime and hasattr(value, "to_pydatetime"):  # pandas Timestamp
+        return value.to_pydatetime()
+    return value
+
+
+def _to_str(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _same(value):
+    return value
+
+
+_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {datetime: _to_datetime, int: int, float: float, str: _to_str}
+
+
+def _base_type(annotation):
+    """Optional[X] -> X"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+class RowEncoder:
+    """
+    Turns database rows into a response model's JSON shape without building
+    a model per row: each field gets one cheap conversion chosen from its
+    annotation up front (ISO strings to datetimes, BIT/Decimal to int), and
+    missing optional fields get their defaults. For rows whose columns are
+    already known to match the model, e.g. SELECTs written for it.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        """
+        Args:
+            model (BaseModel): The response model the rows are sent as
+        """
+        self.fields = [
+            (name, _CONVERTERS.get(_base_type(info.annotation), _same), None if info.is_required() else info.default)
+            for name, info in model.model_fields.items()
+        ]
+
+    def encode(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Args:
+            rows (Iterable[dict]): Rows with (at least) the model's required fields
+
+        Returns:
+            List[dict]: One dict per row with exactly the model's fields
+        """
+        fields = self.fields
+        encoded = []
+        for row in rows:
+            item = {}
+            for name, convert, default in fields:
+                value = row.get(name, default)
+                item[name] = None if value is None else convert(value)
+            encoded.append(item)
+        return encoded
@@ -1,7 +1,9 @@
-from typing import List, Dict, Any
-import pandas as pd
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from .SQLManager import DatabaseManager
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class GroupManager:
     """
@@ -9,11 +11,13 @@ class GroupManager:
     Uses DatabaseManager for executing SQL queries and handling connections.
     """
 
-    def __init__(self, server: str, database: str, username: str, password: str):
+    def __init__(self, server: str = "", database: str = "", username: str = "", password: str = "",
+                 db: Optional[DatabaseManager] = None):
         """
         Initialize a GroupManager instance with an Azure SQL Database connection.
+        Pass an existing DatabaseManager as db to share it instead.
         """
-        self.db = DatabaseManager(
+        self.db = db or DatabaseManager(
             server=server,
             database=database,
             username=username,
@@ -38,7 +42,7 @@ class GroupManager:
         placeholders = ", ".join([f":id{i}" for i in range(len(groupIDList))])
         query = f"SELECT * FROM [Group] WHERE groupID IN ({placeholders})"
         params = {f"id{i}": gid for i, gid in enumerate(groupIDList)}
-        group_df: pd.DataFrame = self.db.read_query_to_df(query, params)
+        group_df: "pd.DataFrame" = self.db.read_query_to_df(query, params)
 
         return group_df.to_dict(orient="records")
 
@@ -51,7 +55,7 @@ class GroupManager:
             List[int]: A list of all group IDs in the database.
         """
         query = "SELECT groupID FROM [Group]"
-        group_df: pd.DataFrame = self.db.read_query_to_df(query)
+        group_df: "pd.DataFrame" = self.db.read_query_to_df(query)
 
         return group_df["groupID"].tolist() if not group_df.empty else []
 
@@ -66,6 +70,8 @@ class GroupManager:
         Returns:
             int: Number of rows inserted
         """
+        import pandas as pd
+
         try:
             # Build a DataFrame with the required schema
             df = pd.DataFrame([{
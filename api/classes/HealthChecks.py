@@ -0,0 +1,192 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, FastAPI, Request
+from starlette.responses import JSONResponse
+from .SingleFlight import SingleFlight
+from .SQLManager import DatabaseManager
+
+# Row counts from the partition metadata: no scan of the table itself
+MSSQL_ROW_COUNT = """
+    SELECT SUM(row_count) AS total FROM sys.dm_db_partition_stats
+    WHERE object_id = OBJECT_ID(:table) AND index_id IN (0, 1)
+"""
+
+
+class TableStats:
+    """
+    Row counts of a service's tables for its /health summary, refreshed in
+    the background every interval seconds (run, started by the service's
+    lifespan) instead of counted on every probe. On Azure SQL the counts come
+    from sys.dm_db_partition_stats; elsewhere from COUNT(*).
+    """
+
+    def __init__(self, db: DatabaseManager, tables: Dict[str, str], interval: float = 60):
+        """
+        Args:
+            db (DatabaseManager): Database to count in
+            tables (dict): Summary field -> table, e.g. {"total_events": "Event"}
+            interval (float): Seconds between refreshes
+        """
+        self.db = db
+        self.tables = tables
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self.refreshed_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        # A first /health request racing the refresher waits for its count
+        self._refreshes = SingleFlight()
+
+    def count(self, table: str) -> int:
+        if self.db.engine.dialect.name == "mssql":
+            rows = self.db.read_query_to_rows(MSSQL_ROW_COUNT, {"table": f"dbo.{table}"})
+        else:
+            rows = self.db.read_query_to_rows(f"SELECT COUNT(*) AS total FROM [{table}]")
+        return int(rows[0]["total"] or 0) if rows else 0
+
+    def refresh(self) -> None:
+        """
+        Count every table again; on failure the previous counts are kept.
+        """
+        try:
+            self.counts = {field: self.count(table) for field, table in self.tables.items()}
+            self.refreshed_at = datetime.now(timezone.utc)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        The latest counts and their age; counted now only if never counted before.
+        """
+        if self.refreshed_at is None and self.last_error is None:
+            await self._refreshes.do("refresh", None, self.refresh)
+        age = (datetime.now(timezone.utc) - self.refreshed_at).total_seconds() if self.refreshed_at else None
+        return {**self.counts, "statsAgeSeconds": None if age is None else round(age, 1),
+                "statsError": self.last_error}
+
+    async def run(self) -> None:
+        """
+        Refresh on the interval until cancelled.
+        """
+        while True:
+            await self._refreshes.do("refresh", None, self.refresh)
+            await asyncio.sleep(self.interval)
+
+
+class HealthChecks:
+    """
+    Liveness, readiness and a summary for one service.
+
+    Liveness touches nothing but the event loop. Readiness fails while the
+    circuit breaker refuses database calls, and otherwise runs SELECT 1 with
+    a short timeout: it fails when no pooled connection frees up in time as
+    well as when the database is down. Concurrent probes share one ping, so
+    a hanging database never collects more than one stuck ping.
+    """
+
+    def __init__(self, db: DatabaseManager, stats: Optional[TableStats], ping_timeout_ms: int = 1000):
+        """
+        Args:
+            db (DatabaseManager): Database to ping
+            stats (TableStats): Row counts for the summary; None leaves them out
+            ping_timeout_ms (int): Milliseconds the ping may take
+        """
+        self.db = db
+        self.stats = stats
+        self.ping_timeout_ms = ping_timeout_ms
+        self._pings = SingleFlight()
+        self.started = time.monotonic()
+
+    def live(self) -> Dict[str, Any]:
+        return {"status": "alive", "uptimeSeconds": round(time.monotonic() - self.started, 1)}
+
+    async def ready(self, app: FastAPI) -> Dict[str, Any]:
+        """
+        {"ready": bool, "database": ...}; "reason" says why it is not ready.
+        """
+        breaker = app.state.breaker
+        if breaker is not None and breaker.rejecting():
+            return {"ready": False, "reason": "circuit open",
+                    "database": {"retryAfter": round(breaker.retry_after(), 1)}}
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._pings.do("ping", None, self.db.ping, self.ping_timeout_ms),
+                                   self.ping_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            return {"ready": False, "reason": "database ping timed out",
+                    "database": {"pingMs": round((time.perf_counter() - start) * 1000, 1)}}
+        except Exception as e:
+            return {"ready": False, "reason": f"database ping failed: {str(e)}", "database": {}}
+        return {"ready": True, "database": {"pingMs": round((time.perf_counter() - start) * 1000, 1)}}
+
+    async def summary(self, app: FastAPI) -> Dict[str, Any]:
+        """
+        Readiness, table counts, circuit breaker and admission control in one.
+        """
+        ready = await self.ready(app)
+        breaker, admission = app.state.breaker, app.state.admission
+        return {
+            "status": "healthy" if ready["ready"] else "unhealthy",
+            **({"error": ready["reason"]} if not ready["ready"] else {}),
+            **(await self.stats.get() if self.stats else {}),
+            "database": ready["database"],
+            "circuitBreaker": breaker.stats() if breaker else {"state": "disabled"},
+            "admission": admission.stats() if admission else {"enabled": False},
+        }
+
+
+@asynccontextmanager
+async def refresh_stats(app: FastAPI):
+    """
+    Lifespan of services with no other background work: refreshes the
+    health check's table counts while the service is up.
+    """
+    stats = app.state.health.stats
+    refresher = asyncio.create_task(stats.run()) if stats is not None else None
+    try:
+        yield
+    finally:
+        if refresher is not None:
+            refresher.cancel()
+
+
+def add_health_checks(app: FastAPI, settings, db: DatabaseManager, path: str, tables: Dict[str, str]) -> None:
+    """
+    Serve path (summary), path/live and path/ready on a FastAPI app; the
+    checks are app.state.health. The service's lifespan runs
+    app.state.health.stats when it is not None (refresh_stats).
+
+    Args:
+        app (FastAPI): The app to configure
+        settings (Settings): Supplies the refresh interval and ping timeout
+        db (DatabaseManager): Database to check
+        path (str): Where the summary is served; must be under a prefix the service owns
+        tables (dict): Summary field -> table counted for it
+    """
+    stats = TableStats(db, tables, settings.health_stats_seconds) if settings.health_stats_seconds > 0 else None
+    app.state.health = HealthChecks(db, stats, ping_timeout_ms=settings.health_ping_timeout_ms)
+    router = APIRouter()
+
+    @router.get(path)
+    async def health_check(request: Request):
+        """Readiness, cached table counts, circuit breaker and admission control"""
+        return await request.app.state.health.summary(request.app)
+
+    @router.get(path + "/live")
+    async def liveness(request: Request):
+        """Liveness probe: the process is up and serving; never touches the database"""
+        return request.app.state.health.live()
+
+    @router.get(path + "/ready")
+    async def readiness(request: Request):
+        """Readiness probe: 503 while the database cannot be reached"""
+        ready = await request.app.state.health.ready(request.app)
+        return JSONResponse(
+            {"status": "ready" if ready["ready"] else "not ready", **ready},
+            status_code=200 if ready["ready"] else 503,
+        )
+
+    app.include_router(router)
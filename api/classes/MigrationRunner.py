@@ -0,0 +1,211 @@
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "sql", "Migrations"
+)
+
+# NNNN_description.sql
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+# Scripts containing this line run batch by batch in autocommit mode, for
+# online changes that must not hold one long transaction. They must be safe
+# to re-run from the start if interrupted.
+NO_TRANSACTION = re.compile(r"^--\s*runner:\s*no-transaction\s*$", re.MULTILINE | re.IGNORECASE)
+
+_CREATE_VERSION_TABLE = """
+    CREATE TABLE SchemaVersion (
+        version INT NOT NULL PRIMARY KEY,
+        name NVARCHAR(200) NOT NULL,
+        checksum NVARCHAR(64) NOT NULL,
+        appliedAt DATETIME2 NOT NULL,
+        durationMs INT NOT NULL
+    )
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One versioned script in sql/Migrations.
+
+    The T-SQL file is the source of truth. A file of the same name under
+    sql/Migrations/<dialect>/ replaces it for that dialect (for changes such as
+    ALTER COLUMN that cannot be translated); otherwise SQLite batches are
+    translated with SQLiteBackend.translate_migration.
+    """
+    version: int
+    name: str
+    path: str
+
+    def source(self, dialect: str) -> str:
+        """
+        The file that runs for a dialect: its override if there is one, else the T-SQL file.
+        """
+        override = os.path.join(os.path.dirname(self.path), dialect, os.path.basename(self.path))
+        return override if os.path.exists(override) else self.path
+
+    def script(self, dialect: str) -> str:
+        with open(self.source(dialect), encoding="utf-8") as f:
+            return f.read()
+
+    def transactional(self, dialect: str) -> bool:
+        return not NO_TRANSACTION.search(self.script(dialect))
+
+    def checksum(self, dialect: str) -> str:
+        """
+        SHA-256 of the file that runs for the dialect, so edits to an override are caught too.
+        """
+        with open(self.source(dialect), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @property
+    def base_checksum(self) -> str:
+        """SHA-256 of the T-SQL file: what was recorded before overrides were hashed."""
+        with open(self.path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def batches(self, dialect: str) -> List[str]:
+        """
+        Split the script for a dialect into executable GO-separated batches.
+        """
+        batches = re.split(r"^\s*GO\s*$", self.script(dialect), flags=re.MULTILINE | re.IGNORECASE)
+        if dialect == "sqlite":
+            from .SQLiteBackend import translate_migration
+            batches = [translate_migration(b) for b in batches]
+        else:
+            batches = [re.sub(r"/\*.*?\*/", "", b, flags=re.DOTALL).strip() for b in batches]
+        return [b for b in batches if b]
+
+
+class MigrationRunner:
+    """
+    Applies the versioned scripts in sql/Migrations in order and records each
+    one in the SchemaVersion table. sql/Schema/Schema.sql is version 0.
+
+    Each migration runs in its own transaction together with its SchemaVersion
+    row, so a failed migration leaves the database at the previous version.
+    Scripts marked "-- runner: no-transaction" instead commit every batch as it
+    runs and are recorded only once the last batch succeeds.
+    """
+
+    def __init__(self, engine: Engine, directory: str = MIGRATIONS_DIR):
+        """
+        Args:
+            engine (Engine): Database to migrate (DatabaseManager.engine)
+            directory (str): Folder holding the NNNN_name.sql scripts
+        """
+        self.engine = engine
+        self.directory = directory
+
+    def discover(self) -> List[Migration]:
+        """
+        All migration scripts in version order.
+        """
+        migrations = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = _FILENAME.match(filename)
+            if match:
+                migrations.append(Migration(int(match.group(1)), match.group(2),
+                                            os.path.join(self.directory, filename)))
+        versions = [m.version for m in migrations]
+        if len(versions) != len(set(versions)):
+            raise Exception(f"Duplicate migration versions in {self.directory}")
+        return migrations
+
+    def _ensure_version_table(self) -> None:
+        if not inspect(self.engine).has_table("SchemaVersion"):
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(text(_CREATE_VERSION_TABLE))
+            except Exception:
+                if not inspect(self.engine).has_table("SchemaVersion"):
+                    raise
+
+    def applied(self) -> Dict[int, dict]:
+        """
+        Rows of SchemaVersion keyed by version.
+        """
+        self._ensure_version_table()
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT version, name, checksum, appliedAt, durationMs FROM SchemaVersion"))
+            return {row["version"]: dict(row) for row in rows.mappings()}
+
+    def current_version(self) -> int:
+        return max(self.applied(), default=0)
+
+    def pending(self) -> List[Migration]:
+        """
+        Migrations not yet applied. Raises if an applied script was edited afterwards.
+        """
+        applied = self.applied()
+        dialect = self.engine.dialect.name
+        pending = []
+        for migration in self.discover():
+            row = applied.get(migration.version)
+            if row is None:
+                pending.append(migration)
+            elif row["checksum"] not in (migration.checksum(dialect), migration.base_checksum):
+                raise Exception(
+                    f"Migration {migration.version:04d}_{migration.name} changed after it was applied; "
+                    f"add a new migration instead of editing it"
+                )
+        return pending
+
+    def _record(self, conn, migration: Migration, elapsed: float) -> None:
+        conn.execute(text("""
+            INSERT INTO SchemaVersion (version, name, checksum, appliedAt, durationMs)
+            VALUES (:version, :name, :checksum, :appliedAt, :durationMs)
+        """), {
+            "version": migration.version,
+            "name": migration.name,
+            "checksum": migration.checksum(self.engine.dialect.name),
+            "appliedAt": datetime.now(),
+            "durationMs": int(elapsed * 1000),
+        })
+
+    def migrate(self, target: Optional[int] = None,
+                on_applied: Optional[Callable[[Migration, float], None]] = None) -> List[Migration]:
+        """
+        Apply pending migrations up to and including target (default: all).
+
+        Args:
+            target (int): Highest version to apply
+            on_applied (callable): Called with (migration, seconds) after each one
+
+        Returns:
+            List[Migration]: The migrations that were applied
+        """
+        dialect = self.engine.dialect.name
+        done = []
+        for migration in self.pending():
+            if target is not None and migration.version > target:
+                break
+            start = time.perf_counter()
+            try:
+                if migration.transactional(dialect):
+                    context = self.engine.begin()
+                else:
+                    context = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+                with context as conn:
+                    for batch in migration.batches(dialect):
+                        conn.exec_driver_sql(batch)
+                    elapsed = time.perf_counter() - start
+                    self._record(conn, migration, elapsed)
+            except Exception as e:
+                # Another process (e.g. a sibling worker) may have applied it first
+                if migration.version in self.applied():
+                    continue
+                raise Exception(f"Migration {migration.version:04d}_{migration.name} failed: {str(e)}")
+            done.append(migration)
+            if on_applied:
+                on_applied(migration, elapsed)
+        return done
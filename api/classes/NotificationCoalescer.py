@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from .NotificationManager import NotificationManager
+from .ServiceConfig import DESCRIPTION_MAX_LENGTH
+from .SQLManager import utc_now
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Window:
+    """Events held back for one group until its window closes."""
+    closes_at: float
+    groupName: str = ""
+    usernames: List[str] = field(default_factory=list)
+    events: List[dict] = field(default_factory=list)
+
+
+def digest_description(groupName: str, events: List[dict]) -> str:
+    """
+    "3 new events in Chess Club: Meeting, Workshop, Trip", cut to fit the column.
+    """
+    text = f"{len(events)} new events in {groupName}: " + ", ".join(e["description"] for e in events)
+    if len(text) > DESCRIPTION_MAX_LENGTH:
+        text = text[:DESCRIPTION_MAX_LENGTH - 3] + "..."
+    return text
+
+
+class NotificationCoalescer:
+    """
+    Merges the notifications for a burst of events in one group.
+
+    The first event for a group is sent at once and opens a window of
+    `window` seconds. Further events for that group inside the window are
+    held in memory; when the window closes they are sent as one digest
+    notification per member (eventCount = number of events). An admin posting
+    20 events to a 500-member group therefore writes 1,000 rows, not 10,000,
+    and each member's inbox gets two entries instead of twenty.
+
+    Held events live only in this process. on_sent is called with the IDs of
+    the events in each digest once it is written, so a caller whose events
+    come from a durable queue (OutboxWorker) can keep them queued until then.
+    A window of 0 turns coalescing off.
+    """
+
+    def __init__(self, nm: NotificationManager, window: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 on_sent: Optional[Callable[[List[int]], None]] = None):
+        """
+        Args:
+            nm (NotificationManager): Writes the notifications and digests
+            window (float): Seconds after a group's first event during which later ones are merged
+            clock (callable): Monotonic time source (tests pass a fake one)
+            on_sent (callable): Called with the event IDs of every digest written
+        """
+        self.nm = nm
+        self.window = window
+        self.clock = clock
+        self.on_sent = on_sent
+        self._windows: Dict[int, _Window] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def held(self) -> int:
+        """Events waiting for a digest."""
+        with self._lock:
+            return sum(len(w.events) for w in self._windows.values())
+
+    def holds(self, eventID: int) -> bool:
+        """Whether an event is waiting for its group's digest."""
+        with self._lock:
+            return any(e["eventID"] == eventID for w in self._windows.values() for e in w.events)
+
+    def notify(self, groupID: int, groupName: str, usernames: List[str], description: str,
+               eventID: int, eventDate: datetime, created_at: Optional[datetime] = None) -> int:
+        """
+        Notify a group's members about a new event, or hold it for the group's digest.
+
+        Returns:
+            int: Notifications written now (0 when the event was held)
+        """
+        self.flush()
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(groupID)
+            if window is not None and self.window > 0:
+                window.groupName = groupName
+                window.usernames = usernames
+                window.events.append({"description": description, "eventID": eventID, "eventDate": eventDate})
+                return 0
+            if self.window > 0:
+                self._windows[groupID] = _Window(closes_at=now + self.window)
+        try:
+            return self.nm.createNotification(
+                usernames=usernames,
+                description=description,
+                eventID=eventID,
+                created_at=created_at or utc_now(),
+                eventDate=eventDate,
+                isRead=0,
+                groupID=groupID
+            )
+        except Exception:
+            # Not sent, so it must not open a window that holds back the next event
+            with self._lock:
+                window = self._windows.get(groupID)
+                if window is not None and not window.events:
+                    del self._windows[groupID]
+            raise
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Send the digests of every closed window (every window when force is set).
+
+        Returns:
+            int: Digest notifications written
+        """
+        now = self.clock()
+        with self._lock:
+            due = {g: w for g, w in self._windows.items() if force or w.closes_at <= now}
+            for groupID in due:
+                del self._windows[groupID]
+        written, error = 0, None
+        for groupID, window in due.items():
+            if not window.events:
+                continue
+            events = window.events
+            if len(events) == 1:
+                description = events[0]["description"]
+            else:
+                description = digest_description(window.groupName, events)
+            try:
+                written += self.nm.createNotification(
+                    usernames=window.usernames,
+                    description=description,
+                    eventID=events[-1]["eventID"],
+                    created_at=utc_now(),
+                    eventDate=min(e["eventDate"] for e in events),
+                    isRead=0,
+                    groupID=groupID,
+                    eventCount=len(events)
+                )
+            except Exception as e:
+                # Hold the events again so the next flush retries them
+                with self._lock:
+                    current = self._windows.setdefault(groupID, window)
+                    if current is not window:
+                        current.events[:0] = events
+                error = error or e
+                continue
+            if self.on_sent is not None:
+                self.on_sent([e["eventID"] for e in events])
+        if error is not None:
+            raise error
+        return written
+
+    async def run(self, interval: float = 1.0) -> None:
+        """
+        Send due digests every interval seconds until cancelled (started by the Events Service lifespan).
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception as e:
+                logger.warning("Notification digest flush failed: %s", e)
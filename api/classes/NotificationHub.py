@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Dict, Iterable, Set, Tuple
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    One Server-Sent Events frame with a JSON payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Comment frame sent on idle connections so proxies keep them open
+HEARTBEAT = ": keepalive\n\n"
+
+
+class Subscription:
+    """
+    One connected client. Holds a bounded queue and nothing else, so an idle
+    connection costs a queue and the suspended stream that reads it.
+    """
+    __slots__ = ("username", "queue", "loop", "overflowed")
+
+    def __init__(self, username: str, queue_size: int):
+        self.username = username
+        self.queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+
+    def _deliver(self, message: Tuple[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A client that stopped reading is told to refetch rather than buffered without bound
+            self.overflowed = True
+
+    async def frames(self, heartbeat: float) -> AsyncIterator[str]:
+        """
+        SSE frames for this client: each published message, a heartbeat comment
+        after heartbeat idle seconds, and a "resync" event if messages were dropped.
+        """
+        while True:
+            try:
+                event, data = await asyncio.wait_for(self.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            yield format_sse(event, data)
+            if self.overflowed and self.queue.empty():
+                self.overflowed = False
+                yield format_sse("resync", {})
+
+
+class NotificationHub:
+    """
+    In-process fan-out of notification events to connected clients
+    (GET /notifications/{username}/stream).
+
+    Streams register one Subscription per connection under their username;
+    NotificationManager.createNotification publishes to the recipients after
+    its transaction commits. publish() may be called from any thread: messages
+    are handed to each subscriber's event loop with call_soon_threadsafe.
+
+    Delivery is best effort and per process. A client connected to another
+    worker does not see the message and picks it up on its next page fetch.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        """
+        Args:
+            queue_size (int): Messages buffered per connection before it is marked for resync
+        """
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def connections(self) -> int:
+        """Open subscriptions across all users."""
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, username: str) -> Subscription:
+        """
+        Register a connection for username. Must be called on the event loop
+        that will read the subscription.
+        """
+        subscription = Subscription(username, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(username, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(subscription.username)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[subscription.username]
+
+    def publish(self, usernames: Iterable[str], event: str, data: Any) -> int:
+        """
+        Send an event to every connection of each user.
+
+        Args:
+            usernames (Iterable[str]): Recipients
+            event (str): SSE event name
+            data: JSON-serialisable payload, shared by all recipients
+
+        Returns:
+            int: Connections the event was handed to
+        """
+        with self._lock:
+            targets = [sub for u in usernames for sub in self._subscribers.get(u, ())]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, (event, data))
+            except RuntimeError:
+                # The connection's loop has shut down; its stream will unsubscribe itself
+                pass
+        return len(targets)
@@ -1,24 +1,25 @@
-from typing import List
-import pandas as pd
-from datetime import datetime, timezone
-from .SQLManager import DatabaseManager
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, text
+from .AdminDirectory import AdminDirectory
+from .NotificationHub import NotificationHub
+from .SQLManager import MAX_BATCH, DatabaseManager
 
 class NotificationManager:
-    def __init__(self, server: str, database: str, username: str, password: str):
-        self.db = DatabaseManager(
+    def __init__(self, server: str = "", database: str = "", username: str = "", password: str = "",
+                 db: Optional[DatabaseManager] = None, hub: Optional[NotificationHub] = None,
+                 admins: Optional[AdminDirectory] = None):
+        self.db = db or DatabaseManager(
             server=server,
             database=database,
             username=username,
             password=password
         )
-
-    def _getAllGroupAdminUsernames(self) -> List[str]:
-        try:
-            query = "SELECT username FROM GroupAdmin"
-            df = self.db.read_query_to_df(query)
-            return df["username"].tolist() if not df.empty else []
-        except Exception as e:
-            raise Exception(f"Failed to fetch group admin usernames: {str(e)}")
+        # Connected clients are pushed new notifications through this hub (optional)
+        self.hub = hub
+        # Cached GroupAdmin lookups; pass the service's directory to share it
+        self.admins = admins or AdminDirectory(self.db)
 
     def createNotification(
         self,
@@ -27,53 +28,300 @@ class NotificationManager:
         eventID: int,
         created_at: datetime,
         eventDate: datetime,
-        isRead: int = 0
+        isRead: int = 0,
+        groupID: Optional[int] = None,
+        eventCount: int = 1
     ) -> int:
         """
-        Create notifications for a list of usernames plus all group admins.
+        Create notifications for a list of usernames plus the admins of groupID
+        (of every group when groupID is omitted). groupID records the group the
+        event belongs to; a digest (NotificationCoalescer) sets eventCount to the
+        number of events it covers.
+
+        Each recipient's NotificationUnreadCount row is bumped in the same
+        transaction as the insert: the unread count for unread notifications,
+        the version (migration 0010) always. Once committed, the notification
+        is pushed to the recipients' open streams through the hub.
         """
         try:
-            all_admins = self._getAllGroupAdminUsernames()
-            target_users = list(set(usernames + all_admins))
+            if groupID is not None:
+                admins = self.admins.admins_of(groupID)
+            else:
+                admins = self.admins.all_admins()
+            target_users = list(set(usernames) | admins)
+            if not target_users:
+                return 0
 
-            df = pd.DataFrame([{
+            rows = [{
                 "username": u,
                 "description": description,
                 "eventID": eventID,
-                "notificationTimestamp": created_at,   # datetime object
-                "eventDate": eventDate,    # datetime object
-                "isRead": isRead
-            } for u in target_users])
-
-            rows_inserted = self.db.send_df_to_table(
-                df, table_name="Notifications", if_exists="append"
-            )
-            return rows_inserted
+                "notificationTimestamp": created_at,
+                "eventDate": eventDate,
+                "isRead": isRead,
+                "groupID": groupID,
+                "eventCount": eventCount
+            } for u in target_users]
+
+            # The rows just inserted: one per recipient for this event and timestamp
+            recipients = """
+                SELECT username FROM Notifications
+                WHERE eventID = :eventID AND notificationTimestamp = :created_at
+            """
+            params = {"eventID": eventID, "created_at": created_at}
+            with self.db.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO Notifications
+                        (username, description, eventID, notificationTimestamp, eventDate, isRead,
+                         groupID, eventCount)
+                    VALUES (:username, :description, :eventID, :notificationTimestamp, :eventDate, :isRead,
+                            :groupID, :eventCount)
+                """), rows)
+                conn.execute(text(f"""
+                    INSERT INTO NotificationUnreadCount (username, unreadCount)
+                    SELECT r.username, 0 FROM ({recipients}) r
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM NotificationUnreadCount c WHERE c.username = r.username
+                    )
+                """), params)
+                conn.execute(text(f"""
+                    UPDATE NotificationUnreadCount
+                    SET unreadCount = unreadCount + :unread, version = version + 1
+                    WHERE username IN ({recipients})
+                """), {**params, "unread": 0 if isRead else 1})
+            if self.hub is not None:
+                self.hub.publish(target_users, "notification", {
+                    "description": description,
+                    "eventID": eventID,
+                    "notificationTimestamp": created_at,
+                    "eventDate": eventDate,
+                    "isRead": isRead,
+                    "groupID": groupID,
+                    "eventCount": eventCount
+                })
+            return len(rows)
         except Exception as e:
             raise Exception(f"Failed to create notifications: {str(e)}")
-        
-    def getNotificationsByUsername(self, username: str):
+
+    def createEventReminders(self, reminders: List[Dict[str, Any]], sent_at: datetime) -> int:
+        """
+        Remind the members of each event's groups that it is about to start
+        (see ReminderScheduler), in one transaction for the whole batch.
+
+        Each reminder is recorded in EventReminderSent with the notifications.
+        Reminders already recorded there, by an earlier run or another process,
+        are skipped, so none is ever sent twice.
+
+        Args:
+            reminders (List[dict]): eventID, leadMinutes, eventDate and description of each reminder
+            sent_at (datetime): Timestamp of the first reminder's notifications; each
+                                further reminder is a microsecond later, as a user may
+                                get several in one batch
+
+        Returns:
+            int: Notifications written
         """
-        Retrieve all notifications for a given user.
+        if not reminders:
+            return 0
+        try:
+            event_ids = bindparam("eventIDs", expanding=True)
+            params = {"eventIDs": sorted({r["eventID"] for r in reminders})}
+            with self.db.begin() as conn:
+                sent = {
+                    (int(eventID), int(lead)) for eventID, lead in conn.execute(text("""
+                        SELECT eventID, leadMinutes FROM EventReminderSent WHERE eventID IN :eventIDs
+                    """).bindparams(event_ids), params)
+                }
+                reminders = [r for r in reminders if (r["eventID"], r["leadMinutes"]) not in sent]
+                if not reminders:
+                    return 0
+
+                members: Dict[int, Dict[str, int]] = {}
+                for eventID, username, groupID in conn.execute(text("""
+                    SELECT gte.eventID, gm.username, MIN(gte.groupID)
+                    FROM GroupToEvent gte
+                    JOIN GroupMember gm ON gm.groupID = gte.groupID
+                    WHERE gte.eventID IN :eventIDs
+                    GROUP BY gte.eventID, gm.username
+                """).bindparams(event_ids), params):
+                    members.setdefault(int(eventID), {})[username] = int(groupID)
+
+                markers, rows, pushes = [], [], []
+                for i, reminder in enumerate(reminders):
+                    recipients = members.get(reminder["eventID"], {})
+                    notification = {
+                        "description": reminder["description"],
+                        "eventID": reminder["eventID"],
+                        "notificationTimestamp": sent_at + timedelta(microseconds=i),
+                        "eventDate": reminder["eventDate"]
+                    }
+                    markers.append({"eventID": reminder["eventID"], "leadMinutes": reminder["leadMinutes"],
+                                    "sentAt": sent_at})
+                    rows += [{**notification, "username": username, "groupID": groupID}
+                             for username, groupID in recipients.items()]
+                    if recipients:
+                        pushes.append((list(recipients), {
+                            **notification, "isRead": 0, "groupID": min(recipients.values()), "eventCount": 1
+                        }))
+
+                # A reminder sent meanwhile by another process violates the primary key and rolls this back
+                conn.execute(text("""
+                    INSERT INTO EventReminderSent (eventID, leadMinutes, sentAt)
+                    VALUES (:eventID, :leadMinutes, :sentAt)
+                """), markers)
+                if rows:
+                    conn.execute(text("""
+                        INSERT INTO Notifications
+                            (username, description, eventID, notificationTimestamp, eventDate, isRead,
+                             groupID, eventCount)
+                        VALUES (:username, :description, :eventID, :notificationTimestamp, :eventDate, 0,
+                                :groupID, 1)
+                    """), rows)
+                    counts = Counter(row["username"] for row in rows)
+                    increments = [{"username": u, "added": n} for u, n in counts.items()]
+                    conn.execute(text("""
+                        INSERT INTO NotificationUnreadCount (username, unreadCount)
+                        SELECT :username, 0
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM NotificationUnreadCount WHERE username = :username
+                        )
+                    """), increments)
+                    conn.execute(text("""
+                        UPDATE NotificationUnreadCount
+                        SET unreadCount = unreadCount + :added, version = version + 1
+                        WHERE username = :username
+                    """), increments)
+            if self.hub is not None:
+                for usernames, data in pushes:
+                    self.hub.publish(usernames, "notification", data)
+            return len(rows)
+        except Exception as e:
+            raise Exception(f"Failed to create event reminders: {str(e)}")
+
+    def getNotificationsByUsername(self, username: str, include_archived: bool = False,
+                                   limit: Optional[int] = None, before: Optional[Any] = None,
+                                   unread_only: bool = False, before_id: Optional[int] = None):
+        """
+        Retrieve notifications for a given user, newest first; notifications
+        with the same timestamp are ordered by notificationID, newest first.
+
+        Pages are read by keyset: pass the notificationTimestamp and
+        notificationID of the last row of one page as before and before_id to
+        get the next one. The timestamp alone is not unique: NotificationsAll
+        holds archived rows beside live ones, and bulk writes may stamp several
+        rows alike. notificationID breaks the tie, so no row is skipped or
+        repeated between pages.
 
         Args:
             username (str): The username whose notifications should be fetched.
+            include_archived (bool): Also return notifications moved to NotificationsArchive.
+            limit (int): Return at most this many notifications (default: all).
+            before: Only return notifications older than this notificationTimestamp.
+            unread_only (bool): Only return notifications that have not been read.
+            before_id (int): With before, also return notifications at exactly
+                that timestamp whose notificationID is lower.
 
         Returns:
             List[dict]: A list of notification records, each represented as a dictionary.
         """
         try:
-            query = """
-                SELECT *
-                FROM Notifications
-                WHERE username = :username
-                ORDER BY notificationTimestamp DESC
+            table = "NotificationsAll" if include_archived else "Notifications"
+            top = "TOP (:limit) " if limit is not None else ""
+            conditions = ["username = :username"]
+            params: Dict[str, Any] = {"username": username}
+            if limit is not None:
+                params["limit"] = limit
+            if unread_only:
+                conditions.append("isRead = 0")
+            if before is not None and before_id is not None:
+                conditions.append("(notificationTimestamp < :before OR "
+                                  "(notificationTimestamp = :before AND notificationID < :before_id))")
+                params.update({"before": before, "before_id": before_id})
+            elif before is not None:
+                conditions.append("notificationTimestamp < :before")
+                params["before"] = before
+            query = f"""
+                SELECT {top}*
+                FROM {table}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY notificationTimestamp DESC, notificationID DESC
             """
-            df = self.db.read_query_to_df(query, {"username": username})
-            return df.to_dict("records") if not df.empty else []
+            return self.db.read_query_to_rows(query, params)
         except Exception as e:
             raise Exception(f"Failed to fetch notifications for {username}: {str(e)}")
 
+    def getUnreadCount(self, username: str) -> int:
+        """
+        Number of unread notifications for a user, read from the maintained
+        NotificationUnreadCount row (one primary key lookup).
+
+        Args:
+            username (str): The username to count for.
+
+        Returns:
+            int: Unread notifications; 0 for a user who has never been notified.
+        """
+        try:
+            query = "SELECT unreadCount FROM NotificationUnreadCount WHERE username = :username"
+            df = self.db.read_query_to_df(query, {"username": username})
+            return int(df.iloc[0]["unreadCount"]) if not df.empty else 0
+        except Exception as e:
+            raise Exception(f"Failed to fetch unread count for {username}: {str(e)}")
+
+    def rebuildUnreadCounts(self) -> int:
+        """
+        Recompute every NotificationUnreadCount row from Notifications, e.g.
+        after bulk-loading notifications outside this manager.
+
+        Returns:
+            int: Number of users with unread notifications.
+        """
+        try:
+            # Rows are updated in place so their versions keep counting up
+            self.db.execute_transaction([
+                ("""
+                    INSERT INTO NotificationUnreadCount (username, unreadCount)
+                    SELECT DISTINCT n.username, 0 FROM Notifications n
+                    WHERE NOT EXISTS (SELECT 1 FROM NotificationUnreadCount c WHERE c.username = n.username)
+                """, None),
+                ("""
+                    UPDATE NotificationUnreadCount
+                    SET unreadCount = (
+                            SELECT COUNT(*) FROM Notifications n
+                            WHERE n.username = NotificationUnreadCount.username AND n.isRead = 0
+                        ),
+                        version = version + 1
+                """, None),
+            ])
+            df = self.db.read_query_to_df("SELECT COUNT(*) as users FROM NotificationUnreadCount WHERE unreadCount > 0")
+            return int(df.iloc[0]["users"])
+        except Exception as e:
+            raise Exception(f"Failed to rebuild unread counts: {str(e)}")
+
+    def _markRead(self, conn, where: str, params: Dict[str, Any], expanding: Iterable[str] = ()) -> int:
+        """
+        Mark the unread notifications matching where as read and take them off
+        their owners' NotificationUnreadCount rows, on the caller's connection.
+        Rows already read are not touched, so a notification is only ever
+        subtracted once.
+        """
+        statement = text(f"""
+            UPDATE Notifications
+            SET isRead = 1
+            OUTPUT INSERTED.username
+            WHERE isRead = 0 AND ({where})
+        """)
+        for name in expanding:
+            statement = statement.bindparams(bindparam(name, expanding=True))
+        changed = Counter(row[0] for row in conn.execute(statement, params))
+        if changed:
+            conn.execute(text("""
+                UPDATE NotificationUnreadCount
+                SET unreadCount = unreadCount - :changed, version = version + 1
+                WHERE username = :username
+            """), [{"username": u, "changed": n} for u, n in changed.items()])
+        return sum(changed.values())
+
     def markNotificationAsRead(self, username: str, eventID: int) -> int:
         """
         Mark a notification as read for a specific user and event.
@@ -86,16 +334,117 @@ class NotificationManager:
             int: Number of rows updated.
         """
         try:
-            query = """
-                UPDATE Notifications
-                SET isRead = 1
-                WHERE username = :username AND eventID = :eventID
-            """
-            with self.db.engine.begin() as conn:
-                result = conn.execute(
-                    query,
-                    {"username": username, "eventID": eventID}
-                )
-                return result.rowcount
+            with self.db.begin() as conn:
+                return self._markRead(conn, "username = :username AND eventID = :eventID",
+                                      {"username": username, "eventID": eventID})
         except Exception as e:
             raise Exception(f"Failed to mark notification as read: {str(e)}")
+
+    def markAllNotificationsAsRead(self, username: str) -> int:
+        """
+        Mark every unread notification of a user as read.
+
+        Args:
+            username (str): The username whose inbox should be cleared.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        try:
+            with self.db.begin() as conn:
+                return self._markRead(conn, "username = :username", {"username": username})
+        except Exception as e:
+            raise Exception(f"Failed to mark notifications as read: {str(e)}")
+
+    def markNotificationsAsReadByID(self, username: str, notificationIDs: List[int]) -> int:
+        """
+        Mark a set of a user's notifications as read. IDs belonging to other
+        users are ignored.
+
+        Args:
+            username (str): The username the notifications belong to.
+            notificationIDs (List[int]): Notifications to mark.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        if not notificationIDs:
+            return 0
+        try:
+            with self.db.begin() as conn:
+                return self._markRead(conn, "username = :username AND notificationID IN :notificationIDs",
+                                      {"username": username, "notificationIDs": list(notificationIDs)},
+                                      expanding=["notificationIDs"])
+        except Exception as e:
+            raise Exception(f"Failed to mark notifications as read: {str(e)}")
+
+    def markNotificationsAsReadInRange(self, username: str, start: Optional[datetime] = None,
+                                       end: Optional[datetime] = None) -> int:
+        """
+        Mark a user's notifications created in [start, end) as read.
+
+        Args:
+            username (str): The username the notifications belong to.
+            start (datetime): Earliest notificationTimestamp to mark (default: no lower bound).
+            end (datetime): Mark notifications strictly before this (default: no upper bound).
+
+        Returns:
+            int: Number of rows updated.
+        """
+        try:
+            conditions = ["username = :username"]
+            params: Dict[str, Any] = {"username": username}
+            if start is not None:
+                conditions.append("notificationTimestamp >= :start")
+                params["start"] = start
+            if end is not None:
+                conditions.append("notificationTimestamp < :end")
+                params["end"] = end
+            with self.db.begin() as conn:
+                return self._markRead(conn, " AND ".join(conditions), params)
+        except Exception as e:
+            raise Exception(f"Failed to mark notifications as read: {str(e)}")
+
+    def applyReadReceipts(self, receipts: Dict[str, Iterable[int]]) -> int:
+        """
+        Mark the notifications acknowledged by several users as read in one
+        transaction (see ReadReceiptBuffer), with one UPDATE per MAX_BATCH
+        bound parameters so a large backlog stays under SQL Server's limit.
+
+        Args:
+            receipts (dict): username -> notification IDs that user has read
+
+        Returns:
+            int: Number of rows updated.
+        """
+        # Split into batches of at most MAX_BATCH parameters: a username and its IDs
+        batches: List[Dict[str, List[int]]] = []
+        batch: Dict[str, List[int]] = {}
+        size = 0
+        for username, ids in receipts.items():
+            for notification_id in ids:
+                cost = 1 if username in batch else 2
+                if size + cost > MAX_BATCH:
+                    batches.append(batch)
+                    batch, size, cost = {}, 0, 2
+                batch.setdefault(username, []).append(notification_id)
+                size += cost
+        if batch:
+            batches.append(batch)
+        if not batches:
+            return 0
+
+        def condition(batch: Dict[str, List[int]]):
+            conditions, params = [], {}
+            for i, (username, ids) in enumerate(batch.items()):
+                names = ", ".join(f":n{i}_{j}" for j in range(len(ids)))
+                conditions.append(f"(username = :u{i} AND notificationID IN ({names}))")
+                params[f"u{i}"] = username
+                params.update({f"n{i}_{j}": notification_id for j, notification_id in enumerate(ids)})
+            return " OR ".join(conditions), params
+
+        try:
+            with self.db.begin() as conn:
+                return sum(self._markRead(conn, *condition(batch)) for batch in batches)
+        except Exception as e:
+            raise Exception(f"Failed to apply read receipts: {str(e)}")
@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, text
+from .SQLManager import DatabaseManager, utc_now
+
+# Rows a worker may claim: not dead-lettered, due, and not leased to a live worker
+_CLAIMABLE = "failedAt IS NULL AND availableAt <= :now AND (claimedUntil IS NULL OR claimedUntil < :now)"
+
+
+class NotificationOutbox:
+    """
+    The NotificationOutbox table (sql/Migrations/0008): one fan-out job per
+    group event, written in the same transaction as the event.
+
+    Workers claim jobs with a lease (claimedBy/claimedUntil) so several can
+    share the queue; a job whose worker died is claimed again once its lease
+    runs out. Delivery is at least once: a worker that notifies and then dies
+    before complete() leaves the job to be delivered again.
+    """
+
+    def __init__(self, db: DatabaseManager, max_attempts: int = 8, backoff: float = 2.0,
+                 max_backoff: float = 300.0, clock: Callable[[], datetime] = utc_now):
+        """
+        Args:
+            db (DatabaseManager): Database holding NotificationOutbox
+            max_attempts (int): Deliveries tried before a job is marked failed
+            backoff (float): Seconds before the first retry; doubled for each further one
+            max_backoff (float): Longest wait between retries
+            clock (callable): Current naive UTC time (tests pass a fake one)
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+    def enqueueStatement(self, eventID: int, groupID: int, groupName: str, description: str,
+                         eventDate: datetime) -> Tuple[str, Dict[str, Any]]:
+        """
+        The INSERT queueing a job, for the caller's execute_transaction, so the
+        job commits or rolls back with the event it is about.
+
+        Returns:
+            tuple: (sql, params)
+        """
+        now = self.clock()
+        return ("""
+            INSERT INTO NotificationOutbox
+                (eventID, groupID, groupName, description, eventDate, createdAt, availableAt, attempts)
+            VALUES (:eventID, :groupID, :groupName, :description, :eventDate, :createdAt, :createdAt, 0)
+        """, {
+            "eventID": eventID,
+            "groupID": groupID,
+            "groupName": groupName,
+            "description": description,
+            "eventDate": eventDate,
+            "createdAt": now
+        })
+
+    def claim(self, worker: str, limit: int, lease: float,
+              eventIDs: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Lease up to limit due jobs (oldest first), or the given jobs if they are due.
+
+        Args:
+            worker (str): Name recorded in claimedBy
+            limit (int): Most jobs to claim
+            lease (float): Seconds before an unfinished job may be claimed by another worker
+            eventIDs (Iterable[int]): Claim only these jobs
+
+        Returns:
+            List[dict]: The claimed jobs, attempts already counting this one
+        """
+        now = self.clock()
+        params: Dict[str, Any] = {"worker": worker, "now": now, "until": now + timedelta(seconds=lease)}
+        if eventIDs is not None:
+            params["eventIDs"] = list(eventIDs)
+            if not params["eventIDs"]:
+                return []
+            chosen = ":eventIDs"
+        else:
+            params["limit"] = limit
+            chosen = f"""(
+                SELECT TOP (:limit) eventID FROM NotificationOutbox
+                WHERE {_CLAIMABLE}
+                ORDER BY availableAt
+            )"""
+        statement = text(f"""
+            UPDATE NotificationOutbox
+            SET claimedBy = :worker, claimedUntil = :until, attempts = attempts + 1
+            OUTPUT INSERTED.eventID, INSERTED.groupID, INSERTED.groupName, INSERTED.description,
+                   INSERTED.eventDate, INSERTED.createdAt, INSERTED.attempts
+            WHERE eventID IN {chosen} AND {_CLAIMABLE}
+        """)
+        if eventIDs is not None:
+            statement = statement.bindparams(bindparam("eventIDs", expanding=True))
+        try:
+            with self.db.begin() as conn:
+                return [dict(row) for row in conn.execute(statement, params).mappings()]
+        except Exception as e:
+            raise Exception(f"Failed to claim outbox jobs: {str(e)}")
+
+    def complete(self, worker: str, eventIDs: List[int]) -> int:
+        """
+        Remove delivered jobs. Jobs whose lease passed to another worker are left to it.
+
+        Returns:
+            int: Jobs removed
+        """
+        if not eventIDs:
+            return 0
+        statement = text("""
+            DELETE FROM NotificationOutbox WHERE eventID IN :eventIDs AND claimedBy = :worker
+        """).bindparams(bindparam("eventIDs", expanding=True))
+        try:
+            with self.db.begin() as conn:
+                return conn.execute(statement, {"eventIDs": list(eventIDs), "worker": worker}).rowcount
+        except Exception as e:
+            raise Exception(f"Failed to complete outbox jobs: {str(e)}")
+
+    def extend(self, worker: str, eventIDs: List[int], lease: float) -> int:
+        """
+        Renew the lease on jobs a worker is still delivering (e.g. held for a digest).
+
+        Returns:
+            int: Jobs whose lease was renewed
+        """
+        if not eventIDs:
+            return 0
+        statement = text("""
+            UPDATE NotificationOutbox SET claimedUntil = :until
+            WHERE eventID IN :eventIDs AND claimedBy = :worker
+        """).bindparams(bindparam("eventIDs", expanding=True))
+        params = {"eventIDs": list(eventIDs), "worker": worker,
+                  "until": self.clock() + timedelta(seconds=lease)}
+        try:
+            with self.db.begin() as conn:
+                return conn.execute(statement, params).rowcount
+        except Exception as e:
+            raise Exception(f"Failed to extend outbox leases: {str(e)}")
+
+    def retry(self, job: Dict[str, Any], error: Exception) -> bool:
+        """
+        Release a job whose delivery failed, to be tried again after a backoff,
+        or mark it failed once it has had max_attempts.
+
+        Returns:
+            bool: True if the job will be retried
+        """
+        now = self.clock()
+        attempts = int(job["attempts"])
+        retrying = attempts < self.max_attempts
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        try:
+            self.db.execute_query("""
+                UPDATE NotificationOutbox
+                SET claimedBy = NULL, claimedUntil = NULL, availableAt = :availableAt,
+                    lastError = :lastError, failedAt = :failedAt
+                WHERE eventID = :eventID
+            """, {
+                "eventID": job["eventID"],
+                "availableAt": now + timedelta(seconds=delay),
+                "lastError": str(error)[:1000],
+                "failedAt": None if retrying else now
+            })
+            return retrying
+        except Exception as e:
+            raise Exception(f"Failed to release outbox job: {str(e)}")
+
+    def requeueFailed(self) -> int:
+        """
+        Give every failed job a fresh set of attempts, e.g. after an outage is fixed.
+
+        Returns:
+            int: Jobs requeued
+        """
+        try:
+            return self.db.execute_transaction([("""
+                UPDATE NotificationOutbox
+                SET failedAt = NULL, attempts = 0, availableAt = :now
+                WHERE failedAt IS NOT NULL
+            """, {"now": self.clock()})])[0]
+        except Exception as e:
+            raise Exception(f"Failed to requeue outbox jobs: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and lag.
+
+        Returns:
+            dict: pending (jobs waiting or being delivered), inFlight (leased
+                  now), failed (out of attempts) and lagSeconds (age of the
+                  oldest pending job, 0 when there is none)
+        """
+        now = self.clock()
+        try:
+            df = self.db.read_query_to_df("""
+                SELECT
+                    SUM(CASE WHEN failedAt IS NULL THEN 1 ELSE 0 END) as pending,
+                    SUM(CASE WHEN failedAt IS NULL AND claimedUntil >= :now THEN 1 ELSE 0 END) as inFlight,
+                    SUM(CASE WHEN failedAt IS NOT NULL THEN 1 ELSE 0 END) as failed,
+                    MIN(CASE WHEN failedAt IS NULL THEN createdAt END) as oldest
+                FROM NotificationOutbox
+            """, {"now": now})
+        except Exception as e:
+            raise Exception(f"Failed to read outbox stats: {str(e)}")
+        row = df.iloc[0]  # aggregates: always one row, NULL sums when the table is empty
+
+        def count(value) -> int:
+            return int(value) if value is not None and value == value else 0
+
+        lag, oldest = 0.0, row["oldest"]
+        if oldest is not None and oldest == oldest:
+            if not isinstance(oldest, datetime):
+                oldest = datetime.fromisoformat(str(oldest))
+            lag = max(0.0, (now - oldest).total_seconds())
+        return {"pending": count(row["pending"]), "inFlight": count(row["inFlight"]),
+                "failed": count(row["failed"]), "lagSeconds": round(lag, 3)}
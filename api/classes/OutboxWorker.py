@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from starlette.concurrency import run_in_threadpool
+from .NotificationCoalescer import NotificationCoalescer
+from .NotificationOutbox import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """
+    Delivers NotificationOutbox jobs: claims a batch, reads the members of
+    every group in it with one query, and notifies each group through the
+    NotificationCoalescer (one bulk insert per event, or a digest). Delivered
+    jobs are removed together; a failed one is released for a retry with
+    backoff while the rest of the batch goes on. A job the coalescer holds
+    for a digest stays leased (renewed every lease / 2 seconds) and is only
+    removed once the digest is written, so a crash before then leaves it to
+    be delivered again.
+
+    Runs inside the Events Service (OUTBOX_INLINE_WORKER=1) or as its own
+    process (api/NotificationWorker.py); any number may share the queue.
+    """
+
+    def __init__(self, outbox: NotificationOutbox, coalescer: NotificationCoalescer, batch_size: int = 100,
+                 lease: float = 60.0, poll_interval: float = 0.5, name: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            outbox (NotificationOutbox): Queue to deliver from
+            coalescer (NotificationCoalescer): Writes the notifications
+            batch_size (int): Jobs claimed at a time
+            lease (float): Seconds a claimed batch is reserved for this worker
+            poll_interval (float): Seconds to wait when the queue is empty
+            name (str): Recorded in claimedBy (default: host:pid)
+            clock (callable): Monotonic time source for lease renewal (tests pass a fake one)
+        """
+        self.outbox = outbox
+        self.coalescer = coalescer
+        self.batch_size = batch_size
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.clock = clock
+        # Jobs held for a digest, by eventID, and when their leases are next renewed
+        self._held: Dict[int, Dict[str, Any]] = {}
+        self._renew_at = 0.0
+        self._lock = threading.RLock()
+        coalescer.on_sent = self._digest_sent
+
+    @property
+    def held(self) -> int:
+        """Jobs leased until their digest is written."""
+        with self._lock:
+            return len(self._held)
+
+    def _digest_sent(self, eventIDs: List[int]) -> None:
+        # The digest is committed: its jobs are done
+        with self._lock:
+            done = [eventID for eventID in eventIDs if self._held.pop(eventID, None) is not None]
+        try:
+            self.outbox.complete(self.name, done)
+        except Exception as e:
+            # The leases run out and the jobs are delivered again
+            logger.warning("Completing digested outbox jobs failed: %s", e)
+
+    def _renew(self) -> None:
+        with self._lock:
+            if not self._held or self.clock() < self._renew_at:
+                return
+            held = list(self._held)
+            self._renew_at = self.clock() + self.lease / 2
+        try:
+            self.outbox.extend(self.name, held, self.lease)
+        except Exception as e:
+            # Tried again next interval; the leases have lease / 2 seconds left
+            logger.warning("Renewing held outbox jobs failed: %s", e)
+
+    def _members(self, groupIDs: Iterable[int]) -> Dict[int, List[str]]:
+        groupIDs = sorted(set(groupIDs))
+        placeholders = ", ".join(f":id{i}" for i in range(len(groupIDs)))
+        df = self.outbox.db.read_query_to_df(
+            f"SELECT groupID, username FROM GroupMember WHERE groupID IN ({placeholders})",
+            {f"id{i}": groupID for i, groupID in enumerate(groupIDs)}
+        )
+        members: Dict[int, List[str]] = {}
+        if not df.empty:
+            for groupID, username in zip(df["groupID"].tolist(), df["username"].tolist()):
+                members.setdefault(int(groupID), []).append(username)
+        return members
+
+    def process(self, eventIDs: Optional[Iterable[int]] = None) -> int:
+        """
+        Claim and deliver one batch of due jobs (only the given ones when eventIDs is set).
+
+        Returns:
+            int: Jobs delivered or held for a digest
+        """
+        self._renew()
+        jobs = self.outbox.claim(self.name, self.batch_size, self.lease, eventIDs)
+        if not jobs:
+            return 0
+        try:
+            members = self._members(job["groupID"] for job in jobs)
+        except Exception as e:
+            for job in jobs:
+                self.outbox.retry(job, e)
+            raise Exception(f"Failed to read group members: {str(e)}")
+
+        delivered, held = [], 0
+        for job in jobs:
+            eventDate = job["eventDate"]
+            if not isinstance(eventDate, datetime):
+                eventDate = datetime.fromisoformat(str(eventDate))
+            eventID = int(job["eventID"])
+            try:
+                # Locked so a digest sent meanwhile cannot miss the job it completes
+                with self._lock:
+                    self.coalescer.notify(
+                        groupID=int(job["groupID"]),
+                        groupName=job["groupName"],
+                        usernames=members.get(int(job["groupID"]), []),
+                        description=job["description"],
+                        eventID=eventID,
+                        eventDate=eventDate
+                    )
+                    if self.coalescer.holds(eventID):
+                        if not self._held:
+                            self._renew_at = self.clock() + self.lease / 2
+                        self._held[eventID] = job
+                        held += 1
+                        continue
+                delivered.append(eventID)
+            except Exception as e:
+                self.outbox.retry(job, e)
+        self.outbox.complete(self.name, delivered)
+        return len(delivered) + held
+
+    async def run(self) -> None:
+        """
+        Deliver until cancelled, polling every poll_interval seconds while the queue is empty.
+        """
+        while True:
+            try:
+                delivered = await run_in_threadpool(self.process)
+            except Exception as e:
+                logger.warning("Outbox delivery failed: %s", e)
+                delivered = 0
+            if delivered < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
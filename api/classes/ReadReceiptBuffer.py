@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Set
+from starlette.concurrency import run_in_threadpool
+from .NotificationManager import NotificationManager
+
+logger = logging.getLogger(__name__)
+
+
+class ReadReceiptBuffer:
+    """
+    Coalesces per-notification read acknowledgements into batched writes.
+
+    Opening notifications one by one would otherwise cost one UPDATE and one
+    transaction each. Acks are held in memory and written together with
+    NotificationManager.applyReadReceipts by run() every flush_interval
+    seconds, or as soon as max_pending acks are waiting; the write happens on
+    the thread pool, never in add(). An ack is lost if the process dies before
+    the next flush, or if max_backlog acks are already waiting (for instance
+    while the database is down); the notification then simply stays unread.
+    """
+
+    def __init__(self, nm: NotificationManager, flush_interval: float = 0.5, max_pending: int = 500,
+                 max_backlog: int = 10000):
+        """
+        Args:
+            nm (NotificationManager): Writes the batched receipts
+            flush_interval (float): Seconds between background flushes
+            max_pending (int): Flush immediately once this many acks are waiting
+            max_backlog (int): Most acks held; further ones are dropped until a flush succeeds
+        """
+        self.nm = nm
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_backlog = max_backlog
+        self.dropped = 0
+        self._pending: Dict[str, Set[int]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        # Set by add() to wake run() early; created by run() on its own loop
+        self._full: Optional[asyncio.Event] = None
+
+    @property
+    def pending(self) -> int:
+        """Acks waiting for the next flush."""
+        return self._count
+
+    def add(self, username: str, notificationID: int) -> None:
+        """
+        Queue a read ack. Duplicate acks for the same notification are merged.
+        """
+        with self._lock:
+            if notificationID not in self._pending.get(username, ()):
+                if self._count >= self.max_backlog:
+                    self.dropped += 1
+                    return
+                self._pending.setdefault(username, set()).add(notificationID)
+                self._count += 1
+            full = self._count >= self.max_pending
+        if full and self._full is not None:
+            self._full.set()
+
+    def flush(self) -> int:
+        """
+        Write every waiting ack in one transaction. If the write fails the
+        acks are put back for the next flush, up to max_backlog.
+
+        Returns:
+            int: Notifications newly marked as read
+        """
+        with self._lock:
+            receipts, self._pending, self._count = self._pending, {}, 0
+        if not receipts:
+            return 0
+        try:
+            return self.nm.applyReadReceipts(receipts)
+        except Exception:
+            with self._lock:
+                for username, ids in receipts.items():
+                    merged = self._pending.setdefault(username, set())
+                    for notificationID in ids - merged:
+                        if self._count >= self.max_backlog:
+                            self.dropped += 1
+                            continue
+                        merged.add(notificationID)
+                        self._count += 1
+            raise
+
+    async def run(self) -> None:
+        """
+        Flush on the interval, or once max_pending acks wait, until cancelled
+        (started by the Events Service lifespan).
+        """
+        self._full = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._full.clear()
+                try:
+                    await run_in_threadpool(self.flush)
+                except Exception as e:
+                    logger.warning("Read receipt flush failed, retrying: %s", e)
+                    # A full buffer must not retry the moment the next ack arrives
+                    await asyncio.sleep(self.flush_interval)
+        finally:
+            self._full = None
@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from .NotificationManager import NotificationManager
+from .ServiceConfig import DESCRIPTION_MAX_LENGTH
+from .SQLManager import utc_now
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+# A pending reminder is one int in the heap: fire time (epoch seconds) in the
+# high bits, then eventID, then the index of its lead time. Ordering the ints
+# orders by fire time, and each entry costs ~45 bytes instead of ~120 for a tuple.
+_LEAD_BITS = 8
+_EVENT_BITS = 32
+
+
+def _pack(fire_at: int, eventID: int, lead_index: int) -> int:
+    return (fire_at << (_EVENT_BITS + _LEAD_BITS)) | (eventID << _LEAD_BITS) | lead_index
+
+
+def _unpack(entry: int) -> Tuple[int, int, int]:
+    return (entry >> (_EVENT_BITS + _LEAD_BITS),
+            (entry >> _LEAD_BITS) & ((1 << _EVENT_BITS) - 1),
+            entry & ((1 << _LEAD_BITS) - 1))
+
+
+def _seconds(moment: datetime) -> int:
+    return int((moment - EPOCH).total_seconds())
+
+
+def parse_leads(value: str) -> List[int]:
+    """
+    "1440,60" -> [60, 1440]: reminder lead times in minutes, shortest first.
+    """
+    return sorted({int(part) for part in value.split(",") if part.strip()})
+
+
+def lead_text(minutes: int) -> str:
+    """1440 -> "1 day", 120 -> "2 hours", 15 -> "15 minutes"."""
+    for unit, size in (("day", 1440), ("hour", 60), ("minute", 1)):
+        if minutes % size == 0:
+            break
+    count = minutes // size
+    return f"{count} {unit}" + ("s" if count != 1 else "")
+
+
+def _time_left(seconds: int) -> int:
+    """Minutes until a start, rounded to the day or hour once that large."""
+    minutes = max(1, round(seconds / 60))
+    for size in (1440, 60):
+        if minutes >= size:
+            return round(minutes / size) * size
+    return minutes
+
+
+def reminder_description(description: str, minutes: int) -> str:
+    """
+    "Starts in 1 hour: Chess night", cut to fit the column.
+    """
+    text = f"Starts in {lead_text(minutes)}: {description}"
+    if len(text) > DESCRIPTION_MAX_LENGTH:
+        text = text[:DESCRIPTION_MAX_LENGTH - 3] + "..."
+    return text
+
+
+class ReminderScheduler:
+    """
+    Reminds group members shortly before their events start.
+
+    Every reload_interval seconds the scheduler reads the events whose
+    reminders fall in the next `window` seconds ([Event] joined to GroupToEvent,
+    by the IX_Event_date index) and rebuilds a heap of them. Between reloads it
+    sleeps until the earliest reminder is due, then sends every due reminder
+    in batches of batch_size through NotificationManager.createEventReminders
+    (one transaction and a few statements per batch). Only the window is held
+    in memory, one int per reminder.
+
+    Sent reminders are recorded in EventReminderSent with their
+    notifications, so a restart reloads only the ones still owed and never
+    sends one twice, even with several processes running a scheduler. A
+    reminder missed while the service was down is sent late, saying how long
+    is actually left, as long as the event has not started; when several
+    leads were missed only the shortest is sent. An event moved after its
+    reminders were loaded is skipped at fire time and picked up again by the
+    next reload.
+    """
+
+    # Seconds to wait before retrying after a failed reload or send
+    RETRY_DELAY = 5.0
+
+    def __init__(self, nm: NotificationManager, leads: Iterable[int] = (1440, 60), window: float = 3600.0,
+                 reload_interval: float = 60.0, batch_size: int = 500,
+                 now: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            nm (NotificationManager): Sends the reminders
+            leads (Iterable[int]): Minutes before an event starts to remind its members
+            window (float): Seconds ahead whose reminders are held in memory
+            reload_interval (float): Seconds between reloads of the window
+            batch_size (int): Reminders sent per transaction
+            now (callable): Current time, in the same (naive, local) clock as [Event].date
+        """
+        self.nm = nm
+        self.leads = sorted(set(leads))
+        if len(self.leads) >= 1 << _LEAD_BITS:
+            raise ValueError(f"At most {(1 << _LEAD_BITS) - 1} reminder lead times are supported")
+        self.window = window
+        self.reload_interval = max(reload_interval, 1.0)
+        self.batch_size = batch_size
+        self.now = now
+        self._heap: List[int] = []
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Reminders loaded and waiting to fire."""
+        return len(self._heap)
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the earliest pending reminder (None when there is none)."""
+        with self._lock:
+            if not self._heap:
+                return None
+            fire_at = _unpack(self._heap[0])[0]
+        return max(0.0, fire_at - _seconds(self.now()))
+
+    def load(self) -> int:
+        """
+        Replace the pending reminders with those due before now + window that
+        have not been sent, including overdue ones for events not yet started.
+
+        Returns:
+            int: Reminders pending
+        """
+        if not self.leads:
+            return 0
+        now = self.now()
+        query = """
+            SELECT e.eventID, e.date, s.leadMinutes
+            FROM [Event] e
+            LEFT JOIN EventReminderSent s ON s.eventID = e.eventID
+            WHERE e.date > :now AND e.date < :until
+              AND EXISTS (SELECT 1 FROM GroupToEvent gte WHERE gte.eventID = e.eventID)
+        """
+        until = now + timedelta(seconds=self.window, minutes=self.leads[-1])
+        try:
+            df = self.nm.db.read_query_to_df(query, {"now": now, "until": until})
+        except Exception as e:
+            raise Exception(f"Failed to load upcoming events: {str(e)}")
+
+        events: Dict[int, Tuple[int, Set[int]]] = {}
+        if not df.empty:
+            import pandas as pd
+
+            starts = (pd.to_datetime(df["date"]) - pd.Timestamp(EPOCH)) // pd.Timedelta(seconds=1)
+            for eventID, start, lead in zip(df["eventID"].tolist(), starts.tolist(), df["leadMinutes"].tolist()):
+                sent = events.setdefault(int(eventID), (int(start), set()))[1]
+                if lead == lead and lead is not None:  # NaN / NULL: nothing sent yet
+                    sent.add(int(lead))
+
+        now_s = _seconds(now)
+        horizon = now_s + self.window
+        heap = []
+        for eventID, (start, sent) in events.items():
+            # Of the leads already past, only the shortest is still worth sending
+            overdue = [lead for lead in self.leads if start - lead * 60 <= now_s]
+            for index, lead in enumerate(self.leads):
+                fire_at = start - lead * 60
+                if lead in sent or fire_at >= horizon or (overdue and lead > overdue[0]):
+                    continue
+                heap.append(_pack(fire_at, eventID, index))
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap = heap
+        return len(heap)
+
+    def fire_due(self) -> int:
+        """
+        Send every pending reminder whose time has come.
+
+        Returns:
+            int: Notifications written
+        """
+        now_s = _seconds(self.now())
+        due = []
+        with self._lock:
+            while self._heap and _unpack(self._heap[0])[0] <= now_s:
+                due.append(_unpack(heapq.heappop(self._heap)))
+        written = 0
+        for start in range(0, len(due), self.batch_size):
+            written += self._send(due[start:start + self.batch_size], now_s)
+        return written
+
+    def _send(self, batch: List[Tuple[int, int, int]], now_s: int) -> int:
+        event_ids = sorted({eventID for _, eventID, _ in batch})
+        placeholders = ", ".join(f":id{i}" for i in range(len(event_ids)))
+        try:
+            df = self.nm.db.read_query_to_df(
+                f"SELECT eventID, date, description FROM [Event] WHERE eventID IN ({placeholders})",
+                {f"id{i}": eventID for i, eventID in enumerate(event_ids)}
+            )
+        except Exception as e:
+            raise Exception(f"Failed to read events for reminders: {str(e)}")
+        events = {}
+        if not df.empty:
+            import pandas as pd
+
+            for eventID, date, description in zip(df["eventID"].tolist(), pd.to_datetime(df["date"]),
+                                                  df["description"].tolist()):
+                events[int(eventID)] = (date.to_pydatetime(), description)
+
+        reminders = []
+        for fire_at, eventID, index in batch:
+            if eventID not in events:
+                continue  # deleted since it was loaded
+            date, description = events[eventID]
+            lead = self.leads[index]
+            start = _seconds(date)
+            if start - lead * 60 != fire_at or start <= now_s:
+                continue  # moved or already started
+            # A reminder sent late (after downtime) says how long is actually left
+            minutes = lead if now_s - fire_at < 60 else _time_left(start - now_s)
+            reminders.append({
+                "eventID": eventID,
+                "leadMinutes": lead,
+                "eventDate": date,
+                "description": reminder_description(description or "", minutes)
+            })
+        return self.nm.createEventReminders(reminders, sent_at=utc_now())
+
+    async def run(self) -> None:
+        """
+        Reload and fire until cancelled (started by the Events Service lifespan).
+        """
+        if not self.leads:
+            return
+        next_load = 0.0
+        while True:
+            try:
+                if time.monotonic() >= next_load:
+                    await run_in_threadpool(self.load)
+                    next_load = time.monotonic() + self.reload_interval
+                await run_in_threadpool(self.fire_due)
+                delay = next_load - time.monotonic()
+                due = self.next_due()
+                if due is not None:
+                    delay = min(delay, due)
+            except Exception as e:
+                logger.warning("Reminder scheduler failed, reloading: %s", e)
+                # Reminders popped but not sent are still owed; the reload finds them
+                next_load = 0.0
+                delay = self.RETRY_DELAY
+            await asyncio.sleep(max(delay, 0.0))
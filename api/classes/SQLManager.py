@@ -1,17 +1,141 @@
+import os
+import math
+import time
 import urllib
-import pandas as pd
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from sqlalchemy import create_engine, text
-from typing import Dict, Any, Optional
-import pandas as pd
+from sqlalchemy.engine import Connection, Engine, make_url
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .DatabaseGuard import CircuitBreaker
+
+
+# Bound parameters per statement when a list is sent as IN (...) or OR'd
+# conditions; SQL Server takes at most 2100 per statement
+MAX_BATCH = 1000
+
+
+def utc_now() -> datetime:
+    """
+    The current time as the services store it: naive UTC, like the schema's
+    datetime2 columns (which hold no offset).
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# Engines are shared per connection string so every manager in a process
+# (and every service mounted in the composed app) draws from one pool.
+_engine_registry: Dict[str, Engine] = {}
+_engine_registry_lock = threading.Lock()
+
+
+def get_engine(connection_string: str) -> Engine:
+    """
+    Return the process-wide engine for a connection string, creating it on first use.
+
+    Args:
+        connection_string (str): SQLAlchemy connection URL
+
+    Returns:
+        Engine: The shared SQLAlchemy engine for that URL
+    """
+    with _engine_registry_lock:
+        engine = _engine_registry.get(connection_string)
+        if engine is None:
+            url = make_url(connection_string)
+            if url.get_backend_name() == "sqlite":
+                from .SQLiteBackend import engine_options, configure_engine
+                engine = create_engine(url, **engine_options(url))
+                configure_engine(engine)
+            elif url.get_backend_name() == "mssql":
+                # fast_executemany sends bulk inserts (send_df_to_table) as one round trip per batch
+                engine = create_engine(connection_string, fast_executemany=True)
+            else:
+                engine = create_engine(connection_string)
+            _engine_registry[connection_string] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """
+    Dispose of every registered engine and clear the registry.
+    """
+    with _engine_registry_lock:
+        for engine in _engine_registry.values():
+            engine.dispose()
+        _engine_registry.clear()
+
+
+def _reset_engines_after_fork() -> None:
+    """
+    Drop pooled connections inherited from the parent process.
+
+    A forked worker must never reuse the parent's sockets, so each engine's pool
+    is replaced without closing the parent's connections (close=False).
+    """
+    global _engine_registry_lock
+    _engine_registry_lock = threading.Lock()
+    for engine in _engine_registry.values():
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engines_after_fork)
+
+
+# Statement timeout (ms) for calls made in the current request or task; None: the manager's default
+_statement_timeout: ContextVar[Optional[int]] = ContextVar("statement_timeout", default=None)
+
+
+@contextmanager
+def statement_timeout(ms: int) -> Iterator[None]:
+    """
+    Run the database calls made inside the block with a timeout of ms
+    milliseconds each (0: no limit), instead of DatabaseManager's default.
+    Applies to this thread or task and to thread pool calls it starts.
+    """
+    token = _statement_timeout.set(ms)
+    try:
+        yield
+    finally:
+        _statement_timeout.reset(token)
+
+
+def _limit_statements(conn: Connection, ms: int) -> Callable[[], None]:
+    """
+    Make conn give up on statements after ms milliseconds, where the backend
+    allows it. Returns a function that lifts the limit again before the
+    connection goes back to the pool.
+    """
+    backend = conn.dialect.name
+    if backend == "sqlite":
+        # Checked every 1000 VM steps; returning nonzero aborts with "interrupted"
+        raw = conn.connection.driver_connection
+        deadline = time.monotonic() + ms / 1000
+        raw.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+        return lambda: raw.set_progress_handler(None, 0)
+    if backend == "mssql":
+        # pyodbc's query timeout, in whole seconds (0: none)
+        raw = conn.connection.driver_connection
+        raw.timeout = max(1, math.ceil(ms / 1000))
+        return lambda: setattr(raw, "timeout", 0)
+    if backend == "postgresql":
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(ms)}")
+    return lambda: None
 
 
 class DatabaseManager:
     """
-    A helper class for connecting to an Azure SQL database and performing
-    read/write operations using SQLAlchemy and pandas.
+    A helper class for connecting to an Azure SQL database (or a local backend
+    given by URL) and performing read/write operations using SQLAlchemy and pandas.
     """
 
-    def __init__(self, server: str, database: str, username: str, password: str):
+    def __init__(self, server: str = "", database: str = "", username: str = "", password: str = "",
+                 url: Optional[str] = None, statement_timeout_ms: int = 0):
         """
         Initialize the database connection.
 
@@ -20,32 +144,133 @@ class DatabaseManager:
             database (str): Database name
             username (str): SQL login username
             password (str): SQL login password
+            url (str): SQLAlchemy URL of another backend (e.g. 'sqlite:///local.db').
+                When given, the Azure SQL settings are ignored.
+            statement_timeout_ms (int): Milliseconds each call may run (0: no limit);
+                statement_timeout() overrides it for a block
+        """
+        if url:
+            self.connection_string = url
+        else:
+            params = urllib.parse.quote_plus(
+                f"DRIVER={{ODBC Driver 18 for SQL Server}};"
+                f"SERVER={server};"
+                f"DATABASE={database};"
+                f"UID={username};"
+                f"PWD={password};"
+                f"Encrypt=yes;"
+                f"TrustServerCertificate=no;"
+                f"Connection Timeout=30;"
+            )
+            self.connection_string = f"mssql+pyodbc:///?odbc_connect={params}"
+        self._engine: Optional[Engine] = None
+        self.statement_timeout_ms = statement_timeout_ms
+        # Set by the services (DatabaseGuard.add_database_guard); None: calls are never refused
+        self.breaker: Optional["CircuitBreaker"] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "DatabaseManager":
         """
-        params = urllib.parse.quote_plus(
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-            f"SERVER={server};"
-            f"DATABASE={database};"
-            f"UID={username};"
-            f"PWD={password};"
-            f"Encrypt=yes;"
-            f"TrustServerCertificate=no;"
-            f"Connection Timeout=30;"
+        Build a DatabaseManager from a ServiceConfig.Settings instance.
+        """
+        return cls(
+            server=settings.db_server,
+            database=settings.db_name,
+            username=settings.db_username,
+            password=settings.db_password,
+            url=settings.database_url or None,
+            statement_timeout_ms=settings.db_statement_timeout_ms
         )
-        connection_string = f"mssql+pyodbc:///?odbc_connect={params}"
-        self.engine = create_engine(connection_string)
+
+    @property
+    def engine(self) -> Engine:
+        """
+        The shared engine for this connection string, created on first use
+        so that constructing a DatabaseManager never touches the database.
+        """
+        if self._engine is None:
+            self._engine = get_engine(self.connection_string)
+        return self._engine
+
+    @contextmanager
+    def _guarded(self, begin: bool) -> Iterator[Connection]:
+        breaker = self.breaker
+        if breaker is not None:
+            breaker.before_call()  # raises CircuitOpen while the database is considered down
+        ms = _statement_timeout.get()
+        if ms is None:
+            ms = self.statement_timeout_ms
+        start = time.perf_counter()
+        try:
+            with (self.engine.begin() if begin else self.engine.connect()) as conn:
+                unlimit = _limit_statements(conn, ms) if ms else None
+                try:
+                    yield conn
+                finally:
+                    if unlimit is not None:
+                        unlimit()
+        except Exception as e:
+            if breaker is not None:
+                breaker.record(time.perf_counter() - start, e)
+            raise
+        if breaker is not None:
+            breaker.record(time.perf_counter() - start)
+
+    def begin(self):
+        """
+        A connection in a transaction that commits at the end of the block,
+        under the statement timeout and circuit breaker. For managers that run
+        several statements together.
+        """
+        return self._guarded(begin=True)
+
+    def connect(self):
+        """
+        Like begin(), without committing: for reads.
+        """
+        return self._guarded(begin=False)
+
+    def ping(self, timeout_ms: int = 1000) -> None:
+        """
+        Run SELECT 1, bypassing the circuit breaker; raises when the database
+        does not answer within timeout_ms. The breaker's probe.
+        """
+        with self.engine.connect() as conn:
+            unlimit = _limit_statements(conn, timeout_ms)
+            try:
+                conn.execute(text("SELECT 1"))
+            finally:
+                unlimit()
 
     # query functions
-    def read_query_to_df(self, sql: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    def read_query_to_df(self, sql: str, params: Optional[Dict[str, Any]] = None) -> "pd.DataFrame":
         """
         Execute a SQL query and return results as a pandas DataFrame.
+
+        The query runs in a committed transaction so that writes returning rows
+        (INSERT ... OUTPUT INSERTED.x) are persisted as well.
         """
+        import pandas as pd
+
         try:
-            with self.engine.connect() as conn:
+            with self.begin() as conn:
                 result = conn.execute(text(sql), params or {})
                 return pd.DataFrame([dict(row) for row in result.mappings()])
         except Exception as e:
             raise Exception(f"Query to DataFrame failed: {str(e)}")
 
+    def read_query_to_rows(self, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query and return its rows as plain dicts, with the driver's
+        values as they are (no DataFrame, no NaN for NULL). For hot read paths
+        that send the rows straight out.
+        """
+        try:
+            with self.begin() as conn:
+                return [dict(row) for row in conn.execute(text(sql), params or {}).mappings()]
+        except Exception as e:
+            raise Exception(f"Query to rows failed: {str(e)}")
+
     def execute_query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> None:
         """
         Execute a SQL command (INSERT, UPDATE, DELETE) without returning results.
@@ -55,17 +280,33 @@ class DatabaseManager:
             params (dict): Parameters for the SQL command
         """
         try:
-            with self.engine.begin() as conn:
+            with self.begin() as conn:
                 conn.execute(text(sql), params or {})
         except Exception as e:
             raise Exception(f"Query execution failed: {str(e)}")
 
-    def send_df_to_table(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append') -> int:
+    def execute_transaction(self, statements: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[int]:
+        """
+        Execute several SQL commands in one transaction; all of them commit or none do.
+
+        Args:
+            statements (list): (sql, params) pairs, run in order
+
+        Returns:
+            List[int]: Rows affected by each command
+        """
+        try:
+            with self.begin() as conn:
+                return [conn.execute(text(sql), params or {}).rowcount for sql, params in statements]
+        except Exception as e:
+            raise Exception(f"Transaction failed: {str(e)}")
+
+    def send_df_to_table(self, df: "pd.DataFrame", table_name: str, if_exists: str = 'append') -> int:
         """
         Send a pandas DataFrame to a database table.
         """
         try:
-            with self.engine.begin() as conn:
+            with self.begin() as conn:
                 rows_inserted = df.to_sql(table_name, conn, if_exists=if_exists, index=False)
                 return rows_inserted if rows_inserted else len(df)
         except Exception as e:
@@ -0,0 +1,228 @@
+"""
+Local SQLite backend for DatabaseManager.
+
+The services are written against Azure SQL (T-SQL). When DatabaseManager is
+given a sqlite:// URL, the engine is configured here so that the same queries
+run unchanged on a laptop:
+
+- every statement is rewritten from T-SQL to SQLite just before execution
+  (translate_tsql), and
+- sql/Schema/Schema.sql is loaded on first connection if the tables are missing
+  (load_schema), and pending sql/Migrations are applied (translate_migration).
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine, URL
+from sqlalchemy.pool import StaticPool
+
+SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "sql", "Schema", "Schema.sql"
+)
+
+# Set to 0 to leave a new local database at the bare Schema.sql version
+AUTO_MIGRATE_ENV = "DB_AUTO_MIGRATE"
+
+_OUTPUT_CLAUSE = re.compile(
+    r"\s+OUTPUT\s+((?:INSERTED|DELETED)\.(?:\w+|\*)(?:\s*,\s*(?:INSERTED|DELETED)\.(?:\w+|\*))*)",
+    re.IGNORECASE,
+)
+_OUTPUT_PREFIX = re.compile(r"\b(?:INSERTED|DELETED)\.", re.IGNORECASE)
+_SELECT_TOP = re.compile(r"\bSELECT\s+(DISTINCT\s+)?TOP\s*(\([^)]*\)|\d+)\s+", re.IGNORECASE)
+
+# (pattern, replacement) pairs applied to every statement in order
+_REWRITES = [
+    (re.compile(r"\[dbo\]\.", re.IGNORECASE), ""),
+    (re.compile(r"\bAS\s+N?VARCHAR\s*\(\s*MAX\s*\)", re.IGNORECASE), "AS TEXT"),
+    (re.compile(r"\bISNULL\s*\(", re.IGNORECASE), "IFNULL("),
+    (re.compile(r"\bSTRING_AGG\s*\(", re.IGNORECASE), "group_concat("),
+]
+
+# T-SQL column types in Schema.sql -> SQLite declared types
+_TYPE_MAP = {
+    "int": "INTEGER",
+    "bigint": "INTEGER",
+    "bit": "INTEGER",
+    "text": "TEXT",
+    "ntext": "TEXT",
+    "datetime": "DATETIME",
+    "datetime2": "DATETIME",
+    "date": "DATE",
+}
+
+
+@lru_cache(maxsize=1024)
+def translate_tsql(sql: str) -> str:
+    """
+    Rewrite the T-SQL constructs used by the services into SQLite syntax.
+
+    Handles [dbo]. prefixes, CAST(... AS NVARCHAR(MAX)), ISNULL(), STRING_AGG(),
+    SELECT TOP (n) (moved to a LIMIT at the end of the same query level) and
+    OUTPUT INSERTED/DELETED clauses (moved to a trailing RETURNING clause).
+    [Bracketed] identifiers are valid SQLite and are left alone.
+
+    Args:
+        sql (str): Statement written for SQL Server
+
+    Returns:
+        str: Equivalent statement for SQLite
+    """
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    sql = _move_top_to_limit(sql)
+
+    match = _OUTPUT_CLAUSE.search(sql)
+    if match:
+        returning = _OUTPUT_PREFIX.sub("", match.group(1))
+        sql = sql[:match.start()] + sql[match.end():]
+        sql = sql.rstrip().rstrip(";") + f" RETURNING {returning}"
+    return sql
+
+
+def _move_top_to_limit(sql: str) -> str:
+    match = _SELECT_TOP.search(sql)
+    while match:
+        # The query ends at the parenthesis closing its level, or at the end of the statement
+        depth, end = 0, len(sql)
+        for i in range(match.end(), len(sql)):
+            if sql[i] == "(":
+                depth += 1
+            elif sql[i] == ")":
+                if depth == 0:
+                    end = i
+                    break
+                depth -= 1
+        limit = match.group(2).strip("() \t")
+        body = sql[match.end():end].rstrip().rstrip(";").rstrip()
+        sql = f"{sql[:match.start()]}SELECT {match.group(1) or ''}{body} LIMIT {limit}{sql[end:]}"
+        match = _SELECT_TOP.search(sql)
+    return sql
+
+
+def _convert_type(match: "re.Match") -> str:
+    name, size = match.group(1).lower(), match.group(2)
+    if name in ("nvarchar", "varchar", "nchar", "char"):
+        if size is None or size.strip("()").lower() == "max":
+            return "TEXT"
+        return f"{name.upper()}{size}"
+    return _TYPE_MAP.get(name, name.upper())
+
+
+def tsql_to_sqlite_ddl(script: str) -> List[str]:
+    """
+    Convert a SQL Server Management Studio table script into SQLite DDL.
+
+    Only CREATE TABLE batches are kept. SET options and the ALTER TABLE foreign
+    key batches are dropped; SQLite cannot add constraints after creation and the
+    local backend does not enforce foreign keys.
+
+    Args:
+        script (str): Contents of a T-SQL script with GO batch separators
+
+    Returns:
+        List[str]: CREATE TABLE IF NOT EXISTS statements
+    """
+    script = re.sub(r"/\*.*?\*/", "", script, flags=re.DOTALL)
+    statements = []
+    for batch in re.split(r"^\s*GO\s*$", script, flags=re.MULTILINE | re.IGNORECASE):
+        batch = batch.strip()
+        if not batch.upper().startswith("CREATE TABLE"):
+            continue
+        batch = re.sub(r"\[dbo\]\.", "", batch, flags=re.IGNORECASE)
+        batch = re.sub(r"\[(\w+)\]\s*(\(\s*(?:\d+|max)\s*\))?(?=\s+(?:NOT\s+)?NULL|\s+IDENTITY)",
+                       _convert_type, batch, flags=re.IGNORECASE)
+        batch = re.sub(r"\bIDENTITY\s*\(\s*\d+\s*,\s*\d+\s*\)", "", batch, flags=re.IGNORECASE)
+        batch = re.sub(r"\b(?:NON)?CLUSTERED\b", "", batch, flags=re.IGNORECASE)
+        batch = re.sub(r"\bWITH\s*\([^)]*\)", "", batch, flags=re.IGNORECASE)
+        batch = re.sub(r"\b(?:TEXTIMAGE_)?ON\s+\[PRIMARY\]", "", batch, flags=re.IGNORECASE)
+        batch = re.sub(r"^CREATE TABLE", "CREATE TABLE IF NOT EXISTS", batch, flags=re.IGNORECASE)
+        statements.append(batch.strip())
+    return statements
+
+
+def translate_migration(batch: str) -> str:
+    """
+    Convert one T-SQL migration batch (table, view or index DDL) into SQLite syntax.
+
+    CREATE TABLE batches go through tsql_to_sqlite_ddl. For the rest,
+    NONCLUSTERED/CLUSTERED and WITH (...) options are dropped, INCLUDE columns
+    are appended to the index key (SQLite has no included columns, so this keeps
+    the index covering), and DROP INDEX ... ON table loses its ON clause.
+    Filtered-index WHERE clauses are valid SQLite partial indexes and are kept.
+
+    Args:
+        batch (str): One GO-separated batch from a migration script
+
+    Returns:
+        str: Equivalent SQLite statement, or "" if the batch is only comments
+    """
+    batch = re.sub(r"/\*.*?\*/", "", batch, flags=re.DOTALL)
+    batch = re.sub(r"--[^\n]*", "", batch).strip()
+    if batch.upper().startswith("CREATE TABLE"):
+        return tsql_to_sqlite_ddl(batch)[0]
+    batch = re.sub(r"\[dbo\]\.", "", batch, flags=re.IGNORECASE)
+    batch = re.sub(r"\b(?:NON)?CLUSTERED\s+", "", batch, flags=re.IGNORECASE)
+    batch = re.sub(r"\bWITH\s*\([^)]*\)", "", batch, flags=re.IGNORECASE)
+    batch = re.sub(r"\)\s*INCLUDE\s*\(([^)]*)\)", r", \1)", batch, flags=re.IGNORECASE)
+    batch = re.sub(r"^(DROP\s+INDEX\s+)(\[?\w+\]?)\s+ON\s+\[?\w+\]?", r"\1IF EXISTS \2", batch,
+                   flags=re.IGNORECASE)
+    return batch.strip()
+
+
+def load_schema(engine: Engine, path: str = SCHEMA_PATH) -> None:
+    """
+    Create the tables from sql/Schema/Schema.sql in a SQLite database.
+
+    Args:
+        engine (Engine): SQLite engine to load into
+        path (str): Path to the UTF-16 encoded schema script
+    """
+    with open(path, encoding="utf-16") as f:
+        statements = tsql_to_sqlite_ddl(f.read())
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+
+def engine_options(url: URL) -> Dict[str, Any]:
+    """
+    create_engine() keyword arguments for a SQLite URL.
+
+    In-memory databases use a single shared connection so every session sees
+    the same data; all SQLite connections may be used from the threadpool.
+    Parameters are bound by name, so translate_tsql may move clauses around.
+    """
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}, "paramstyle": "named"}
+    if url.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    return options
+
+
+def configure_engine(engine: Engine) -> None:
+    """
+    Install T-SQL translation on a SQLite engine, load the schema if needed and
+    apply pending migrations (unless DB_AUTO_MIGRATE=0).
+
+    Args:
+        engine (Engine): Newly created SQLite engine
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout = 5000")
+        if engine.url.database not in (None, "", ":memory:"):
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.close()
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def _translate(conn, cursor, statement, parameters, context, executemany):
+        return translate_tsql(statement), parameters
+
+    if not inspect(engine).has_table("Event"):
+        load_schema(engine)
+    if os.environ.get(AUTO_MIGRATE_ENV, "1") != "0":
+        from .MigrationRunner import MigrationRunner
+        MigrationRunner(engine).migrate()
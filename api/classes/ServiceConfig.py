@@ -0,0 +1,118 @@
+import os
+from dataclasses import dataclass, field
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+
+def _env(name: str, default: str):
+    return field(default_factory=lambda: os.environ.get(name, default))
+
+
+def _env_int(name: str, default: int):
+    return field(default_factory=lambda: int(os.environ.get(name, default)))
+
+
+@dataclass
+class Settings:
+    """
+    Runtime configuration shared by every service.
+    Each field falls back to an environment variable, then to the dev default.
+    """
+    db_server: str = _env("DB_SERVER", "cs4090.database.windows.net,1433")
+    db_name: str = _env("DB_NAME", "CS4090Project")
+    db_username: str = _env("DB_USERNAME", "DevUser")
+    db_password: str = _env("DB_PASSWORD", "CSProject4090!")
+    # SQLAlchemy URL overriding the Azure settings, e.g. sqlite:///local.db
+    database_url: str = _env("DATABASE_URL", "")
+    # Events older than this many days are moved to the archive tables
+    archive_horizon_days: int = _env_int("ARCHIVE_HORIZON_DAYS", 180)
+    # Per-notification read acks are written in batches this often, or sooner once this many wait
+    read_ack_flush_ms: int = _env_int("READ_ACK_FLUSH_MS", 500)
+    read_ack_batch_size: int = _env_int("READ_ACK_BATCH_SIZE", 500)
+    # Most acks held while flushes fail; later ones are dropped (the notification stays unread)
+    read_ack_max_backlog: int = _env_int("READ_ACK_MAX_BACKLOG", 10000)
+    # Seconds between keepalive comments on idle notification streams
+    sse_heartbeat_seconds: int = _env_int("SSE_HEARTBEAT_SECONDS", 15)
+    # Further events for a group within this many seconds of the first are sent as one digest (0: off)
+    notification_digest_seconds: int = _env_int("NOTIFICATION_DIGEST_SECONDS", 60)
+    # Members are reminded this many minutes before an event starts (comma-separated; empty: off)
+    reminder_lead_minutes: str = _env("REMINDER_LEAD_MINUTES", "1440,60")
+    # Minutes ahead whose reminders the scheduler holds in memory
+    reminder_window_minutes: int = _env_int("REMINDER_WINDOW_MINUTES", 60)
+    # Seconds a service trusts its cached copy of GroupAdmin before reloading it
+    admin_cache_seconds: int = _env_int("ADMIN_CACHE_SECONDS", 30)
+    # 1: the Events Service delivers the notification outbox itself; 0: leave it to NotificationWorker.py
+    outbox_inline_worker: int = _env_int("OUTBOX_INLINE_WORKER", 1)
+    # Generated .ics calendar feeds each service process keeps in memory
+    calendar_cache_feeds: int = _env_int("CALENDAR_CACHE_FEEDS", 1000)
+    # Responses smaller than this many bytes are sent uncompressed (-1: no compression)
+    compression_min_bytes: int = _env_int("COMPRESSION_MIN_BYTES", 1024)
+    # Responses at least this large are compressed on the thread pool instead of the event loop
+    compression_offload_bytes: int = _env_int("COMPRESSION_OFFLOAD_BYTES", 32768)
+    # 1: concurrent identical reads share one database call; 0: each runs its own
+    read_coalescing: int = _env_int("READ_COALESCING", 1)
+    # Requests each service works on at once, sized to the connection pool (0: no limit)
+    admission_max_concurrent: int = _env_int("ADMISSION_MAX_CONCURRENT", 12)
+    # Of those, writes (POST/PUT/DELETE) at most; reads always get the rest
+    admission_max_writes: int = _env_int("ADMISSION_MAX_WRITES", 4)
+    # Requests that may wait for a slot per lane; more get 503 at once
+    admission_read_queue: int = _env_int("ADMISSION_READ_QUEUE", 100)
+    admission_write_queue: int = _env_int("ADMISSION_WRITE_QUEUE", 50)
+    # Milliseconds a request may wait for a slot before it gets 503
+    admission_read_deadline_ms: int = _env_int("ADMISSION_READ_DEADLINE_MS", 2000)
+    admission_write_deadline_ms: int = _env_int("ADMISSION_WRITE_DEADLINE_MS", 5000)
+    # Milliseconds each database call may run before it is cancelled (0: no limit)
+    db_statement_timeout_ms: int = _env_int("DB_STATEMENT_TIMEOUT_MS", 5000)
+    # Per-endpoint overrides of that, as handler=ms pairs; whole calendar feeds take longer
+    db_statement_timeouts: str = _env("DB_STATEMENT_TIMEOUTS", "get_user_calendar=15000,get_group_calendar=15000")
+    # Percent of recent database calls failing or slow that opens the circuit breaker (0: no breaker)
+    db_breaker_failure_percent: int = _env_int("DB_BREAKER_FAILURE_PERCENT", 50)
+    # Recent calls that percentage is taken over
+    db_breaker_window: int = _env_int("DB_BREAKER_WINDOW", 20)
+    # Calls running at least this many milliseconds count as slow
+    db_breaker_slow_ms: int = _env_int("DB_BREAKER_SLOW_MS", 2000)
+    # Seconds an open breaker refuses calls before a probe may close it
+    db_breaker_open_seconds: int = _env_int("DB_BREAKER_OPEN_SECONDS", 10)
+    # Seconds between background refreshes of the row counts in /health (0: not reported)
+    health_stats_seconds: int = _env_int("HEALTH_STATS_SECONDS", 60)
+    # Milliseconds the readiness probe's SELECT 1 may take before the service reports not ready
+    health_ping_timeout_ms: int = _env_int("HEALTH_PING_TIMEOUT_MS", 1000)
+
+
+# Column sizes (sql/Migrations/0002_description_nvarchar.sql and Schema.sql);
+# request models validate against these so inserts never truncate
+DESCRIPTION_MAX_LENGTH = 1000
+NAME_MAX_LENGTH = 50
+
+
+# CORS settings shared by every service
+CORS_ALLOW_ORIGINS = [
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:5174",
+    "http://127.0.0.1",
+]
+CORS_ALLOW_ORIGIN_REGEX = r"http://localhost:\d+"
+
+# Pagination cursor for the next page of a list response
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Response headers the frontend is allowed to read
+CORS_EXPOSE_HEADERS = [NEXT_CURSOR_HEADER, "ETag", "Retry-After"]
+
+
+def add_cors(app: FastAPI) -> None:
+    """
+    Attach the shared CORS configuration to a FastAPI app.
+
+    Args:
+        app (FastAPI): The app to configure
+    """
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ALLOW_ORIGINS,
+        allow_origin_regex=CORS_ALLOW_ORIGIN_REGEX,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=CORS_EXPOSE_HEADERS,
+    )
@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Tuple
+from starlette.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical reads share one database call.
+
+    When an admin posts an event, every member's client refetches the same
+    lists at once. A read started with do(name, key, ...) while another with
+    the same name and key is still running waits for that call and gets its
+    result instead of running the query again. Calls run on the thread pool,
+    so the event loop keeps serving other requests while they wait.
+
+    Sharing means a request may get the result of a call that started shortly
+    before it arrived. Keys that include a version stamp (ETag) only ever
+    share a result read at that version. Writes in this process call forget()
+    for reads without one, so requests after the write start a new call.
+    Results are shared between requests and must not be modified.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled (bool): Share calls; when False every read runs its own call
+        """
+        self.enabled = enabled
+        self._calls: Dict[Tuple[str, Hashable], "asyncio.Future"] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, name: str, key: Hashable, fn: Callable[..., Any], *args) -> Any:
+        """
+        fn(*args), or the result of the identical call already in flight.
+
+        Args:
+            name (str): Kind of read, for forget() and the stats
+            key: What makes two reads of this kind identical
+            fn: Blocking function doing the read
+        """
+        counts = self._counts.setdefault(name, {"requests": 0, "executions": 0})
+        counts["requests"] += 1
+        call = self._calls.get((name, key)) if self.enabled else None
+        if call is None:
+            counts["executions"] += 1
+            call = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            if self.enabled:
+                self._calls[(name, key)] = call
+                call.add_done_callback(lambda done, k=(name, key): self._finished(k, done))
+        # A waiter that is cancelled (client gone) leaves the call running for the others
+        return await asyncio.shield(call)
+
+    def _finished(self, key: Tuple[str, Hashable], call: "asyncio.Future") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()  # retrieved even if every waiter was cancelled
+
+    def forget(self, *names: str) -> None:
+        """
+        After a write: reads of these kinds no longer join calls already in
+        flight, which may have read the data before the write.
+        """
+        for key in [key for key in self._calls if key[0] in names]:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per kind of read: requests, database calls made (executions), requests
+        served from another's call (shared) and requests per call (ratio).
+        """
+        return {
+            name: {
+                **counts,
+                "shared": counts["requests"] - counts["executions"],
+                "ratio": round(counts["requests"] / counts["executions"], 3) if counts["executions"] else 0.0,
+            }
+            for name, counts in sorted(self._counts.items())
+        }
@@ -0,0 +1,135 @@
+"""
+Tail latency of the Events Service under overload, with and without admission control.
+
+Offers --rate requests per second for --duration seconds, in process (ASGI),
+to a service whose database is simulated as a pool of --pool connections
+with --db-latency ms per query and a --pool-timeout (the stand-in for the
+30 s Azure SQL connection timeout). Nine in ten requests are reads
+(/events/group/{id}, /events/{id}); the rest are RSVP writes. Read
+coalescing is off so every request reaches the database. Reports, per
+mode, successes and their latency, 503s and how long they took to arrive,
+and failures (pool timeouts).
+
+Run from the project root:
+    python benchmarks/admission_control.py
+    python benchmarks/admission_control.py --rate 1000 --db-latency 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+GROUPS = 20
+EVENTS_PER_GROUP = 20
+
+
+def seed(db) -> None:
+    events = range(1, GROUPS * EVENTS_PER_GROUP + 1)
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES (:u, 'pw', 'F', 'L', 0)",
+         [{"u": f"user{i}"} for i in range(200)]),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:g, :n, 'bench')",
+         [{"g": g, "n": f"Group {g}"} for g in range(1, GROUPS + 1)]),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', 'Session')",
+         [{"id": i} for i in events]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, :g)",
+         [{"id": i, "g": (i - 1) // EVENTS_PER_GROUP + 1} for i in events]),
+    ])
+
+
+def simulate_pool(db, size: int, latency: float, timeout: float) -> None:
+    """Every query holds one of size connections for latency seconds; waiting longer than timeout fails"""
+    pool = threading.BoundedSemaphore(size)
+    for name in ("read_query_to_df", "read_query_to_rows", "execute_query", "execute_transaction"):
+        call = getattr(db, name)
+
+        def pooled(*args, _call=call, **kwargs):
+            if not pool.acquire(timeout=timeout):
+                raise Exception("QueuePool limit reached, connection timed out")
+            try:
+                time.sleep(latency)
+                return _call(*args, **kwargs)
+            finally:
+                pool.release()
+        setattr(db, name, pooled)
+
+
+async def offer(app, rate: float, duration: float, seed_value: int) -> list:
+    import httpx
+
+    rng = random.Random(seed_value)
+    results = []
+
+    async def one(client, at):
+        await asyncio.sleep(max(0.0, at - (time.perf_counter() - start)))
+        sent = time.perf_counter()
+        roll = rng.random()
+        if roll < 0.9:
+            event_id = rng.randint(1, GROUPS * EVENTS_PER_GROUP)
+            url = f"/events/group/{rng.randint(1, GROUPS)}" if roll < 0.6 else f"/events/{event_id}"
+            res = await client.get(url)
+        else:
+            res = await client.post(f"/rsvp/{rng.randint(1, GROUPS * EVENTS_PER_GROUP)}",
+                                    json={"username": f"user{rng.randrange(200)}"})
+        results.append((res.status_code, time.perf_counter() - sent))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, i / rate) for i in range(int(rate * duration))))
+    return results
+
+
+def run(tmp: str, admission: bool, args) -> dict:
+    from classes.ServiceConfig import Settings
+    from classes.SQLManager import DatabaseManager
+    from Event import create_app
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, f'admission_{int(admission)}.db')}")
+    seed(db)
+    simulate_pool(db, args.pool, args.db_latency / 1000, args.pool_timeout)
+    settings = Settings(read_coalescing=0, admission_max_concurrent=args.pool if admission else 0)
+    results = asyncio.run(offer(create_app(settings, db=db), args.rate, args.duration, seed_value=4090))
+    db.engine.dispose()
+
+    statuses = Counter(status for status, _ in results)
+    ok = sorted(seconds * 1000 for status, seconds in results if status < 400)
+    shed = sorted(seconds * 1000 for status, seconds in results if status == 503)
+    pct = lambda values, p: values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+    return {
+        "ok": len(ok), "shed": len(shed), "failed": sum(n for s, n in statuses.items() if s >= 500 and s != 503),
+        "p50": pct(ok, 0.50), "p99": pct(ok, 0.99), "shed_p50": pct(shed, 0.50), "shed_p99": pct(shed, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=400, help="requests offered per second")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--pool", type=int, default=12, help="simulated database connections")
+    parser.add_argument("--db-latency", type=float, default=50.0, help="ms per query")
+    parser.add_argument("--pool-timeout", type=float, default=5.0, help="seconds to wait for a connection")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"off": run(tmp, False, args), "on": run(tmp, True, args)}
+
+    capacity = args.pool / (args.db_latency / 1000) / 2  # about two queries per request
+    print(f"\n{args.rate:g} req/s offered for {args.duration:g}s; the database serves about {capacity:g} req/s\n")
+    print(f"{'admission':<10} {'ok':>7} {'p50 ms':>8} {'p99 ms':>8} {'503':>7} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['ok']:>7,} {r['p50']:>8.0f} {r['p99']:>8.0f} "
+              f"{r['shed']:>7,} {r['shed_p50']:>8.0f} {r['shed_p99']:>8.0f} {r['failed']:>7,}")
+    print("\n503s wait out their deadline only when queued writes keep losing slots to reads")
+
+
+if __name__ == "__main__":
+    main()
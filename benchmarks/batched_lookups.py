@@ -0,0 +1,81 @@
+"""
+Database calls and time to load a list of events one by one or in one batch.
+
+A page showing --events events with their groups either calls
+GET /events/{id} once per event (two queries each: the event and its groups)
+or sends every ID to POST /events/by_id/, whose request-scoped loaders read
+all events in one query and all their groups in another. Requests go
+through the Events Service in process (ASGI), against a seeded SQLite
+database; --db-latency adds a round trip per query as against Azure SQL.
+
+Run from the project root:
+    python benchmarks/batched_lookups.py
+    python benchmarks/batched_lookups.py --events 200 --db-latency 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+from read_coalescing import CountingDB, seed
+
+
+async def per_id(client, event_ids: list) -> int:
+    responses = await asyncio.gather(*(client.get(f"/events/{event_id}") for event_id in event_ids))
+    for res in responses:
+        res.raise_for_status()
+    return len(responses)
+
+
+async def batched(client, event_ids: list) -> int:
+    res = await client.post("/events/by_id/", json=event_ids)
+    res.raise_for_status()
+    return len(res.json())
+
+
+def run(tmp: str, mode: str, args) -> dict:
+    import httpx
+    from classes.SQLManager import DatabaseManager
+    from Event import create_app
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, f'lookups_{mode}.db')}")
+    seed(db, args.events)
+    counting = CountingDB(db, args.db_latency / 1000)
+    counting.wrap("read_query_to_rows")
+    app = create_app(db=db)
+    load = per_id if mode == "per id" else batched
+
+    async def page():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            return await load(client, list(range(1, args.events + 1)))
+
+    start = time.perf_counter()
+    events = asyncio.run(page())
+    elapsed = time.perf_counter() - start
+    db.engine.dispose()
+    return {"events": events, "calls": counting.calls, "ms": elapsed * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50, help="events on the page")
+    parser.add_argument("--db-latency", type=float, default=10.0, help="ms added to each query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {mode: run(tmp, mode, args) for mode in ("per id", "batched")}
+
+    print(f"\n{args.events} events with their groups, {args.db_latency:g} ms per query\n")
+    print(f"{'lookup':<9} {'events':>7} {'db calls':>9} {'total ms':>9}")
+    for name, r in results.items():
+        print(f"{name:<9} {r['events']:>7,} {r['calls']:>9,} {r['ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
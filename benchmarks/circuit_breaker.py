@@ -0,0 +1,144 @@
+"""
+Request latency and database calls during a database outage, with and
+without the circuit breaker.
+
+--clients clients poll /events/group/{id} in a loop through the Events
+Service in process (ASGI), against a seeded SQLite database. For
+--outage seconds in the middle of the run every statement hangs until its
+statement timeout (--timeout) and then fails, as when Azure SQL stops
+answering. Reports, per phase, the requests answered (by the phase they
+ended in), how (200, 503 or 500), p50/p99 latency and the database calls
+attempted, and how long after the outage the first request succeeded again.
+
+Run from the project root:
+    python benchmarks/circuit_breaker.py
+    python benchmarks/circuit_breaker.py --clients 50 --outage 10 --timeout 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+
+def seed(db, groups: int) -> None:
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:id, 'Bench', 'breaker benchmark')",
+         [{"id": i} for i in range(1, groups + 1)]),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', 'Session')",
+         [{"id": i} for i in range(1, groups + 1)]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, :id)", [{"id": i} for i in range(1, groups + 1)]),
+    ])
+
+
+class Outage:
+    """While on, every statement hangs for the timeout and then fails"""
+
+    def __init__(self, engine, hang: float):
+        from sqlalchemy import event, exc
+
+        self.on, self.calls = False, 0
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def hang_up(conn, cursor, statement, parameters, context, executemany):
+            if self.on:
+                self.calls += 1
+                time.sleep(hang)
+                raise exc.OperationalError(statement, parameters, Exception("Query timeout expired"))
+
+
+def percentile(values: list, q: float) -> float:
+    return sorted(values)[int(len(values) * q)] * 1000 if values else 0.0
+
+
+async def drive(app, outage: Outage, args) -> dict:
+    import httpx
+
+    phases = {name: {"codes": {}, "latencies": [], "calls": 0} for name in ("before", "outage", "after")}
+    phase, recovered_at = "before", None
+
+    async def client_loop(client, group_id):
+        nonlocal recovered_at
+        while phase != "done":
+            start = time.perf_counter()
+            res = await client.get(f"/events/group/{group_id}")
+            current = phase  # counted in the phase it ended in
+            if current == "done":
+                break
+            stats = phases[current]
+            stats["codes"][res.status_code] = stats["codes"].get(res.status_code, 0) + 1
+            stats["latencies"].append(time.perf_counter() - start)
+            if current == "after" and res.status_code == 200 and recovered_at is None:
+                recovered_at = time.perf_counter()
+            if res.status_code != 200:
+                await asyncio.sleep(args.backoff / 1000)  # clients back off a little on errors
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 timeout=None) as client:
+        clients = [asyncio.ensure_future(client_loop(client, i % args.groups + 1)) for i in range(args.clients)]
+        for name, seconds in (("before", args.warmup), ("outage", args.outage), ("after", args.recovery)):
+            calls = outage.calls
+            phase = name
+            outage.on = name == "outage"
+            if name == "after":
+                ended = time.perf_counter()
+            await asyncio.sleep(seconds)
+            phases[name]["calls"] = outage.calls - calls
+        phase = "done"
+        await asyncio.gather(*clients)
+    phases["recovery"] = (recovered_at - ended) if recovered_at else None
+    return phases
+
+
+def run(tmp: str, breaker: bool, args) -> dict:
+    from classes.ServiceConfig import Settings
+    from classes.SQLManager import DatabaseManager
+    from Event import create_app
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, f'breaker_{int(breaker)}.db')}",
+                         statement_timeout_ms=args.timeout)
+    seed(db, args.groups)
+    outage = Outage(db.engine, args.timeout / 1000)
+    settings = Settings(read_coalescing=0, admission_max_concurrent=0,
+                        db_breaker_failure_percent=50 if breaker else 0, db_breaker_open_seconds=args.open_seconds)
+    phases = asyncio.run(drive(create_app(settings, db=db), outage, args))
+    db.engine.dispose()
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds before the outage")
+    parser.add_argument("--outage", type=float, default=6.0, help="seconds the database hangs")
+    parser.add_argument("--recovery", type=float, default=4.0, help="seconds after the outage")
+    parser.add_argument("--timeout", type=int, default=1000, help="statement timeout, ms")
+    parser.add_argument("--open-seconds", type=int, default=2, help="DB_BREAKER_OPEN_SECONDS")
+    parser.add_argument("--backoff", type=float, default=100.0, help="ms a client waits after an error")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"off": run(tmp, False, args), "on": run(tmp, True, args)}
+
+    print(f"\n{args.clients} clients; the database hangs {args.timeout} ms per statement "
+          f"for {args.outage:g} s\n")
+    print(f"{'breaker':<8} {'phase':<8} {'200':>7} {'503':>7} {'500':>7} {'p50 ms':>8} {'p99 ms':>8} {'db calls':>9}")
+    for name, phases in results.items():
+        for phase in ("before", "outage", "after"):
+            p = phases[phase]
+            codes = p["codes"]
+            print(f"{name:<8} {phase:<8} {codes.get(200, 0):>7,} {codes.get(503, 0):>7,} {codes.get(500, 0):>7,} "
+                  f"{percentile(p['latencies'], 0.5):>8.1f} {percentile(p['latencies'], 0.99):>8.1f} "
+                  f"{p['calls'] if phase == 'outage' else '':>9}")
+        recovery = phases["recovery"]
+        print(f"{name:<8} first 200 after the outage: "
+              f"{'never' if recovery is None else f'{recovery * 1000:.0f} ms'}\n")
+
+
+if __name__ == "__main__":
+    main()
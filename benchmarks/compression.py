@@ -0,0 +1,103 @@
+"""
+Bytes on the wire and CPU cost of response compression on realistic payloads.
+
+Seeds a SQLite database with the synthetic data generator, fetches the
+largest list responses the frontend loads through the composed app
+(uncompressed), and reports for each the size and the compression time per
+response for gzip at levels 1, 6 and 9 and, when the brotli package is
+installed, brotli at qualities 4 and 11. The services use gzip 6 / brotli 4
+(classes/Compression.py).
+
+Run from the project root:
+    python benchmarks/compression.py
+    python benchmarks/compression.py --users 20000 --groups 1000 --repeat 50
+"""
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+
+def payloads(client, db) -> dict:
+    """Uncompressed bodies of the heaviest list responses in the seeded data"""
+    group_ids = client.get("/groups/").json()
+    busiest = db.read_query_to_df("""
+        SELECT TOP 1 gm.username FROM GroupMember gm GROUP BY gm.username ORDER BY COUNT(*) DESC
+    """).iloc[0]["username"]
+    biggest = int(db.read_query_to_df("""
+        SELECT TOP 1 groupID FROM GroupToEvent GROUP BY groupID ORDER BY COUNT(*) DESC
+    """).iloc[0]["groupID"])
+    identity = {"Accept-Encoding": "identity"}
+    requests = {
+        "group directory": ("POST", "/groups/by_id/", group_ids),
+        f"events, group {biggest}": ("GET", f"/events/group/{biggest}", None),
+        f"events, {busiest}": ("GET", f"/events/user/{busiest}", None),
+        "notifications x200": ("GET", f"/notifications/{busiest}?limit=200&include_archived=true", None),
+        "calendar.ics": ("GET", f"/events/user/{busiest}/calendar.ics", None),
+    }
+    bodies = {}
+    for name, (method, url, body) in requests.items():
+        res = client.request(method, url, json=body, headers=identity)
+        res.raise_for_status()
+        bodies[name] = res.content
+    return bodies
+
+
+def encoders() -> dict:
+    codecs = {f"gzip-{level}": (lambda level: lambda b: gzip.compress(b, compresslevel=level, mtime=0))(level)
+              for level in (1, 6, 9)}
+    try:
+        import brotli
+    except ImportError:
+        return codecs
+    for quality in (4, 11):
+        codecs[f"br-{quality}"] = (lambda quality: lambda b: brotli.compress(b, quality=quality))(quality)
+    return codecs
+
+
+def timed(fn, body: bytes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(body)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--groups", type=int, default=300)
+    parser.add_argument("--events-per-group", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    sys.path.insert(0, os.path.join(ROOT, "sql", "testSQLConnection"))
+    from DataGenerator import GeneratorConfig, generate, load
+    from classes.ServiceConfig import Settings
+    from classes.SQLManager import DatabaseManager
+    from Main import create_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, 'compression.db')}")
+        config = GeneratorConfig(users=args.users, groups=args.groups, events_per_group=args.events_per_group)
+        load(db, generate(config), progress=False)
+        with TestClient(create_app(Settings(compression_min_bytes=-1), db=db)) as client:
+            bodies = payloads(client, db)
+        db.engine.dispose()
+
+    codecs = encoders()
+    print(f"\n{'':<22} {'bytes':>10}" + "".join(f" {name:>17}" for name in codecs))
+    print(f"{'':<22} {'':>10}" + "".join(f" {'bytes      ms':>17}" for _ in codecs))
+    for name, body in bodies.items():
+        cells = "".join(f" {len(fn(body)):>10,} {timed(fn, body, args.repeat):>6.2f}" for fn in codecs.values())
+        print(f"{name:<22} {len(body):>10,}{cells}")
+    print("\nms: compression time per response on one core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Feed-query latency and I/O before and after migration 0002 (TEXT -> NVARCHAR).
+
+"Before" runs the feed queries as they were written for TEXT columns, with
+CAST(... AS NVARCHAR(MAX)); "after" applies 0002_description_nvarchar and runs
+them as the services now issue them, without the casts.
+
+On SQL Server, logical and LOB logical reads are collected from
+SET STATISTICS IO. The database must be at version 1 (python api/Migrate.py
+--target 1); the benchmark applies version 2 itself.
+
+Run from the project root:
+    python benchmarks/description_columns.py --local        # generated SQLite database (latency only)
+    python benchmarks/description_columns.py                # configured database (DB_* / DATABASE_URL)
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from query_timings import ROOT, seed_local  # noqa: E402
+
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+_CAST = "CAST({0}description AS NVARCHAR(MAX)) as description"
+
+# name -> (query with {desc} placeholders for the description column, params key)
+FEEDS = {
+    "events for user": ("""
+        SELECT DISTINCT e.eventID, e.date, {desc:e.}
+        FROM [Event] e
+        JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        JOIN GroupMember gm ON gte.groupID = gm.groupID
+        WHERE gm.username = :username
+        ORDER BY e.date
+    """, "busiest_user"),
+    "events for group": ("""
+        SELECT e.eventID, e.date, {desc:e.}
+        FROM [Event] e
+        JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        WHERE gte.groupID = :group_id
+        ORDER BY e.date
+    """, "biggest_group"),
+    "event details": ("""
+        SELECT eventID, date, {desc:}
+        FROM [Event]
+        WHERE eventID = :event_id
+    """, "first_event"),
+    "groups for user": ("""
+        SELECT g.groupID, g.groupName, {desc:g.}
+        FROM [Group] g
+        JOIN GroupMember gm ON g.groupID = gm.groupID
+        WHERE gm.username = :username
+    """, "busiest_user"),
+    "notifications for user": ("""
+        SELECT username, {desc:}, eventID, isRead, notificationTimestamp, eventDate
+        FROM Notifications
+        WHERE username = :username
+        ORDER BY notificationTimestamp DESC
+    """, "busiest_user"),
+}
+
+_PARAM_NAMES = {"busiest_user": "username", "biggest_group": "group_id", "first_event": "event_id"}
+_IO_LINE = re.compile(r"logical reads (\d+).*?lob logical reads (\d+)", re.IGNORECASE)
+
+
+def render(template: str, legacy: bool) -> str:
+    def column(match):
+        prefix = match.group(1)
+        return _CAST.format(prefix) if legacy else f"{prefix}description"
+    return re.sub(r"\{desc:(\w*\.?)\}", column, template)
+
+
+def feed_queries(legacy: bool) -> dict:
+    return {
+        name: (render(sql, legacy), lambda p, key=key: {_PARAM_NAMES[key]: p[key]})
+        for name, (sql, key) in FEEDS.items()
+    }
+
+
+def io_stats(db, queries: dict, params: dict) -> dict:
+    """
+    (logical reads, LOB logical reads) per query from SET STATISTICS IO (SQL Server only).
+    """
+    stats = {}
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SET STATISTICS IO ON")
+        for name, (sql, make_params) in queries.items():
+            bound = make_params(params)
+            names = re.findall(r":(\w+)", sql)
+            cursor.execute(re.sub(r":(\w+)", "?", sql), [bound[n] for n in names])
+            cursor.fetchall()
+            messages = list(cursor.messages)
+            while cursor.nextset():
+                messages += cursor.messages
+            reads = [tuple(map(int, m.groups())) for _, text in messages for m in [_IO_LINE.search(text)] if m]
+            stats[name] = (sum(r[0] for r in reads), sum(r[1] for r in reads))
+        cursor.execute("SET STATISTICS IO OFF")
+    finally:
+        raw.close()
+    return stats
+
+
+def timed(db, queries: dict, params: dict, repeat: int) -> dict:
+    from sqlalchemy import text
+
+    timings = {}
+    with db.engine.connect() as conn:
+        for name, (sql, make_params) in queries.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(text(sql), make_params(params)).fetchall()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = (statistics.median(samples), sorted(samples)[int(len(samples) * 0.95) - 1])
+    return timings
+
+
+def measure(db, params: dict, legacy: bool, repeat: int) -> dict:
+    queries = feed_queries(legacy)
+    result = {"latency": timed(db, queries, params, repeat)}
+    if db.engine.dialect.name == "mssql":
+        result["io"] = io_stats(db, queries, params)
+    return result
+
+
+def live_params(db) -> dict:
+    """Pick the busiest user and biggest group from an existing database."""
+    df = db.read_query_to_df("""
+        SELECT TOP 1 username FROM GroupMember GROUP BY username ORDER BY COUNT(*) DESC
+    """)
+    busiest_user = df.iloc[0]["username"]
+    df = db.read_query_to_df("""
+        SELECT TOP 1 groupID FROM GroupToEvent GROUP BY groupID ORDER BY COUNT(*) DESC
+    """)
+    biggest_group = int(df.iloc[0]["groupID"])
+    df = db.read_query_to_df("SELECT MIN(eventID) as eventID FROM [Event]")
+    return {"busiest_user": busiest_user, "biggest_group": biggest_group, "first_event": int(df.iloc[0]["eventID"])}
+
+
+def report(before: dict, after: dict) -> None:
+    print(f"\n{'feed query':<26} {'p50 before':>11} {'p50 after':>10} {'p95 before':>11} {'p95 after':>10}"
+          f" {'reads before':>13} {'reads after':>12} {'LOB before':>11} {'LOB after':>10}")
+    for name in FEEDS:
+        (b50, b95), (a50, a95) = before["latency"][name], after["latency"][name]
+        line = f"{name:<26} {b50:>11.2f} {a50:>10.2f} {b95:>11.2f} {a95:>10.2f}"
+        if "io" in before:
+            (br, bl), (ar, al) = before["io"][name], after["io"][name]
+            line += f" {br:>13} {ar:>12} {bl:>11} {al:>10}"
+        else:
+            line += f" {'n/a':>13} {'n/a':>12} {'n/a':>11} {'n/a':>10}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--local", action="store_true", help="use a generated SQLite database")
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=2_500)
+    parser.add_argument("--seed", type=int, default=4090)
+    parser.add_argument("--repeat", type=int, default=25)
+    args = parser.parse_args()
+
+    from classes.MigrationRunner import MigrationRunner
+    from classes.SQLManager import DatabaseManager
+    from classes.ServiceConfig import Settings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.local:
+            db, params = seed_local(tmp, args.users, args.groups, args.seed, version=1)
+        else:
+            db = DatabaseManager.from_settings(Settings())
+            params = live_params(db)
+
+        runner = MigrationRunner(db.engine)
+        if runner.current_version() != 1:
+            sys.exit(f"Database is at version {runner.current_version()}; the benchmark needs version 1")
+
+        before = measure(db, params, legacy=True, repeat=args.repeat)
+        start = time.perf_counter()
+        runner.migrate(target=2)
+        print(f"0002_description_nvarchar applied in {time.perf_counter() - start:.1f}s")
+        after = measure(db, params, legacy=False, repeat=args.repeat)
+
+    report(before, after)
+    if db.engine.dialect.name == "sqlite":
+        print("\nSQLite has no LOB storage; only the per-row CAST is removed here. Run against SQL Server for I/O.")
+
+
+if __name__ == "__main__":
+    main()
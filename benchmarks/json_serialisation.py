@@ -0,0 +1,102 @@
+"""
+Serialisation cost of the hot list endpoints before and after FastJSON.
+
+Seeds a SQLite database with --rows events and notifications and times, per
+request-sized list, the path each endpoint used to take (read into a
+DataFrame, convert to records, validate every row against the response
+model, encode with json) against the current one (read plain rows, shape
+them with RowEncoder, encode with orjson when installed). Both produce the
+same JSON, which is checked first.
+
+Run from the project root:
+    python benchmarks/json_serialisation.py
+    python benchmarks/json_serialisation.py --rows 1000 --repeat 200
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+EVENTS = "SELECT e.eventID, e.date, e.description FROM [Event] e ORDER BY e.date"
+NOTIFICATIONS = "SELECT * FROM Notifications WHERE username = 'bench' ORDER BY notificationTimestamp DESC"
+
+
+def seed(db, rows: int) -> None:
+    start = datetime(2026, 1, 1, 18)
+    db.execute_transaction([
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, :date, :d)",
+         [{"id": i, "date": start + timedelta(hours=i), "d": f"Session {i} at 6pm"} for i in range(1, rows + 1)]),
+        ("""INSERT INTO Notifications (username, description, eventID, notificationTimestamp, eventDate, isRead, groupID)
+            VALUES ('bench', :d, :id, :ts, :date, :r, 1)""",
+         [{"d": f"New event: Session {i}", "id": i, "ts": start - timedelta(minutes=i),
+           "date": start + timedelta(hours=i), "r": i % 2} for i in range(1, rows + 1)]),
+    ])
+
+
+def old_path(db, sql: str, adapter, event_dates: bool) -> bytes:
+    df = db.read_query_to_df(sql)
+    if event_dates:
+        rows = df.to_dict("records")
+        for row in rows:
+            if isinstance(row["date"], datetime):
+                row["date"] = row["date"].isoformat()
+    else:
+        rows = df.astype(object).where(df.notna(), None).to_dict("records")
+    # What FastAPI does with a returned list and a response model
+    content = adapter.dump_python(adapter.validate_python(rows), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def new_path(db, sql: str, encoder) -> bytes:
+    from classes.FastJSON import dumps
+    return dumps(encoder.encode(db.read_query_to_rows(sql)))
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from pydantic import TypeAdapter
+    from classes.FastJSON import RowEncoder, dumps, orjson
+    from classes.SQLManager import DatabaseManager
+    from Event import EventResponse, NotificationResponse
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, 'json.db')}")
+        seed(db, args.rows)
+        cases = [
+            ("events", EVENTS, EventResponse, True),
+            ("notifications", NOTIFICATIONS, NotificationResponse, False),
+        ]
+        print(f"\n{args.rows} rows per response, encoder: {'orjson' if orjson else 'json'}\n")
+        print(f"{'':<14} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'encode-only ms':>15}")
+        for name, sql, model, event_dates in cases:
+            adapter, encoder = TypeAdapter(List[model]), RowEncoder(model)
+            assert json.loads(old_path(db, sql, adapter, event_dates)) == json.loads(new_path(db, sql, encoder))
+            before = timed(lambda: old_path(db, sql, adapter, event_dates), args.repeat)
+            after = timed(lambda: new_path(db, sql, encoder), args.repeat)
+            rows = db.read_query_to_rows(sql)
+            encode = timed(lambda: dumps(encoder.encode(rows)), args.repeat)
+            print(f"{name:<14} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x {encode:>15.2f}")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+End-to-end load test for the User, Event and Group services.
+
+Seeds a local SQLite database, launches the services with uvicorn, and drives a
+weighted mix of realistic traffic from concurrent virtual users:
+
+    login           POST /login
+    dashboard       GET /events/user/{u}, /groups/user/{u}, /notifications/{u}
+    event_burst     an admin posts several events to their group back to back
+    rsvp_rush       many users RSVP to the same newly created event
+    notif_poll      GET /notifications/{u}
+
+Throughput and p50/p95/p99 latency are reported per endpoint. Results can be
+saved as a baseline and later runs compared against it; the script exits with
+status 1 when a threshold is exceeded.
+
+Run from the project root:
+    python benchmarks/load_test.py --profile mixed --duration 30
+    python benchmarks/load_test.py --profile mixed --save-baseline
+    python benchmarks/load_test.py --profile mixed --compare
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --users 200   # existing server, no seeding
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "api")
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+
+# Relative slack allowed against the baseline before a run counts as a regression
+DEFAULT_THRESHOLDS = {
+    "p95_increase": 0.25,
+    "p99_increase": 0.50,
+    "throughput_drop": 0.20,
+    "error_rate": 0.01,
+}
+
+# Scenario weights per traffic profile
+PROFILES = {
+    "mixed": {"login": 1, "dashboard": 6, "notif_poll": 8, "event_burst": 1, "rsvp_rush": 2},
+    "read_heavy": {"login": 1, "dashboard": 10, "notif_poll": 10},
+    "event_burst": {"event_burst": 6, "dashboard": 4, "notif_poll": 4},
+    "rsvp_rush": {"rsvp_rush": 8, "dashboard": 2},
+}
+
+
+# Seeding
+
+def seed_database(url: str, users: int, groups: int, events_per_group: int, seed: int) -> dict:
+    """
+    Populate a fresh local database with the synthetic data generator and
+    return the identities the scenarios use.
+    """
+    sys.path.insert(0, os.path.join(ROOT, "sql", "testSQLConnection"))
+    from DataGenerator import GeneratorConfig, generate, load
+    from classes.SQLManager import DatabaseManager
+
+    config = GeneratorConfig(users=users, groups=groups, events_per_group=events_per_group, seed=seed)
+    tables = generate(config)
+    load(DatabaseManager(url=url), tables, progress=False)
+    return identities_from(tables["User"], tables["GroupAdmin"], tables["Event"]["eventID"])
+
+
+def identities_from(users, admins, event_ids) -> dict:
+    return {
+        "usernames": list(users["username"]),
+        "passwords": dict(zip(users["username"], users["password"])),
+        "admins": dict(zip(admins["groupID"].astype(int), admins["username"])),
+        "event_ids": [int(e) for e in event_ids],
+    }
+
+
+def load_identities(users: int, groups: int) -> dict:
+    """
+    Identities for a server seeded elsewhere with DataGenerator defaults (--url mode).
+    Usernames and passwords follow the generator's row-index naming.
+    """
+    import pandas as pd
+    ids = range(users)
+    return identities_from(
+        pd.DataFrame({"username": [f"user{i:07d}" for i in ids], "password": [f"pw{i}" for i in ids]}),
+        pd.DataFrame({"groupID": list(range(1, groups + 1)), "username": [""] * groups}),
+        range(1, groups + 1),
+    )
+
+
+# Measurement
+
+class Recorder:
+    """Collects latency samples and errors per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str,
+                      expected=(200, 201), **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            res = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            self.latencies[label].append(time.perf_counter() - start)
+            return None
+        self.latencies[label].append(time.perf_counter() - start)
+        if res.status_code not in expected:
+            self.errors[label] += 1
+        return res
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, duration: float) -> Dict[str, dict]:
+    """Per-endpoint throughput, error rate and latency percentiles (ms)."""
+    summary = {}
+    for label, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        summary[label] = {
+            "count": len(samples),
+            "rps": len(samples) / duration,
+            "error_rate": recorder.errors[label] / len(samples),
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    return summary
+
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict], thresholds: Dict[str, float]) -> List[str]:
+    """
+    Return a description of every threshold the run exceeds relative to the baseline.
+    Endpoints missing from either side are ignored.
+    """
+    regressions = []
+    for label, base in baseline.items():
+        current = summary.get(label)
+        if current is None:
+            continue
+        for metric, key in (("p95_ms", "p95_increase"), ("p99_ms", "p99_increase")):
+            limit = base[metric] * (1 + thresholds[key])
+            if current[metric] > limit:
+                regressions.append(f"{label}: {metric} {current[metric]:.1f} > {limit:.1f}")
+        floor = base["rps"] * (1 - thresholds["throughput_drop"])
+        if current["rps"] < floor:
+            regressions.append(f"{label}: rps {current['rps']:.1f} < {floor:.1f}")
+        if current["error_rate"] > max(base["error_rate"], thresholds["error_rate"]):
+            regressions.append(f"{label}: error rate {current['error_rate']:.2%}")
+    return regressions
+
+
+# Scenarios
+
+class Scenarios:
+    def __init__(self, ids: dict, rng: random.Random, recorder: Recorder):
+        self.ids = ids
+        self.rng = rng
+        self.rec = recorder
+
+    def _user(self) -> str:
+        # Skew traffic towards a hot set of users, as real usage does
+        usernames = self.ids["usernames"]
+        return usernames[min(int(self.rng.paretovariate(1.2)) - 1, len(usernames) - 1)] \
+            if self.rng.random() < 0.5 else self.rng.choice(usernames)
+
+    async def login(self, client):
+        u = self._user()
+        await self.rec.request(client, "POST /login", "POST", "/login",
+                               json={"username": u, "password": self.ids["passwords"][u]})
+
+    async def dashboard(self, client):
+        u = self._user()
+        await asyncio.gather(
+            self.rec.request(client, "GET /events/user/{username}", "GET", f"/events/user/{u}"),
+            self.rec.request(client, "GET /groups/user/{username}", "GET", f"/groups/user/{u}"),
+            self.rec.request(client, "GET /notifications/{username}", "GET", f"/notifications/{u}"),
+        )
+
+    async def notif_poll(self, client):
+        await self.rec.request(client, "GET /notifications/{username}", "GET", f"/notifications/{self._user()}")
+
+    async def event_burst(self, client):
+        group_id = self.rng.choice(list(self.ids["admins"]))
+        for i in range(5):
+            date = (datetime(2026, 6, 1) + timedelta(days=self.rng.randint(0, 180))).isoformat()
+            res = await self.rec.request(client, "POST /events/group/{group_id}", "POST", f"/events/group/{group_id}",
+                                         json={"date": date, "description": f"Burst event {i}"})
+            if res is not None and res.status_code == 201:
+                self.ids["event_ids"].append(res.json()["eventID"])
+
+    async def rsvp_rush(self, client):
+        event_id = self.ids["event_ids"][-1]
+        users = self.rng.sample(self.ids["usernames"], k=min(20, len(self.ids["usernames"])))
+        await asyncio.gather(*(
+            self.rec.request(client, "POST /rsvp/{event_id}", "POST", f"/rsvp/{event_id}",
+                             expected=(201, 409), json={"username": u})
+            for u in users
+        ))
+
+
+async def run_load(base_url: str, ids: dict, profile: str, users: int, duration: float,
+                   think_time: float, seed: int) -> Recorder:
+    recorder = Recorder()
+    rng = random.Random(seed)
+    scenarios = Scenarios(ids, rng, recorder)
+    names = list(PROFILES[profile])
+    weights = [PROFILES[profile][n] for n in names]
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def virtual_user():
+            while time.perf_counter() < stop_at:
+                await getattr(scenarios, rng.choices(names, weights)[0])(client)
+                if think_time:
+                    await asyncio.sleep(rng.expovariate(1 / think_time))
+
+        await asyncio.gather(*(virtual_user() for _ in range(users)))
+    return recorder
+
+
+# Server management
+
+def launch(db_url: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=db_url)
+    cmd = [sys.executable, "-m", "uvicorn", "Main:app", "--port", str(port), "--log-level", "warning",
+           "--no-access-log"]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    return subprocess.Popen(cmd, cwd=API_DIR, env=env)
+
+
+async def wait_until_up(base_url: str, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(base_url + "/health")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise TimeoutError(f"{base_url} did not come up within {timeout}s")
+
+
+def print_report(summary: Dict[str, dict], duration: float) -> None:
+    total = sum(s["count"] for s in summary.values())
+    print(f"\n{'endpoint':<36} {'count':>7} {'req/s':>8} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, s in summary.items():
+        print(f"{label:<36} {s['count']:>7} {s['rps']:>8.1f} {s['error_rate'] * 100:>6.2f} "
+              f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}")
+    print(f"{'TOTAL':<36} {total:>7} {total / duration:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--think-time", type=float, default=0.05, help="mean pause between scenarios (s)")
+    parser.add_argument("--seed", type=int, default=4090)
+    parser.add_argument("--seed-users", type=int, default=1000)
+    parser.add_argument("--seed-groups", type=int, default=50)
+    parser.add_argument("--seed-events", type=float, default=20, help="mean events per group")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--url", help="target an already running server instead of launching one")
+    parser.add_argument("--output", help="write the JSON summary here")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail if the run regresses against the baseline")
+    args = parser.parse_args()
+
+    proc = None
+    tmpdir = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+        ids = load_identities(args.seed_users, args.seed_groups)
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        db_url = f"sqlite:///{os.path.join(tmpdir.name, 'loadtest.db')}"
+        print(f"Seeding {args.seed_users} users and {args.seed_groups} groups ...")
+        ids = seed_database(db_url, args.seed_users, args.seed_groups, args.seed_events, args.seed)
+        base_url = f"http://127.0.0.1:{args.port}"
+        proc = launch(db_url, args.port, args.workers)
+
+    try:
+        asyncio.run(wait_until_up(base_url))
+        print(f"Running profile '{args.profile}' with {args.users} users for {args.duration:.0f}s ...")
+        recorder = asyncio.run(run_load(base_url, ids, args.profile, args.users, args.duration,
+                                        args.think_time, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    summary = summarize(recorder, args.duration)
+    print_report(summary, args.duration)
+
+    result = {
+        "profile": args.profile,
+        "users": args.users,
+        "duration": args.duration,
+        "workers": args.workers,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "endpoints": summary,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    baseline_path = os.path.join(BASELINE_DIR, f"{args.profile}.json")
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+
+    if args.compare:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline["endpoints"], DEFAULT_THRESHOLDS)
+        if regressions:
+            print("\nREGRESSIONS against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Write amplification of notification fan-out with and without digests.
+
+Posts --events events to one group of --members members through the
+notification path used by POST /events/group/{id}, once with coalescing off
+and once with a digest window, and reports the rows written, the inbox size
+per member, and the time spent writing.
+
+Run from the project root:
+    python benchmarks/notification_digests.py
+    python benchmarks/notification_digests.py --members 2000 --events 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+
+def run(tmp: str, members: int, events: int, window: float) -> dict:
+    from classes.NotificationCoalescer import NotificationCoalescer
+    from classes.NotificationManager import NotificationManager
+    from classes.SQLManager import DatabaseManager
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, f'digests_{window:g}.db')}")
+    usernames = [f"member{i:05d}" for i in range(members)]
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Bench', 'digest benchmark')", None),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES (:u, 1)", {"u": usernames[0]}),
+    ])
+    coalescer = NotificationCoalescer(NotificationManager(db=db), window=window)
+
+    start = time.perf_counter()
+    for i in range(events):
+        coalescer.notify(1, "Bench", usernames, f"Session {i + 1}", i + 1, datetime(2026, 1, 1) + timedelta(days=i))
+    coalescer.flush(force=True)
+    elapsed = time.perf_counter() - start
+
+    rows = int(db.read_query_to_df("SELECT COUNT(*) as total FROM Notifications").iloc[0]["total"])
+    db.engine.dispose()
+    return {"rows": rows, "inbox": rows / members, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--window", type=float, default=60.0, help="digest window in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        without = run(tmp, args.members, args.events, 0)
+        with_digest = run(tmp, args.members, args.events, args.window)
+
+    print(f"\n{args.events} events to a group of {args.members} members\n")
+    print(f"{'':<14} {'rows written':>13} {'inbox/member':>13} {'write s':>9}")
+    for name, r in (("per event", without), ("with digests", with_digest)):
+        print(f"{name:<14} {r['rows']:>13,} {r['inbox']:>13.1f} {r['seconds']:>9.2f}")
+    print(f"\nRows written reduced {without['rows'] / with_digest['rows']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
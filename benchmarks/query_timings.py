@@ -0,0 +1,168 @@
+"""
+Before/after timings of the hot queries across a schema migration.
+
+Builds a local SQLite database at the bare Schema.sql version, fills it with
+the synthetic data generator, times each hot query, applies migrations up to
+--target, and times them again. Results are printed and can be saved.
+
+Run from the project root:
+    python benchmarks/query_timings.py
+    python benchmarks/query_timings.py --users 200000 --groups 10000 --save
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.insert(0, os.path.join(ROOT, "sql", "testSQLConnection"))
+
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "baselines", "query_timings.json")
+
+# name -> (SQL as issued by the services, function(tables) -> params)
+QUERIES = {
+    "events for user (Event.get_user_events)": ("""
+        SELECT DISTINCT e.eventID, e.date, e.description
+        FROM [Event] e
+        JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        JOIN GroupMember gm ON gte.groupID = gm.groupID
+        WHERE gm.username = :username
+        ORDER BY e.date
+    """, lambda t: {"username": t["busiest_user"]}),
+    "events for group (Event.get_group_events)": ("""
+        SELECT e.eventID, e.date, e.description
+        FROM [Event] e
+        JOIN GroupToEvent gte ON e.eventID = gte.eventID
+        WHERE gte.groupID = :group_id
+        ORDER BY e.date
+    """, lambda t: {"group_id": t["biggest_group"]}),
+    "group members (notification fan-out)": (
+        "SELECT username FROM GroupMember WHERE groupID = :group_id",
+        lambda t: {"group_id": t["biggest_group"]}),
+    "admin groups with counts (Group.get_admin_groups)": ("""
+        SELECT g.groupID, g.groupName, g.description,
+               (SELECT COUNT(*) FROM GroupMember WHERE groupID = g.groupID) as memberCount,
+               (SELECT COUNT(*) FROM GroupToEvent WHERE groupID = g.groupID) as eventCount
+        FROM [Group] g
+        JOIN GroupAdmin ga ON g.groupID = ga.groupID
+        WHERE ga.username = :username
+        ORDER BY g.groupName
+    """, lambda t: {"username": t["biggest_group_admin"]}),
+    "group name check (Group.create_group)": (
+        "SELECT groupID FROM [Group] WHERE groupName = :groupName",
+        lambda t: {"groupName": "Not A Group"}),
+    "unread notifications": ("""
+        SELECT eventID, notificationTimestamp, eventDate
+        FROM Notifications
+        WHERE username = :username AND isRead = 0
+        ORDER BY notificationTimestamp DESC
+    """, lambda t: {"username": t["busiest_user"]}),
+    "upcoming events by date": ("""
+        SELECT eventID, date FROM [Event]
+        WHERE date >= :start AND date < :end
+        ORDER BY date
+    """, lambda t: {"start": datetime(2025, 6, 1), "end": datetime(2025, 6, 8)}),
+}
+
+
+def time_queries(db, params, repeat: int, queries: dict = QUERIES) -> dict:
+    """Median wall time in ms for each query."""
+    from sqlalchemy import text
+
+    timings = {}
+    with db.engine.connect() as conn:
+        for name, (sql, make_params) in queries.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(text(sql), make_params(params)).fetchall()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = statistics.median(samples)
+    return timings
+
+
+def seed_local(tmp: str, users: int, groups: int, seed: int, version: int = 0):
+    """
+    Create a generated SQLite database in tmp at a given schema version.
+
+    Returns:
+        (DatabaseManager, dict): The database and the parameters the queries use
+    """
+    # Hold the database at the requested version so the "before" numbers are real
+    os.environ["DB_AUTO_MIGRATE"] = "0"
+    from DataGenerator import GeneratorConfig, generate, load
+    from classes.MigrationRunner import MigrationRunner
+    from classes.SQLManager import DatabaseManager
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, 'timings.db')}")
+    if version:
+        MigrationRunner(db.engine).migrate(target=version)
+    print(f"Generating {users:,} users / {groups:,} groups ...")
+    tables = generate(GeneratorConfig(users=users, groups=groups, seed=seed))
+    load(db, tables, progress=False)
+
+    members = tables["GroupMember"]
+    biggest_group = int(members.groupby("groupID").size().idxmax())
+    admins = tables["GroupAdmin"]
+    params = {
+        "busiest_user": members.groupby("username").size().idxmax(),
+        "biggest_group": biggest_group,
+        "biggest_group_admin": admins.loc[admins["groupID"] == biggest_group, "username"].iloc[0],
+        "first_event": 1,
+    }
+    return db, params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=2_500)
+    parser.add_argument("--seed", type=int, default=4090)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--target", type=int, help="highest migration version to apply (default: all)")
+    parser.add_argument("--save", action="store_true", help=f"write results to {RESULTS_PATH}")
+    args = parser.parse_args()
+
+    from classes.MigrationRunner import MigrationRunner
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, params = seed_local(tmp, args.users, args.groups, args.seed)
+        runner = MigrationRunner(db.engine)
+        version_before = runner.current_version()
+        before = time_queries(db, params, args.repeat)
+        applied = runner.migrate(target=args.target)
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        after = time_queries(db, params, args.repeat)
+        version_after = runner.current_version()
+
+    print(f"\nSchema version {version_before} -> {version_after} "
+          f"({', '.join(f'{m.version:04d}_{m.name}' for m in applied) or 'nothing applied'})\n")
+    print(f"{'query':<52} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<52} {before[name]:>10.2f} {after[name]:>10.2f} {speedup:>7.1f}x")
+
+    if args.save:
+        os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+        with open(RESULTS_PATH, "w") as f:
+            json.dump({
+                "users": args.users,
+                "groups": args.groups,
+                "seed": args.seed,
+                "backend": "sqlite",
+                "version_before": version_before,
+                "version_after": version_after,
+                "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "queries": {name: {"before_ms": before[name], "after_ms": after[name]} for name in QUERIES},
+            }, f, indent=2)
+        print(f"\nSaved to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
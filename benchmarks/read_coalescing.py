@@ -0,0 +1,105 @@
+"""
+Database calls and latency of a refresh burst with and without read coalescing.
+
+Simulates the moment after an admin posts an event: --members clients fetch
+/events/group/{id} and /events/{event_id} at the same time. Requests go
+through the Events Service in process (ASGI), against a seeded SQLite
+database. --db-latency adds a round trip per query so the calls overlap as
+they do against Azure SQL. Reports the database calls made, requests per
+call and p50/p95 latency with READ_COALESCING on and off.
+
+Run from the project root:
+    python benchmarks/read_coalescing.py
+    python benchmarks/read_coalescing.py --members 500 --db-latency 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+
+def seed(db, events: int) -> None:
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Bench', 'coalescing benchmark')", None),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', :d)",
+         [{"id": i, "d": f"Session {i} at 6pm"} for i in range(1, events + 1)]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, 1)", [{"id": i} for i in range(1, events + 1)]),
+    ])
+
+
+class CountingDB:
+    """Counts the database calls and adds the round trip latency to each"""
+
+    def __init__(self, db, latency: float):
+        self.db, self.latency, self.calls = db, latency, 0
+
+    def wrap(self, name: str):
+        read = getattr(self.db, name)
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            time.sleep(self.latency)
+            return read(*args, **kwargs)
+        setattr(self.db, name, call)
+
+
+async def burst(app, members: int, event_id: int) -> list:
+    import httpx
+
+    async def fetch(client, url):
+        start = time.perf_counter()
+        (await client.get(url)).raise_for_status()
+        return time.perf_counter() - start
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        return await asyncio.gather(*(fetch(client, url) for _ in range(members)
+                                      for url in ("/events/group/1", f"/events/{event_id}")))
+
+
+def run(tmp: str, coalescing: int, args) -> dict:
+    from classes.ServiceConfig import Settings
+    from classes.SQLManager import DatabaseManager
+    from Event import create_app
+
+    db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, f'coalescing_{coalescing}.db')}")
+    seed(db, args.events)
+    counting = CountingDB(db, args.db_latency / 1000)
+    for name in ("read_query_to_df", "read_query_to_rows"):
+        counting.wrap(name)
+    app = create_app(Settings(read_coalescing=coalescing), db=db)
+
+    start = time.perf_counter()
+    latencies = sorted(asyncio.run(burst(app, args.members, args.events)))
+    elapsed = time.perf_counter() - start
+    db.engine.dispose()
+    return {
+        "requests": len(latencies), "calls": counting.calls, "seconds": elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000, "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--events", type=int, default=50, help="events in the group")
+    parser.add_argument("--db-latency", type=float, default=10.0, help="ms added to each query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"off": run(tmp, 0, args), "on": run(tmp, 1, args)}
+
+    print(f"\n{args.members} members refreshing a group of {args.events} events, "
+          f"{args.db_latency:g} ms per query\n")
+    print(f"{'coalescing':<11} {'requests':>9} {'db calls':>9} {'req/call':>9} {'p50 ms':>8} {'p95 ms':>8} {'total s':>8}")
+    for name, r in results.items():
+        print(f"{name:<11} {r['requests']:>9,} {r['calls']:>9,} {r['requests'] / r['calls']:>9.1f} "
+              f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
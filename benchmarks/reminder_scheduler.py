@@ -0,0 +1,101 @@
+"""
+Scale of the event reminder scheduler.
+
+Seeds --events group events starting over the next --window minutes plus the
+lead time, so every event's reminder falls inside one scheduler window, then
+reports:
+
+- load: time to read the window and build the heap, and the memory the
+  heap of pending reminders holds (per reminder)
+- fire: time to send the reminders due in the first --fire minutes, and the
+  rate in reminders per second
+- restart: how many reminders a fresh scheduler reloads afterwards (the sent
+  ones must not come back)
+
+Run from the project root:
+    python benchmarks/reminder_scheduler.py
+    python benchmarks/reminder_scheduler.py --events 500000 --fire 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+LEAD_MINUTES = 60
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def seed(db, events: int, window_minutes: int, now: datetime, chunk: int = 50_000) -> None:
+    """One group with two members; event starts spread evenly over the window"""
+    rng = random.Random(4090)
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Bench', 'reminders')", None),
+        ("INSERT INTO GroupMember (username, groupID) VALUES (:u, 1)", [{"u": "ann"}, {"u": "ben"}]),
+    ])
+    first = now + timedelta(minutes=LEAD_MINUTES)
+    for base in range(1, events + 1, chunk):
+        ids = range(base, min(events, base + chunk - 1) + 1)
+        dates = [first + timedelta(seconds=rng.randrange(window_minutes * 60)) for _ in ids]
+        db.execute_transaction([
+            ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, :date, 'bench')",
+             [{"id": i, "date": d} for i, d in zip(ids, dates)]),
+            ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, 1)", [{"id": i} for i in ids]),
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=300_000)
+    parser.add_argument("--window", type=int, default=60, help="scheduler window in minutes")
+    parser.add_argument("--fire", type=int, default=1, help="minutes of reminders to send")
+    args = parser.parse_args()
+
+    from classes.NotificationManager import NotificationManager
+    from classes.ReminderScheduler import ReminderScheduler
+    from classes.SQLManager import DatabaseManager
+
+    now = datetime(2026, 1, 1, 9, 0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(url=f"sqlite:///{os.path.join(tmp, 'reminders.db')}")
+        print(f"Seeding {args.events:,} events ...")
+        seed(db, args.events, args.window, now)
+        nm = NotificationManager(db=db)
+        clock = Clock(now)
+        scheduler = ReminderScheduler(nm, leads=[LEAD_MINUTES], window=args.window * 60, now=clock)
+
+        start = time.perf_counter()
+        pending = scheduler.load()
+        load_s = time.perf_counter() - start
+        kept = sys.getsizeof(scheduler._heap) + sum(sys.getsizeof(entry) for entry in scheduler._heap)
+
+        clock.now = now + timedelta(minutes=args.fire)
+        start = time.perf_counter()
+        written = scheduler.fire_due()
+        fire_s = time.perf_counter() - start
+        sent = pending - scheduler.pending
+
+        reloaded = ReminderScheduler(nm, leads=[LEAD_MINUTES], window=args.window * 60, now=clock).load()
+        db.engine.dispose()
+
+    print(f"\nload     {pending:,} pending reminders in {load_s:.2f} s; "
+          f"heap {kept / 2**20:.1f} MB ({kept / max(pending, 1):.0f} B/reminder)")
+    print(f"fire     {sent:,} reminders ({written:,} notifications) in {fire_s:.2f} s "
+          f"= {sent / max(fire_s, 1e-9):,.0f} reminders/s")
+    print(f"restart  {reloaded:,} reminders reloaded ({pending - sent:,} still owed)")
+
+
+if __name__ == "__main__":
+    main()
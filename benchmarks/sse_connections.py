@@ -0,0 +1,168 @@
+"""
+Connection-scale benchmark for the notification stream
+(GET /notifications/{username}/stream).
+
+Seeds a local SQLite database with one group holding a member per
+connection, launches the Events Service with uvicorn, and opens idle
+Server-Sent Events connections in steps (--connections), one per member. At
+each step the script records:
+
+- the server's resident memory, and memory per connection above the baseline
+- server CPU while every connection sits idle (heartbeats only)
+- fan-out latency: the time from POST /events/group/{id} until each
+  connected member receives the "notification" event (p50/p99/max)
+
+Run from the project root:
+    python benchmarks/sse_connections.py
+    python benchmarks/sse_connections.py --connections 1000 5000 10000 --idle 10
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+import httpx
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "api")
+sys.path.insert(0, API_DIR)
+
+GROUP_ID = 1
+
+
+def seed(db_url: str, members: int) -> List[str]:
+    """One group with every user as a member; the first user is its admin."""
+    from classes.SQLManager import DatabaseManager
+
+    db = DatabaseManager(url=db_url)
+    usernames = [f"sse{i:06d}" for i in range(members)]
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES (:u, 'pw', 'S', 'E', 0)",
+         [{"u": u} for u in usernames]),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:g, 'Stream', 'benchmark')",
+         {"g": GROUP_ID}),
+        ("INSERT INTO GroupMember (username, groupID) VALUES (:u, :g)",
+         [{"u": u, "g": GROUP_ID} for u in usernames]),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES (:u, :g)", {"u": usernames[0], "g": GROUP_ID}),
+    ])
+    db.engine.dispose()
+    return usernames
+
+
+def raise_fd_limit() -> int:
+    """Lift the open-file soft limit to the hard limit (inherited by the server)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    return soft
+
+
+class Stream:
+    """A raw-socket SSE client; cheaper than an HTTP client per connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int, username: str) -> "Stream":
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(f"GET /notifications/{username}/stream HTTP/1.1\r\nHost: {host}\r\n"
+                     f"Accept: text/event-stream\r\n\r\n".encode())
+        await writer.drain()
+        await reader.readuntil(b"event: unread")
+        return cls(reader, writer)
+
+    async def wait_for(self, event: bytes) -> float:
+        await self.reader.readuntil(b"event: " + event)
+        return time.perf_counter()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+async def run(args, usernames: List[str], server: psutil.Process) -> None:
+    host, base_url = "127.0.0.1", f"http://127.0.0.1:{args.port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        for _ in range(300):
+            try:
+                await client.get("/health")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+        baseline_mb = server.memory_info().rss / 2**20
+        print(f"Server baseline RSS {baseline_mb:.1f} MB\n")
+        print(f"{'connections':>11} {'open s':>7} {'RSS MB':>8} {'KB/conn':>8} {'idle CPU %':>10} "
+              f"{'fan-out p50 ms':>14} {'p99 ms':>8} {'max ms':>8}")
+
+        streams: List[Stream] = []
+        for target in sorted(args.connections):
+            start = time.perf_counter()
+            while len(streams) < target:
+                batch = usernames[len(streams):min(target, len(streams) + args.open_batch)]
+                streams += await asyncio.gather(*(Stream.open(host, args.port, u) for u in batch))
+            opened = time.perf_counter() - start
+
+            server.cpu_percent()
+            await asyncio.sleep(args.idle)
+            idle_cpu = server.cpu_percent()
+            rss_mb = server.memory_info().rss / 2**20
+            per_conn_kb = (rss_mb - baseline_mb) * 1024 / len(streams)
+
+            waiters = [asyncio.ensure_future(s.wait_for(b"notification")) for s in streams]
+            sent = time.perf_counter()
+            res = await client.post(f"/events/group/{GROUP_ID}", json={
+                "date": datetime(2026, 1, 1).isoformat(), "description": f"fan-out to {len(streams)}"})
+            res.raise_for_status()
+            arrivals = [(t - sent) * 1000 for t in await asyncio.gather(*waiters)]
+
+            print(f"{len(streams):>11} {opened:>7.1f} {rss_mb:>8.1f} {per_conn_kb:>8.1f} {idle_cpu:>10.1f} "
+                  f"{percentile(arrivals, 50):>14.1f} {percentile(arrivals, 99):>8.1f} {max(arrivals):>8.1f}")
+
+        for s in streams:
+            s.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, nargs="+", default=[100, 1000, 2000])
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds to sample idle CPU at each step")
+    parser.add_argument("--open-batch", type=int, default=200, help="connections opened concurrently")
+    parser.add_argument("--port", type=int, default=8102)
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    # Client and server each hold one descriptor per connection
+    if max(args.connections) + 100 > limit:
+        sys.exit(f"Open-file limit is {limit}; raise it (ulimit -n) for {max(args.connections)} connections")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'sse.db')}"
+        print(f"Seeding one group of {max(args.connections):,} members ...")
+        usernames = seed(db_url, max(args.connections))
+        # Every step's event must fan out at once rather than wait for a digest
+        env = dict(os.environ, DATABASE_URL=db_url, NOTIFICATION_DIGEST_SECONDS="0")
+        proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "Event:app", "--port", str(args.port),
+                                 "--log-level", "warning", "--backlog", "4096"], cwd=API_DIR, env=env)
+        try:
+            asyncio.run(run(args, usernames, psutil.Process(proc.pid)))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
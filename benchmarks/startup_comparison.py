@@ -0,0 +1,89 @@
+"""
+Startup-time and memory comparison: three separate services vs. the composed app.
+
+Launches each configuration with uvicorn, waits until every port answers an
+HTTP request, and reports wall-clock startup time and resident memory (RSS)
+summed over the server processes.
+
+Run from the project root:
+    python benchmarks/startup_comparison.py [--runs 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api")
+
+SEPARATE = [("User:app", 8001), ("Event:app", 8002), ("Group:app", 8003)]
+COMPOSED = [("Main:app", 8000)]
+
+
+def _rss_mb(pid: int) -> float:
+    """Resident set size of a process in MB."""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except ImportError:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _wait_until_up(port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/__startup_probe__", timeout=1)
+            return
+        except urllib.error.HTTPError:
+            return  # any HTTP answer (404 included) means the server is up
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.02)
+    raise TimeoutError(f"Port {port} did not come up within {timeout}s")
+
+
+def measure(config, timeout: float = 60.0):
+    """Start every app in a configuration; return (startup seconds, total RSS MB)."""
+    start = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", target, "--port", str(port), "--log-level", "warning"],
+            cwd=API_DIR,
+        )
+        for target, port in config
+    ]
+    try:
+        for _, port in config:
+            _wait_until_up(port, timeout)
+        elapsed = time.perf_counter() - start
+        rss = sum(_rss_mb(p.pid) for p in procs)
+        return elapsed, rss
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'configuration':<12} {'processes':>9} {'startup s (median)':>19} {'RSS MB (median)':>16}")
+    for name, config in (("separate", SEPARATE), ("composed", COMPOSED)):
+        results = [measure(config) for _ in range(args.runs)]
+        startup = statistics.median(r[0] for r in results)
+        rss = statistics.median(r[1] for r in results)
+        print(f"{name:<12} {len(config):>9} {startup:>19.3f} {rss:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
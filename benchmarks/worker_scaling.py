@@ -0,0 +1,102 @@
+"""
+Throughput vs. worker count for the multi-worker launcher.
+
+For each worker count, starts `api/Launcher.py <service> --workers N`, drives a
+fixed number of concurrent clients against one endpoint for a fixed duration,
+and reports requests/second and p50/p95 latency.
+
+Run from the project root:
+    python benchmarks/worker_scaling.py --service event --path /events/user/jsmith --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api")
+
+
+async def _wait_until_up(base_url: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get(base_url + "/__startup_probe__")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise TimeoutError(f"{base_url} did not come up within {timeout}s")
+
+
+async def _drive(url: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                try:
+                    res = await client.get(url)
+                    if res.status_code >= 500:
+                        errors += 1
+                except httpx.TransportError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run(service: str, port: int, path: str, workers: int, concurrency: int, duration: float):
+    proc = subprocess.Popen(
+        [sys.executable, "Launcher.py", service, "--workers", str(workers), "--port", str(port)],
+        cwd=API_DIR,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(_wait_until_up(base_url, 60))
+        # Every worker may need a moment to finish importing after the first answers.
+        time.sleep(1.0)
+        latencies, errors = asyncio.run(_drive(base_url + path, concurrency, duration))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    return {
+        "workers": workers,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": p95 * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", default="event")
+    parser.add_argument("--port", type=int, default=8102)
+    parser.add_argument("--path", default="/events/user/jsmith")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for n in args.workers:
+        r = run(args.service, args.port, args.path, n, args.concurrency, args.duration)
+        print(f"{r['workers']:>7} {r['rps']:>10.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
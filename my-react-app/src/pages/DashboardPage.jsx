@@ -1,8 +1,27 @@
-import React from "react";
+import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 
 export default function DashboardPage({ username, onLogout }) {
   const navigate = useNavigate();
+  const [unreadCount, setUnreadCount] = useState(0);
+
+  // The server pushes the unread count on connect and each new notification after it;
+  // EventSource reconnects by itself and gets a fresh count when it does
+  useEffect(() => {
+    if (!username) return;
+    const stream = new EventSource(`http://localhost:8002/notifications/${username}/stream`);
+    stream.addEventListener("unread", (e) => setUnreadCount(JSON.parse(e.data).unreadCount));
+    stream.addEventListener("notification", (e) => {
+      if (!JSON.parse(e.data).isRead) setUnreadCount((count) => count + 1);
+    });
+    stream.addEventListener("resync", () => {
+      fetch(`http://localhost:8002/notifications/${username}/unread-count`)
+        .then((response) => (response.ok ? response.json() : null))
+        .then((data) => data && setUnreadCount(data.unreadCount))
+        .catch((err) => console.error("Error fetching unread count:", err));
+    });
+    return () => stream.close();
+  }, [username]);
 
   const handleGoToEvents = () => {
     navigate("/events");
@@ -98,7 +117,7 @@ export default function DashboardPage({ username, onLogout }) {
             onClick={handleGoToNotifications}
             style={buttonStyle("#17a2be", "#11707f")}
           >
-            View Notifications
+            View Notifications{unreadCount > 0 ? ` (${unreadCount})` : ""}
           </button>
 
 
@@ -1,9 +1,14 @@
 import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 
+const PAGE_SIZE = 20;
+
 export default function NotificationsPage() {
   const [notifications, setNotifications] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [unreadOnly, setUnreadOnly] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState("");
   const navigate = useNavigate();
 
@@ -24,19 +29,27 @@ export default function NotificationsPage() {
       return;
     }
     fetchNotifications();
-  }, [username]);
+  }, [username, unreadOnly]);
+
+  // Fetch one page; the X-Next-Cursor response header points at the next one
+  const fetchPage = async (cursor) => {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (unreadOnly) params.set("unread_only", "true");
+    if (cursor) params.set("cursor", cursor);
+    const response = await fetch(`http://localhost:8002/notifications/${username}?${params}`);
+    if (!response.ok) {
+      throw new Error("Failed to load notifications");
+    }
+    return { page: await response.json(), cursor: response.headers.get("X-Next-Cursor") };
+  };
 
   const fetchNotifications = async () => {
     setLoading(true);
     setError("");
     try {
-      const response = await fetch(`http://localhost:8002/notifications/${username}`);
-      if (response.ok) {
-        const data = await response.json();
-        setNotifications(data);
-      } else {
-        setError("Failed to load notifications");
-      }
+      const { page, cursor } = await fetchPage(null);
+      setNotifications(page);
+      setNextCursor(cursor);
     } catch (err) {
       console.error("Error fetching notifications:", err);
       setError("Failed to connect to server. Make sure backend is running on http://localhost:8002");
@@ -45,6 +58,48 @@ export default function NotificationsPage() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const { page, cursor } = await fetchPage(nextCursor);
+      setNotifications((current) => [...current, ...page]);
+      setNextCursor(cursor);
+    } catch (err) {
+      console.error("Error fetching notifications:", err);
+      setError("Failed to load more notifications");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Opening a notification sends a read ack; the server batches these
+  const markRead = async (note) => {
+    if (note.isRead || !note.notificationID) return;
+    setNotifications((current) =>
+      current.map((n) => (n.notificationID === note.notificationID ? { ...n, isRead: 1 } : n))
+    );
+    try {
+      await fetch(`http://localhost:8002/notifications/${username}/${note.notificationID}/read`, { method: "PUT" });
+    } catch (err) {
+      console.error("Error marking notification as read:", err);
+    }
+  };
+
+  const markAllRead = async () => {
+    try {
+      const response = await fetch(`http://localhost:8002/notifications/${username}/read-all`, { method: "PUT" });
+      if (response.ok) {
+        setNotifications((current) => (unreadOnly ? [] : current.map((n) => ({ ...n, isRead: 1 }))));
+        if (unreadOnly) setNextCursor(null);
+      } else {
+        setError("Failed to mark notifications as read");
+      }
+    } catch (err) {
+      console.error("Error marking notifications as read:", err);
+      setError("Failed to mark notifications as read");
+    }
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleString("en-US", {
@@ -80,6 +135,24 @@ export default function NotificationsPage() {
       >
         <h1 style={{ margin: 0, fontSize: "24px" }}>Notifications</h1>
         <div style={{ display: "flex", gap: "12px", alignItems: "center" }}>
+          <button
+            onClick={markAllRead}
+            style={{
+              padding: "8px 16px",
+              backgroundColor: "#28a745",
+              color: "white",
+              border: "none",
+              borderRadius: "4px",
+              cursor: "pointer",
+              fontSize: "14px",
+            }}
+          >
+            Mark all read
+          </button>
+          <label style={{ color: "#666", fontSize: "14px", display: "flex", gap: "6px", alignItems: "center" }}>
+            <input type="checkbox" checked={unreadOnly} onChange={(e) => setUnreadOnly(e.target.checked)} />
+            Unread only
+          </label>
           <span style={{ color: "#666", fontSize: "14px" }}>
             Welcome, {user.Fname} {user.Lname}
           </span>
@@ -150,7 +223,9 @@ export default function NotificationsPage() {
             {notifications.map((note) => (
               <div
                 key={note.notificationID || `${note.username}-${note.eventID}-${note.notificationTimestamp}`}
+                onClick={() => markRead(note)}
                 style={{
+                  cursor: note.isRead ? "default" : "pointer",
                   backgroundColor: "white",
                   borderRadius: "8px",
                   padding: "20px",
@@ -200,6 +275,10 @@ export default function NotificationsPage() {
                   {note.description || "No description"}
                 </div>
 
+                {note.eventCount > 1 && (
+                  <div style={{ fontSize: "13px", color: "#666" }}>{note.eventCount} events</div>
+                )}
+
                 <div style={{ fontSize: "13px", color: note.isRead ? "#28a745" : "#dc3545", marginTop: "12px", fontWeight: "500" }}>
                   {note.isRead ? "Read" : "Unread"}
                 </div>
@@ -207,6 +286,26 @@ export default function NotificationsPage() {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div style={{ textAlign: "center", marginTop: "24px" }}>
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              style={{
+                padding: "10px 24px",
+                backgroundColor: "#007bff",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: loadingMore ? "default" : "pointer",
+                fontSize: "14px",
+              }}
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,61 @@
+/* Covering nonclustered indexes for the hot read paths.
+   Every table only had its clustered primary key, so lookups by the second
+   key column (GroupMember.groupID, GroupToEvent.groupID, GroupAdmin.groupID)
+   and the date / unread filters scanned the whole table. */
+
+/* GET /events/group/{id}, notification fan-out, memberCount subquery */
+CREATE NONCLUSTERED INDEX [IX_GroupMember_groupID] ON [dbo].[GroupMember]
+(
+	[groupID] ASC,
+	[username] ASC
+) WITH (ONLINE = ON)
+GO
+
+/* WHERE gte.groupID = :group_id and the eventCount subquery */
+CREATE NONCLUSTERED INDEX [IX_GroupToEvent_groupID] ON [dbo].[GroupToEvent]
+(
+	[groupID] ASC,
+	[eventID] ASC
+) WITH (ONLINE = ON)
+GO
+
+/* Admin lookups by group */
+CREATE NONCLUSTERED INDEX [IX_GroupAdmin_groupID] ON [dbo].[GroupAdmin]
+(
+	[groupID] ASC,
+	[username] ASC
+) WITH (ONLINE = ON)
+GO
+
+/* ORDER BY e.date feeds; eventID is the clustered key and rides along */
+CREATE NONCLUSTERED INDEX [IX_Event_date] ON [dbo].[Event]
+(
+	[date] ASC
+) WITH (ONLINE = ON)
+GO
+
+/* Duplicate-name check in POST /groups/create */
+CREATE NONCLUSTERED INDEX [IX_Group_groupName] ON [dbo].[Group]
+(
+	[groupName] ASC
+) WITH (ONLINE = ON)
+GO
+
+/* Unread notifications per user, newest first (filtered: read rows are never indexed) */
+CREATE NONCLUSTERED INDEX [IX_Notifications_unread] ON [dbo].[Notifications]
+(
+	[username] ASC,
+	[notificationTimestamp] DESC
+)
+INCLUDE ([eventID], [eventDate])
+WHERE [isRead] = 0
+WITH (ONLINE = ON)
+GO
+
+/* markNotificationAsRead: WHERE username = :username AND eventID = :eventID */
+CREATE NONCLUSTERED INDEX [IX_Notifications_username_eventID] ON [dbo].[Notifications]
+(
+	[username] ASC,
+	[eventID] ASC
+) WITH (ONLINE = ON)
+GO
@@ -0,0 +1,117 @@
+/* Legacy TEXT description columns -> NVARCHAR(1000).
+   TEXT values live off-row as LOBs and cannot be compared, sorted or used
+   with DISTINCT, so every read had to CAST(... AS NVARCHAR(MAX)). The change
+   is made online, one table at a time:
+     1. add a nullable NVARCHAR(1000) column (metadata only)
+     2. backfill it in batches of 5000 rows, each its own short transaction
+     3. in one short transaction, copy rows written since the backfill, drop
+        the TEXT column and rename the new one into place
+   Every step checks the current column type first, so the script can be
+   re-run from the top if it is interrupted. */
+-- runner: no-transaction
+
+/* [Event] */
+IF EXISTS (SELECT 1 FROM sys.columns
+           WHERE object_id = OBJECT_ID(N'dbo.Event') AND name = N'description' AND TYPE_NAME(system_type_id) = N'text')
+BEGIN
+    /* Refuse to truncate */
+    IF EXISTS (SELECT 1 FROM [dbo].[Event] WHERE DATALENGTH([description]) > 1000)
+        THROW 50000, N'Event.description has values longer than 1000 characters', 1;
+    IF COL_LENGTH(N'dbo.Event', N'description_nv') IS NULL
+        ALTER TABLE [dbo].[Event] ADD [description_nv] NVARCHAR(1000) NULL;
+END
+GO
+IF COL_LENGTH(N'dbo.Event', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        DECLARE @rows INT = 1;
+        WHILE @rows > 0
+        BEGIN
+            UPDATE TOP (5000) [dbo].[Event]
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE [description_nv] IS NULL AND [description] IS NOT NULL;
+            SET @rows = @@ROWCOUNT;
+        END';
+GO
+IF COL_LENGTH(N'dbo.Event', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        SET XACT_ABORT ON;
+        BEGIN TRANSACTION;
+            UPDATE [dbo].[Event] WITH (TABLOCKX)
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE ([description_nv] IS NULL AND [description] IS NOT NULL)
+               OR CAST([description] AS NVARCHAR(1000)) <> [description_nv];
+            ALTER TABLE [dbo].[Event] DROP COLUMN [description];
+            EXEC sp_rename N''dbo.Event.description_nv'', N''description'', N''COLUMN'';
+        COMMIT TRANSACTION;';
+GO
+
+/* [Group] */
+IF EXISTS (SELECT 1 FROM sys.columns
+           WHERE object_id = OBJECT_ID(N'dbo.Group') AND name = N'description' AND TYPE_NAME(system_type_id) = N'text')
+BEGIN
+    /* Refuse to truncate */
+    IF EXISTS (SELECT 1 FROM [dbo].[Group] WHERE DATALENGTH([description]) > 1000)
+        THROW 50000, N'Group.description has values longer than 1000 characters', 1;
+    IF COL_LENGTH(N'dbo.Group', N'description_nv') IS NULL
+        ALTER TABLE [dbo].[Group] ADD [description_nv] NVARCHAR(1000) NULL;
+END
+GO
+IF COL_LENGTH(N'dbo.Group', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        DECLARE @rows INT = 1;
+        WHILE @rows > 0
+        BEGIN
+            UPDATE TOP (5000) [dbo].[Group]
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE [description_nv] IS NULL AND [description] IS NOT NULL;
+            SET @rows = @@ROWCOUNT;
+        END';
+GO
+IF COL_LENGTH(N'dbo.Group', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        SET XACT_ABORT ON;
+        BEGIN TRANSACTION;
+            UPDATE [dbo].[Group] WITH (TABLOCKX)
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE ([description_nv] IS NULL AND [description] IS NOT NULL)
+               OR CAST([description] AS NVARCHAR(1000)) <> [description_nv];
+            ALTER TABLE [dbo].[Group] DROP COLUMN [description];
+            EXEC sp_rename N''dbo.[Group].description_nv'', N''description'', N''COLUMN'';
+        COMMIT TRANSACTION;';
+GO
+
+/* [Notifications] */
+IF EXISTS (SELECT 1 FROM sys.columns
+           WHERE object_id = OBJECT_ID(N'dbo.Notifications') AND name = N'description' AND TYPE_NAME(system_type_id) = N'text')
+BEGIN
+    /* Refuse to truncate */
+    IF EXISTS (SELECT 1 FROM [dbo].[Notifications] WHERE DATALENGTH([description]) > 1000)
+        THROW 50000, N'Notifications.description has values longer than 1000 characters', 1;
+    IF COL_LENGTH(N'dbo.Notifications', N'description_nv') IS NULL
+        ALTER TABLE [dbo].[Notifications] ADD [description_nv] NVARCHAR(1000) NULL;
+END
+GO
+IF COL_LENGTH(N'dbo.Notifications', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        DECLARE @rows INT = 1;
+        WHILE @rows > 0
+        BEGIN
+            UPDATE TOP (5000) [dbo].[Notifications]
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE [description_nv] IS NULL AND [description] IS NOT NULL;
+            SET @rows = @@ROWCOUNT;
+        END';
+GO
+IF COL_LENGTH(N'dbo.Notifications', N'description_nv') IS NOT NULL
+    EXEC sp_executesql N'
+        SET XACT_ABORT ON;
+        BEGIN TRANSACTION;
+            UPDATE [dbo].[Notifications] WITH (TABLOCKX)
+            SET [description_nv] = CAST([description] AS NVARCHAR(1000))
+            WHERE ([description_nv] IS NULL AND [description] IS NOT NULL)
+               OR CAST([description] AS NVARCHAR(1000)) <> [description_nv];
+            ALTER TABLE [dbo].[Notifications] DROP COLUMN [description];
+            EXEC sp_rename N''dbo.Notifications.description_nv'', N''description'', N''COLUMN'';
+            ALTER TABLE [dbo].[Notifications] ALTER COLUMN [description] NVARCHAR(1000) NOT NULL;
+        COMMIT TRANSACTION;';
+GO
@@ -0,0 +1,94 @@
+/* Cold storage for past events.
+   ArchiveManager moves events older than the archive horizon, with their
+   group links and RSVPs, and read notifications about them into these tables
+   so the hot tables only hold current data. The *All views union hot and
+   archived rows for the include_archived read mode. Archive tables carry no
+   foreign keys so rows can be moved in any order within a batch. */
+
+CREATE TABLE [dbo].[EventArchive](
+	[eventID] [int] NOT NULL,
+	[date] [datetime2](7) NOT NULL,
+	[description] [nvarchar](1000) NULL,
+	[archivedAt] [datetime2](7) NOT NULL,
+ CONSTRAINT [PK_EventArchive] PRIMARY KEY CLUSTERED 
+(
+	[eventID] ASC
+)
+)
+GO
+CREATE TABLE [dbo].[GroupToEventArchive](
+	[eventID] [int] NOT NULL,
+	[groupID] [int] NOT NULL,
+ CONSTRAINT [PK_GroupToEventArchive] PRIMARY KEY CLUSTERED 
+(
+	[eventID] ASC,
+	[groupID] ASC
+)
+)
+GO
+CREATE TABLE [dbo].[RSVPArchive](
+	[eventID] [int] NOT NULL,
+	[username] [nvarchar](50) NOT NULL,
+ CONSTRAINT [PK_RSVPArchive] PRIMARY KEY CLUSTERED 
+(
+	[eventID] ASC,
+	[username] ASC
+)
+)
+GO
+CREATE TABLE [dbo].[NotificationsArchive](
+	[username] [nvarchar](50) NOT NULL,
+	[description] [nvarchar](1000) NOT NULL,
+	[eventID] [int] NULL,
+	[isRead] [bit] NOT NULL,
+	[notificationTimestamp] [datetime2](7) NOT NULL,
+	[eventDate] [datetime2](7) NOT NULL,
+ CONSTRAINT [PK_NotificationsArchive] PRIMARY KEY CLUSTERED 
+(
+	[username] ASC,
+	[notificationTimestamp] ASC
+)
+)
+GO
+CREATE NONCLUSTERED INDEX [IX_EventArchive_date] ON [dbo].[EventArchive]
+(
+	[date] ASC
+)
+GO
+CREATE NONCLUSTERED INDEX [IX_GroupToEventArchive_groupID] ON [dbo].[GroupToEventArchive]
+(
+	[groupID] ASC,
+	[eventID] ASC
+)
+GO
+
+/* Batches are chosen by read state and event date */
+CREATE NONCLUSTERED INDEX [IX_Notifications_read_eventDate] ON [dbo].[Notifications]
+(
+	[eventDate] ASC
+)
+INCLUDE ([username], [notificationTimestamp])
+WHERE [isRead] = 1
+WITH (ONLINE = ON)
+GO
+
+CREATE VIEW [dbo].[EventAll] AS
+SELECT [eventID], [date], [description] FROM [dbo].[Event]
+UNION ALL
+SELECT [eventID], [date], [description] FROM [dbo].[EventArchive]
+GO
+CREATE VIEW [dbo].[GroupToEventAll] AS
+SELECT [eventID], [groupID] FROM [dbo].[GroupToEvent]
+UNION ALL
+SELECT [eventID], [groupID] FROM [dbo].[GroupToEventArchive]
+GO
+CREATE VIEW [dbo].[RSVPAll] AS
+SELECT [eventID], [username] FROM [dbo].[RSVP]
+UNION ALL
+SELECT [eventID], [username] FROM [dbo].[RSVPArchive]
+GO
+CREATE VIEW [dbo].[NotificationsAll] AS
+SELECT [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate] FROM [dbo].[Notifications]
+UNION ALL
+SELECT [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate] FROM [dbo].[NotificationsArchive]
+GO
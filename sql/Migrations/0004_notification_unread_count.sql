@@ -0,0 +1,23 @@
+/* Per-user unread notification counter.
+   The bell badge polls GET /notifications/{username}/unread-count, which reads
+   one row here by primary key instead of counting the user's notifications.
+   NotificationManager keeps it in step in the same transaction as every
+   notification insert and mark-as-read. Archival only moves read
+   notifications, so it never changes the counts. */
+
+CREATE TABLE [dbo].[NotificationUnreadCount](
+	[username] [nvarchar](50) NOT NULL,
+	[unreadCount] [int] NOT NULL,
+ CONSTRAINT [PK_NotificationUnreadCount] PRIMARY KEY CLUSTERED
+(
+	[username] ASC
+)
+)
+GO
+
+/* Backfill from the unread filtered index (IX_Notifications_unread) */
+INSERT INTO [dbo].[NotificationUnreadCount] ([username], [unreadCount])
+SELECT [username], COUNT(*) FROM [dbo].[Notifications]
+WHERE [isRead] = 0
+GROUP BY [username]
+GO
@@ -0,0 +1,26 @@
+/* Surrogate key for notifications.
+   Bulk mark-as-read (PUT /notifications/{username}/read) and per-item read
+   acknowledgements address single notifications by ID; (username,
+   notificationTimestamp) stays the clustered primary key so the per-user
+   feed and its pagination are unchanged. Archived rows keep their ID. */
+
+ALTER TABLE [dbo].[Notifications] ADD [notificationID] [int] IDENTITY(1,1) NOT NULL
+GO
+
+/* WHERE notificationID IN (...) AND username = :username */
+CREATE UNIQUE NONCLUSTERED INDEX [IX_Notifications_notificationID] ON [dbo].[Notifications]
+(
+	[notificationID] ASC
+)
+INCLUDE ([username])
+WITH (ONLINE = ON)
+GO
+
+ALTER TABLE [dbo].[NotificationsArchive] ADD [notificationID] [int] NULL
+GO
+
+ALTER VIEW [dbo].[NotificationsAll] AS
+SELECT [notificationID], [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate] FROM [dbo].[Notifications]
+UNION ALL
+SELECT [notificationID], [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate] FROM [dbo].[NotificationsArchive]
+GO
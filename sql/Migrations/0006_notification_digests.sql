@@ -0,0 +1,22 @@
+/* Digest notifications.
+   When a group schedules several events in a short window, members get one
+   notification for the first event and then one digest row covering the rest
+   (NotificationCoalescer) instead of a row per member per event. groupID
+   records the group a notification came from; eventCount is the number of
+   events a digest stands for (1 for an ordinary notification). */
+
+ALTER TABLE [dbo].[Notifications] ADD
+	[groupID] [int] NULL,
+	[eventCount] [int] NOT NULL CONSTRAINT [DF_Notifications_eventCount] DEFAULT (1)
+GO
+
+ALTER TABLE [dbo].[NotificationsArchive] ADD
+	[groupID] [int] NULL,
+	[eventCount] [int] NOT NULL CONSTRAINT [DF_NotificationsArchive_eventCount] DEFAULT (1)
+GO
+
+ALTER VIEW [dbo].[NotificationsAll] AS
+SELECT [notificationID], [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate], [groupID], [eventCount] FROM [dbo].[Notifications]
+UNION ALL
+SELECT [notificationID], [username], [description], [eventID], [isRead], [notificationTimestamp], [eventDate], [groupID], [eventCount] FROM [dbo].[NotificationsArchive]
+GO
@@ -0,0 +1,18 @@
+/* Reminders already sent for upcoming events.
+   classes/ReminderScheduler.py notifies group members a configurable lead
+   time before each event starts. NotificationManager.createEventReminders
+   writes one row here per (event, lead) in the same transaction as the
+   reminder notifications; the primary key makes a second send of the same
+   reminder fail, so a restart or a second process never sends it twice. */
+
+CREATE TABLE [dbo].[EventReminderSent](
+	[eventID] [int] NOT NULL,
+	[leadMinutes] [int] NOT NULL,
+	[sentAt] [datetime2](7) NOT NULL,
+ CONSTRAINT [PK_EventReminderSent] PRIMARY KEY CLUSTERED
+(
+	[eventID] ASC,
+	[leadMinutes] ASC
+)
+)
+GO
@@ -0,0 +1,37 @@
+/* Durable queue of notification fan-out jobs.
+   POST /events/group/{id} writes the event, its group link and one row here
+   in a single transaction, so every saved event is notified about even if
+   the notification write fails or the service stops. Delivery workers
+   (classes/OutboxWorker.py, api/NotificationWorker.py) claim due rows with a
+   lease, notify the group's members and delete the row. A failed delivery is
+   retried with backoff; after the last attempt failedAt is set and the row
+   stays for inspection. */
+
+CREATE TABLE [dbo].[NotificationOutbox](
+	[eventID] [int] NOT NULL,
+	[groupID] [int] NOT NULL,
+	[groupName] [nvarchar](50) NOT NULL,
+	[description] [nvarchar](1000) NOT NULL,
+	[eventDate] [datetime2](7) NOT NULL,
+	[createdAt] [datetime2](7) NOT NULL,
+	[availableAt] [datetime2](7) NOT NULL,
+	[attempts] [int] NOT NULL,
+	[claimedBy] [nvarchar](100) NULL,
+	[claimedUntil] [datetime2](7) NULL,
+	[lastError] [nvarchar](1000) NULL,
+	[failedAt] [datetime2](7) NULL,
+ CONSTRAINT [PK_NotificationOutbox] PRIMARY KEY CLUSTERED
+(
+	[eventID] ASC
+)
+)
+GO
+
+/* Workers claim the oldest due jobs; failed jobs are never claimed */
+CREATE NONCLUSTERED INDEX [IX_NotificationOutbox_availableAt] ON [dbo].[NotificationOutbox]
+(
+	[availableAt] ASC
+)
+INCLUDE ([claimedUntil])
+WHERE [failedAt] IS NULL
+GO
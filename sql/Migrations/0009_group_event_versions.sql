@@ -0,0 +1,17 @@
+/* Per-group change counter for the group's events.
+   Every write that changes which events a group has, or what they say
+   (create, update, delete, archive), bumps the group's version in the same
+   transaction. Calendar feeds (classes/CalendarFeeds.py) use it to answer
+   polls with 304 Not Modified and to regenerate a cached feed only when it
+   changed. A group without a row has never had an event change (version 0). */
+
+CREATE TABLE [dbo].[GroupEventVersion](
+	[groupID] [int] NOT NULL,
+	[version] [bigint] NOT NULL,
+	[changedAt] [datetime2](7) NOT NULL,
+ CONSTRAINT [PK_GroupEventVersion] PRIMARY KEY CLUSTERED
+(
+	[groupID] ASC
+)
+)
+GO
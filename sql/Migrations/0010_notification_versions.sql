@@ -0,0 +1,16 @@
+/* Change counter for each user's notifications.
+   GET /notifications/{username} answers If-None-Match with 304 when the
+   version is unchanged (classes/ChangeVersions.py). NotificationManager bumps
+   it in the same transaction as every notification insert and mark-as-read,
+   and archiving bumps it for the users whose read notifications it moves.
+   Users notified only with already-read notifications get a row too, so every
+   user with notifications has a version. */
+
+ALTER TABLE [dbo].[NotificationUnreadCount] ADD
+	[version] [bigint] NOT NULL CONSTRAINT [DF_NotificationUnreadCount_version] DEFAULT (0)
+GO
+
+INSERT INTO [dbo].[NotificationUnreadCount] ([username], [unreadCount])
+SELECT DISTINCT [username], 0 FROM [dbo].[Notifications] n
+WHERE NOT EXISTS (SELECT 1 FROM [dbo].[NotificationUnreadCount] c WHERE c.[username] = n.[username])
+GO
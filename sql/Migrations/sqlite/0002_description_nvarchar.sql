@@ -0,0 +1,3 @@
+/* SQLite stores TEXT and NVARCHAR(n) the same way (TEXT affinity, no length
+   limit, no LOB pages), so the local backend has nothing to change. The
+   version is still recorded to keep both backends in step. */
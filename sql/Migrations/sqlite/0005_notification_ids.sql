@@ -0,0 +1,25 @@
+/* SQLite cannot add an IDENTITY column to an existing table. Notifications
+   is a rowid table, so the ID is the rowid: existing rows are backfilled from
+   it and a trigger fills it in for new rows. */
+
+ALTER TABLE Notifications ADD COLUMN notificationID INTEGER
+GO
+UPDATE Notifications SET notificationID = rowid
+GO
+CREATE TRIGGER TR_Notifications_notificationID AFTER INSERT ON Notifications
+WHEN NEW.notificationID IS NULL
+BEGIN
+    UPDATE Notifications SET notificationID = NEW.rowid WHERE rowid = NEW.rowid;
+END
+GO
+CREATE UNIQUE INDEX IX_Notifications_notificationID ON Notifications (notificationID, username)
+GO
+ALTER TABLE NotificationsArchive ADD COLUMN notificationID INTEGER
+GO
+DROP VIEW NotificationsAll
+GO
+CREATE VIEW NotificationsAll AS
+SELECT notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate FROM Notifications
+UNION ALL
+SELECT notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate FROM NotificationsArchive
+GO
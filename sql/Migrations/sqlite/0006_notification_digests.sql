@@ -0,0 +1,17 @@
+/* SQLite adds one column per ALTER TABLE and has no ALTER VIEW. */
+
+ALTER TABLE Notifications ADD COLUMN groupID INTEGER NULL
+GO
+ALTER TABLE Notifications ADD COLUMN eventCount INTEGER NOT NULL DEFAULT 1
+GO
+ALTER TABLE NotificationsArchive ADD COLUMN groupID INTEGER NULL
+GO
+ALTER TABLE NotificationsArchive ADD COLUMN eventCount INTEGER NOT NULL DEFAULT 1
+GO
+DROP VIEW NotificationsAll
+GO
+CREATE VIEW NotificationsAll AS
+SELECT notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate, groupID, eventCount FROM Notifications
+UNION ALL
+SELECT notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate, groupID, eventCount FROM NotificationsArchive
+GO
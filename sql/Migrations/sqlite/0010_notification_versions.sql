@@ -0,0 +1,8 @@
+/* SQLite adds a column with a plain DEFAULT (no named constraint). */
+
+ALTER TABLE NotificationUnreadCount ADD COLUMN version INTEGER NOT NULL DEFAULT 0
+GO
+INSERT INTO NotificationUnreadCount (username, unreadCount)
+SELECT DISTINCT username, 0 FROM Notifications n
+WHERE NOT EXISTS (SELECT 1 FROM NotificationUnreadCount c WHERE c.username = n.username)
+GO
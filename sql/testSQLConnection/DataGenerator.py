@@ -0,0 +1,272 @@
+"""
+Synthetic data generator for realistic-volume seeding.
+
+SQL_Functions.main_populate_database() loads a handful of hand-written rows;
+this module produces any number of users, groups, memberships, events, RSVPs
+and notifications with the skew seen in real usage:
+
+- group sizes follow a power law (a few huge groups, a long tail of small ones)
+- each group draws most members from a local "neighbourhood" of users and the
+  rest from a globally popular pool, so active users collaborate across groups
+- only some events fan out notifications, and older notifications are more
+  likely to have been read
+
+Every table is generated with vectorised numpy operations from a single seed,
+so the same config always yields the same rows. Tables are bulk-loaded in
+chunks, in foreign key order, with progress reporting.
+
+Run:
+    python DataGenerator.py --users 1000000 --groups 50000 --seed 4090
+    DATABASE_URL=sqlite:///local.db python DataGenerator.py --users 100000
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import inspect
+
+# Add the api directory to the path so the classes package can be imported
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "api"))
+
+from classes.NotificationManager import NotificationManager
+from classes.SQLManager import DatabaseManager
+from classes.ServiceConfig import Settings
+
+# Tables in foreign key order
+LOAD_ORDER = ["User", "Group", "GroupMember", "GroupAdmin", "Event", "GroupToEvent", "RSVP", "Notifications"]
+
+FIRST_NAMES = np.array(["John", "Alice", "Michael", "Bob", "Sarah", "Kelly", "Priya", "Wei", "Carlos", "Fatima",
+                        "Liam", "Emma", "Noah", "Olivia", "Ava", "Mateo", "Yuki", "Amara", "Ivan", "Zoe"])
+LAST_NAMES = np.array(["Smith", "Davis", "Johnson", "Wilson", "Lee", "Brown", "Patel", "Chen", "Garcia", "Khan",
+                       "Nguyen", "Martin", "Lopez", "Kim", "Clark", "Lewis", "Walker", "Young", "Hall", "Allen"])
+GROUP_KINDS = np.array(["Book Club", "Hiking", "Tech Meetup", "Chess Club", "Running Crew", "Study Group",
+                        "Choir", "Volunteers", "Board Games", "Photography"])
+EVENT_KINDS = np.array(["Meeting", "Workshop", "Social", "Trip", "Practice", "Talk", "Game Night", "Review"])
+
+
+@dataclass
+class GeneratorConfig:
+    """
+    Volume and shape of the generated data set.
+    """
+    users: int = 10_000
+    groups: int = 500
+    # Power-law exponent for group sizes; lower means heavier tail
+    group_size_alpha: float = 1.2
+    min_group_size: int = 8
+    max_group_size: int = 50_000
+    # Share of each group's members drawn from the globally popular pool
+    collaborator_fraction: float = 0.3
+    events_per_group: float = 8.0
+    rsvp_rate: float = 0.25
+    # Share of events whose creation notified the group (older data predates notifications)
+    notified_event_fraction: float = 0.3
+    read_rate: float = 0.7
+    start_date: datetime = datetime(2025, 1, 1)
+    days: int = 730
+    seed: int = 4090
+
+
+def _usernames(ids: np.ndarray) -> np.ndarray:
+    return np.char.add("user", np.char.zfill(ids.astype(str), 7))
+
+
+def _power_law_sizes(rng: np.random.Generator, config: GeneratorConfig) -> np.ndarray:
+    """Pareto distributed group sizes, clipped to [min_group_size, min(max_group_size, users)]."""
+    upper = min(config.max_group_size, config.users)
+    sizes = config.min_group_size * (1 + rng.pareto(config.group_size_alpha, config.groups))
+    return np.clip(sizes.astype(np.int64), min(config.min_group_size, upper), upper)
+
+
+def generate(config: GeneratorConfig) -> Dict[str, pd.DataFrame]:
+    """
+    Generate every table for a config.
+
+    Args:
+        config (GeneratorConfig): Volume and shape of the data set
+
+    Returns:
+        Dict[str, pd.DataFrame]: Table name -> rows, keyed in LOAD_ORDER
+    """
+    rng = np.random.default_rng(config.seed)
+    n_users, n_groups = config.users, config.groups
+    user_ids = np.arange(n_users)
+    usernames = _usernames(user_ids)
+
+    users = pd.DataFrame({
+        "username": usernames,
+        "password": np.char.add("pw", user_ids.astype(str)),
+        "Fname": rng.choice(FIRST_NAMES, n_users),
+        "Lname": rng.choice(LAST_NAMES, n_users),
+        "isAdmin": np.zeros(n_users, dtype=bool),
+    })
+
+    group_ids = np.arange(1, n_groups + 1)
+    groups = pd.DataFrame({
+        "groupID": group_ids,
+        "groupName": np.char.add(np.char.add(rng.choice(GROUP_KINDS, n_groups), " "), group_ids.astype(str)),
+        "description": np.char.add("Generated group ", group_ids.astype(str)),
+    })
+
+    # Memberships: a local neighbourhood around each group's home user plus
+    # collaborators drawn from a Zipf-like activity distribution over all users.
+    sizes = _power_law_sizes(rng, config)
+    member_group = np.repeat(group_ids, sizes)
+    home = np.repeat(rng.integers(0, n_users, n_groups), sizes)
+    local = (home + rng.integers(0, np.repeat(sizes, sizes) * 4)) % n_users
+    activity = 1.0 / np.arange(1, n_users + 1) ** 0.8
+    popular = rng.permutation(n_users)[rng.choice(n_users, len(member_group), p=activity / activity.sum())]
+    is_collaborator = rng.random(len(member_group)) < config.collaborator_fraction
+    member_user = np.where(is_collaborator, popular, local)
+
+    # One admin per group, always a member
+    admin_user = member_user[np.concatenate(([0], np.cumsum(sizes)[:-1]))]
+    keys = np.unique(np.concatenate((member_group * n_users + member_user, group_ids * n_users + admin_user)))
+    member_group, member_user = keys // n_users, keys % n_users
+    group_members = pd.DataFrame({"username": usernames[member_user], "groupID": member_group})
+    group_admins = pd.DataFrame({"username": usernames[admin_user], "groupID": group_ids})
+
+    # Members sorted by group so each group's members are a contiguous slice
+    counts = np.bincount(member_group, minlength=n_groups + 1)[1:]
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # Events: bigger groups run more events
+    per_group = rng.poisson(config.events_per_group * np.sqrt(counts / counts.mean())) + 1
+    event_group = np.repeat(group_ids, per_group)
+    n_events = len(event_group)
+    event_ids = np.arange(1, n_events + 1)
+    start = np.datetime64(config.start_date, "s")
+    event_dates = start + rng.integers(0, config.days * 86_400, n_events).astype("timedelta64[s]")
+    events = pd.DataFrame({
+        "eventID": event_ids,
+        "date": pd.to_datetime(event_dates),
+        "description": np.char.add(np.char.add(rng.choice(EVENT_KINDS, n_events), " #"), event_ids.astype(str)),
+    })
+    group_to_event = pd.DataFrame({"eventID": event_ids, "groupID": event_group})
+
+    # RSVPs: a binomial share of the hosting group's members
+    group_index = event_group - 1
+    rsvp_counts = rng.binomial(counts[group_index], config.rsvp_rate)
+    rsvp_event = np.repeat(event_ids, rsvp_counts)
+    rsvp_group = np.repeat(group_index, rsvp_counts)
+    picks = offsets[rsvp_group] + (rng.random(len(rsvp_event)) * counts[rsvp_group]).astype(np.int64)
+    rsvp_keys = np.unique(rsvp_event * n_users + member_user[picks])
+    rsvps = pd.DataFrame({"eventID": rsvp_keys // n_users, "username": usernames[rsvp_keys % n_users]})
+
+    # Notifications: every member of the hosting group, for a share of events.
+    # Creation times are distinct per event so (username, notificationTimestamp) stays unique.
+    notified = event_ids[rng.random(n_events) < config.notified_event_fraction]
+    notified_group = group_index[notified - 1]
+    fanout = counts[notified_group]
+    note_event = np.repeat(notified, fanout)
+    slot = np.arange(fanout.sum()) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+    note_user = member_user[np.repeat(offsets[notified_group], fanout) + slot]
+    created = start + (note_event * 60).astype("timedelta64[s]")
+    age = (note_event.max(initial=1) - note_event) / max(note_event.max(initial=1), 1)
+    notifications = pd.DataFrame({
+        "username": usernames[note_user],
+        "description": events["description"].to_numpy()[note_event - 1],
+        "eventID": note_event,
+        "isRead": rng.random(len(note_event)) < config.read_rate * (0.5 + age),
+        "notificationTimestamp": pd.to_datetime(created),
+        "eventDate": pd.to_datetime(event_dates[note_event - 1]),
+    })
+
+    return {
+        "User": users,
+        "Group": groups,
+        "GroupMember": group_members,
+        "GroupAdmin": group_admins,
+        "Event": events,
+        "GroupToEvent": group_to_event,
+        "RSVP": rsvps,
+        "Notifications": notifications,
+    }
+
+
+def chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def load(db: DatabaseManager, tables: Dict[str, pd.DataFrame], chunk_size: int = 50_000,
+         progress: bool = True) -> Dict[str, Tuple[int, float]]:
+    """
+    Bulk-load generated tables in foreign key order.
+
+    Args:
+        db (DatabaseManager): Target database
+        tables (dict): Output of generate()
+        chunk_size (int): Rows per INSERT batch / transaction
+        progress (bool): Print a progress line per chunk
+
+    Returns:
+        Dict[str, Tuple[int, float]]: Table name -> (rows loaded, seconds taken)
+    """
+    stats = {}
+    for name in LOAD_ORDER:
+        df = tables[name]
+        loaded, start = 0, time.perf_counter()
+        for chunk in chunks(df, chunk_size):
+            db.send_df_to_table(chunk, name)
+            loaded += len(chunk)
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r  {name:<14} {loaded:>10,}/{len(df):,} rows  {loaded / max(elapsed, 1e-9):>10,.0f} rows/s",
+                      end="", flush=True)
+        stats[name] = (loaded, time.perf_counter() - start)
+        if progress:
+            print()
+    # Notifications were loaded directly, so derive the unread counters (migration 0004)
+    if inspect(db.engine).has_table("NotificationUnreadCount"):
+        NotificationManager(db=db).rebuildUnreadCounts()
+    return stats
+
+
+def main(argv: Optional[list] = None):
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--groups", type=int, default=defaults.groups)
+    parser.add_argument("--alpha", type=float, default=defaults.group_size_alpha, help="group size power-law exponent")
+    parser.add_argument("--collaborators", type=float, default=defaults.collaborator_fraction)
+    parser.add_argument("--events-per-group", type=float, default=defaults.events_per_group)
+    parser.add_argument("--rsvp-rate", type=float, default=defaults.rsvp_rate)
+    parser.add_argument("--notified-events", type=float, default=defaults.notified_event_fraction)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--dry-run", action="store_true", help="generate and report sizes without loading")
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(
+        users=args.users, groups=args.groups, group_size_alpha=args.alpha,
+        collaborator_fraction=args.collaborators, events_per_group=args.events_per_group,
+        rsvp_rate=args.rsvp_rate, notified_event_fraction=args.notified_events, seed=args.seed,
+    )
+
+    start = time.perf_counter()
+    tables = generate(config)
+    print(f"Generated in {time.perf_counter() - start:.1f}s (seed {config.seed}):")
+    for name in LOAD_ORDER:
+        print(f"  {name:<14} {len(tables[name]):>12,} rows")
+    sizes = tables["GroupMember"].groupby("groupID").size()
+    print(f"  group sizes: median {sizes.median():.0f}, p99 {sizes.quantile(0.99):.0f}, max {sizes.max()}")
+
+    if args.dry_run:
+        return
+    print("Loading ...")
+    db = DatabaseManager.from_settings(Settings())
+    stats = load(db, tables, chunk_size=args.chunk_size)
+    total_rows = sum(rows for rows, _ in stats.values())
+    total_time = sum(seconds for _, seconds in stats.values())
+    print(f"Loaded {total_rows:,} rows in {total_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,16 @@ import pandas as pd
 from fastapi import FastAPI
 from datetime import datetime, timedelta
 
-# Add the path to the api/classes directory so Python can find SQLManager.py
-sys.path.append(os.path.join(os.path.dirname(__file__), "api", "classes"))
+# Add the api directory to the path so the classes package can be imported
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "api"))
 
-####################################################################
-# Pathing may be wrong, the DatabaseManager was moved into the classes folder in api
-####################################################################
-
-# Import your DatabaseManager class
-from SQLManager import DatabaseManager
+from classes.SQLManager import DatabaseManager
+from classes.ServiceConfig import Settings
 
 app = FastAPI()
 
-# Initialize db connection
-db = DatabaseManager(
-    server="cs4090.database.windows.net,1433",
-    database="CS4090Project",
-    username="DevUser",
-    password="CSProject4090!"
-)
+# Initialize db connection (set DATABASE_URL=sqlite:///local.db to populate a local database)
+db = DatabaseManager.from_settings(Settings())
 
 # Population functions
 
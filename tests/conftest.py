@@ -0,0 +1,44 @@
+"""
+Shared Test Fixtures
+
+File Name: conftest.py
+
+The seeded SQLite database the service-level suites run against, and the
+fake clock the time-dependent classes are driven with. A module that needs
+more rows overrides db and adds them to this one.
+"""
+
+import pytest
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.SQLManager import DatabaseManager
+
+
+class Clock:
+    """Stands in for time.monotonic or datetime.now; tests move now by hand"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Chess (admin bob, carol) and Go (carol)"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'clubs.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES (:u, 'pw', 'F', 'L', 0)",
+         [{"u": "bob"}, {"u": "carol"}]),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:g, :n, 'club')",
+         [{"g": 1, "n": "Chess"}, {"g": 2, "n": "Go"}]),
+        ("INSERT INTO GroupMember (username, groupID) VALUES (:u, :g)",
+         [{"u": "bob", "g": 1}, {"u": "carol", "g": 1}, {"u": "carol", "g": 2}]),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES ('bob', 1)", None),
+    ])
+    return db
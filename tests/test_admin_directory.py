@@ -0,0 +1,146 @@
+"""
+Admin Directory Test Suite
+
+File Name: test_admin_directory.py
+
+Runs classes/AdminDirectory.py against a SQLite file: lookups by group and by
+user, write-through on add/remove, reloads after the ttl and on a confirmed
+miss, admin-scoped notification recipients, and event authorisation in the
+Events Service.
+
+Run: pytest test_admin_directory.py -v
+"""
+
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.AdminDirectory import AdminDirectory
+from classes.NotificationManager import NotificationManager
+from classes.SQLManager import DatabaseManager
+from Main import create_app
+from tests.conftest import Clock
+
+
+class CountingDB:
+    """Wraps a DatabaseManager and counts the queries sent through it"""
+
+    def __init__(self, db):
+        self.db = db
+        self.queries = 0
+
+    def read_query_to_df(self, sql, params=None):
+        self.queries += 1
+        return self.db.read_query_to_df(sql, params)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """carol runs Chess (1), dave runs Go (2); bob is in Chess, which has event 1"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'admins.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES (:u, 'pw', 'F', 'L', 0)",
+         [{"u": u} for u in ("bob", "carol", "dave")]),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Chess', 'club')", None),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (2, 'Go', 'club')", None),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES ('carol', 1)", None),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES ('dave', 2)", None),
+        ("INSERT INTO GroupMember (username, groupID) VALUES ('bob', 1)", None),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (1, :d, 'meet')", {"d": datetime(2026, 3, 1)}),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (1, 1)", None),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (2, :d, 'solo')", {"d": datetime(2026, 3, 2)}),
+    ])
+    return db
+
+
+def test_lookups_by_group_and_user(db):
+    admins = AdminDirectory(db)
+    assert admins.admins_of(1) == {"carol"}
+    assert admins.groups_of("dave") == {2}
+    assert admins.all_admins() == {"carol", "dave"}
+    assert admins.is_admin("carol", 1) and not admins.is_admin("carol", 2)
+    assert admins.admins_of(99) == set() and admins.groups_of("bob") == set()
+
+
+def test_lookups_are_served_from_memory_until_ttl(db):
+    clock, counting = Clock(), CountingDB(db)
+    admins = AdminDirectory(counting, ttl=30, clock=clock)
+    for _ in range(100):
+        admins.is_admin("carol", 1)
+    assert counting.queries == 1
+
+    db.execute_query("INSERT INTO GroupAdmin (username, groupID) VALUES ('bob', 2)")
+    assert not admins.is_admin("bob", 2)
+    clock.now = 30
+    assert admins.is_admin("bob", 2)
+    assert counting.queries == 2
+
+
+def test_add_and_remove_update_the_cached_copy(db):
+    counting = CountingDB(db)
+    admins = AdminDirectory(counting)
+    assert admins.groups_of("bob") == set()
+    admins.add("bob", 1)
+    admins.remove("dave", 2)
+    assert admins.admins_of(1) == {"bob", "carol"}
+    assert admins.groups_of("bob") == {1}
+    assert admins.admins_of(2) == set() and "dave" not in admins.all_admins()
+    assert counting.queries == 1
+
+    admins.invalidate()
+    assert admins.admins_of(2) == {"dave"}
+    assert counting.queries == 2
+
+
+def test_confirmed_miss_reloads_at_most_once_per_interval(db):
+    clock, counting = Clock(), CountingDB(db)
+    admins = AdminDirectory(counting, ttl=30, clock=clock)
+    assert not admins.is_admin("bob", 2)
+    db.execute_query("INSERT INTO GroupAdmin (username, groupID) VALUES ('bob', 2)")
+
+    assert not admins.is_admin("bob", 2, confirm=True)  # loaded just now
+    clock.now = AdminDirectory.CONFIRM_INTERVAL
+    assert admins.is_admin("bob", 2, confirm=True)
+    assert counting.queries == 2
+
+
+def test_notifications_go_to_the_groups_own_admins(db):
+    nm = NotificationManager(db=db)
+    written = nm.createNotification(["bob"], "meet", 1, created_at=datetime(2026, 1, 1),
+                                    eventDate=datetime(2026, 3, 1), groupID=1)
+    assert written == 2
+    assert nm.getUnreadCount("carol") == 1
+    assert nm.getUnreadCount("dave") == 0
+
+
+def test_event_changes_need_a_group_admin(db):
+    client = TestClient(create_app(db=db))
+    payload = {"name": "Meet", "date": "2026-03-05", "time": "18:00"}
+
+    res = client.put("/events/bob/1", json=payload)
+    assert res.status_code == 403
+    assert client.delete("/events/dave/1").status_code == 403
+
+    assert client.put("/events/carol/1", json=payload).status_code == 200
+    # An event in no group is open to any user, as before
+    assert client.put("/events/bob/2", json=payload).status_code == 200
+    assert client.delete("/events/carol/1").status_code == 200
+
+
+def test_group_created_through_the_composed_app_is_admin_at_once(db):
+    client = TestClient(create_app(db=db))
+    assert client.get("/groups/admin/bob").json() == []
+
+    res = client.post("/groups/create", json={"groupName": "Bridge", "description": "d", "adminUsername": "bob"})
+    assert res.status_code == 201
+    group_id = res.json()["groupID"]
+    assert [g["groupID"] for g in client.get("/groups/admin/bob").json()] == [group_id]
+
+    res = client.post(f"/events/group/{group_id}", json={"date": "2026-04-01T18:00:00", "description": "first"})
+    event_id = res.json()["eventID"]
+    assert client.delete(f"/events/bob/{event_id}").status_code == 200
@@ -0,0 +1,160 @@
+"""
+Admission Control Test Suite
+
+File Name: test_admission.py
+
+Checks classes/AdmissionControl.py: requests over the concurrency limits
+wait in bounded per-lane queues, are turned away with 503 and Retry-After
+when a queue is full or its deadline passes, and queued reads are admitted
+before queued writes.
+
+Run: pytest test_admission.py -v
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.AdmissionControl import (READ, WRITE, AdmissionController, AdmissionMiddleware, Lane, Rejected,
+                                      classify)
+from classes.ServiceConfig import Settings
+from classes.SQLManager import DatabaseManager
+from Main import create_app
+
+
+def controller(total=1, writes=1, queue=10, deadline=1.0):
+    return AdmissionController(total, {
+        READ: Lane(max_concurrent=total, max_queue=queue, deadline=deadline),
+        WRITE: Lane(max_concurrent=writes, max_queue=queue, deadline=deadline),
+    })
+
+
+def test_classify():
+    assert classify("GET", "/events/group/1") == READ
+    assert classify("POST", "/events/group/1") == WRITE
+    assert classify("PUT", "/notifications/bob/read") == WRITE
+    for method, path in [("GET", "/health"), ("GET", "/groups/health/ready"), ("GET", "/users/health/live"),
+                         ("GET", "/notifications/bob/stream"), ("GET", "/events/stats/admission"),
+                         ("GET", "/groups/stats/coalescing"), ("GET", "/outbox/stats"), ("OPTIONS", "/login")]:
+        assert classify(method, path) is None
+    # User-chosen path segments that look like exempt routes are still admitted
+    for path in ["/events/user/health", "/groups/user/stats", "/notifications/stats",
+                 "/events/user/stats/admission", "/notifications/bob/stream/x"]:
+        assert classify("GET", path) == READ
+
+
+def test_queue_full_and_deadline():
+    async def main():
+        admission = controller(total=1, queue=1, deadline=0.05)
+        await admission.acquire(READ)
+        waiter = asyncio.ensure_future(admission.acquire(READ))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as full:
+            await admission.acquire(READ)
+        assert full.value.reason == "queue full" and full.value.retry_after >= 1
+        with pytest.raises(Rejected, match="deadline"):
+            await waiter
+        stats = admission.stats()["lanes"][READ]
+        assert (stats["admitted"], stats["queueFull"], stats["timedOut"], stats["queued"]) == (1, 1, 1, 0)
+    asyncio.run(main())
+
+
+def test_reads_before_writes():
+    async def main():
+        admission, order = controller(total=1), []
+
+        async def request(lane):
+            await admission.acquire(lane)
+            order.append(lane)
+            admission.release(lane, 0.01)
+
+        await admission.acquire(WRITE)
+        queued = [asyncio.ensure_future(request(WRITE)), asyncio.ensure_future(request(READ))]
+        await asyncio.sleep(0)
+        admission.release(WRITE, 0.01)
+        await asyncio.gather(*queued)
+        assert order == [READ, WRITE]
+    asyncio.run(main())
+
+
+def test_writes_capped_within_the_total():
+    async def main():
+        admission = controller(total=3, writes=1)
+        await admission.acquire(WRITE)
+        second_write = asyncio.ensure_future(admission.acquire(WRITE))
+        await asyncio.wait_for(admission.acquire(READ), 0.1)  # reads still get in
+        await asyncio.sleep(0)
+        assert not second_write.done()
+        admission.release(WRITE, 0.01)
+        await asyncio.wait_for(second_write, 0.1)
+        assert admission.active == 2
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def main():
+        admission = controller(total=1)
+        await admission.acquire(READ)
+        waiter = asyncio.ensure_future(admission.acquire(READ))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert admission.stats()["lanes"][READ]["queued"] == 0
+        admission.release(READ, 0.01)
+        assert admission.active == 0
+    asyncio.run(main())
+
+
+def test_overload_gets_fast_503():
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(0.3)
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(AdmissionMiddleware, controller=controller(total=1, queue=1, deadline=5))
+
+    async def burst():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            slow_requests = [asyncio.ensure_future(client.get("/slow")) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            health = await client.get("/health")
+            health_time = time.perf_counter() - start
+            return await asyncio.gather(*slow_requests), health, health_time
+
+    responses, health, health_time = asyncio.run(burst())
+    assert sorted(r.status_code for r in responses) == [200, 200, 503]
+    rejected = next(r for r in responses if r.status_code == 503)
+    assert int(rejected.headers["retry-after"]) >= 1
+    assert health.status_code == 200 and health_time < 0.2  # probes are never queued
+
+
+def test_services_shed_with_cors_headers(tmp_path):
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'admission.db'}")
+    settings = Settings(admission_max_concurrent=1, admission_read_queue=0)
+    app = create_app(settings, db=db)
+    events = next(service for service in app.services if service.title == "Events Service")
+    events.state.admission.active = 1  # every slot taken
+
+    client = TestClient(app)
+    res = client.get("/events/group/1", headers={"Origin": "http://localhost:5173"})
+    assert res.status_code == 503 and "retry-after" in res.headers
+    assert res.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert "Retry-After" in res.headers["access-control-expose-headers"]
+    assert client.get("/groups/user/bob").status_code == 200  # each service has its own limits
+    assert client.get("/events/stats/admission").json()["lanes"]["read"]["queueFull"] == 1
@@ -0,0 +1,111 @@
+"""
+Event Archival Test Suite
+
+File Name: test_archive.py
+
+Runs classes/ArchiveManager.py against a SQLite file and checks that past
+events, their links, RSVPs and read notifications move to the archive tables,
+and that read endpoints only see them with include_archived=true.
+
+Run: pytest test_archive.py -v
+"""
+
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.ArchiveManager import ArchiveManager
+from classes.SQLManager import DatabaseManager
+from Main import create_app
+
+HORIZON = datetime(2026, 1, 1)
+
+
+def count(db, table):
+    return int(db.read_query_to_df(f"SELECT COUNT(*) as total FROM {table}").iloc[0]["total"])
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Two groups' worth of past and future events for bob"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'archive.db'}")
+    statements = [
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES ('bob', 'pw', 'B', 'X', 0)", None),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Chess', 'club')", None),
+        ("INSERT INTO GroupMember (username, groupID) VALUES ('bob', 1)", None),
+    ]
+    for event_id in range(1, 8):
+        date = datetime(2025, event_id, 1) if event_id <= 5 else datetime(2026, event_id, 1)
+        params = {"id": event_id, "date": date, "ts": datetime(2024, 12, 1, 0, event_id)}
+        statements += [
+            ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, :date, 'e')", params),
+            ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, 1)", params),
+            ("INSERT INTO RSVP (eventID, username) VALUES (:id, 'bob')", params),
+            # even events' notifications have been read
+            ("""INSERT INTO Notifications (username, description, eventID, isRead, notificationTimestamp, eventDate)
+                VALUES ('bob', 'e', :id, :id % 2 = 0, :ts, :date)""", params),
+        ]
+    db.execute_transaction(statements)
+    return db
+
+
+def test_archives_past_events_with_links_and_rsvps(db):
+    moved = ArchiveManager(db, batch_size=2, pause=0).archiveEvents(HORIZON)
+    assert moved == 5
+    assert count(db, "[Event]") == 2 and count(db, "EventArchive") == 5
+    assert count(db, "GroupToEvent") == 2 and count(db, "GroupToEventArchive") == 5
+    assert count(db, "RSVP") == 2 and count(db, "RSVPArchive") == 5
+
+
+def test_only_read_notifications_are_archived(db):
+    moved = ArchiveManager(db, batch_size=1, pause=0).archiveNotifications(HORIZON)
+    # past events 2 and 4 were read; 1, 3, 5 are unread and stay hot
+    assert moved == 2
+    hot = db.read_query_to_df("SELECT eventID FROM Notifications ORDER BY eventID")
+    assert hot["eventID"].tolist() == [1, 3, 5, 6, 7]
+
+
+def test_archived_notifications_keep_their_id(db):
+    query = "SELECT eventID, notificationID FROM {} ORDER BY eventID"
+    before = db.read_query_to_df(query.format("Notifications"))
+    ArchiveManager(db, batch_size=10, pause=0).archiveNotifications(HORIZON)
+    after = db.read_query_to_df(query.format("NotificationsAll"))
+    assert after.sort_values("eventID").reset_index(drop=True).equals(before)
+
+def test_batches_are_bounded(db):
+    batches = []
+    archiver = ArchiveManager(db, batch_size=2, pause=0)
+    moved = archiver.archiveEvents(HORIZON, max_batches=2, on_batch=batches.append)
+    assert batches == [2, 2] and moved == 4
+    assert archiver.archiveEvents(HORIZON) == 1
+    assert archiver.archiveEvents(HORIZON) == 0
+
+
+def test_reads_exclude_archive_unless_requested(db):
+    ArchiveManager(db, pause=0).archive(HORIZON)
+    client = TestClient(create_app(db=db))
+
+    assert [e["eventID"] for e in client.get("/events/user/bob").json()] == [6, 7]
+    assert len(client.get("/events/user/bob?include_archived=true").json()) == 7
+    assert len(client.get("/events/group/1?include_archived=true").json()) == 7
+
+    assert client.get("/events/1").status_code == 404
+    details = client.get("/events/1?include_archived=true").json()
+    assert details["groups"][0]["groupID"] == 1
+
+    assert len(client.get("/notifications/bob").json()) == 5
+    assert len(client.get("/notifications/bob?include_archived=true").json()) == 7
+
+
+def test_new_event_ids_skip_archived_ones(db):
+    """IDs of archived events are never reused"""
+    db.execute_query("UPDATE [Event] SET date = :d", {"d": datetime(2025, 1, 1)})
+    ArchiveManager(db, pause=0).archiveEvents(HORIZON)
+    client = TestClient(create_app(db=db))
+    res = client.post("/events/group/1", json={"date": "2026-11-01T18:00:00", "description": "new"})
+    assert res.json()["eventID"] == 8
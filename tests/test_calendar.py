@@ -0,0 +1,162 @@
+"""
+Calendar Feed Test Suite
+
+File Name: test_calendar.py
+
+Runs the .ics feed endpoints of the Events Service against a SQLite file:
+feeds list the right events in valid iCalendar, unchanged feeds answer
+conditional polls with 304 without reading events, and every event write
+(create, update, delete, archive) changes the affected feeds.
+
+Run: pytest test_calendar.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.ArchiveManager import ArchiveManager
+from classes.CalendarFeeds import CalendarFeeds, ics_escape, ics_line
+from classes.ChangeVersions import not_modified
+from Event import create_app
+
+
+@pytest.fixture
+def db(db):
+    """The shared Chess and Go clubs, plus dave, who is in no group"""
+    db.execute_query("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES ('dave', 'pw', 'F', 'L', 0)")
+    return db
+
+
+@pytest.fixture
+def client(db):
+    return TestClient(create_app(db=db))
+
+
+def add_event(client, group_id, date, description):
+    res = client.post(f"/events/group/{group_id}", json={"date": date, "description": description})
+    assert res.status_code == 201
+    return res.json()["eventID"]
+
+
+def summaries(res):
+    return [line[len("SUMMARY:"):] for line in res.text.split("\r\n") if line.startswith("SUMMARY:")]
+
+
+def test_ics_formatting():
+    assert ics_escape("a, b; c\\d\ne") == "a\\, b\\; c\\\\d\\ne"
+    folded = ics_line("SUMMARY:" + "é" * 60)
+    lines = folded.split(b"\r\n")
+    assert all(len(line) <= 75 for line in lines)
+    assert b"".join(lines[:1] + [line[1:] for line in lines[1:]]).decode() == "SUMMARY:" + "é" * 60
+
+
+def test_conditional_rules():
+    assert not_modified('"a", W/"b"', None, '"b"', None)
+    assert not not_modified('"a"', "Sun, 01 Mar 2026 12:00:00 GMT", '"b"', datetime(2020, 1, 1).astimezone())
+    last = datetime.fromisoformat("2026-03-01T12:00:00+00:00")
+    assert not_modified(None, "Sun, 01 Mar 2026 12:00:00 GMT", '"b"', last)
+    assert not not_modified(None, "Sun, 01 Mar 2026 11:59:59 GMT", '"b"', last)
+    assert not not_modified(None, "yesterday", '"b"', last)
+
+
+def test_group_feed_and_304(client, db):
+    add_event(client, 1, "2026-04-02T18:00:00", "Blitz, rapid; classical")
+    add_event(client, 1, "2026-04-01T18:00:00", "Opening night")
+    add_event(client, 2, "2026-04-03T18:00:00", "Go night")
+
+    res = client.get("/events/group/1/calendar.ics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/calendar")
+    assert res.text.startswith("BEGIN:VCALENDAR\r\n") and res.text.endswith("END:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:Chess" in res.text
+    assert "DTSTART:20260401T180000" in res.text
+    assert summaries(res) == ["Opening night", "Blitz\\, rapid\\; classical"]
+
+    etag, modified = res.headers["etag"], res.headers["last-modified"]
+    with patch.object(db, "read_query_to_df", wraps=db.read_query_to_df) as reads:
+        assert client.get("/events/group/1/calendar.ics", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/events/group/1/calendar.ics",
+                          headers={"If-Modified-Since": modified}).status_code == 304
+        assert reads.call_count == 2  # the stamp only
+
+    assert client.get("/events/group/9/calendar.ics").status_code == 404
+
+
+def test_feeds_change_with_events(client, db):
+    event_id = add_event(client, 1, "2026-04-01T18:00:00", "Opening night")
+    add_event(client, 2, "2026-04-03T18:00:00", "Go night")
+    etag = client.get("/events/group/1/calendar.ics").headers["etag"]
+    go_etag = client.get("/events/group/2/calendar.ics").headers["etag"]
+
+    res = client.put(f"/events/bob/{event_id}", json={"name": "Finals", "date": "2026-04-05T18:00:00", "time": "6pm"})
+    assert res.status_code == 200
+    res = client.get("/events/group/1/calendar.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and summaries(res) == ["Finals at 6pm"]
+    assert client.get("/events/group/2/calendar.ics", headers={"If-None-Match": go_etag}).status_code == 304
+
+    etag = res.headers["etag"]
+    assert client.delete(f"/events/bob/{event_id}").status_code == 200
+    res = client.get("/events/group/1/calendar.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and summaries(res) == []
+
+
+
+def test_failed_delete_keeps_the_feed_stamp(client, db):
+    event_id = add_event(client, 1, "2026-04-01T18:00:00", "Opening night")
+    etag = client.get("/events/group/1/calendar.ics").headers["etag"]
+    db.execute_query("""
+        CREATE TRIGGER keep_events BEFORE DELETE ON [Event]
+        BEGIN SELECT RAISE(ABORT, 'locked'); END
+    """)
+    assert client.delete(f"/events/bob/{event_id}").status_code == 500
+    res = client.get("/events/group/1/calendar.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 304  # the bump rolled back with the deletes
+
+def test_user_feed(client, db):
+    add_event(client, 1, "2026-04-01T18:00:00", "Chess night")
+    add_event(client, 2, "2026-04-03T18:00:00", "Go night")
+
+    res = client.get("/events/user/carol/calendar.ics")
+    assert summaries(res) == ["Chess night", "Go night"]
+    assert "CATEGORIES:Go" in res.text
+    assert "last-modified" not in res.headers
+    etag = res.headers["etag"]
+    assert client.get("/events/user/carol/calendar.ics", headers={"If-None-Match": etag}).status_code == 304
+
+    # Leaving a group changes the feed even though no event did
+    db.execute_query("DELETE FROM GroupMember WHERE username = 'carol' AND groupID = 2")
+    res = client.get("/events/user/carol/calendar.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and summaries(res) == ["Chess night"]
+
+    assert summaries(client.get("/events/user/dave/calendar.ics")) == []
+    assert client.get("/events/user/nobody/calendar.ics").status_code == 404
+
+
+def test_regenerated_only_when_changed(db):
+    feeds = CalendarFeeds(db, max_feeds=1)
+    db.execute_transaction([
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (1, '2026-04-01 18:00:00', 'x')", None),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (1, 1)", None),
+    ])
+    with patch.object(feeds, "_render", wraps=feeds._render) as render:
+        first = feeds.body(feeds.groupStamp(1))
+        assert feeds.body(feeds.groupStamp(1)) is first
+        assert render.call_count == 1
+        feeds.body(feeds.groupStamp(2))  # pushes group 1 out of a one-feed cache
+        feeds.body(feeds.groupStamp(1))
+        assert render.call_count == 3
+
+
+def test_archiving_changes_the_feed(client, db):
+    add_event(client, 1, "2020-01-01T18:00:00", "Long ago")
+    etag = client.get("/events/group/1/calendar.ics").headers["etag"]
+    ArchiveManager(db, pause=0).archiveEvents(datetime.now() - timedelta(days=180))
+    res = client.get("/events/group/1/calendar.ics", headers={"If-None-Match": etag})
+    assert res.status_code == 200 and summaries(res) == []
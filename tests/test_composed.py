@@ -0,0 +1,103 @@
+"""
+Composed Service Test Suite
+
+File Name: test_composed.py
+
+Checks that the single-process entry point in api/Main.py routes each request
+to the service that owns it. A single mock database is injected.
+
+Run: pytest test_composed.py -v
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from Main import create_app, ServiceDispatcher, service_prefixes
+
+
+@pytest.fixture
+def mock_db():
+    """One mock database shared by every service, as in production"""
+    return MagicMock()
+
+
+@pytest.fixture
+def client(mock_db):
+    """Create test client for the composed app"""
+    with TestClient(create_app(db=mock_db)) as c:
+        yield c
+
+
+def test_service_prefixes_skip_docs_routes():
+    """Only API routes contribute prefixes"""
+    service = FastAPI()
+
+    @service.get("/things/{thing_id}")
+    async def get_thing(thing_id: int):
+        return {}
+
+    assert service_prefixes(service) == ["/things"]
+
+
+def test_duplicate_prefix_rejected():
+    """Two services may not claim the same path prefix"""
+    first, second = FastAPI(title="first"), FastAPI(title="second")
+
+    @first.get("/shared")
+    async def a():
+        return {}
+
+    @second.get("/shared/thing")
+    async def b():
+        return {}
+
+    with pytest.raises(ValueError):
+        ServiceDispatcher([first, second])
+
+
+def test_routes_login_to_user_service(client, mock_db):
+    """/login is served by the User service"""
+    mock_df = MagicMock()
+    mock_df.__len__.return_value = 0
+    mock_db.read_query_to_df.return_value = mock_df
+
+    res = client.post("/login", json={"username": "nobody", "password": "x"})
+
+    assert res.status_code == 401
+
+
+def test_routes_events_to_event_service(client, mock_db):
+    """/events/... is served by the Event service"""
+    mock_df = MagicMock()
+    mock_df.__len__.return_value = 0
+    mock_db.read_query_to_df.return_value = mock_df
+
+    res = client.get("/events/user/testuser")
+
+    assert res.status_code == 200
+    assert res.json() == []
+
+
+def test_routes_groups_to_group_service(client, mock_db):
+    """/groups/... is served by the Group service"""
+    mock_df = MagicMock()
+    mock_df.to_dict.return_value = [{"groupID": 1, "groupName": "Test", "description": "desc"}]
+    mock_db.read_query_to_df.return_value = mock_df
+
+    res = client.get("/groups/user/testuser")
+
+    assert res.status_code == 200
+    assert res.json()[0]["groupID"] == 1
+
+
+def test_unknown_prefix_not_found(client):
+    """Paths no service owns return 404"""
+    res = client.get("/nothing/here")
+    assert res.status_code == 404
@@ -0,0 +1,139 @@
+"""
+Response Compression Test Suite
+
+File Name: test_compression.py
+
+Checks the shared CompressionMiddleware (classes/Compression.py): codings are
+negotiated from Accept-Encoding, small and streamed responses are left alone,
+large ones are compressed (off the event loop past the offload size), and the
+services' list endpoints arrive compressed with a weak ETag.
+
+Run: pytest test_compression.py -v
+"""
+
+import gzip
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes import Compression
+from classes.Compression import CompressionMiddleware, negotiate
+from classes.ServiceConfig import Settings
+from classes.SQLManager import DatabaseManager
+from Main import create_app
+
+BIG = b'{"rows":[' + b",".join(b'{"eventID":%d,"description":"Chess night"}' % i for i in range(400)) + b"]}"
+
+
+def raw_get(client, url, accept="gzip"):
+    """The response as sent, without the client decoding it"""
+    with client.stream("GET", url, headers={"Accept-Encoding": accept}) as res:
+        return res, b"".join(res.iter_raw())
+
+
+def make_client(offload_size: int) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    def big():
+        return Response(BIG, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BIG, BIG]), media_type="application/json")
+
+    @app.get("/unchanged")
+    def unchanged():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, offload_size=offload_size)
+    return TestClient(app)
+
+
+@pytest.fixture
+def small_app():
+    return make_client(offload_size=len(BIG) + 1)
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert negotiate("gzip;q=0.5, br", ["br", "gzip"]) == "br"
+    assert negotiate("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["br", "gzip"]) is None
+    assert negotiate("GZIP;q=0.001", ["gzip"]) == "gzip"
+    assert negotiate("gzip;q=0", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+
+def test_large_body_compressed(small_app):
+    res, body = raw_get(small_app, "/big")
+    assert res.headers["content-encoding"] == "gzip"
+    assert res.headers["vary"] == "Accept-Encoding"
+    assert int(res.headers["content-length"]) == len(body) < len(BIG) / 4
+    assert gzip.decompress(body) == BIG
+    assert res.headers["etag"] == 'W/"v1"'
+
+
+def test_left_alone(small_app):
+    res, body = raw_get(small_app, "/small")
+    assert "content-encoding" not in res.headers and body == b'{"ok":true}'
+    assert res.headers["vary"] == "Accept-Encoding"
+
+    res, body = raw_get(small_app, "/big", accept="identity")
+    assert "content-encoding" not in res.headers and body == BIG and res.headers["etag"] == '"v1"'
+
+    res, body = raw_get(small_app, "/stream")
+    assert "content-encoding" not in res.headers and body == BIG + BIG
+
+    res, _ = raw_get(small_app, "/unchanged")
+    assert res.status_code == 304 and "content-encoding" not in res.headers
+
+
+def test_large_bodies_compressed_off_the_loop(small_app):
+    with patch.object(Compression, "run_in_threadpool", wraps=Compression.run_in_threadpool) as offload:
+        small_app.get("/big")
+        assert offload.call_count == 0
+        res = make_client(offload_size=1024).get("/big")
+        assert offload.call_count == 1 and res.content == BIG
+
+
+@pytest.mark.skipif(Compression.brotli is None, reason="brotli is not installed")
+def test_brotli_preferred(small_app):
+    res, body = raw_get(small_app, "/big", accept="gzip, br")
+    assert res.headers["content-encoding"] == "br"
+    assert Compression.brotli.decompress(body) == BIG
+
+
+def test_services_compress_lists(tmp_path):
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'compression.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES ('bob', 'pw', 'F', 'L', 0)", None),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Chess', 'club')", None),
+        ("INSERT INTO GroupMember (username, groupID) VALUES ('bob', 1)", None),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', 'Chess night')",
+         [{"id": i} for i in range(1, 101)]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, 1)", [{"id": i} for i in range(1, 101)]),
+    ])
+    with TestClient(create_app(db=db)) as client:
+        res, body = raw_get(client, "/events/group/1")
+        assert res.headers["content-encoding"] == "gzip" and res.headers["etag"].startswith('W/"')
+        assert len(gzip.decompress(body)) > 4 * len(body)
+        assert client.get("/events/group/1", headers={"If-None-Match": res.headers["etag"]}).status_code == 304
+
+        res, _ = raw_get(client, "/groups/user/bob")
+        assert res.status_code == 200 and "content-encoding" not in res.headers  # one group: under the threshold
+
+    with TestClient(create_app(Settings(compression_min_bytes=-1), db=db)) as client:
+        res, _ = raw_get(client, "/events/group/1")
+        assert "content-encoding" not in res.headers
@@ -0,0 +1,122 @@
+"""
+Conditional GET Test Suite
+
+File Name: test_conditional_get.py
+
+Runs the composed app against a SQLite file: the event, group and
+notification lists the frontend re-fetches carry ETags from the change
+counters (classes/ChangeVersions.py), answer a current If-None-Match with
+304 without running their query, and change tag after every write that
+changes what they return.
+
+Run: pytest test_conditional_get.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.ArchiveManager import ArchiveManager
+from classes.NotificationManager import NotificationManager
+from Main import create_app
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(create_app(db=db)) as client:
+        yield client
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+@pytest.mark.parametrize("url", ["/events/user/carol", "/events/group/1", "/groups/user/carol",
+                                 "/notifications/carol"])
+def test_304_skips_the_query(client, db, url):
+    client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "Chess night"})
+    res = client.get(url)
+    assert res.status_code == 200 and res.json()
+    etag = res.headers["etag"]
+    assert etag.startswith('W/"') and res.headers["cache-control"] == "no-cache"
+
+    with patch.object(db, "read_query_to_df", wraps=db.read_query_to_df) as reads:
+        res = revalidate(client, url, etag)
+        assert res.status_code == 304 and res.content == b""
+        assert res.headers["etag"] == etag
+        assert reads.call_count == 1  # the version stamp
+    assert revalidate(client, url, 'W/"stale", ' + etag).status_code == 304
+    assert revalidate(client, url, '"stale"').status_code == 200
+
+
+def test_event_writes_change_event_tags(client):
+    event_id = client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "a"}).json()["eventID"]
+    chess = client.get("/events/group/1").headers["etag"]
+    go = client.get("/events/group/2").headers["etag"]
+    carol = client.get("/events/user/carol").headers["etag"]
+
+    client.put(f"/events/bob/{event_id}", json={"name": "b", "time": "6pm"})
+    assert revalidate(client, "/events/group/1", chess).status_code == 200
+    assert revalidate(client, "/events/group/2", go).status_code == 304
+    res = revalidate(client, "/events/user/carol", carol)
+    assert res.status_code == 200 and res.json()[0]["description"] == "b at 6pm"
+
+    carol = res.headers["etag"]
+    client.post("/events/group/2", json={"date": "2026-04-02T18:00:00", "description": "c"})
+    assert revalidate(client, "/events/user/carol", carol).status_code == 200
+
+
+def test_membership_changes_tags(client):
+    events = client.get("/events/user/bob").headers["etag"]
+    groups = client.get("/groups/user/bob").headers["etag"]
+    client.post("/groups/join/2", params={"username": "bob"})
+    assert revalidate(client, "/events/user/bob", events).status_code == 200
+    res = revalidate(client, "/groups/user/bob", groups)
+    assert res.status_code == 200 and sorted(g["groupID"] for g in res.json()) == [1, 2]
+
+
+def test_notification_writes_change_the_tag(client, db):
+    client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "a"})
+    res = client.get("/notifications/carol")
+    etag = res.headers["etag"]
+    notification_id = res.json()[0]["notificationID"]
+
+    client.put("/notifications/carol/read", json={"notificationIDs": [notification_id]})
+    res = revalidate(client, "/notifications/carol", etag)
+    assert res.status_code == 200 and res.json()[0]["isRead"] == 1
+    etag = res.headers["etag"]
+
+    # Marking nothing leaves it alone; an already-read notification still changes the list
+    client.put("/notifications/carol/read-all")
+    assert revalidate(client, "/notifications/carol", etag).status_code == 304
+    nm = NotificationManager(db=db)
+    nm.createNotification(["carol"], "read already", 1, datetime(2026, 3, 1, 9), datetime(2026, 4, 1), isRead=1)
+    res = revalidate(client, "/notifications/carol", etag)
+    assert res.status_code == 200 and len(res.json()) == 2
+    etag = res.headers["etag"]
+
+    # Archiving moves read notifications out of the default list
+    ArchiveManager(db, pause=0).archiveNotifications(datetime(2027, 1, 1))
+    res = revalidate(client, "/notifications/carol", etag)
+    assert res.status_code == 200 and res.json() == []
+
+
+def test_rebuilding_counts_changes_the_tag(client, db):
+    client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "a"})
+    etag = client.get("/notifications/carol").headers["etag"]
+    assert NotificationManager(db=db).rebuildUnreadCounts() == 2
+    assert revalidate(client, "/notifications/carol", etag).status_code == 200
+    assert client.get("/notifications/carol/unread-count").json()["unreadCount"] == 1
+
+
+def test_notification_tags_differ_between_users(client):
+    client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "a"})
+    bob, carol = (client.get(f"/notifications/{u}").headers["etag"] for u in ("bob", "carol"))
+    assert bob != carol  # both counters are at the same version
+    assert revalidate(client, "/notifications/bob", carol).status_code == 200
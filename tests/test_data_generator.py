@@ -0,0 +1,95 @@
+"""
+Synthetic Data Generator Test Suite
+
+File Name: test_data_generator.py
+
+Checks that sql/testSQLConnection/DataGenerator.py is reproducible, respects
+every primary key and membership rule, produces skewed group sizes, and loads
+into a local SQLite database.
+
+Run: pytest test_data_generator.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.insert(0, os.path.join(ROOT, "sql", "testSQLConnection"))
+
+from DataGenerator import GeneratorConfig, LOAD_ORDER, generate, load
+from classes.SQLManager import DatabaseManager
+
+PRIMARY_KEYS = {
+    "User": ["username"],
+    "Group": ["groupID"],
+    "GroupMember": ["username", "groupID"],
+    "GroupAdmin": ["username", "groupID"],
+    "Event": ["eventID"],
+    "GroupToEvent": ["eventID", "groupID"],
+    "RSVP": ["eventID", "username"],
+    "Notifications": ["username", "notificationTimestamp"],
+}
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate(GeneratorConfig(users=2000, groups=100, seed=7))
+
+
+def test_same_seed_same_data(tables):
+    """Generation is reproducible from the seed"""
+    again = generate(GeneratorConfig(users=2000, groups=100, seed=7))
+    for name in LOAD_ORDER:
+        assert tables[name].equals(again[name])
+    other = generate(GeneratorConfig(users=2000, groups=100, seed=8))
+    assert not tables["GroupMember"].equals(other["GroupMember"])
+
+
+@pytest.mark.parametrize("name", LOAD_ORDER)
+def test_primary_keys_unique(tables, name):
+    """No generated table violates its primary key"""
+    assert not tables[name].duplicated(PRIMARY_KEYS[name]).any()
+
+
+def test_admins_are_members(tables):
+    """Every group has an admin who is also a member"""
+    members = set(zip(tables["GroupMember"]["username"], tables["GroupMember"]["groupID"]))
+    admins = set(zip(tables["GroupAdmin"]["username"], tables["GroupAdmin"]["groupID"]))
+    assert admins <= members
+    assert len(admins) == 100
+
+
+def test_rsvps_and_notifications_come_from_group_members(tables):
+    """Only members of an event's group RSVP or get notified"""
+    members = set(zip(tables["GroupMember"]["username"], tables["GroupMember"]["groupID"]))
+    event_group = dict(zip(tables["GroupToEvent"]["eventID"], tables["GroupToEvent"]["groupID"]))
+    for table in ("RSVP", "Notifications"):
+        df = tables[table]
+        assert all((u, event_group[e]) in members for u, e in zip(df["username"], df["eventID"]))
+
+
+def test_group_sizes_are_skewed(tables):
+    """Power-law sizes: the largest group dwarfs the median one"""
+    sizes = tables["GroupMember"].groupby("groupID").size()
+    assert sizes.max() > 5 * sizes.median()
+
+
+def test_users_collaborate_across_groups(tables):
+    """Some users belong to several groups"""
+    per_user = tables["GroupMember"].groupby("username").size()
+    assert (per_user >= 3).sum() > 0
+
+
+def test_load_into_sqlite(tmp_path):
+    """Chunked load writes every row"""
+    small = generate(GeneratorConfig(users=200, groups=10, seed=1))
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'gen.db'}")
+    stats = load(db, small, chunk_size=100, progress=False)
+    for name in LOAD_ORDER:
+        df = db.read_query_to_df(f"SELECT COUNT(*) as total FROM [{name}]")
+        assert int(df.iloc[0]["total"]) == len(small[name]) == stats[name][0]
+    unread = db.read_query_to_df("SELECT SUM(unreadCount) as total FROM NotificationUnreadCount")
+    assert int(unread.iloc[0]["total"]) == int((~small["Notifications"]["isRead"]).sum())
@@ -0,0 +1,110 @@
+"""
+Request Batching Test Suite
+
+File Name: test_data_loader.py
+
+Checks classes/DataLoader.py: lookups made in the same tick go out as one
+batch (split at max_batch), results are memoised and errors are not, and
+the Events and Group services answer by-ID lists with one query per entity
+type however many IDs are asked for.
+
+Run: pytest test_data_loader.py -v
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.DataLoader import DataLoader, Loaders
+from classes.SingleFlight import SingleFlight
+from classes.SQLManager import DatabaseManager
+import Event
+import Group
+
+
+def recording(found, batches, error=None):
+    async def batch(keys):
+        batches.append(keys)
+        if error:
+            raise error
+        return {key: found[key] for key in keys if key in found}
+    return batch
+
+
+def test_loads_in_one_tick_share_a_batch():
+    async def main():
+        batches = []
+        loader = DataLoader(recording({1: "a", 2: "b", 3: "c"}, batches))
+
+        async def lookup(key):
+            return await loader.load(key)
+
+        assert await asyncio.gather(lookup(1), lookup(2), lookup(9), lookup(1)) == ["a", "b", None, "a"]
+        assert await loader.load_many([3, 2]) == ["c", "b"]
+        assert batches == [[1, 2, 9], [3]]  # 2 was memoised
+        assert await loader.load(1) == "a" and loader.batches == 2
+    asyncio.run(main())
+
+
+def test_large_batches_are_split_and_errors_not_memoised():
+    async def main():
+        batches = []
+        loader = DataLoader(recording({i: i for i in range(5)}, batches), max_batch=2)
+        assert await loader.load_many(range(5)) == [0, 1, 2, 3, 4]
+        assert batches == [[0, 1], [2, 3], [4]]
+
+        failing = DataLoader(recording({}, batches, error=ValueError("down")))
+        with pytest.raises(ValueError):
+            await failing.load_many([7, 8])
+        failing.batch = recording({7: "ok"}, batches)
+        assert await failing.load(7) == "ok"
+    asyncio.run(main())
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'loaders.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [User] (username, password, Fname, Lname, isAdmin) VALUES ('bob', 'pw', 'Bob', 'B', 0)", None),
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:id, :name, 'club')",
+         [{"id": 1, "name": "Chess"}, {"id": 2, "name": "Go"}]),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', :d)",
+         [{"id": i, "d": f"Night {i}"} for i in range(1, 41)]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, :g)",
+         [{"id": i, "g": 1 + i % 2} for i in range(1, 41)] + [{"id": 40, "g": 2}]),
+    ])
+    return db
+
+
+def test_event_list_takes_two_queries(db):
+    client = TestClient(Event.create_app(db=db))
+    with patch.object(db, "read_query_to_rows", side_effect=db.read_query_to_rows) as reads:
+        res = client.post("/events/by_id/", json=[40, 3, 999] + list(range(1, 31)) + [3])
+    assert res.status_code == 200 and reads.call_count == 2
+    events = res.json()
+    assert [e["eventID"] for e in events] == [40, 3] + [i for i in range(1, 31) if i != 3]
+    assert events[0] == {"eventID": 40, "date": "2026-04-01 18:00:00", "description": "Night 40", "groups": [
+        {"groupID": 1, "groupName": "Chess", "description": "club"},
+        {"groupID": 2, "groupName": "Go", "description": "club"},
+    ]}
+    assert client.get("/events/3").json() == events[1]
+    assert client.get("/events/999").status_code == 404
+
+
+def test_groups_by_id_and_users(db):
+    client = TestClient(Group.create_app(db=db))
+    res = client.post("/groups/by_id/", json=[2, 5, 1, 2])
+    assert [g["groupName"] for g in res.json()] == ["Go", "Chess"]
+
+    async def main():
+        loaders = Loaders(db, SingleFlight())
+        users = await loaders.users.load_many(["bob", "nobody"])
+        assert users == [{"username": "bob", "Fname": "Bob", "Lname": "B", "isAdmin": 0}, None]
+        assert loaders.users is not loaders.groups and loaders.users.batches == 1
+    asyncio.run(main())
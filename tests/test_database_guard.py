@@ -0,0 +1,144 @@
+"""
+Database Guard Test Suite
+
+File Name: test_database_guard.py
+
+Checks classes/DatabaseGuard.py and the statement timeouts in
+classes/SQLManager.py: a runaway SQLite query is interrupted at its
+timeout, endpoints run under their DB_STATEMENT_TIMEOUTS override, and the
+circuit breaker opens on failing or slow calls, refuses calls (and requests,
+with 503) while open, and closes again after a successful probe.
+
+Run: pytest test_database_guard.py -v
+"""
+
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from sqlalchemy import exc
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes import SQLManager
+from classes.DatabaseGuard import CircuitBreaker, CircuitOpen, parse_statement_timeouts
+from classes.ServiceConfig import Settings
+from classes.SQLManager import DatabaseManager, statement_timeout
+from Event import create_app
+from tests.conftest import Clock
+
+# Counts to a billion: far longer than any timeout below
+RUNAWAY = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000)
+    SELECT COUNT(*) AS total FROM n
+"""
+
+
+def down():
+    return exc.OperationalError("SELECT 1", {}, Exception("login timeout expired"))
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(url=f"sqlite:///{tmp_path / 'guard.db'}", statement_timeout_ms=200)
+
+
+def test_runaway_query_is_interrupted(db):
+    start = time.perf_counter()
+    with pytest.raises(Exception, match="interrupted"):
+        db.read_query_to_rows(RUNAWAY)
+    assert time.perf_counter() - start < 2
+
+    with statement_timeout(50):
+        start = time.perf_counter()
+        with pytest.raises(Exception, match="interrupted"):
+            db.read_query_to_rows(RUNAWAY)
+        assert time.perf_counter() - start < 1
+
+    # The limit is lifted before the connection goes back to the pool
+    db.statement_timeout_ms = 0
+    assert db.read_query_to_rows("SELECT 1 AS one") == [{"one": 1}]
+
+
+def test_breaker_opens_on_failures_and_probe_closes_it():
+    clock, probe = Clock(), MagicMock()
+    breaker = CircuitBreaker(probe, window=4, min_calls=4, failure_ratio=0.5, open_seconds=10, clock=clock)
+    for error in (None, None, down(), down()):
+        breaker.before_call()
+        breaker.record(0.01, error)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()  # refused at once, no probe yet
+    assert probe.call_count == 0
+
+    clock.now = 11
+    probe.side_effect = down()
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()  # probe fails: open for another 10 s
+    assert breaker.state == CircuitBreaker.OPEN and breaker.retry_after() == 10
+
+    clock.now = 22
+    probe.side_effect = None
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["trips"] == 2 and breaker.stats()["rejected"] == 1 and probe.call_count == 2
+
+
+def test_breaker_counts_slow_calls_but_not_bad_queries():
+    breaker = CircuitBreaker(MagicMock(), window=4, min_calls=4, failure_ratio=0.5, slow_seconds=1)
+    integrity = exc.IntegrityError("INSERT", {}, Exception("duplicate key"))
+    for error in (integrity, ValueError("bad input"), integrity, integrity):
+        breaker.record(0.01, error)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    for seconds in (0.1, 0.1, 3.0, 3.0):
+        breaker.record(seconds)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_manager_calls_are_refused_while_open(db):
+    db.breaker = CircuitBreaker(db.ping, window=2, min_calls=2, open_seconds=60)
+    for _ in range(2):
+        with pytest.raises(Exception, match="interrupted"):
+            db.read_query_to_rows(RUNAWAY)
+    assert db.breaker.state == CircuitBreaker.OPEN
+
+    start = time.perf_counter()
+    with pytest.raises(Exception, match="circuit open"):
+        db.read_query_to_rows("SELECT 1 AS one")
+    assert time.perf_counter() - start < 0.05
+
+
+def test_open_breaker_answers_503_but_health_reports_it(db):
+    app = create_app(Settings(db_breaker_window=2), db=db)
+    client = TestClient(app)
+    breaker = app.state.breaker
+    assert db.breaker is breaker
+    breaker.record(0.01, down())
+    breaker.record(0.01, down())
+
+    res = client.get("/events/group/1")
+    assert res.status_code == 503 and int(res.headers["retry-after"]) >= 1
+    health = client.get("/health").json()
+    assert health["status"] == "unhealthy"
+    assert health["circuitBreaker"]["state"] == "open"
+
+
+def test_endpoint_timeout_overrides(db):
+    assert parse_statement_timeouts(" get_group_events=50, get_user_calendar=15000,") == {
+        "get_group_events": 50, "get_user_calendar": 15000}
+    client = TestClient(create_app(Settings(db_statement_timeouts="get_group_events=50"), db=db))
+    seen = []
+
+    def read(*args):
+        seen.append(SQLManager._statement_timeout.get())
+        return []
+
+    with patch.object(db, "read_query_to_rows", side_effect=read):
+        assert client.get("/events/group/1").status_code == 200
+        assert client.get("/events/user/bob").status_code == 200
+    assert seen == [50, None]  # None: the manager's default
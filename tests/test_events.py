@@ -19,55 +19,60 @@ from datetime import datetime
 import sys
 import os
 
-# Mock the database and notification modules BEFORE importing Event - big issue was here
-sys.modules['classes'] = MagicMock()
-sys.modules['classes.SQLManager'] = MagicMock()
-sys.modules['classes.NotificationManager'] = MagicMock()
-
 # Add api folder to sys.path so imports work
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
 
-from Event import app, EventCreate, EventUpdate, EventCreateForGroup, RSVPRequest
-
-@pytest.fixture
-def client():
-    """Create test client for FastAPI app"""
-    return TestClient(app)
+from Event import create_app, EventCreate, EventUpdate, EventCreateForGroup, RSVPRequest
 
 @pytest.fixture
 def mock_db():
     """Create a mock database object"""
-    with patch("Event.db") as mock:
-        yield mock
+    return MagicMock()
 
 @pytest.fixture
 def mock_nm():
     """Create a mock notification manager object"""
-    with patch("Event.nm") as mock:
-        yield mock
+    return MagicMock()
+
+def user_exists(mock_db, username="testuser"):
+    """User lookups go through the users loader (read_query_to_rows)"""
+    mock_db.read_query_to_rows.return_value = [
+        {"username": username, "Fname": "Test", "Lname": "User", "isAdmin": 0}
+    ]
+
+@pytest.fixture
+def client(mock_db, mock_nm):
+    """Create test client for a FastAPI app wired to the mocks"""
+    return TestClient(create_app(db=mock_db, nm=mock_nm))
 
 
 # get events username
 
 def test_get_user_events_success(client, mock_db):
     """Test retrieving events for a valid user"""
-    mock_df = MagicMock()
-    mock_df.__len__.return_value = 1
-    mock_df.to_dict.return_value = [
-        {"eventID": 1, "date": "2025-12-09T12:00:00", "description": "Test Event"}
+    mock_db.read_query_to_rows.return_value = [
+        {"eventID": 1, "date": datetime(2025, 12, 9, 12, 0, 0), "description": "Test Event"}
     ]
-    mock_db.read_query_to_df.return_value = mock_df
 
     res = client.get("/events/user/testuser")
     assert res.status_code == 200
-    assert len(res.json()) == 1
+    assert res.json() == [{"eventID": 1, "date": "2025-12-09T12:00:00", "description": "Test Event"}]
+
+
+def test_feed_queries_read_description_without_cast(client, mock_db):
+    """description is NVARCHAR since migration 0002; no per-row CAST"""
+    mock_db.read_query_to_rows.return_value = []
+
+    client.get("/events/user/testuser")
+    client.get("/events/group/1")
+    assert mock_db.read_query_to_rows.call_count == 2
+    for call in mock_db.read_query_to_rows.call_args_list:
+        assert "CAST" not in call.args[0]
 
 
 def test_get_user_events_empty(client, mock_db):
     """Test retrieving events when user has no events"""
-    mock_df = MagicMock()
-    mock_df.__len__.return_value = 0
-    mock_db.read_query_to_df.return_value = mock_df
+    mock_db.read_query_to_rows.return_value = []
 
     res = client.get("/events/user/testuser")
     assert res.status_code == 200
@@ -76,7 +81,7 @@ def test_get_user_events_empty(client, mock_db):
 
 def test_get_user_events_failure(client, mock_db):
     """Test database error during user event retrieval"""
-    mock_db.read_query_to_df.side_effect = Exception("DB error")
+    mock_db.read_query_to_rows.side_effect = Exception("DB error")
 
     res = client.get("/events/user/testuser")
     assert res.status_code == 500
@@ -87,13 +92,10 @@ def test_get_user_events_failure(client, mock_db):
 
 def test_get_group_events_success(client, mock_db):
     """Test retrieving events for a valid group"""
-    mock_df = MagicMock()
-    mock_df.__len__.return_value = 2
-    mock_df.to_dict.return_value = [
+    mock_db.read_query_to_rows.return_value = [
         {"eventID": 1, "date": "2025-12-09T12:00:00", "description": "Group Event 1"},
         {"eventID": 2, "date": "2025-12-10T14:00:00", "description": "Group Event 2"}
     ]
-    mock_db.read_query_to_df.return_value = mock_df
 
     res = client.get("/events/group/1")
     assert res.status_code == 200
@@ -102,7 +104,7 @@ def test_get_group_events_success(client, mock_db):
 
 def test_get_group_events_failure(client, mock_db):
     """Test database error during group event retrieval"""
-    mock_db.read_query_to_df.side_effect = Exception("DB error")
+    mock_db.read_query_to_rows.side_effect = Exception("DB error")
 
     res = client.get("/events/group/1")
     assert res.status_code == 500
@@ -113,21 +115,13 @@ def test_get_group_events_failure(client, mock_db):
 
 def test_get_event_details_success(client, mock_db):
     """Test retrieving details for a specific event"""
-    event_df = MagicMock()
-    event_df.__len__.return_value = 1
-    event_df.iloc = [MagicMock(to_dict=MagicMock(return_value={
-        "eventID": 1,
-        "date": "2025-12-09T12:00:00",
-        "description": "Test Event"
-    }))]
-    
-    groups_df = MagicMock()
-    groups_df.__len__.return_value = 1
-    groups_df.to_dict.return_value = [
-        {"groupID": 1, "groupName": "Test Group", "description": "Test Group Desc"}
-    ]
-    
-    mock_db.read_query_to_df.side_effect = [event_df, groups_df]
+    def read(sql, params):
+        # The event and its groups are read together, in either order
+        if "JOIN" in sql:
+            return [{"eventID": 1, "groupID": 1, "groupName": "Test Group", "description": "Test Group Desc"}]
+        return [{"eventID": 1, "date": "2025-12-09T12:00:00", "description": "Test Event"}]
+
+    mock_db.read_query_to_rows.side_effect = read
 
     res = client.get("/events/1")
     assert res.status_code == 200
@@ -137,9 +131,7 @@ def test_get_event_details_success(client, mock_db):
 
 def test_get_event_details_not_found(client, mock_db):
     """Test retrieving details for non-existent event"""
-    mock_df = MagicMock()
-    mock_df.__len__.return_value = 0
-    mock_db.read_query_to_df.return_value = mock_df
+    mock_db.read_query_to_rows.return_value = []
 
     res = client.get("/events/999")
     assert res.status_code == 404
@@ -150,13 +142,11 @@ def test_get_event_details_not_found(client, mock_db):
 
 def test_create_event_success(client, mock_db):
     """Test successful event creation"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     result_df = MagicMock()
     result_df.iloc = [{"eventID": 42}]
     
-    mock_db.read_query_to_df.side_effect = [user_df, result_df]
+    mock_db.read_query_to_df.side_effect = [result_df]
 
     payload = {"name": "Party", "date": "2025-12-20", "time": "18:00"}
     res = client.post("/events/testuser", json=payload)
@@ -167,9 +157,7 @@ def test_create_event_success(client, mock_db):
 
 def test_create_event_user_not_found(client, mock_db):
     """Test event creation with non-existent user"""
-    mock_df = MagicMock()
-    mock_df.__len__.return_value = 0
-    mock_db.read_query_to_df.return_value = mock_df
+    mock_db.read_query_to_rows.return_value = []
 
     payload = {"name": "Party", "date": "2025-12-20", "time": "18:00"}
     res = client.post("/events/nonexistentuser", json=payload)
@@ -185,6 +173,14 @@ def test_create_event_missing_fields(client, mock_db):
     assert res.status_code == 422
 
 
+def test_create_event_for_group_description_too_long(client, mock_db):
+    """Descriptions longer than the NVARCHAR(1000) column are rejected up front"""
+    payload = {"date": "2025-12-20", "description": "x" * 1001}
+    res = client.post("/events/group/1", json=payload)
+    assert res.status_code == 422
+    mock_db.read_query_to_df.assert_not_called()
+
+
 # post
 
 def test_create_event_for_group_success(client, mock_db, mock_nm):
@@ -227,13 +223,11 @@ def test_create_event_for_group_not_found(client, mock_db):
 
 def test_update_event_success(client, mock_db):
     """Test successful event update"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     event_df = MagicMock()
     event_df.__len__.return_value = 1
     
-    mock_db.read_query_to_df.side_effect = [user_df, event_df]
+    mock_db.read_query_to_df.side_effect = [event_df]
     mock_db.execute_query.return_value = None
 
     payload = {"name": "Updated Party", "date": "2025-12-21", "time": "19:00"}
@@ -245,13 +239,11 @@ def test_update_event_success(client, mock_db):
 
 def test_update_event_not_found(client, mock_db):
     """Test event update with non-existent event"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     event_df = MagicMock()
     event_df.__len__.return_value = 0
     
-    mock_db.read_query_to_df.side_effect = [user_df, event_df]
+    mock_db.read_query_to_df.side_effect = [event_df]
 
     payload = {"name": "Updated Party", "date": "2025-12-21", "time": "19:00"}
     res = client.put("/events/testuser/999", json=payload)
@@ -262,13 +254,11 @@ def test_update_event_not_found(client, mock_db):
 
 def test_update_event_no_fields(client, mock_db):
     """Test event update with no fields to update"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     event_df = MagicMock()
     event_df.__len__.return_value = 1
     
-    mock_db.read_query_to_df.side_effect = [user_df, event_df]
+    mock_db.read_query_to_df.side_effect = [event_df]
 
     payload = {}
     res = client.put("/events/testuser/1", json=payload)
@@ -281,13 +271,11 @@ def test_update_event_no_fields(client, mock_db):
 
 def test_delete_event_success(client, mock_db):
     """Test successful event deletion"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     event_df = MagicMock()
     event_df.__len__.return_value = 1
     
-    mock_db.read_query_to_df.side_effect = [user_df, event_df]
+    mock_db.read_query_to_df.side_effect = [event_df]
     mock_db.execute_query.return_value = None
 
     res = client.delete("/events/testuser/1")
@@ -298,13 +286,11 @@ def test_delete_event_success(client, mock_db):
 
 def test_delete_event_not_found(client, mock_db):
     """Test event deletion with non-existent event"""
-    user_df = MagicMock()
-    user_df.__len__.return_value = 1
-    
+    user_exists(mock_db)
     event_df = MagicMock()
     event_df.__len__.return_value = 0
     
-    mock_db.read_query_to_df.side_effect = [user_df, event_df]
+    mock_db.read_query_to_df.side_effect = [event_df]
 
     res = client.delete("/events/testuser/999")
     
@@ -340,6 +326,7 @@ def test_check_rsvp_not_exists(client, mock_db):
 
 def test_rsvp_to_event_success(client, mock_db):
     """Test successful RSVP to event"""
+    user_exists(mock_db)
     mock_df = MagicMock()
     mock_df.__len__.return_value = 0
     mock_db.read_query_to_df.return_value = mock_df
@@ -354,6 +341,7 @@ def test_rsvp_to_event_success(client, mock_db):
 
 def test_rsvp_to_event_conflict(client, mock_db):
     """Test RSVP when already RSVPed"""
+    user_exists(mock_db)
     mock_df = MagicMock()
     mock_df.__len__.return_value = 1
     mock_db.read_query_to_df.return_value = mock_df
@@ -365,6 +353,17 @@ def test_rsvp_to_event_conflict(client, mock_db):
     assert res.json()["detail"] == "Already RSVPed to this event"
 
 
+def test_rsvp_to_event_user_not_found(client, mock_db):
+    """Test RSVP by a user who does not exist"""
+    mock_db.read_query_to_rows.return_value = []
+
+    res = client.post("/rsvp/1", json={"username": "ghost"})
+
+    assert res.status_code == 404
+    assert res.json()["detail"] == "User not found"
+    mock_db.execute_query.assert_not_called()
+
+
 def test_un_rsvp_success(client, mock_db):
     """Test successful RSVP removal"""
     mock_df = MagicMock()
@@ -426,6 +425,45 @@ def test_get_notifications_success(client, mock_nm):
     assert len(res.json()) == 1
 
 
+def test_get_notifications_next_cursor(client, mock_nm):
+    """A full page asks for one extra row and returns a cursor for the rest"""
+    mock_nm.getNotificationsByUsername.return_value = [
+        {
+            "username": "testuser",
+            "description": f"Event {i}",
+            "eventID": i,
+            "notificationTimestamp": datetime(2025, 12, 9, 12, i, 0),
+            "eventDate": datetime(2025, 12, 20, 18, 0, 0),
+            "isRead": 0,
+            "notificationID": i
+        }
+        for i in (3, 2, 1)
+    ]
+
+    res = client.get("/notifications/testuser?limit=2&unread_only=true")
+
+    assert res.status_code == 200
+    assert [n["eventID"] for n in res.json()] == [3, 2]
+    kwargs = mock_nm.getNotificationsByUsername.call_args.kwargs
+    assert kwargs["limit"] == 3 and kwargs["unread_only"] is True
+
+    res = client.get(f"/notifications/testuser?limit=2&cursor={res.headers['X-Next-Cursor']}")
+    kwargs = mock_nm.getNotificationsByUsername.call_args.kwargs
+    assert kwargs["before"] == "2025-12-09 12:02:00" and kwargs["before_id"] == 2
+
+
+def test_get_notifications_invalid_cursor(client, mock_nm):
+    res = client.get("/notifications/testuser?cursor=not-a-cursor")
+    assert res.status_code == 400
+
+
+def test_get_unread_count(client, mock_nm):
+    mock_nm.getUnreadCount.return_value = 7
+    res = client.get("/notifications/testuser/unread-count")
+    assert res.status_code == 200
+    assert res.json() == {"username": "testuser", "unreadCount": 7}
+
+
 # Summary
 if __name__ == "__main__":
     print("\n" + "="*70)
@@ -443,7 +481,7 @@ if __name__ == "__main__":
     print("  • Health & Notifications - 2 tests")
     print("\nTotal: 25 test cases")
     print("\n✓ All tests use mocks - NO database connection required")
-    print("✓ Database and NotificationManager modules completely mocked")
+    print("✓ Database and NotificationManager injected as mocks")
     print("✓ No real data will be written to any database")
     print("\nTo run these tests:")
     print("  pytest test_Event.py -v")
@@ -0,0 +1,65 @@
+"""
+Fast JSON Test Suite
+
+File Name: test_fast_json.py
+
+The hot list endpoints send rows through RowEncoder and dumps instead of
+validating them against their response models; the JSON must stay what
+FastAPI produced from the models, with orjson and without it.
+
+Run: pytest test_fast_json.py -v
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+from pydantic import TypeAdapter
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes import FastJSON
+from classes.FastJSON import RowEncoder, dumps
+from Event import EventResponse, NotificationResponse
+
+# As the drivers return them: SQLite gives ISO strings, SQL Server datetimes, BIT as bool
+NOTIFICATION_ROWS = [
+    {"notificationID": 1, "username": "carol", "description": "New event: Chess, café", "eventID": 5,
+     "notificationTimestamp": "2026-03-01 12:00:00.123456", "eventDate": "2026-04-01 18:00:00.000000",
+     "isRead": 0, "groupID": 1, "eventCount": 1},
+    {"notificationID": None, "username": "carol", "description": "3 new events", "eventID": None,
+     "notificationTimestamp": datetime(2026, 3, 1, 11, tzinfo=timezone.utc), "eventDate": datetime(2026, 4, 2),
+     "isRead": True, "groupID": None, "eventCount": Decimal(3)},
+    # Written before digests and groups on notifications
+    {"username": "carol", "description": "old", "notificationTimestamp": datetime(2026, 1, 1),
+     "eventDate": datetime(2026, 1, 2), "isRead": False},
+]
+EVENT_ROWS = [
+    {"eventID": 1, "date": "2026-04-01T18:00:00", "description": "Chess night"},
+    {"eventID": 2, "date": "2026-04-02 18:00:00.000000", "description": None},
+]
+
+
+def model_json(model, rows):
+    adapter = TypeAdapter(List[model])
+    return json.loads(adapter.dump_json(adapter.validate_python(rows)))
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("model,rows", [(NotificationResponse, NOTIFICATION_ROWS), (EventResponse, EVENT_ROWS)])
+def test_same_json_as_the_model(monkeypatch, use_orjson, model, rows):
+    if use_orjson and FastJSON.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(FastJSON, "orjson", None)
+    assert json.loads(dumps(RowEncoder(model).encode(rows))) == model_json(model, rows)
+
+
+def test_event_dates_are_sent_as_iso_strings():
+    """The endpoints converted datetime dates with isoformat() before returning them"""
+    encoded = RowEncoder(EventResponse).encode([{"eventID": 1, "date": datetime(2026, 4, 1, 18), "groupName": "Chess"}])
+    assert encoded == [{"eventID": 1, "date": "2026-04-01T18:00:00", "description": None}]
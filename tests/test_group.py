@@ -7,15 +7,20 @@ import os
 # Add api folder to sys.path,  was a major issue with import issues in the original file when used in this
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
 
-# Mock the database and notification modules BEFORE importing Event - big issue was here
-sys.modules['classes'] = MagicMock()
-sys.modules['classes.GroupManager'] = MagicMock()
+import pandas as pd
 
-from Group import app, gm
+from classes.AdminDirectory import AdminDirectory
+from Group import create_app
+
+# Group manager and admin directory injected into the app under test
+gm = MagicMock()
+admins = AdminDirectory(db=MagicMock())
 
 @pytest.fixture
 def client():
-    return TestClient(app)
+    admins.invalidate()
+    admins.db.read_query_to_df.return_value = pd.DataFrame({"username": ["chase"], "groupID": [1]})
+    return TestClient(create_app(gm=gm, admins=admins))
 
 
 # GET /groups/
@@ -35,14 +40,14 @@ def test_get_all_group_ids_failure(client):
 
 # POST /groups/by_id/
 def test_get_groups_by_id_success(client):
-    gm.getGroupInfoByID = MagicMock(return_value=[{"groupID": 1, "groupName": "Test", "description": "desc"}])
+    gm.db.read_query_to_rows = MagicMock(return_value=[{"groupID": 1, "groupName": "Test", "description": "desc"}])
     res = client.post("/groups/by_id/", json=[1])
     assert res.status_code == 200
     assert res.json() == [{"groupID": 1, "groupName": "Test", "description": "desc"}]
 
 
 def test_get_groups_by_id_failure(client):
-    gm.getGroupInfoByID = MagicMock(side_effect=Exception("DB error"))
+    gm.db.read_query_to_rows = MagicMock(side_effect=Exception("DB error"))
     res = client.post("/groups/by_id/", json=[1])
     assert res.status_code == 500
     assert "Error retrieving group info" in res.json()["detail"]
@@ -79,7 +84,7 @@ def test_leave_group_failure(client):
 
 
 # GET /groups/user/{username}
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_get_user_groups_success(mock_db, client):
     mock_df = MagicMock()
     mock_df.to_dict.return_value = [{"groupID": 1, "groupName": "G", "description": "D"}]
@@ -90,7 +95,7 @@ def test_get_user_groups_success(mock_db, client):
     assert res.json() == [{"groupID": 1, "groupName": "G", "description": "D"}]
 
 
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_get_user_groups_failure(mock_db, client):
     mock_db.read_query_to_df.side_effect = Exception("user error")
 
@@ -100,7 +105,7 @@ def test_get_user_groups_failure(mock_db, client):
 
 
 # GET /groups/admin/{username}
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_get_admin_groups_success(mock_db, client):
     mock_df = MagicMock()
     mock_df.to_dict.return_value = [
@@ -111,9 +116,21 @@ def test_get_admin_groups_success(mock_db, client):
     res = client.get("/groups/admin/chase")
     assert res.status_code == 200
     assert res.json()[0]["memberCount"] == 5
+    # Groups come from the admin directory, not a join on GroupAdmin
+    query, params = mock_db.read_query_to_df.call_args.args
+    assert "GroupAdmin" not in query
+    assert params == {"id0": 1}
+
+
+@patch.object(gm, "db")
+def test_get_admin_groups_none_skips_query(mock_db, client):
+    res = client.get("/groups/admin/dana")
+    assert res.status_code == 200
+    assert res.json() == []
+    mock_db.read_query_to_df.assert_not_called()
 
 
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_get_admin_groups_failure(mock_db, client):
     mock_db.read_query_to_df.side_effect = Exception("admin error")
 
@@ -123,7 +140,7 @@ def test_get_admin_groups_failure(mock_db, client):
 
 
 # POST /groups/create
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_create_group_success(mock_db, client):
     # group does not already exist
     mock_db.read_query_to_df.side_effect = [
@@ -132,15 +149,18 @@ def test_create_group_success(mock_db, client):
     ]
     mock_db.execute_query = MagicMock()
     gm.addGroupMember = MagicMock()
+    assert not admins.is_admin("chase", 10)  # directory loaded before the group exists
 
     payload = {"groupName": "NewGroup", "description": "Test group", "adminUsername": "chase"}
     res = client.post("/groups/create", json=payload)
     assert res.status_code == 201
     assert res.json()["groupID"] == 10
     assert res.json()["groupName"] == "NewGroup"
+    # The new admin is recorded in the cached directory as well
+    assert admins.is_admin("chase", 10)
 
 
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_create_group_conflict(mock_db, client):
     mock_df = MagicMock()
     mock_df.__len__.return_value = 1
@@ -152,7 +172,7 @@ def test_create_group_conflict(mock_db, client):
     assert res.json()["detail"] == "Group name already exists"
 
 
-@patch("Group.gm.db")
+@patch.object(gm, "db")
 def test_create_group_failure(mock_db, client):
     mock_db.read_query_to_df.side_effect = Exception("create error")
 
@@ -160,3 +180,11 @@ def test_create_group_failure(mock_db, client):
     res = client.post("/groups/create", json=payload)
     assert res.status_code == 500
     assert "Error creating group" in res.json()["detail"]
+
+
+def test_create_group_fields_too_long(client):
+    """groupName and description are validated against their column sizes"""
+    res = client.post("/groups/create", json={"groupName": "x" * 51, "description": "d", "adminUsername": "chase"})
+    assert res.status_code == 422
+    res = client.post("/groups/create", json={"groupName": "ok", "description": "d" * 1001, "adminUsername": "chase"})
+    assert res.status_code == 422
@@ -0,0 +1,116 @@
+"""
+Health Check Test Suite
+
+File Name: test_health.py
+
+Checks classes/HealthChecks.py on all three services: liveness never touches
+the database, readiness pings it (503 when the ping fails, times out or the
+circuit breaker is open; concurrent probes share one ping), and /health
+serves table counts refreshed in the background instead of counting on
+every probe.
+
+Run: pytest test_health.py -v
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+import Main
+from classes.ServiceConfig import Settings
+from classes.SQLManager import DatabaseManager
+import Event
+import Group
+import User
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'health.db'}")
+    db.execute_query("INSERT INTO [Event] (eventID, date, description) VALUES (1, '2026-04-01 18:00:00', 'Chess')")
+    return db
+
+
+@pytest.mark.parametrize("create_app,path", [
+    (Event.create_app, "/health"), (Group.create_app, "/groups/health"), (User.create_app, "/users/health"),
+])
+def test_liveness_never_touches_the_database(create_app, path):
+    mock_db = MagicMock()
+    client = TestClient(create_app(db=mock_db))
+    mock_db.reset_mock()
+    res = client.get(f"{path}/live")
+    assert res.status_code == 200 and res.json()["status"] == "alive"
+    assert mock_db.mock_calls == []
+
+
+def test_composed_app_serves_every_service_health(db):
+    client = TestClient(Main.create_app(Settings(), db=db))
+    assert client.get("/health").json()["total_events"] == 1
+    assert client.get("/groups/health").json()["total_groups"] == 0
+    assert client.get("/users/health/ready").json()["status"] == "ready"
+    assert client.get("/users/health/live").status_code == 200
+
+
+def test_readiness_fails_when_the_ping_does(db):
+    client = TestClient(Group.create_app(db=db))
+    assert client.get("/groups/health/ready").status_code == 200
+
+    with patch.object(db, "ping", side_effect=Exception("login timeout expired")):
+        res = client.get("/groups/health/ready")
+    assert res.status_code == 503
+    assert res.json()["reason"] == "database ping failed: login timeout expired"
+
+
+def test_readiness_fails_when_the_breaker_is_open(db):
+    app = Event.create_app(Settings(db_breaker_window=2), db=db)
+    app.state.breaker.record(3.0)
+    app.state.breaker.record(3.0)
+    with patch.object(db, "ping") as ping:
+        res = TestClient(app).get("/health/ready")
+    assert res.status_code == 503 and res.json()["reason"] == "circuit open"
+    assert ping.call_count == 0
+
+
+def test_hanging_database_gets_one_ping(db):
+    app = Event.create_app(Settings(health_ping_timeout_ms=100), db=db)
+    pings = []
+
+    def hang(timeout_ms):
+        pings.append(timeout_ms)
+        time.sleep(0.5)
+
+    async def probes():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/health/ready") for _ in range(5)))
+
+    with patch.object(db, "ping", side_effect=hang):
+        start = time.perf_counter()
+        responses = asyncio.run(probes())
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 503 and r.json()["reason"] == "database ping timed out" for r in responses)
+    assert elapsed < 0.4 and pings == [100]
+
+
+def test_table_counts_are_cached_and_refreshed_in_background(db):
+    app = Event.create_app(Settings(health_stats_seconds=1), db=db)
+    read = db.read_query_to_rows
+    with patch.object(db, "read_query_to_rows", side_effect=read) as reads, TestClient(app) as client:
+        first = client.get("/health").json()
+        for _ in range(5):
+            assert client.get("/health").json()["total_events"] == 1
+        assert reads.call_count == 3  # Event, Notifications, RSVP: once, by the lifespan's refresher
+
+        db.execute_query("INSERT INTO [Event] (eventID, date, description) VALUES (2, '2026-04-02 18:00:00', 'Go')")
+        time.sleep(1.2)
+        health = client.get("/health").json()
+    assert first["status"] == "healthy" and first["total_rsvps"] == 0
+    assert health["total_events"] == 2 and health["statsAgeSeconds"] < 1
+    assert health["circuitBreaker"]["state"] == "closed" and health["admission"]["enabled"] is True
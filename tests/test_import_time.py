@@ -0,0 +1,63 @@
+"""
+Import Cost Test Suite
+
+File Name: test_import_time.py
+
+Each service module is imported in a fresh interpreter to check that importing
+it has no side effects (no engine, no database driver, no pandas) and that the
+cold import stays within IMPORT_TIME_BUDGET_S.
+
+Run: pytest test_import_time.py -v -s
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "api")
+
+# Cold import of a single service module, in seconds
+IMPORT_TIME_BUDGET_S = 2.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+from classes.SQLManager import _engine_registry
+print(json.dumps({{
+    "seconds": elapsed,
+    "engines": len(_engine_registry),
+    "pandas": "pandas" in sys.modules,
+    "pyodbc": "pyodbc" in sys.modules,
+}}))
+"""
+
+
+def cold_import(module: str) -> dict:
+    """Import a module in a new interpreter and report what it cost."""
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=API_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["User", "Event", "Group", "Main"])
+def test_import_is_side_effect_free(module):
+    """Importing a service creates no engine and loads no heavy modules"""
+    result = cold_import(module)
+    assert result["engines"] == 0
+    assert not result["pandas"]
+    assert not result["pyodbc"]
+
+
+@pytest.mark.parametrize("module", ["User", "Event", "Group", "Main"])
+def test_import_within_budget(module):
+    """Cold import time stays under the budget"""
+    result = cold_import(module)
+    print(f"\n{module}: {result['seconds'] * 1000:.0f} ms")
+    assert result["seconds"] < IMPORT_TIME_BUDGET_S
@@ -0,0 +1,58 @@
+"""
+Launcher Test Suite
+
+File Name: test_launcher.py
+
+Covers worker-count selection and argument handling of api/Launcher.py.
+uvicorn is patched out, so no server is started.
+
+Run: pytest test_launcher.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+import Launcher
+
+
+def test_worker_count_from_env(monkeypatch):
+    """WEB_CONCURRENCY overrides CPU detection"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert Launcher.default_worker_count() == 3
+
+
+def test_worker_count_from_cpus(monkeypatch):
+    """Without WEB_CONCURRENCY the CPU count is used"""
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    assert Launcher.default_worker_count() >= 1
+
+
+def test_launch_passes_workers_and_port():
+    """The chosen service, port and worker count reach uvicorn"""
+    with patch("Launcher.uvicorn.run") as mock_run:
+        Launcher.main(["group", "--workers", "4"])
+
+    args, kwargs = mock_run.call_args
+    assert args[0] == "Group:app"
+    assert kwargs["port"] == 8003
+    assert kwargs["workers"] == 4
+
+
+def test_launch_defaults_to_cpu_workers(monkeypatch):
+    """Worker count defaults to default_worker_count()"""
+    monkeypatch.setenv("WEB_CONCURRENCY", "5")
+    with patch("Launcher.uvicorn.run") as mock_run:
+        Launcher.main(["event"])
+
+    assert mock_run.call_args.kwargs["workers"] == 5
+
+
+def test_unknown_service_rejected():
+    """Only known services can be launched"""
+    with pytest.raises(SystemExit):
+        Launcher.main(["billing"])
@@ -0,0 +1,63 @@
+"""
+Load Test Harness Test Suite
+
+File Name: test_load_test.py
+
+Checks the percentile and baseline-regression logic in benchmarks/load_test.py.
+The load run itself needs live servers and is not exercised here.
+
+Run: pytest test_load_test.py -v
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+from load_test import DEFAULT_THRESHOLDS, Recorder, compare, percentile, summarize
+
+
+def endpoint(p95=100.0, p99=200.0, rps=50.0, error_rate=0.0):
+    return {"count": 100, "rps": rps, "error_rate": error_rate, "p50_ms": 50.0, "p95_ms": p95, "p99_ms": p99}
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_reports_errors_and_throughput():
+    rec = Recorder()
+    rec.latencies["GET /x"] = [0.01, 0.02, 0.03, 0.04]
+    rec.errors["GET /x"] = 1
+    summary = summarize(rec, duration=2.0)["GET /x"]
+    assert summary["count"] == 4
+    assert summary["rps"] == 2.0
+    assert summary["error_rate"] == 0.25
+    assert summary["p50_ms"] == 20.0
+
+
+def test_compare_within_thresholds():
+    baseline = {"GET /x": endpoint()}
+    current = {"GET /x": endpoint(p95=120.0, rps=45.0)}
+    assert compare(current, baseline, DEFAULT_THRESHOLDS) == []
+
+
+def test_compare_flags_latency_throughput_and_errors():
+    baseline = {"GET /x": endpoint()}
+    current = {"GET /x": endpoint(p95=200.0, rps=10.0, error_rate=0.05)}
+    regressions = compare(current, baseline, DEFAULT_THRESHOLDS)
+    assert len(regressions) == 3
+    assert any("p95_ms" in r for r in regressions)
+    assert any("rps" in r for r in regressions)
+    assert any("error rate" in r for r in regressions)
+
+
+def test_compare_ignores_new_and_missing_endpoints():
+    baseline = {"GET /old": endpoint()}
+    current = {"GET /new": endpoint(p95=10_000.0)}
+    assert compare(current, baseline, DEFAULT_THRESHOLDS) == []
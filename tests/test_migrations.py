@@ -0,0 +1,174 @@
+"""
+Migration Runner Test Suite
+
+File Name: test_migrations.py
+
+Covers classes/MigrationRunner.py and the SQLite translation of migration DDL,
+using throwaway migration folders and SQLite files.
+
+Run: pytest test_migrations.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from sqlalchemy import inspect
+from classes.MigrationRunner import MigrationRunner, MIGRATIONS_DIR
+from classes.SQLiteBackend import translate_migration
+from classes.SQLManager import DatabaseManager
+
+
+@pytest.fixture
+def bare_db(tmp_path, monkeypatch):
+    """A SQLite database at the bare Schema.sql version"""
+    monkeypatch.setenv("DB_AUTO_MIGRATE", "0")
+    return DatabaseManager(url=f"sqlite:///{tmp_path / 'bare.db'}")
+
+
+@pytest.fixture
+def migrations(tmp_path):
+    folder = tmp_path / "migrations"
+    folder.mkdir()
+    (folder / "0001_first.sql").write_text(
+        "/* members by group */\nCREATE NONCLUSTERED INDEX [IX_A] ON [dbo].[GroupMember] ([groupID]) WITH (ONLINE = ON)\nGO\n"
+    )
+    (folder / "0002_second.sql").write_text("CREATE INDEX [IX_B] ON [Event] ([date])\nGO\n")
+    (folder / "notes.txt").write_text("ignored")
+    return folder
+
+
+def index_names(db, table):
+    return {ix["name"] for ix in inspect(db.engine).get_indexes(table)}
+
+
+# translation
+
+def test_translate_covering_index():
+    batch = """
+        CREATE NONCLUSTERED INDEX [IX_X] ON [dbo].[Notifications]
+        ([username] ASC, [notificationTimestamp] DESC)
+        INCLUDE ([eventID], [eventDate])
+        WHERE [isRead] = 0
+        WITH (ONLINE = ON)
+    """
+    sql = translate_migration(batch)
+    assert "NONCLUSTERED" not in sql and "INCLUDE" not in sql and "ONLINE" not in sql
+    assert "[notificationTimestamp] DESC, [eventID], [eventDate])" in sql
+    assert "WHERE [isRead] = 0" in sql
+
+
+def test_translate_drop_index():
+    assert translate_migration("DROP INDEX [IX_X] ON [dbo].[Event]") == "DROP INDEX IF EXISTS [IX_X]"
+
+
+def test_translate_comment_only_batch():
+    assert translate_migration("/* nothing */\n-- here\n") == ""
+
+
+# runner
+
+def test_migrate_applies_in_order_and_records_versions(bare_db, migrations):
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    assert runner.current_version() == 0
+    done = runner.migrate()
+    assert [m.version for m in done] == [1, 2]
+    assert runner.current_version() == 2
+    assert "IX_A" in index_names(bare_db, "GroupMember")
+    assert "IX_B" in index_names(bare_db, "Event")
+
+
+def test_migrate_is_idempotent(bare_db, migrations):
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    runner.migrate()
+    assert runner.migrate() == []
+
+
+def test_migrate_to_target(bare_db, migrations):
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    runner.migrate(target=1)
+    assert runner.current_version() == 1
+    assert [m.version for m in runner.pending()] == [2]
+
+
+def test_edited_migration_is_rejected(bare_db, migrations):
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    runner.migrate()
+    (migrations / "0001_first.sql").write_text("CREATE INDEX [IX_C] ON [Event] ([date])\nGO\n")
+    with pytest.raises(Exception, match="changed after it was applied"):
+        runner.pending()
+
+
+def test_failed_migration_is_not_recorded(bare_db, migrations):
+    (migrations / "0003_broken.sql").write_text("CREATE INDEX [IX_D] ON [NoSuchTable] ([x])\nGO\n")
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    with pytest.raises(Exception, match="0003_broken failed"):
+        runner.migrate()
+    assert runner.current_version() == 2
+
+
+def test_dialect_override(bare_db, migrations):
+    """A script under <dialect>/ replaces the T-SQL one for that backend"""
+    (migrations / "sqlite").mkdir()
+    (migrations / "sqlite" / "0002_second.sql").write_text("CREATE INDEX [IX_SQLITE] ON [Event] ([date])\nGO\n")
+    MigrationRunner(bare_db.engine, str(migrations)).migrate()
+    assert "IX_SQLITE" in index_names(bare_db, "Event")
+    assert "IX_B" not in index_names(bare_db, "Event")
+
+
+
+def test_edited_dialect_override_is_rejected(bare_db, migrations):
+    (migrations / "sqlite").mkdir()
+    override = migrations / "sqlite" / "0002_second.sql"
+    override.write_text("CREATE INDEX [IX_SQLITE] ON [Event] ([date])\nGO\n")
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    runner.migrate()
+    (migrations / "0002_second.sql").write_text("CREATE INDEX [IX_B2] ON [Event] ([date])\nGO\n")
+    assert runner.pending() == []  # the T-SQL script does not run here
+    override.write_text("CREATE INDEX [IX_SQLITE2] ON [Event] ([date])\nGO\n")
+    with pytest.raises(Exception, match="0002_second changed after it was applied"):
+        runner.pending()
+
+def test_no_transaction_migration(bare_db, migrations):
+    """A script marked no-transaction commits batch by batch and is recorded at the end"""
+    (migrations / "0003_online.sql").write_text(
+        "-- runner: no-transaction\nCREATE INDEX [IX_E] ON [RSVP] ([username])\nGO\n"
+        "CREATE INDEX [IX_F] ON [NoSuchTable] ([x])\nGO\n"
+    )
+    runner = MigrationRunner(bare_db.engine, str(migrations))
+    assert not runner.discover()[2].transactional("sqlite")
+    with pytest.raises(Exception, match="0003_online failed"):
+        runner.migrate()
+    # the first batch stays committed; the version is not recorded
+    assert "IX_E" in index_names(bare_db, "RSVP")
+    assert runner.current_version() == 2
+
+
+def test_description_migration_is_noop_on_sqlite(bare_db):
+    """0002 has an empty SQLite override but is still recorded"""
+    runner = MigrationRunner(bare_db.engine)
+    migration = runner.discover()[1]
+    assert migration.name == "description_nvarchar"
+    assert migration.batches("sqlite") == []
+    assert not migration.transactional("mssql")
+    assert len(migration.batches("mssql")) == 9
+    runner.migrate(target=2)
+    assert runner.current_version() == 2
+
+
+def test_local_database_is_migrated_automatically(tmp_path):
+    """A new SQLite database comes up at the latest version with the hot-path indexes"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'auto.db'}")
+    runner = MigrationRunner(db.engine)
+    assert runner.pending() == []
+    assert runner.current_version() == max(m.version for m in runner.discover())
+    assert "IX_GroupMember_groupID" in index_names(db, "GroupMember")
+    assert "IX_Notifications_unread" in index_names(db, "Notifications")
+
+
+def test_shipped_migrations_are_numbered_uniquely():
+    migrations = MigrationRunner(None, MIGRATIONS_DIR).discover()
+    assert migrations and migrations[0].version == 1
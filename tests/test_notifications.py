@@ -0,0 +1,437 @@
+"""
+Notification Test Suite
+
+File Name: test_notifications.py
+
+Runs classes/NotificationManager.py and the notification endpoints against a
+SQLite file: cursor pagination, the unread filter, and the unread counter kept
+by createNotification and the mark-as-read paths, including buffered read
+acknowledgements (classes/ReadReceiptBuffer.py), push delivery through
+classes/NotificationHub.py, and digests from classes/NotificationCoalescer.py.
+
+Run: pytest test_notifications.py -v
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.NotificationCoalescer import NotificationCoalescer, digest_description
+from classes.NotificationHub import NotificationHub
+from classes.NotificationManager import NotificationManager
+from classes.ReadReceiptBuffer import ReadReceiptBuffer
+from classes.SQLManager import DatabaseManager
+from Event import create_app
+from tests.conftest import Clock
+
+
+@pytest.fixture
+def nm(tmp_path):
+    """bob is a member and carol the admin of one group; both were notified about five events"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'notifications.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Chess', 'club')", None),
+        ("INSERT INTO GroupAdmin (username, groupID) VALUES ('carol', 1)", None),
+        ("INSERT INTO GroupMember (username, groupID) VALUES ('bob', 1)", None),
+    ])
+    nm = NotificationManager(db=db)
+    for event_id in range(1, 6):
+        nm.createNotification(["bob"], f"event {event_id}", event_id,
+                              created_at=datetime(2025, 1, event_id, 9, 0),
+                              eventDate=datetime(2025, 2, event_id))
+    return nm
+
+
+@pytest.fixture
+def client(nm):
+    return TestClient(create_app(db=nm.db, nm=nm))
+
+
+def ids(nm, username):
+    """notificationID by eventID"""
+    return {n["eventID"]: n["notificationID"] for n in nm.getNotificationsByUsername(username)}
+
+
+def unread(nm, username):
+    return sorted(n["eventID"] for n in nm.getNotificationsByUsername(username, unread_only=True))
+
+
+def test_create_counts_every_recipient(nm):
+    """Members and admins are notified, and each counter goes up once per notification"""
+    assert nm.getUnreadCount("bob") == 5
+    assert nm.getUnreadCount("carol") == 5
+    assert nm.getUnreadCount("nobody") == 0
+
+
+def test_read_notifications_are_not_counted(nm):
+    nm.createNotification(["bob"], "seen", 6, created_at=datetime(2025, 1, 6), eventDate=datetime(2025, 2, 6), isRead=1)
+    assert nm.getUnreadCount("bob") == 5
+
+
+def test_mark_read_decrements_once(nm):
+    assert nm.markNotificationAsRead("bob", 3) == 1
+    assert nm.markNotificationAsRead("bob", 3) == 0
+    assert nm.getUnreadCount("bob") == 4
+    assert nm.getUnreadCount("carol") == 5
+
+
+def test_rebuild_matches_maintained_counts(nm):
+    nm.markNotificationAsRead("carol", 1)
+    nm.db.execute_query("UPDATE NotificationUnreadCount SET unreadCount = 99")
+    assert nm.rebuildUnreadCounts() == 2
+    assert nm.getUnreadCount("bob") == 5 and nm.getUnreadCount("carol") == 4
+
+
+def test_pages_walk_history_newest_first(client):
+    seen, cursor = [], None
+    while True:
+        res = client.get("/notifications/bob", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert res.status_code == 200
+        assert len(res.json()) <= 2
+        seen += [n["eventID"] for n in res.json()]
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [5, 4, 3, 2, 1]
+
+
+def test_pages_split_rows_with_the_same_timestamp(client, nm):
+    """Archived rows may share a timestamp with live ones; the ID breaks the tie"""
+    nm.db.execute_query("""
+        INSERT INTO NotificationsArchive
+            (notificationID, username, description, eventID, isRead, notificationTimestamp, eventDate)
+        SELECT notificationID + :offset, username, description, eventID + :offset, 1, notificationTimestamp, eventDate
+        FROM Notifications WHERE username = 'bob' AND eventID = 3
+    """, {"offset": 100})
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, "include_archived": True, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/notifications/bob", params=params)
+        seen += [n["eventID"] for n in res.json()]
+        cursor = res.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [5, 4, 103, 3, 2, 1]  # the first page ends between 103 and 3
+
+
+def test_unread_only_filter(client, nm):
+    nm.markNotificationAsRead("bob", 5)
+    nm.markNotificationAsRead("bob", 2)
+    res = client.get("/notifications/bob", params={"unread_only": True})
+    assert [n["eventID"] for n in res.json()] == [4, 3, 1]
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_unread_count_endpoint(client, nm):
+    nm.markNotificationAsRead("bob", 1)
+    res = client.get("/notifications/bob/unread-count")
+    assert res.status_code == 200
+    assert res.json() == {"username": "bob", "unreadCount": 4}
+
+
+# bulk mark-as-read
+
+def test_every_notification_gets_an_id(nm):
+    assert sorted(ids(nm, "bob").values()) == sorted(set(ids(nm, "bob").values()))
+    assert not set(ids(nm, "bob").values()) & set(ids(nm, "carol").values())
+
+
+def test_mark_all_read(client, nm):
+    res = client.put("/notifications/bob/read-all")
+    assert res.json() == {"username": "bob", "updated": 5}
+    assert nm.getUnreadCount("bob") == 0 and nm.getUnreadCount("carol") == 5
+    assert client.put("/notifications/bob/read-all").json()["updated"] == 0
+
+
+def test_mark_read_by_id_ignores_other_users(client, nm):
+    bob, carol = ids(nm, "bob"), ids(nm, "carol")
+    res = client.put("/notifications/bob/read", json={"notificationIDs": [bob[1], bob[2], carol[3]]})
+    assert res.json()["updated"] == 2
+    assert unread(nm, "bob") == [3, 4, 5]
+    assert nm.getUnreadCount("bob") == 3 and nm.getUnreadCount("carol") == 5
+
+
+def test_mark_read_by_id_requires_ids(client):
+    assert client.put("/notifications/bob/read", json={"notificationIDs": []}).status_code == 422
+
+
+def test_mark_read_in_range(client, nm):
+    res = client.put("/notifications/bob/read-range", json={"start": "2025-01-02T00:00:00", "end": "2025-01-04T00:00:00"})
+    assert res.json()["updated"] == 2
+    assert unread(nm, "bob") == [1, 4, 5]
+    assert nm.getUnreadCount("bob") == 3
+
+
+def test_mark_read_in_range_rejects_empty_range(client):
+    res = client.put("/notifications/bob/read-range", json={"start": "2025-01-04T00:00:00", "end": "2025-01-02T00:00:00"})
+    assert res.status_code == 400
+
+
+# buffered read acknowledgements
+
+def test_acks_are_written_together_on_flush(nm):
+    bob, carol = ids(nm, "bob"), ids(nm, "carol")
+    buffer = ReadReceiptBuffer(nm, max_pending=100)
+    for notification_id in (bob[1], bob[2], bob[1]):
+        buffer.add("bob", notification_id)
+    buffer.add("carol", carol[5])
+    assert buffer.pending == 3 and unread(nm, "bob") == [1, 2, 3, 4, 5]
+
+    assert buffer.flush() == 3
+    assert buffer.pending == 0
+    assert unread(nm, "bob") == [3, 4, 5] and unread(nm, "carol") == [1, 2, 3, 4]
+    assert nm.getUnreadCount("bob") == 3 and nm.getUnreadCount("carol") == 4
+
+
+def test_acks_flush_at_size_threshold(nm):
+    bob = ids(nm, "bob")
+    buffer = ReadReceiptBuffer(nm, flush_interval=60, max_pending=2)
+
+    async def main():
+        flusher = asyncio.create_task(buffer.run())
+        await asyncio.sleep(0)
+        buffer.add("bob", bob[1])
+        buffer.add("bob", bob[2])
+        assert buffer.pending == 2  # add() never writes; the flusher wakes up
+        for _ in range(100):
+            if buffer.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        flusher.cancel()
+
+    asyncio.run(main())
+    assert buffer.pending == 0 and unread(nm, "bob") == [3, 4, 5]
+
+
+def test_large_backlog_is_written_in_batches(nm):
+    bob, carol = ids(nm, "bob"), ids(nm, "carol")
+    receipts = {"bob": [bob[i] for i in (1, 2, 3)], "carol": [carol[i] for i in (1, 2, 3, 4)]}
+    with patch("classes.NotificationManager.MAX_BATCH", 3), \
+            patch.object(nm, "_markRead", side_effect=nm._markRead) as mark:
+        assert nm.applyReadReceipts(receipts) == 7
+    assert mark.call_count == 4  # bob 2 + 1, carol 2 + 2: a username and two IDs per UPDATE
+    assert unread(nm, "bob") == [4, 5] and nm.getUnreadCount("carol") == 1
+
+
+def test_failed_flush_keeps_acks():
+    class Down:
+        def applyReadReceipts(self, receipts):
+            raise Exception("database unavailable")
+
+    buffer = ReadReceiptBuffer(Down())
+    buffer.add("bob", 1)
+    with pytest.raises(Exception):
+        buffer.flush()
+    buffer.add("bob", 1)
+    buffer.add("bob", 2)
+    assert buffer.pending == 2
+
+
+def test_backlog_is_capped_while_flushes_fail():
+    class Down:
+        def applyReadReceipts(self, receipts):
+            raise Exception("database unavailable")
+
+    buffer = ReadReceiptBuffer(Down(), max_backlog=3)
+    for notification_id in range(5):
+        buffer.add("bob", notification_id)
+    assert buffer.pending == 3 and buffer.dropped == 2
+    with pytest.raises(Exception):
+        buffer.flush()
+    buffer.add("carol", 9)
+    assert buffer.pending == 3 and buffer.dropped == 3
+
+
+def test_ack_endpoint_is_flushed_on_shutdown(nm):
+    bob = ids(nm, "bob")
+    with TestClient(create_app(db=nm.db, nm=nm)) as client:
+        res = client.put(f"/notifications/bob/{bob[4]}/read")
+        assert res.status_code == 202
+    assert unread(nm, "bob") == [1, 2, 3, 5]
+    assert nm.getUnreadCount("bob") == 4
+
+
+# push delivery
+
+def test_hub_delivers_to_each_connection_of_a_user():
+    async def scenario():
+        hub = NotificationHub()
+        first, second, other = hub.subscribe("bob"), hub.subscribe("bob"), hub.subscribe("carol")
+        assert hub.publish(["bob"], "notification", {"eventID": 1}) == 2
+        await asyncio.sleep(0)
+        assert first.queue.get_nowait() == second.queue.get_nowait() == ("notification", {"eventID": 1})
+        assert other.queue.empty()
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.connections == 1
+        assert hub.publish(["bob"], "notification", {}) == 0
+
+    asyncio.run(scenario())
+
+
+def test_hub_publish_from_another_thread():
+    async def scenario():
+        hub = NotificationHub()
+        subscription = hub.subscribe("bob")
+        thread = threading.Thread(target=hub.publish, args=(["bob"], "notification", {"eventID": 2}))
+        thread.start()
+        frame = await asyncio.wait_for(subscription.frames(heartbeat=5).__anext__(), 5)
+        thread.join()
+        assert frame.startswith("event: notification\n") and '"eventID": 2' in frame
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_told_to_resync():
+    async def scenario():
+        hub = NotificationHub(queue_size=2)
+        subscription = hub.subscribe("bob")
+        for i in range(5):
+            hub.publish(["bob"], "notification", {"eventID": i})
+        await asyncio.sleep(0)
+        frames = subscription.frames(heartbeat=5)
+        events = [(await frames.__anext__()).split("\n")[0] for _ in range(3)]
+        assert events == ["event: notification", "event: notification", "event: resync"]
+
+    asyncio.run(scenario())
+
+
+def test_idle_stream_sends_heartbeat():
+    async def scenario():
+        subscription = NotificationHub().subscribe("bob")
+        return await subscription.frames(heartbeat=0.01).__anext__()
+
+    assert asyncio.run(scenario()) == ": keepalive\n\n"
+
+
+def test_created_notifications_are_pushed(nm):
+    async def scenario():
+        nm.hub = NotificationHub()
+        bob, dave = nm.hub.subscribe("bob"), nm.hub.subscribe("dave")
+        nm.createNotification(["bob"], "new", 9, created_at=datetime(2025, 1, 9), eventDate=datetime(2025, 2, 9))
+        await asyncio.sleep(0)
+        event, data = bob.queue.get_nowait()
+        assert event == "notification" and data["eventID"] == 9
+        assert dave.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_stream_endpoint_starts_with_unread_count(nm):
+    """Drive the ASGI app directly; the stream ends when the client disconnects"""
+    app = create_app(db=nm.db, nm=nm)
+
+    async def scenario():
+        disconnect = asyncio.Event()
+        messages = []
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and message.get("body"):
+                disconnect.set()
+
+        scope = {"type": "http", "method": "GET", "path": "/notifications/bob/stream", "raw_path": b"",
+                 "query_string": b"", "headers": [], "http_version": "1.1", "scheme": "http",
+                 "server": ("test", 80), "client": ("test", 1), "root_path": "", "app": app}
+        await asyncio.wait_for(app(scope, receive, send), 5)
+        return messages
+
+    messages = asyncio.run(scenario())
+    start = messages[0]
+    assert start["status"] == 200
+    assert dict(start["headers"])[b"content-type"].startswith(b"text/event-stream")
+    assert messages[1]["body"] == b'event: unread\ndata: {"unreadCount": 5}\n\n'
+    assert app.state.hub.connections == 0
+
+
+# digests
+
+def rows_for(nm, username):
+    return nm.getNotificationsByUsername(username)
+
+
+def test_burst_becomes_first_notification_plus_digest(nm):
+    clock = Clock()
+    coalescer = NotificationCoalescer(nm, window=60, clock=clock)
+    for i, name in enumerate(["Meeting", "Workshop", "Trip", "Review"]):
+        coalescer.notify(1, "Chess", ["bob"], name, 10 + i, datetime(2025, 3, 10 - i))
+    assert coalescer.held == 3
+    clock.now = 30
+    assert coalescer.flush() == 0
+
+    clock.now = 61
+    assert coalescer.flush() == 2  # bob and the admin carol
+    newest = rows_for(nm, "bob")[:2]
+    assert newest[0]["eventCount"] == 3 and newest[0]["eventID"] == 13 and newest[0]["groupID"] == 1
+    assert newest[0]["description"] == "3 new events in Chess: Workshop, Trip, Review"
+    assert str(newest[0]["eventDate"]).startswith("2025-03-07")
+    assert newest[1]["eventCount"] == 1 and newest[1]["description"] == "Meeting"
+    assert len(rows_for(nm, "bob")) == 7
+    assert nm.getUnreadCount("bob") == 7
+
+
+def test_window_reopens_after_digest(nm):
+    clock = Clock()
+    coalescer = NotificationCoalescer(nm, window=60, clock=clock)
+    coalescer.notify(1, "Chess", ["bob"], "first", 10, datetime(2025, 3, 1))
+    clock.now = 61
+    # the window closed with nothing held, so this one goes out at once
+    assert coalescer.notify(1, "Chess", ["bob"], "second", 11, datetime(2025, 3, 2)) == 2
+    assert coalescer.held == 0
+
+
+def test_zero_window_sends_every_event(nm):
+    coalescer = NotificationCoalescer(nm, window=0)
+    for i in range(3):
+        assert coalescer.notify(1, "Chess", ["bob"], f"e{i}", 10 + i, datetime(2025, 3, 1)) == 2
+    assert nm.getUnreadCount("bob") == 8
+
+
+def test_failed_digest_is_retried():
+    class Flaky:
+        calls = 0
+
+        def createNotification(self, **kwargs):
+            self.calls += 1
+            if self.calls == 2:
+                raise Exception("database unavailable")
+            return len(kwargs["usernames"])
+
+    clock = Clock()
+    coalescer = NotificationCoalescer(Flaky(), window=10, clock=clock)
+    coalescer.notify(1, "Chess", ["bob"], "a", 1, datetime(2025, 3, 1))
+    coalescer.notify(1, "Chess", ["bob"], "b", 2, datetime(2025, 3, 2))
+    clock.now = 11
+    with pytest.raises(Exception):
+        coalescer.flush()
+    assert coalescer.held == 1
+    assert coalescer.flush() == 1 and coalescer.held == 0
+
+
+def test_digest_description_fits_column():
+    events = [{"description": "x" * 400} for _ in range(5)]
+    text = digest_description("Chess", events)
+    assert len(text) == 1000 and text.endswith("...")
+
+
+def test_group_events_are_digested_through_the_api(nm):
+    with TestClient(create_app(db=nm.db, nm=nm)) as client:
+        for day in range(1, 4):
+            res = client.post("/events/group/1", json={"date": f"2025-04-0{day}", "description": f"Day {day}"})
+            assert res.status_code == 201
+        assert len(client.get("/notifications/bob").json()) == 6
+    # shutdown flushes the held digest
+    newest = rows_for(nm, "bob")[0]
+    assert newest["eventCount"] == 2 and newest["description"] == "2 new events in Chess: Day 2, Day 3"
@@ -0,0 +1,241 @@
+"""
+Notification Outbox Test Suite
+
+File Name: test_outbox.py
+
+Runs classes/NotificationOutbox.py and classes/OutboxWorker.py against a
+SQLite file with a fake clock: jobs commit with their events, are leased to
+one worker at a time, retried with backoff until they fail, and delivered in
+batches; the Events Service queues them in place of writing notifications
+inline, and a separate worker delivers them when OUTBOX_INLINE_WORKER=0.
+
+Run: pytest test_outbox.py -v
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.NotificationCoalescer import NotificationCoalescer
+from classes.NotificationManager import NotificationManager
+from classes.NotificationOutbox import NotificationOutbox
+from classes.OutboxWorker import OutboxWorker
+from classes.ServiceConfig import Settings
+from Event import create_app
+from tests.conftest import Clock
+
+NOW = datetime(2026, 3, 1, 12, 0)  # naive UTC, as stored
+
+
+@pytest.fixture
+def clock():
+    return Clock(NOW)
+
+
+@pytest.fixture
+def outbox(db, clock):
+    return NotificationOutbox(db, max_attempts=3, backoff=2.0, clock=clock)
+
+
+def enqueue(db, outbox, eventID, groupID, groupName="Chess"):
+    date = datetime(2026, 4, eventID, 18, 0)
+    db.execute_transaction([
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, :date, :d)",
+         {"id": eventID, "date": date, "d": f"Event {eventID}"}),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, :g)", {"id": eventID, "g": groupID}),
+        outbox.enqueueStatement(eventID, groupID, groupName, f"Event {eventID}", date),
+    ])
+
+
+def worker(outbox, **kwargs):
+    coalescer = NotificationCoalescer(NotificationManager(db=outbox.db), window=0)
+    return OutboxWorker(outbox, coalescer, name="w1", **kwargs)
+
+
+def test_job_rolls_back_with_its_event(db, outbox):
+    enqueue(db, outbox, 1, 1)
+    with pytest.raises(Exception):
+        db.execute_transaction([
+            outbox.enqueueStatement(2, 1, "Chess", "Event 2", datetime(2026, 4, 2)),
+            ("INSERT INTO [Event] (eventID, date, description) VALUES (1, '2026-04-02', 'taken')", None),
+        ])
+    assert outbox.stats()["pending"] == 1
+
+
+def test_claim_lease_and_complete(db, outbox, clock):
+    for eventID in (1, 2, 3):
+        enqueue(db, outbox, eventID, 1)
+        clock.now += timedelta(seconds=1)
+
+    first = outbox.claim("w1", limit=2, lease=30)
+    assert [job["eventID"] for job in first] == [1, 2]  # oldest first
+    assert first[0]["attempts"] == 1
+    assert [job["eventID"] for job in outbox.claim("w2", limit=10, lease=30)] == [3]
+    assert outbox.claim("w2", limit=10, lease=30) == []
+    assert outbox.stats()["inFlight"] == 3
+
+    # w1 stalls past its lease; w2 takes its jobs over and w1 can no longer complete them
+    clock.now += timedelta(seconds=31)
+    assert [job["eventID"] for job in outbox.claim("w2", limit=10, lease=30)] == [1, 2, 3]
+    assert outbox.complete("w1", [1, 2]) == 0
+    assert outbox.complete("w2", [1, 2, 3]) == 3
+    assert outbox.stats() == {"pending": 0, "inFlight": 0, "failed": 0, "lagSeconds": 0.0}
+
+
+def test_retry_backs_off_then_fails(db, outbox, clock):
+    enqueue(db, outbox, 1, 1)
+    job = outbox.claim("w1", limit=1, lease=30)[0]
+    for delay in (2, 4):
+        assert outbox.retry(job, Exception("database unavailable"))
+        clock.now += timedelta(seconds=delay - 0.1)
+        assert outbox.claim("w1", limit=1, lease=30) == []
+        clock.now += timedelta(seconds=0.2)
+        job = outbox.claim("w1", limit=1, lease=30)[0]
+    assert job["attempts"] == 3
+    assert not outbox.retry(job, Exception("database unavailable"))
+    clock.now += timedelta(days=1)
+    assert outbox.claim("w1", limit=1, lease=30) == []
+    assert outbox.stats()["failed"] == 1 and outbox.stats()["pending"] == 0
+    error = db.read_query_to_df("SELECT lastError FROM NotificationOutbox", {}).iloc[0]["lastError"]
+    assert error == "database unavailable"
+
+    assert outbox.requeueFailed() == 1
+    assert outbox.claim("w1", limit=1, lease=30)[0]["attempts"] == 1
+
+
+def test_stats_lag(db, outbox, clock):
+    enqueue(db, outbox, 1, 1)
+    clock.now += timedelta(seconds=90)
+    enqueue(db, outbox, 2, 1)
+    clock.now += timedelta(seconds=10)
+    assert outbox.stats() == {"pending": 2, "inFlight": 0, "failed": 0, "lagSeconds": 100.0}
+
+
+
+def test_timestamps_are_stored_as_naive_utc(db):
+    outbox = NotificationOutbox(db)
+    enqueue(db, outbox, 1, 1)
+    assert outbox.stats()["lagSeconds"] < 5
+    assert worker(outbox).process() == 1
+    sent = NotificationManager(db=db).getNotificationsByUsername("bob")[0]["notificationTimestamp"]
+    sent = sent if isinstance(sent, datetime) else datetime.fromisoformat(str(sent))
+    assert sent.tzinfo is None and abs(sent - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
+
+def test_worker_delivers_a_batch_across_groups(db, outbox):
+    for eventID, groupID, name in ((1, 1, "Chess"), (2, 2, "Go"), (3, 1, "Chess")):
+        enqueue(db, outbox, eventID, groupID, name)
+    w = worker(outbox, batch_size=2)
+    assert w.process() == 2
+    assert w.process() == 1
+    assert w.process() == 0
+    nm = w.coalescer.nm
+    assert sorted(n["eventID"] for n in nm.getNotificationsByUsername("carol")) == [1, 2, 3]
+    assert nm.getUnreadCount("bob") == 2
+    assert outbox.stats()["pending"] == 0
+
+
+def test_worker_retries_only_the_failed_job(db, outbox):
+    enqueue(db, outbox, 1, 1)
+    enqueue(db, outbox, 2, 2, "Go")
+    w = worker(outbox)
+    notify = w.coalescer.notify
+
+    def flaky(**kwargs):
+        if kwargs["eventID"] == 2:
+            raise Exception("insert failed")
+        return notify(**kwargs)
+
+    w.coalescer.notify = flaky
+    assert w.process() == 1
+    stats = outbox.stats()
+    assert stats["pending"] == 1 and stats["inFlight"] == 0
+    w.coalescer.notify = notify
+    assert w.process() == 0  # still backing off
+
+
+
+def digesting_worker(outbox, seconds):
+    coalescer = NotificationCoalescer(NotificationManager(db=outbox.db), window=60, clock=seconds)
+    return OutboxWorker(outbox, coalescer, name="w1", lease=30, clock=seconds)
+
+
+def test_jobs_held_for_a_digest_stay_leased_until_it_is_written(db, outbox, clock):
+    seconds = Clock(0.0)
+    for eventID in (1, 2, 3):
+        enqueue(db, outbox, eventID, 1)
+    w = digesting_worker(outbox, seconds)
+    assert w.process() == 3  # 1 sent, 2 and 3 held
+    assert w.held == 2 and outbox.stats()["inFlight"] == 2
+
+    # Renewed at lease / 2, so no other worker takes them over while the window is open
+    for _ in range(4):
+        clock.now += timedelta(seconds=20)
+        seconds.now += 20
+        assert w.process() == 0
+    assert outbox.claim("w2", limit=10, lease=30) == []
+
+    assert w.coalescer.flush() == 2  # the digest, for bob and carol
+    assert w.held == 0 and outbox.stats()["pending"] == 0
+
+
+def test_held_jobs_survive_a_crash(db, outbox, clock):
+    for eventID in (1, 2):
+        enqueue(db, outbox, eventID, 1)
+    assert digesting_worker(outbox, Clock(0.0)).process() == 2  # then the process dies holding 2
+    assert outbox.stats()["pending"] == 1
+
+    clock.now += timedelta(seconds=31)
+    assert worker(outbox).process() == 1
+    assert [n["eventID"] for n in NotificationManager(db=db).getNotificationsByUsername("bob")] == [2, 1]
+
+def test_api_queues_and_external_worker_delivers(db, clock):
+    settings = Settings(database_url="", outbox_inline_worker=0, reminder_lead_minutes="")
+    app = create_app(settings=settings, db=db)
+    client = TestClient(app)
+    res = client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "Game night"})
+    assert res.status_code == 201
+    assert client.get("/notifications/bob").json() == []
+    assert client.get("/outbox/stats").json()["pending"] == 1
+
+    outbox = NotificationOutbox(db)
+    assert worker(outbox).process() == 1
+    assert [n["description"] for n in client.get("/notifications/bob").json()] == ["Game night"]
+    assert client.get("/outbox/stats").json()["pending"] == 0
+
+
+def test_api_delivers_inline_by_default(db):
+    client = TestClient(create_app(db=db))
+    res = client.post("/events/group/2", json={"date": "2026-04-01T18:00:00", "description": "Go night"})
+    assert res.status_code == 201
+    assert [n["eventID"] for n in client.get("/notifications/carol").json()] == [res.json()["eventID"]]
+    assert client.get("/outbox/stats").json() == {"pending": 0, "inFlight": 0, "failed": 0, "lagSeconds": 0.0}
+
+
+def test_inline_delivery_runs_off_the_event_loop(db):
+    app = create_app(db=db)
+    process, loops = app.state.outbox_worker.process, []
+
+    def spy(eventIDs=None):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return process(eventIDs)
+
+    app.state.outbox_worker.process = spy
+    res = TestClient(app).post("/events/group/2", json={"date": "2026-04-01T18:00:00", "description": "Go night"})
+    assert res.status_code == 201 and loops == [None]
+
+
+def test_deleting_an_undelivered_event_drops_its_job(db):
+    settings = Settings(database_url="", outbox_inline_worker=0, reminder_lead_minutes="")
+    client = TestClient(create_app(settings=settings, db=db))
+    event_id = client.post("/events/group/1", json={"date": "2026-04-01T18:00:00", "description": "x"}).json()["eventID"]
+    assert client.delete(f"/events/bob/{event_id}").status_code == 200
+    assert client.get("/outbox/stats").json()["pending"] == 0
@@ -0,0 +1,161 @@
+"""
+Reminder Scheduler Test Suite
+
+File Name: test_reminders.py
+
+Runs classes/ReminderScheduler.py against a SQLite file with a fake clock:
+reminders fire at their lead times, are written once per member with the
+unread counter, survive a restart without being sent twice, and skip events
+that moved, were deleted or already started.
+
+Run: pytest test_reminders.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.NotificationHub import NotificationHub
+from classes.NotificationManager import NotificationManager
+from classes.ReminderScheduler import (ReminderScheduler, _pack, _time_left, _unpack, lead_text, parse_leads,
+                                       reminder_description)
+from classes.SQLManager import DatabaseManager
+from tests.conftest import Clock
+
+START = datetime(2026, 3, 1, 18, 0)
+
+
+@pytest.fixture
+def nm(tmp_path):
+    """Chess (bob, carol) has event 1 at START; Go (carol) has event 2 a day later; event 3 is in no group"""
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'reminders.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (:g, :n, 'club')",
+         [{"g": 1, "n": "Chess"}, {"g": 2, "n": "Go"}]),
+        ("INSERT INTO GroupMember (username, groupID) VALUES (:u, :g)",
+         [{"u": "bob", "g": 1}, {"u": "carol", "g": 1}, {"u": "carol", "g": 2}]),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, :date, :d)",
+         [{"id": 1, "date": START, "d": "Chess night"},
+          {"id": 2, "date": START + timedelta(days=1), "d": "Go night"},
+          {"id": 3, "date": START, "d": "Solo"}]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:e, :g)", [{"e": 1, "g": 1}, {"e": 2, "g": 2}]),
+    ])
+    return NotificationManager(db=db)
+
+
+def scheduler(nm, clock, **kwargs):
+    return ReminderScheduler(nm, leads=[1440, 60], window=2 * 3600, now=clock, **kwargs)
+
+
+def descriptions(nm, username):
+    return sorted(n["description"] for n in nm.getNotificationsByUsername(username))
+
+
+def test_helpers():
+    assert parse_leads("1440, 60,,60") == [60, 1440]
+    assert parse_leads("") == []
+    assert [lead_text(m) for m in (1440, 2880, 60, 90, 1)] == ["1 day", "2 days", "1 hour", "90 minutes", "1 minute"]
+    assert [_time_left(s) for s in (20, 29 * 60, 238 * 60, 1500 * 60)] == [1, 29, 240, 1440]
+    assert len(reminder_description("x" * 2000, 60)) == 1000
+    entry = _pack(1_800_000_000, 2**31 - 1, 3)
+    assert _unpack(entry) == (1_800_000_000, 2**31 - 1, 3)
+    assert _pack(1, 999, 0) < _pack(2, 1, 0)
+
+
+def test_fires_each_lead_once_at_its_time(nm):
+    clock = Clock(START - timedelta(days=1, hours=1))
+    s = scheduler(nm, clock)
+    assert s.load() == 1  # event 1's day-ahead reminder is inside the window
+    assert s.fire_due() == 0
+    assert s.next_due() == 3600
+
+    clock.now = START - timedelta(days=1)
+    assert s.fire_due() == 2  # bob and carol
+    assert descriptions(nm, "bob") == ["Starts in 1 day: Chess night"]
+    assert nm.getUnreadCount("carol") == 1
+
+    clock.now = START - timedelta(hours=1)
+    s.load()
+    assert s.fire_due() == 2
+    assert descriptions(nm, "bob") == ["Starts in 1 day: Chess night", "Starts in 1 hour: Chess night"]
+    assert nm.getNotificationsByUsername("bob")[0]["groupID"] == 1
+
+
+def test_restart_does_not_send_twice(nm):
+    clock = Clock(START - timedelta(hours=1))
+    first = scheduler(nm, clock)
+    assert first.load() == 2  # event 1's hour-ahead now, event 2's day-ahead in an hour
+    assert first.fire_due() == 2
+
+    restarted = scheduler(nm, clock)
+    assert restarted.load() == 1
+    assert _unpack(restarted._heap[0])[1] == 2
+    assert restarted.fire_due() == 0
+
+    # Even a scheduler holding a stale copy of the sent reminder cannot send it again
+    stale = scheduler(nm, clock)
+    fire_at = int((START - timedelta(hours=1) - datetime(1970, 1, 1)).total_seconds())
+    stale._heap = [_pack(fire_at, 1, 0)]
+    assert stale.fire_due() == 0
+    assert nm.getUnreadCount("bob") == 1
+
+
+def test_missed_reminders_send_only_the_shortest_lead(nm):
+    """Down through both of event 1's reminders; back up 30 minutes before it starts"""
+    clock = Clock(START - timedelta(minutes=30))
+    s = scheduler(nm, clock)
+    s.load()
+    assert s.fire_due() == 2
+    assert descriptions(nm, "bob") == ["Starts in 30 minutes: Chess night"]
+    # The day-ahead reminder stays skipped after the next reload; only event 2's is left
+    assert s.load() == 1
+    assert _unpack(s._heap[0])[1] == 2
+
+
+def test_moved_started_and_deleted_events(nm):
+    clock = Clock(START - timedelta(hours=1))
+    s = scheduler(nm, clock)
+    assert s.load() == 2
+    nm.db.execute_query("UPDATE [Event] SET date = :d WHERE eventID = 1", {"d": START + timedelta(hours=3)})
+    assert s.fire_due() == 0  # the loaded reminder no longer matches the event
+
+    # Moved four hours out: its day-ahead reminder is now overdue and goes out late
+    s.load()
+    assert s.fire_due() == 2
+    assert descriptions(nm, "bob") == ["Starts in 4 hours: Chess night"]
+
+    clock.now = START + timedelta(hours=2)
+    s.load()
+    assert s.fire_due() == 3  # event 1's hour-ahead, and event 2's late day-ahead for carol
+    assert "Starts in 22 hours: Go night" in descriptions(nm, "carol")
+
+    clock.now = START + timedelta(days=1, hours=1)
+    assert s.load() == 0  # both have started
+
+
+def test_deleted_event_is_skipped(nm):
+    clock = Clock(START - timedelta(hours=1))
+    s = scheduler(nm, clock)
+    s.load()
+    nm.db.execute_query("DELETE FROM [Event] WHERE eventID = 1")
+    assert s.fire_due() == 0
+    assert nm.getUnreadCount("bob") == 0
+
+
+def test_batches_and_hub_push(nm):
+    hub = NotificationHub()
+    nm.hub = hub
+    published = []
+    hub.publish = lambda usernames, event, data: published.append((sorted(usernames), data["eventID"]))
+    clock = Clock(START + timedelta(hours=23))
+    s = scheduler(nm, clock, batch_size=1)
+    nm.db.execute_query("UPDATE [Event] SET date = :d WHERE eventID = 1", {"d": START + timedelta(days=1)})
+    assert s.load() == 2
+    assert s.fire_due() == 3
+    assert sorted(published) == [(["bob", "carol"], 1), (["carol"], 2)]
+    # carol got two reminders in the same instant without a key clash
+    assert nm.getUnreadCount("carol") == 2
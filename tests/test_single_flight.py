@@ -0,0 +1,126 @@
+"""
+Read Coalescing Test Suite
+
+File Name: test_single_flight.py
+
+Checks classes/SingleFlight.py: concurrent identical reads share one call
+(and its errors), later reads and reads after forget() start a new one, and
+a burst of identical requests to the Events Service runs the list query
+once and shows up in /events/stats/coalescing.
+
+Run: pytest test_single_flight.py -v
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.ServiceConfig import Settings
+from classes.SingleFlight import SingleFlight
+from classes.SQLManager import DatabaseManager
+from Event import create_app
+
+
+def slow(result, calls, delay=0.1):
+    def read(*args):
+        calls.append(args)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return read
+
+
+def test_concurrent_reads_share_one_call():
+    async def main():
+        flights, calls = SingleFlight(), []
+        read = slow([1, 2], calls)
+        results = await asyncio.gather(*(flights.do("events", 7, read, 7) for _ in range(5)),
+                                       flights.do("events", 8, read, 8))
+        assert results == [[1, 2]] * 6
+        assert sorted(calls) == [(7,), (8,)]
+        assert flights.in_flight == 0
+
+        await flights.do("events", 7, read, 7)  # nothing in flight any more
+        assert len(calls) == 3
+        assert flights.stats() == {"events": {"requests": 7, "executions": 3, "shared": 4, "ratio": 2.333}}
+    asyncio.run(main())
+
+
+def test_errors_are_shared_and_not_kept():
+    async def main():
+        flights, calls = SingleFlight(), []
+        results = await asyncio.gather(*(flights.do("events", 1, slow(ValueError("down"), calls)) for _ in range(3)),
+                                       return_exceptions=True)
+        assert len(calls) == 1 and all(isinstance(r, ValueError) for r in results)
+        assert await flights.do("events", 1, slow("ok", calls)) == "ok"
+    asyncio.run(main())
+
+
+def test_forget_and_disabled():
+    async def main():
+        flights, calls = SingleFlight(), []
+        first = asyncio.ensure_future(flights.do("details", 1, slow("before", calls)))
+        await asyncio.sleep(0.02)
+        flights.forget("details")  # a write happened meanwhile
+        assert await flights.do("details", 1, slow("after", calls)) == "after"
+        assert await first == "before"
+
+        off, calls = SingleFlight(enabled=False), []
+        await asyncio.gather(*(off.do("details", 1, slow("x", calls)) for _ in range(3)))
+        assert len(calls) == 3
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_leaves_the_call_running():
+    async def main():
+        flights, calls = SingleFlight(), []
+        read = slow("rows", calls)
+        leader = asyncio.ensure_future(flights.do("events", 1, read))
+        follower = asyncio.ensure_future(flights.do("events", 1, read))
+        await asyncio.sleep(0.02)
+        leader.cancel()
+        assert await follower == "rows" and len(calls) == 1
+    asyncio.run(main())
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'flights.db'}")
+    db.execute_transaction([
+        ("INSERT INTO [Group] (groupID, groupName, description) VALUES (1, 'Chess', 'club')", None),
+        ("INSERT INTO [Event] (eventID, date, description) VALUES (:id, '2026-04-01 18:00:00', 'Chess night')",
+         [{"id": i} for i in range(1, 4)]),
+        ("INSERT INTO GroupToEvent (eventID, groupID) VALUES (:id, 1)", [{"id": i} for i in range(1, 4)]),
+    ])
+    return db
+
+
+@pytest.mark.parametrize("coalescing,queries", [(1, 1), (0, 10)])
+def test_burst_of_identical_requests(db, coalescing, queries):
+    app = create_app(Settings(read_coalescing=coalescing), db=db)
+    read = db.read_query_to_rows
+
+    def slow_read(*args):
+        time.sleep(0.2)
+        return read(*args)
+
+    async def burst():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.get("/events/group/1") for _ in range(10)))
+            return responses, (await client.get("/events/stats/coalescing")).json()
+
+    with patch.object(db, "read_query_to_rows", side_effect=slow_read) as reads:
+        responses, stats = asyncio.run(burst())
+    assert all(r.status_code == 200 and len(r.json()) == 3 for r in responses)
+    assert len({r.headers["etag"] for r in responses}) == 1
+    assert reads.call_count == queries
+    assert stats["reads"]["group_events"]["requests"] == 10
+    assert stats["reads"]["group_events"]["executions"] == queries
@@ -0,0 +1,122 @@
+"""
+Local Database Backend Test Suite
+
+File Name: test_sqlite_backend.py
+
+Covers the T-SQL -> SQLite translation in classes/SQLiteBackend.py and runs a
+short end-to-end flow through the composed app against a real SQLite file,
+so no Azure connection is needed.
+
+Run: pytest test_sqlite_backend.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+# Add api folder to sys.path so imports work
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
+
+from classes.SQLiteBackend import translate_tsql, tsql_to_sqlite_ddl, SCHEMA_PATH
+from classes.SQLManager import DatabaseManager
+from Main import create_app
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh SQLite database with the project schema loaded"""
+    return DatabaseManager(url=f"sqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def client(db):
+    return TestClient(create_app(db=db))
+
+
+# translation
+
+def test_translate_cast_nvarchar_max():
+    sql = "SELECT CAST(e.description AS NVARCHAR(MAX)) as description FROM [Event] e"
+    assert translate_tsql(sql) == "SELECT CAST(e.description AS TEXT) as description FROM [Event] e"
+
+
+def test_translate_isnull():
+    sql = "SELECT ISNULL(MAX(eventID), 0) + 1 as next_id FROM [Event]"
+    assert "IFNULL(MAX(eventID), 0)" in translate_tsql(sql)
+
+
+def test_translate_output_inserted():
+    sql = """
+        INSERT INTO [Event] (date, description)
+        OUTPUT INSERTED.eventID
+        VALUES (:date, :description)
+    """
+    translated = translate_tsql(sql)
+    assert "OUTPUT" not in translated
+    assert translated.endswith("VALUES (:date, :description) RETURNING eventID")
+
+
+def test_translate_select_top():
+    sql = "SELECT TOP 1 username FROM GroupMember ORDER BY username;"
+    assert translate_tsql(sql) == "SELECT username FROM GroupMember ORDER BY username LIMIT 1"
+
+
+def test_translate_select_top_in_subquery():
+    sql = "SELECT MAX(x) as m FROM (SELECT TOP (:n) x FROM T WHERE y < :y ORDER BY x) b"
+    assert translate_tsql(sql) == "SELECT MAX(x) as m FROM (SELECT x FROM T WHERE y < :y ORDER BY x LIMIT :n) b"
+
+
+def test_translate_leaves_plain_sql_alone():
+    sql = "SELECT username FROM [User] WHERE username = :username"
+    assert translate_tsql(sql) == sql
+
+
+def test_schema_script_converts_every_table():
+    with open(SCHEMA_PATH, encoding="utf-16") as f:
+        statements = tsql_to_sqlite_ddl(f.read())
+    assert len(statements) == 8
+    assert all(s.startswith("CREATE TABLE IF NOT EXISTS") for s in statements)
+    assert not any("[PRIMARY]" in s or "CLUSTERED" in s for s in statements)
+
+
+# end to end
+
+def test_schema_loaded_on_first_use(db):
+    df = db.read_query_to_df("SELECT COUNT(*) as total FROM [Event]")
+    assert int(df.iloc[0]["total"]) == 0
+
+
+def test_group_event_flow(client):
+    """Register, create a group, add an event and read it back as a member"""
+    for name in ("alice", "bob"):
+        res = client.post("/register", json={"username": name, "password": "pw", "Fname": name, "Lname": "X"})
+        assert res.status_code == 201
+
+    res = client.post("/groups/create", json={"groupName": "Chess", "description": "club", "adminUsername": "alice"})
+    assert res.status_code == 201
+    group_id = res.json()["groupID"]
+
+    assert client.post(f"/groups/join/{group_id}?username=bob").status_code == 200
+
+    res = client.post(f"/events/group/{group_id}", json={"date": "2026-11-01T18:00:00", "description": "Game night"})
+    assert res.status_code == 201
+    event_id = res.json()["eventID"]
+
+    events = client.get("/events/user/bob").json()
+    assert [e["eventID"] for e in events] == [event_id]
+
+    notifications = client.get("/notifications/bob").json()
+    assert notifications[0]["description"] == "Game night"
+
+    assert client.post(f"/rsvp/{event_id}", json={"username": "bob"}).status_code == 201
+    assert client.get(f"/rsvp/{event_id}/bob").json()["isRSVPed"] is True
+
+
+def test_output_inserted_insert_is_committed(client):
+    """POST /events/{username} uses OUTPUT INSERTED and must persist the row"""
+    client.post("/register", json={"username": "carol", "password": "pw", "Fname": "C", "Lname": "X"})
+    res = client.post("/events/carol", json={"name": "Standup", "date": "2026-11-02", "time": "09:00"})
+    assert res.status_code == 201
+
+    assert client.get("/health").json()["total_events"] == 1
@@ -18,26 +18,22 @@ from fastapi.testclient import TestClient
 import sys
 import os
 
-# Mock the database module BEFORE importing User
-sys.modules['database'] = MagicMock()
-
 # Add api folder to sys.path so imports work
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "api"))
 
-from User import app, LoginRequest, UserCreate, UserResponse
+from User import create_app, LoginRequest, UserCreate, UserResponse
 
 
 @pytest.fixture
-def client():
-    """Create test client for FastAPI app"""
-    return TestClient(app)
+def mock_db():
+    """Create a mock database object"""
+    return MagicMock()
 
 
 @pytest.fixture
-def mock_db():
-    """Create a mock database object"""
-    with patch("User.db") as mock:
-        yield mock
+def client(mock_db):
+    """Create test client for a FastAPI app wired to the mock database"""
+    return TestClient(create_app(db=mock_db))
 
 
 # LOGIN tests